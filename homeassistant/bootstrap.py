@@ -308,6 +308,7 @@ async def async_load_base_functionality(hass: core.HomeAssistant) -> None:
         label_registry.async_load(hass),
         hass.async_add_executor_job(_cache_uname_processor),
         template.async_load_custom_templates(hass),
+        template.async_load_template_sources(hass),
         restore_state.async_load(hass),
         hass.config_entries.async_initialize(),
     )
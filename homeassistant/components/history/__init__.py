@@ -117,7 +117,7 @@ class HistoryPeriodView(HomeAssistantView):
 
         return cast(
             web.Response,
-            await get_instance(hass).async_add_executor_job(
+            await get_instance(hass).async_add_read_executor_job(
                 self._sorted_significant_states_json,
                 hass,
                 start_time,
@@ -142,7 +142,7 @@ class HistoryPeriodView(HomeAssistantView):
         no_attributes: bool,
     ) -> web.Response:
         """Fetch significant stats from the database as json."""
-        with session_scope(hass=hass, read_only=True) as session:
+        with session_scope(hass=hass, read_only=True, read_pool=True) as session:
             return self.json(
                 list(
                     history.get_significant_states_with_session(
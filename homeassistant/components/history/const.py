@@ -5,3 +5,6 @@ DOMAIN = "history"
 EVENT_COALESCE_TIME = 0.35
 
 MAX_PENDING_HISTORY_STATES = 2048
+
+# The number of entities sent in each message of a chunked history stream
+MAX_ENTITIES_PER_CHUNK = 100
@@ -0,0 +1,120 @@
+"""Downsample history states for the history integration."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import math
+from typing import Any, Final
+
+from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_STATE
+
+DOWNSAMPLE_LTTB: Final = "lttb"
+DOWNSAMPLE_MIN_MAX: Final = "min_max"
+
+# The smallest number of points a series can be downsampled to
+# since the first and last points are always kept
+MIN_POINTS: Final = 3
+
+
+def _lttb_indices(xs: list[float], ys: list[float], max_points: int) -> list[int]:
+    """Select the indices of max_points points with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always selected. The points in between are
+    split into max_points - 2 buckets and the point of each bucket forming the
+    largest triangle with the previously selected point and the average of the
+    next bucket is selected.
+    """
+    count = len(xs)
+    bucket_size = (count - 2) / (max_points - 2)
+    indices = [0]
+    selected = 0
+    for bucket in range(max_points - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        next_count = next_end - end
+        avg_x = sum(xs[end:next_end]) / next_count
+        avg_y = sum(ys[end:next_end]) / next_count
+        selected_x = xs[selected]
+        selected_y = ys[selected]
+        max_area = -1.0
+        for idx in range(start, end):
+            area = abs(
+                (selected_x - avg_x) * (ys[idx] - selected_y)
+                - (selected_x - xs[idx]) * (avg_y - selected_y)
+            )
+            if area > max_area:
+                max_area = area
+                selected = idx
+        indices.append(selected)
+    indices.append(count - 1)
+    return indices
+
+
+def _min_max_indices(xs: list[float], ys: list[float], max_points: int) -> list[int]:
+    """Select the indices of at most max_points points with min-max buckets.
+
+    The first and last points are always selected. The points in between are
+    split into buckets and the minimum and maximum points of each bucket are
+    selected in the order they occurred.
+    """
+    count = len(xs)
+    buckets = (max_points - 2) // 2
+    if not buckets:
+        return [0, count - 1]
+    bucket_size = (count - 2) / buckets
+    indices = [0]
+    for bucket in range(buckets):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        if start == end:
+            continue
+        bucket_range = range(start, end)
+        min_idx = min(bucket_range, key=ys.__getitem__)
+        max_idx = max(bucket_range, key=ys.__getitem__)
+        if min_idx == max_idx:
+            indices.append(min_idx)
+        else:
+            indices.extend(sorted((min_idx, max_idx)))
+    indices.append(count - 1)
+    return indices
+
+
+_METHODS: dict[str, Callable[[list[float], list[float], int], list[int]]] = {
+    DOWNSAMPLE_LTTB: _lttb_indices,
+    DOWNSAMPLE_MIN_MAX: _min_max_indices,
+}
+
+
+def downsample_compressed_states(
+    states: list[dict[str, Any]], max_points: int, method: str = DOWNSAMPLE_LTTB
+) -> list[dict[str, Any]]:
+    """Downsample the compressed states of an entity to about max_points states.
+
+    Only states with a numeric value are downsampled. States without
+    a numeric value, such as unavailable, are always kept so gaps in
+    the graph are preserved.
+    """
+    if len(states) <= max_points:
+        return states
+    numeric: list[int] = []
+    xs: list[float] = []
+    ys: list[float] = []
+    for idx, state in enumerate(states):
+        try:
+            value = float(state[COMPRESSED_STATE_STATE])
+        except (TypeError, ValueError):
+            continue
+        if not math.isfinite(value):
+            continue
+        numeric.append(idx)
+        xs.append(state[COMPRESSED_STATE_LAST_UPDATED])
+        ys.append(value)
+    numeric_points = max_points - (len(states) - len(numeric))
+    if len(numeric) <= max(numeric_points, MIN_POINTS):
+        return states
+    keep = [True] * len(states)
+    for idx in numeric:
+        keep[idx] = False
+    for numeric_idx in _METHODS[method](xs, ys, max(numeric_points, MIN_POINTS)):
+        keep[numeric[numeric_idx]] = True
+    return [state for state, kept in zip(states, keep) if kept]
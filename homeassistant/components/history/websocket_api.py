@@ -5,6 +5,7 @@ import asyncio
 from collections.abc import Callable, Iterable, MutableMapping
 from dataclasses import dataclass
 from datetime import datetime as dt
+from functools import partial
 import logging
 from typing import Any, cast
 
@@ -12,6 +13,7 @@ import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.websocket_api import messages
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.const import (
@@ -38,11 +40,23 @@ from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.typing import EventType
 import homeassistant.util.dt as dt_util
 
-from .const import EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
+from .const import (
+    EVENT_COALESCE_TIME,
+    MAX_ENTITIES_PER_CHUNK,
+    MAX_PENDING_HISTORY_STATES,
+)
+from .downsample import (
+    DOWNSAMPLE_LTTB,
+    DOWNSAMPLE_MIN_MAX,
+    MIN_POINTS,
+    downsample_compressed_states,
+)
 from .helpers import entities_may_have_state_changes_after, has_recorder_run_after
 
 _LOGGER = logging.getLogger(__name__)
 
+_DownsampleType = Callable[[list[dict[str, Any]]], list[dict[str, Any]]]
+
 
 @dataclass(slots=True)
 class HistoryLiveStream:
@@ -74,23 +88,25 @@ def _ws_get_significant_states(
     no_attributes: bool,
 ) -> bytes:
     """Fetch history significant_states and convert them to json in the executor."""
-    return json_bytes(
-        messages.result_message(
-            msg_id,
-            history.get_significant_states(
-                hass,
-                start_time,
-                end_time,
-                entity_ids,
-                None,
-                include_start_time_state,
-                significant_changes_only,
-                minimal_response,
-                no_attributes,
-                True,
-            ),
+    with session_scope(hass=hass, read_only=True, read_pool=True) as session:
+        return json_bytes(
+            messages.result_message(
+                msg_id,
+                history.get_significant_states_with_session(
+                    hass,
+                    session,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    None,
+                    include_start_time_state,
+                    significant_changes_only,
+                    minimal_response,
+                    no_attributes,
+                    True,
+                ),
+            )
         )
-    )
 
 
 @websocket_api.websocket_command(
@@ -156,7 +172,7 @@ async def ws_get_history_during_period(
     minimal_response = msg["minimal_response"]
 
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+        await get_instance(hass).async_add_read_executor_job(
             _ws_get_significant_states,
             hass,
             msg["id"],
@@ -221,23 +237,29 @@ def _generate_historical_response(
     minimal_response: bool,
     no_attributes: bool,
     send_empty: bool,
+    downsample: _DownsampleType | None,
 ) -> tuple[float, dt | None, bytes | None]:
     """Generate a historical response."""
-    states = cast(
-        MutableMapping[str, list[dict[str, Any]]],
-        history.get_significant_states(
-            hass,
-            start_time,
-            end_time,
-            entity_ids,
-            None,
-            include_start_time_state,
-            significant_changes_only,
-            minimal_response,
-            no_attributes,
-            True,
-        ),
-    )
+    with session_scope(hass=hass, read_only=True, read_pool=True) as session:
+        states = cast(
+            MutableMapping[str, list[dict[str, Any]]],
+            history.get_significant_states_with_session(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                None,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+                True,
+            ),
+        )
+    if downsample:
+        for entity_id, state_list in states.items():
+            states[entity_id] = downsample(state_list)
     last_time_ts = 0.0
     for state_list in states.values():
         if (
@@ -264,6 +286,79 @@ def _generate_historical_response(
     )
 
 
+def _generate_chunked_historical_response(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    entity_ids: list[str] | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    send_empty: bool,
+    downsample: _DownsampleType | None,
+) -> tuple[float, dt | None, bytes | None]:
+    """Generate a historical response and send it in chunks of entities.
+
+    The states are sent as soon as MAX_ENTITIES_PER_CHUNK entities have been
+    read from the database so only the states of those entities are held in
+    memory, and a large request does not fill the pending messages of the
+    connection. The returned final message has the start and end time of the
+    response.
+    """
+    last_time_ts = 0.0
+    call_soon_threadsafe = hass.loop.call_soon_threadsafe
+    chunk: dict[str, list[dict[str, Any]]] = {}
+
+    def _send_chunk(states: dict[str, list[dict[str, Any]]]) -> None:
+        call_soon_threadsafe(
+            connection.send_message,
+            json_bytes(messages.event_message(msg_id, {"states": states})),
+        )
+
+    with session_scope(hass=hass, read_only=True, read_pool=True) as session:
+        for entity_id, states in history.stream_significant_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            True,
+        ):
+            state_list = cast(list[dict[str, Any]], states)
+            if downsample:
+                state_list = downsample(state_list)
+            if (
+                state_last_time := state_list[-1][COMPRESSED_STATE_LAST_UPDATED]
+            ) > last_time_ts:
+                last_time_ts = cast(float, state_last_time)
+            chunk[entity_id] = state_list
+            if len(chunk) >= MAX_ENTITIES_PER_CHUNK:
+                _send_chunk(chunk)
+                chunk = {}
+    if chunk:
+        _send_chunk(chunk)
+
+    if last_time_ts == 0:
+        if not send_empty:
+            return last_time_ts, None, None
+        last_time_dt = end_time
+    else:
+        last_time_dt = dt_util.utc_from_timestamp(last_time_ts)
+
+    return (
+        last_time_ts,
+        last_time_dt,
+        _generate_websocket_response(msg_id, start_time, last_time_dt, {}),
+    )
+
+
 async def _async_send_historical_states(
     hass: HomeAssistant,
     connection: ActiveConnection,
@@ -276,22 +371,43 @@ async def _async_send_historical_states(
     minimal_response: bool,
     no_attributes: bool,
     send_empty: bool,
+    chunked: bool = False,
+    downsample: _DownsampleType | None = None,
 ) -> dt | None:
     """Fetch history significant_states and send them to the client."""
     instance = get_instance(hass)
-    last_time_ts, last_time_dt, payload = await instance.async_add_executor_job(
-        _generate_historical_response,
-        hass,
-        msg_id,
-        start_time,
-        end_time,
-        entity_ids,
-        include_start_time_state,
-        significant_changes_only,
-        minimal_response,
-        no_attributes,
-        send_empty,
-    )
+    if chunked:
+        job = await instance.async_add_read_executor_job(
+            _generate_chunked_historical_response,
+            hass,
+            connection,
+            msg_id,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            send_empty,
+            downsample,
+        )
+    else:
+        job = await instance.async_add_read_executor_job(
+            _generate_historical_response,
+            hass,
+            msg_id,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            send_empty,
+            downsample,
+        )
+    last_time_ts, last_time_dt, payload = job
     if payload:
         connection.send_message(payload)
     return last_time_dt if last_time_ts != 0 else None
@@ -401,6 +517,11 @@ def _async_subscribe_events(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("chunked", default=False): bool,
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=MIN_POINTS)),
+        vol.Optional("downsample_method", default=DOWNSAMPLE_LTTB): vol.In(
+            [DOWNSAMPLE_LTTB, DOWNSAMPLE_MIN_MAX]
+        ),
     }
 )
 @websocket_api.async_response
@@ -440,6 +561,14 @@ async def ws_stream(
     significant_changes_only = msg["significant_changes_only"]
     no_attributes = msg["no_attributes"]
     minimal_response = msg["minimal_response"]
+    chunked = msg["chunked"]
+    downsample: _DownsampleType | None = None
+    if max_points := msg.get("max_points"):
+        downsample = partial(
+            downsample_compressed_states,
+            max_points=max_points,
+            method=msg["downsample_method"],
+        )
 
     if end_time and end_time <= utc_now:
         if (
@@ -466,6 +595,8 @@ async def ws_stream(
             minimal_response,
             no_attributes,
             True,
+            chunked,
+            downsample,
         )
         return
 
@@ -530,6 +661,8 @@ async def ws_stream(
         minimal_response,
         no_attributes,
         True,
+        chunked,
+        downsample,
     )
 
     if msg_id not in connection.subscriptions:
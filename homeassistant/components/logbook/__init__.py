@@ -35,6 +35,8 @@ from . import rest_api, websocket_api
 from .const import (  # noqa: F401
     ATTR_MESSAGE,
     DOMAIN,
+    LIVE_CONTEXT_CACHE_MAX_SIZE,
+    LIVE_CONTEXT_CACHE_TTL,
     LOGBOOK_ENTRY_CONTEXT_ID,
     LOGBOOK_ENTRY_DOMAIN,
     LOGBOOK_ENTRY_ENTITY_ID,
@@ -43,7 +45,7 @@ from .const import (  # noqa: F401
     LOGBOOK_ENTRY_NAME,
     LOGBOOK_ENTRY_SOURCE,
 )
-from .models import LazyEventPartialState, LogbookConfig
+from .models import LazyEventPartialState, LiveContextCache, LogbookConfig
 
 CONFIG_SCHEMA = vol.Schema(
     {DOMAIN: INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA}, extra=vol.ALLOW_EXTRA
@@ -135,7 +137,12 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     external_events: dict[
         str, tuple[str, Callable[[LazyEventPartialState], dict[str, Any]]]
     ] = {}
-    hass.data[DOMAIN] = LogbookConfig(external_events, filters, entities_filter)
+    hass.data[DOMAIN] = LogbookConfig(
+        external_events,
+        filters,
+        entities_filter,
+        LiveContextCache(hass, LIVE_CONTEXT_CACHE_TTL, LIVE_CONTEXT_CACHE_MAX_SIZE),
+    )
     websocket_api.async_setup(hass)
     rest_api.async_setup(hass, config, filters, entities_filter)
     hass.services.async_register(DOMAIN, "log", log_message, schema=LOG_MESSAGE_SCHEMA)
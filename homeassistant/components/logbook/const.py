@@ -18,6 +18,11 @@ ATTR_MESSAGE = "message"
 
 DOMAIN = "logbook"
 
+# The origin events of recent contexts kept to resolve
+# the context parents of the events in live streams
+LIVE_CONTEXT_CACHE_TTL = 3600
+LIVE_CONTEXT_CACHE_MAX_SIZE = 8192
+
 CONTEXT_USER_ID = "context_user_id"
 CONTEXT_ENTITY_ID = "context_entity_id"
 CONTEXT_ENTITY_ID_NAME = "context_entity_id_name"
@@ -14,8 +14,15 @@ from homeassistant.components.recorder.models import (
     ulid_to_bytes_or_none,
     uuid_hex_to_bytes_or_none,
 )
-from homeassistant.const import ATTR_ICON, EVENT_STATE_CHANGED
-from homeassistant.core import Context, Event, State, callback
+from homeassistant.const import ATTR_ICON, EVENT_STATE_CHANGED, MATCH_ALL
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Context,
+    Event,
+    HomeAssistant,
+    State,
+    callback,
+)
 from homeassistant.util.json import json_loads
 from homeassistant.util.ulid import ulid_to_bytes
 
@@ -34,6 +41,7 @@ class LogbookConfig:
     ]
     sqlalchemy_filter: Filters | None = None
     entity_filter: Callable[[str], bool] | None = None
+    context_cache: LiveContextCache | None = None
 
 
 class LazyEventPartialState:
@@ -150,3 +158,69 @@ def async_event_to_row(event: Event) -> EventAsRow:
         row_id=hash(event),
         icon=new_state.attributes.get(ATTR_ICON),
     )
+
+
+class LiveContextCache:
+    """Remember the origin events of recent contexts for live streams.
+
+    Live streams do not query the database for the rows that started
+    a context. The origin event of a context is available from the
+    context itself, but the origin event of its parent context is
+    not, so the origin events seen on the bus are kept for a while.
+    """
+
+    def __init__(self, hass: HomeAssistant, ttl: float, max_size: int) -> None:
+        """Init the cache."""
+        self.hass = hass
+        self.ttl = ttl
+        self.max_size = max_size
+        # Ordered by the time the events were fired
+        self._origin_events: dict[str, Event] = {}
+        self._streams = 0
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_subscribe(self) -> CALLBACK_TYPE:
+        """Populate the cache until the returned callback is called."""
+        self._streams += 1
+        if self._unsub is None:
+            self._unsub = self.hass.bus.async_listen(
+                MATCH_ALL, self._async_remember_origin, run_immediately=True
+            )
+
+        @callback
+        def _async_unsubscribe() -> None:
+            self._streams -= 1
+            if not self._streams and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+                self._origin_events.clear()
+
+        return _async_unsubscribe
+
+    @callback
+    def _async_remember_origin(self, event: Event) -> None:
+        """Remember the event if it started its context."""
+        context = event.context
+        if context.origin_event is not event or (
+            event.event_type == EVENT_STATE_CHANGED
+            and event.data.get("new_state") is None
+        ):
+            return
+        origin_events = self._origin_events
+        origin_events[context.id] = event
+        expired = event.time_fired_timestamp - self.ttl
+        while (
+            len(origin_events) > self.max_size
+            or next(iter(origin_events.values())).time_fired_timestamp < expired
+        ):
+            del origin_events[next(iter(origin_events))]
+
+    @callback
+    def async_get(self, context_id_bin: bytes) -> EventAsRow | None:
+        """Return the origin event of a context as a row."""
+        if (context_id := bytes_to_ulid_or_none(context_id_bin)) and (
+            event := self._origin_events.get(context_id)
+        ):
+            return async_event_to_row(event)
+        return None
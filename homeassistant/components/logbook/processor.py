@@ -61,7 +61,13 @@ from .const import (
     LOGBOOK_ENTRY_WHEN,
 )
 from .helpers import is_sensor_continuous
-from .models import EventAsRow, LazyEventPartialState, LogbookConfig, async_event_to_row
+from .models import (
+    EventAsRow,
+    LazyEventPartialState,
+    LiveContextCache,
+    LogbookConfig,
+    async_event_to_row,
+)
 from .queries import statement_for_request
 from .queries.common import PSEUDO_EVENT_STATE_CHANGED
 
@@ -108,6 +114,7 @@ class EventProcessor:
         self.context_id = context_id
         logbook_config: LogbookConfig = hass.data[DOMAIN]
         self.filters: Filters | None = logbook_config.sqlalchemy_filter
+        self.context_cache = logbook_config.context_cache
         format_time = (
             _row_time_fired_timestamp if timestamp else _row_time_fired_isoformat
         )
@@ -134,6 +141,8 @@ class EventProcessor:
         self.logbook_run.event_cache.clear()
         self.logbook_run.context_lookup.clear()
         self.logbook_run.memoize_new_contexts = False
+        # The contexts of the live events are resolved from memory
+        self.context_augmenter.context_cache = self.context_cache
 
     def get_events(
         self,
@@ -141,7 +150,7 @@ class EventProcessor:
         end_day: dt,
     ) -> list[dict[str, Any]]:
         """Get events for a period of time."""
-        with session_scope(hass=self.hass, read_only=True) as session:
+        with session_scope(hass=self.hass, read_only=True, read_pool=True) as session:
             metadata_ids: list[int] | None = None
             instance = get_instance(self.hass)
             if self.entity_ids:
@@ -164,6 +173,7 @@ class EventProcessor:
                 self.device_ids,
                 self.filters,
                 self.context_id,
+                instance.logbook_index_manager.indexed_since,
             )
             return self.humanify(
                 execute_stmt_lambda_element(session, stmt, orm_rows=False)
@@ -283,15 +293,19 @@ class ContextAugmenter:
         self.external_events = logbook_run.external_events
         self.event_cache = logbook_run.event_cache
         self.include_entity_name = logbook_run.include_entity_name
+        self.context_cache: LiveContextCache | None = None
 
     def _get_context_row(
         self, context_id_bin: bytes | None, row: Row | EventAsRow
     ) -> Row | EventAsRow | None:
-        """Get the context row from the id or row context."""
-        if context_id_bin is not None and (
-            context_row := self.context_lookup.get(context_id_bin)
-        ):
-            return context_row
+        """Get the context row from the id, the live context cache or row context."""
+        if context_id_bin is not None:
+            if context_row := self.context_lookup.get(context_id_bin):
+                return context_row
+            if self.context_cache is not None and (
+                context_row := self.context_cache.async_get(context_id_bin)
+            ):
+                return context_row
         if (context := getattr(row, "context", None)) is not None and (
             origin_event := context.origin_event
         ) is not None:
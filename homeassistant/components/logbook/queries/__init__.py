@@ -14,6 +14,7 @@ from .all import all_stmt
 from .devices import devices_stmt
 from .entities import entities_stmt
 from .entities_and_devices import entities_devices_stmt
+from .index import index_devices_stmt, index_entities_devices_stmt, index_entities_stmt
 
 
 def statement_for_request(
@@ -25,8 +26,16 @@ def statement_for_request(
     device_ids: list[str] | None = None,
     filters: Filters | None = None,
     context_id: str | None = None,
+    logbook_index_since: float | None = None,
 ) -> StatementLambdaElement:
-    """Generate the logbook statement for a logbook request."""
+    """Generate the logbook statement for a logbook request.
+
+    The logbook index is used for entities and devices when the
+    recorder has been indexing since before the start of the request.
+    The events of entities without states metadata, such as entities
+    excluded from the recorder, are not indexed so the existing queries
+    are used when any of the entities has no metadata_id.
+    """
     start_day = start_day_dt.timestamp()
     end_day = end_day_dt.timestamp()
     # No entities: logbook sends everything for the timeframe
@@ -41,6 +50,26 @@ def statement_for_request(
             context_id_bin,
         )
 
+    if (
+        logbook_index_since is not None
+        and start_day >= logbook_index_since
+        and (not entity_ids or len(states_metadata_ids or ()) >= len(set(entity_ids)))
+    ):
+        if entity_ids and device_ids:
+            return index_entities_devices_stmt(
+                start_day,
+                end_day,
+                event_type_ids,
+                states_metadata_ids or [],
+                device_ids,
+            )
+        if entity_ids:
+            return index_entities_stmt(
+                start_day, end_day, event_type_ids, states_metadata_ids or []
+            )
+        assert device_ids is not None
+        return index_devices_stmt(start_day, end_day, event_type_ids, device_ids)
+
     # sqlalchemy caches object quoting, the
     # json quotable ones must be a different
     # object from the non-json ones to prevent
@@ -0,0 +1,235 @@
+"""Logbook index queries for logbook."""
+from __future__ import annotations
+
+from collections.abc import Collection
+
+from sqlalchemy import lambda_stmt, select, union_all
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from sqlalchemy.sql.selectable import CTE, CompoundSelect, Select
+
+from homeassistant.components.recorder.db_schema import (
+    OLD_STATE,
+    EventData,
+    Events,
+    EventTypes,
+    LogbookIndex,
+    StateAttributes,
+    States,
+    StatesMeta,
+)
+
+from .common import (
+    EVENT_ROWS_NO_STATES,
+    NOT_CONTEXT_ONLY,
+    apply_events_context_hints,
+    apply_states_context_hints,
+    select_events_context_only,
+    select_states,
+    select_states_context_only,
+)
+from .entities import apply_entities_hints
+
+
+def _apply_index_time_range(sel: Select, start_day: float, end_day: float) -> Select:
+    """Filter the logbook index by time range."""
+    return sel.where(
+        (LogbookIndex.time_fired_ts > start_day)
+        & (LogbookIndex.time_fired_ts < end_day)
+    )
+
+
+def _select_index_events(
+    sel: Select,
+    start_day: float,
+    end_day: float,
+    event_type_ids: tuple[int, ...],
+    matcher: ColumnElement[bool],
+) -> Select:
+    """Generate a select for the indexed events matching the matcher."""
+    return (
+        _apply_index_time_range(sel.select_from(LogbookIndex), start_day, end_day)
+        .where(matcher)
+        .join(Events, LogbookIndex.event_id == Events.event_id)
+        .where(Events.event_type_id.in_(event_type_ids))
+        .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id))
+        .outerjoin(EventData, (Events.data_id == EventData.data_id))
+    )
+
+
+def _select_index_states(
+    start_day: float, end_day: float, states_metadata_ids: Collection[int]
+) -> Select:
+    """Generate a select for the indexed states of the entities.
+
+    The logbook index only has the state changes the logbook
+    shows so only the old state has to be checked to still
+    exist like the states queries do.
+    """
+    return (
+        _apply_index_time_range(
+            select_states().select_from(LogbookIndex), start_day, end_day
+        )
+        .where(LogbookIndex.metadata_id.in_(states_metadata_ids))
+        .join(
+            States,
+            (LogbookIndex.state_id == States.state_id)
+            & (LogbookIndex.metadata_id == States.metadata_id),
+        )
+        .outerjoin(OLD_STATE, (States.old_state_id == OLD_STATE.state_id))
+        .where(OLD_STATE.state_id.is_not(None))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
+        .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
+    )
+
+
+def _select_entities_states_context_ids(
+    start_day: float, end_day: float, states_metadata_ids: Collection[int]
+) -> Select:
+    """Generate a select for the context ids of the states of the entities."""
+    return (
+        apply_entities_hints(select(States.context_id_bin))
+        .filter(
+            (States.last_updated_ts > start_day) & (States.last_updated_ts < end_day)
+        )
+        .where(States.metadata_id.in_(states_metadata_ids))
+    )
+
+
+def _apply_index_context_union(
+    context_ids_cte: CTE, *selects: Select
+) -> CompoundSelect:
+    """Generate a query to find the rows linked to the context ids."""
+    return union_all(
+        *selects,
+        apply_events_context_hints(
+            select_events_context_only()
+            .select_from(context_ids_cte)
+            .outerjoin(
+                Events, context_ids_cte.c.context_id_bin == Events.context_id_bin
+            )
+            .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id))
+            .outerjoin(EventData, (Events.data_id == EventData.data_id))
+        ),
+        apply_states_context_hints(
+            select_states_context_only()
+            .select_from(context_ids_cte)
+            .outerjoin(
+                States, context_ids_cte.c.context_id_bin == States.context_id_bin
+            )
+            .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
+        ),
+    )
+
+
+def _apply_index_entities_union(
+    start_day: float,
+    end_day: float,
+    event_type_ids: tuple[int, ...],
+    states_metadata_ids: Collection[int],
+    matcher: ColumnElement[bool],
+) -> CompoundSelect:
+    """Generate a logbook query for the matching events and the entities states."""
+    union = union_all(
+        _select_index_events(
+            select(Events.context_id_bin), start_day, end_day, event_type_ids, matcher
+        ),
+        _select_entities_states_context_ids(start_day, end_day, states_metadata_ids),
+    ).subquery()
+    context_ids_cte: CTE = (
+        select(union.c.context_id_bin).group_by(union.c.context_id_bin).cte()
+    )
+    return _apply_index_context_union(
+        context_ids_cte,
+        _select_index_events(
+            select(*EVENT_ROWS_NO_STATES, NOT_CONTEXT_ONLY),
+            start_day,
+            end_day,
+            event_type_ids,
+            matcher,
+        ),
+        _select_index_states(start_day, end_day, states_metadata_ids),
+    )
+
+
+def index_entities_stmt(
+    start_day: float,
+    end_day: float,
+    event_type_ids: tuple[int, ...],
+    states_metadata_ids: Collection[int],
+) -> StatementLambdaElement:
+    """Generate a logbook index query for multiple entities."""
+    return lambda_stmt(
+        lambda: _apply_index_entities_union(
+            start_day,
+            end_day,
+            event_type_ids,
+            states_metadata_ids,
+            LogbookIndex.metadata_id.in_(states_metadata_ids),
+        ).order_by(Events.time_fired_ts)
+    )
+
+
+def index_entities_devices_stmt(
+    start_day: float,
+    end_day: float,
+    event_type_ids: tuple[int, ...],
+    states_metadata_ids: Collection[int],
+    device_ids: list[str],
+) -> StatementLambdaElement:
+    """Generate a logbook index query for multiple entities and devices."""
+    return lambda_stmt(
+        lambda: _apply_index_entities_union(
+            start_day,
+            end_day,
+            event_type_ids,
+            states_metadata_ids,
+            LogbookIndex.metadata_id.in_(states_metadata_ids)
+            | LogbookIndex.device_id.in_(device_ids),
+        ).order_by(Events.time_fired_ts)
+    )
+
+
+def _apply_index_devices_union(
+    start_day: float,
+    end_day: float,
+    event_type_ids: tuple[int, ...],
+    device_ids: list[str],
+) -> CompoundSelect:
+    """Generate a logbook query for the events of the devices."""
+    inner = _select_index_events(
+        select(Events.context_id_bin),
+        start_day,
+        end_day,
+        event_type_ids,
+        LogbookIndex.device_id.in_(device_ids),
+    ).subquery()
+    context_ids_cte: CTE = (
+        select(inner.c.context_id_bin).group_by(inner.c.context_id_bin).cte()
+    )
+    return _apply_index_context_union(
+        context_ids_cte,
+        _select_index_events(
+            select(*EVENT_ROWS_NO_STATES, NOT_CONTEXT_ONLY),
+            start_day,
+            end_day,
+            event_type_ids,
+            LogbookIndex.device_id.in_(device_ids),
+        ),
+    )
+
+
+def index_devices_stmt(
+    start_day: float,
+    end_day: float,
+    event_type_ids: tuple[int, ...],
+    device_ids: list[str],
+) -> StatementLambdaElement:
+    """Generate a logbook index query for multiple devices."""
+    return lambda_stmt(
+        lambda: _apply_index_devices_union(
+            start_day, end_day, event_type_ids, device_ids
+        ).order_by(Events.time_fired_ts)
+    )
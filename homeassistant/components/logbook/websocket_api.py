@@ -6,6 +6,7 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime as dt, timedelta
 import logging
+from operator import is_
 from typing import Any
 
 import voluptuous as vol
@@ -29,6 +30,7 @@ from .models import LogbookConfig, async_event_to_row
 from .processor import EventProcessor
 
 MAX_PENDING_LOGBOOK_EVENTS = 2048
+LIVE_FEEDS = f"{DOMAIN}_live_feeds"
 EVENT_COALESCE_TIME = 0.35
 # minimum size that we will split the query
 BIG_QUERY_HOURS = 25
@@ -47,11 +49,135 @@ class LogbookLiveStream:
     end_time_unsub: CALLBACK_TYPE | None = None
     task: asyncio.Task | None = None
     wait_sync_task: asyncio.Task | None = None
+    live: bool = False
+
+
+_LiveFeedKey = tuple[frozenset[str], frozenset[str] | None, frozenset[str] | None, bool]
+
+
+class LogbookLiveFeed:
+    """Share the subscriptions and messages of live streams with the same filter.
+
+    The streams of a feed get the same events at the same time, so once
+    they are live the batches they coalesce are humanified and serialized
+    only once for all of them.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        key: _LiveFeedKey,
+        event_types: tuple[str, ...],
+        entities_filter: Callable[[str], bool] | None,
+        entity_ids: list[str] | None,
+        device_ids: list[str] | None,
+    ) -> None:
+        """Init the feed and subscribe to the events."""
+        self.hass = hass
+        self.key = key
+        self.streams: list[Callable[[Event], None]] = []
+        self.event_processor = EventProcessor(
+            hass,
+            event_types,
+            entity_ids,
+            device_ids,
+            None,
+            timestamp=True,
+            include_entity_name=False,
+        )
+        self.event_processor.switch_to_live()
+        self._subscriptions: list[CALLBACK_TYPE] = []
+        if context_cache := self.event_processor.context_cache:
+            self._subscriptions.append(context_cache.async_subscribe())
+        async_subscribe_events(
+            hass,
+            self._subscriptions,
+            self._async_forward,
+            event_types,
+            entities_filter,
+            entity_ids,
+            device_ids,
+        )
+        self._batch: list[Event] = []
+        self._batch_json: bytes | None = None
+
+    @callback
+    def _async_forward(self, event: Event) -> None:
+        """Forward an event to the streams."""
+        for target in self.streams.copy():
+            target(event)
+
+    @callback
+    def async_add_stream(self, target: Callable[[Event], None]) -> CALLBACK_TYPE:
+        """Forward the events to a stream until the returned callback is called."""
+        self.streams.append(target)
+
+        @callback
+        def _async_remove_stream() -> None:
+            self.streams.remove(target)
+            if self.streams:
+                return
+            for subscription in self._subscriptions:
+                subscription()
+            self._subscriptions.clear()
+            self.hass.data[LIVE_FEEDS].pop(self.key, None)
+
+        return _async_remove_stream
+
+    @callback
+    def async_events_json(self, events: list[Event]) -> bytes | None:
+        """Return the serialized logbook events of a batch of live events."""
+        if len(events) != len(self._batch) or not all(map(is_, events, self._batch)):
+            self._batch = events
+            logbook_events = self.event_processor.humanify(
+                async_event_to_row(e) for e in events
+            )
+            self._batch_json = (
+                json_bytes({"events": logbook_events}) if logbook_events else None
+            )
+        return self._batch_json
+
+
+@callback
+def _async_get_live_feed(
+    hass: HomeAssistant,
+    event_types: tuple[str, ...],
+    entities_filter: Callable[[str], bool] | None,
+    entity_ids: list[str] | None,
+    device_ids: list[str] | None,
+) -> LogbookLiveFeed:
+    """Get the live feed of the streams with the same filter."""
+    live_feeds: dict[_LiveFeedKey, LogbookLiveFeed] = hass.data[LIVE_FEEDS]
+    key: _LiveFeedKey = (
+        frozenset(event_types),
+        frozenset(entity_ids) if entity_ids else None,
+        frozenset(device_ids) if device_ids else None,
+        entities_filter is not None,
+    )
+    if (live_feed := live_feeds.get(key)) is None:
+        live_feed = live_feeds[key] = LogbookLiveFeed(
+            hass, key, event_types, entities_filter, entity_ids, device_ids
+        )
+    return live_feed
+
+
+def _live_event_message(msg_id: int, events_json: bytes) -> bytes:
+    """Return an event message with the serialized logbook events."""
+    return b"".join(
+        (
+            b'{"id":',
+            str(msg_id).encode(),
+            b',"type":"event","event":',
+            events_json,
+            b"}",
+        )
+    )
 
 
 @callback
 def async_setup(hass: HomeAssistant) -> None:
     """Set up the logbook websocket API."""
+    hass.data[LIVE_FEEDS] = {}
     websocket_api.async_register_command(hass, ws_get_events)
     websocket_api.async_register_command(hass, ws_event_stream)
 
@@ -167,7 +293,7 @@ async def _async_get_ws_stream_events(
     partial: bool,
 ) -> tuple[bytes, dt | None]:
     """Async wrapper around _ws_formatted_get_events."""
-    return await get_instance(hass).async_add_executor_job(
+    return await get_instance(hass).async_add_read_executor_job(
         _ws_stream_get_events,
         msg_id,
         start_time,
@@ -218,8 +344,14 @@ async def _async_events_consumer(
     msg_id: int,
     stream_queue: asyncio.Queue[Event],
     event_processor: EventProcessor,
+    live_stream: LogbookLiveStream,
+    live_feed: LogbookLiveFeed,
 ) -> None:
-    """Stream events from the queue."""
+    """Stream events from the queue.
+
+    Once the stream is live, the events are formatted by the live feed
+    which shares the messages with the other streams of the feed.
+    """
     while True:
         events: list[Event] = [await stream_queue.get()]
         # If the event is older than the last db
@@ -234,7 +366,10 @@ async def _async_events_consumer(
         while not stream_queue.empty():
             events.append(stream_queue.get_nowait())
 
-        if logbook_events := event_processor.humanify(
+        if live_stream.live:
+            if events_json := live_feed.async_events_json(events):
+                connection.send_message(_live_event_message(msg_id, events_json))
+        elif logbook_events := event_processor.humanify(
             async_event_to_row(e) for e in events
         ):
             connection.send_message(
@@ -361,15 +496,10 @@ async def ws_event_stream(
         logbook_config: LogbookConfig = hass.data[DOMAIN]
         entities_filter = logbook_config.entity_filter
 
-    async_subscribe_events(
-        hass,
-        subscriptions,
-        _queue_or_cancel,
-        event_types,
-        entities_filter,
-        entity_ids,
-        device_ids,
+    live_feed = _async_get_live_feed(
+        hass, event_types, entities_filter, entity_ids, device_ids
     )
+    subscriptions.append(live_feed.async_add_stream(_queue_or_cancel))
     subscriptions_setup_complete_time = dt_util.utcnow()
     connection.subscriptions[msg_id] = _unsub
     connection.send_result(msg_id)
@@ -401,6 +531,8 @@ async def ws_event_stream(
             msg_id,
             stream_queue,
             event_processor,
+            live_stream,
+            live_feed,
         )
     )
 
@@ -428,6 +560,7 @@ async def ws_event_stream(
         partial=False,
     )
     event_processor.switch_to_live()
+    live_stream.live = True
 
 
 def _ws_formatted_get_events(
@@ -504,7 +637,7 @@ async def ws_get_events(
     )
 
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+        await get_instance(hass).async_add_read_executor_job(
             _ws_formatted_get_events,
             msg["id"],
             start_time,
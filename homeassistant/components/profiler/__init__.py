@@ -20,7 +20,11 @@ from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
 from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.entity_platform import async_get_polling_stats
+from homeassistant.helpers.event import (
+    async_get_template_render_stats,
+    async_track_time_interval,
+)
 from homeassistant.helpers.service import async_register_admin_service
 
 from .const import DOMAIN
@@ -35,6 +39,8 @@ SERVICE_DUMP_LOG_OBJECTS = "dump_log_objects"
 SERVICE_LRU_STATS = "lru_stats"
 SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
+SERVICE_LOG_TEMPLATE_RENDERS = "log_template_renders"
+SERVICE_LOG_POLLING_STATS = "log_polling_stats"
 
 _LRU_CACHE_WRAPPER_OBJECT = _lru_cache_wrapper.__name__
 _SQLALCHEMY_LRU_OBJECT = "LRUCache"
@@ -57,14 +63,18 @@ SERVICES = (
     SERVICE_LRU_STATS,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
+    SERVICE_LOG_TEMPLATE_RENDERS,
+    SERVICE_LOG_POLLING_STATS,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
 
 DEFAULT_MAX_OBJECTS = 5
+DEFAULT_MAX_TEMPLATES = 25
 
 CONF_SECONDS = "seconds"
 CONF_MAX_OBJECTS = "max_objects"
+CONF_MAX_TEMPLATES = "max_templates"
 
 LOG_INTERVAL_SUB = "log_interval_subscription"
 
@@ -254,6 +264,42 @@ async def async_setup_entry(  # noqa: C901
             arepr.maxstring = original_maxstring
             arepr.maxother = original_maxother
 
+    @callback
+    def _async_log_template_renders(call: ServiceCall) -> None:
+        """Log the templates with the highest total render time."""
+        stats = sorted(
+            async_get_template_render_stats(hass).items(),
+            key=lambda item: item[1].total_time,
+            reverse=True,
+        )
+        for template, template_stats in stats[: call.data[CONF_MAX_TEMPLATES]]:
+            _LOGGER.critical(
+                "Template rendered %s times in %.3fs total, %.3fs max: %s",
+                template_stats.renders,
+                template_stats.total_time,
+                template_stats.max_time,
+                template,
+            )
+
+    @callback
+    def _async_log_polling_stats(call: ServiceCall) -> None:
+        """Log the polling stats of the entity platforms."""
+        stats = sorted(
+            async_get_polling_stats(hass).items(),
+            key=lambda item: item[1].max_poll_duration,
+            reverse=True,
+        )
+        for platform, platform_stats in stats:
+            _LOGGER.critical(
+                "Platform %s polled %s times, skipped %s polls, last poll took"
+                " %.3fs, max %.3fs",
+                platform,
+                platform_stats.polls,
+                platform_stats.skipped_polls,
+                platform_stats.last_poll_duration,
+                platform_stats.max_poll_duration,
+            )
+
     async_register_admin_service(
         hass,
         DOMAIN,
@@ -348,6 +394,27 @@ async def async_setup_entry(  # noqa: C901
         _async_dump_scheduled,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_LOG_TEMPLATE_RENDERS,
+        _async_log_template_renders,
+        schema=vol.Schema(
+            {
+                vol.Optional(
+                    CONF_MAX_TEMPLATES, default=DEFAULT_MAX_TEMPLATES
+                ): vol.Range(min=1, max=1024),
+            }
+        ),
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_LOG_POLLING_STATS,
+        _async_log_polling_stats,
+    )
+
     return True
 
 
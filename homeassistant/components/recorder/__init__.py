@@ -52,6 +52,9 @@ DEFAULT_COMMIT_INTERVAL = 5
 
 CONF_AUTO_PURGE = "auto_purge"
 CONF_AUTO_REPACK = "auto_repack"
+CONF_BULK_STATE_WRITES = "bulk_state_writes"
+CONF_DB_PARTITIONING = "db_partitioning"
+CONF_DB_READ_URL = "db_read_url"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
@@ -99,6 +102,7 @@ CONFIG_SCHEMA = vol.Schema(
                     ),
                     vol.Optional(CONF_PURGE_INTERVAL, default=1): cv.positive_int,
                     vol.Optional(CONF_DB_URL): vol.All(cv.string, validate_db_url),
+                    vol.Optional(CONF_DB_READ_URL): vol.All(cv.string, validate_db_url),
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
                     ): cv.positive_int,
@@ -111,6 +115,8 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_BULK_STATE_WRITES, default=False): cv.boolean,
+                    vol.Optional(CONF_DB_PARTITIONING, default=False): cv.boolean,
                 }
             ),
         )
@@ -156,10 +162,13 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         keep_days=keep_days,
         commit_interval=commit_interval,
         uri=db_url,
+        read_uri=conf.get(CONF_DB_READ_URL),
         db_max_retries=db_max_retries,
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_event_types=exclude_event_types,
+        bulk_state_writes=conf[CONF_BULK_STATE_WRITES],
+        db_partitioning=conf[CONF_DB_PARTITIONING],
     )
     instance.async_initialize()
     instance.async_register()
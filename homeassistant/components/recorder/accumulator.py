@@ -0,0 +1,161 @@
+"""Accumulate recorded states in memory for compiling statistics."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from datetime import datetime
+import threading
+import time
+
+from homeassistant.core import Event, State, callback, split_entity_id
+import homeassistant.util.dt as dt_util
+
+
+class StatesAccumulator:
+    """Keep the recorded states of tracked domains for the open statistics period.
+
+    The states are fed from the recorder event listener in the event loop
+    and read by the recorder platforms when they compile short term statistics
+    in the recorder thread, which avoids reading them back from the states table.
+
+    The accumulator only has complete history from the time a domain was first
+    tracked, or the time the recorder last started listening for events, or
+    the time it was last pruned, whichever is the latest. Callers must fall
+    back to querying the database for periods that start before that time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the accumulator."""
+        self._lock = threading.Lock()
+        self.domains: frozenset[str] = frozenset()
+        # Per entity_id, the states ordered by last_updated_timestamp
+        # and their last_updated_timestamp for bisecting
+        self._states: dict[str, list[State]] = {}
+        self._timestamps: dict[str, list[float]] = {}
+        self._valid_from = time.time()
+
+    def track_domain(self, domain: str, current_states: Iterable[State]) -> None:
+        """Start accumulating states for a domain.
+
+        The current states of the domain are used to make sure periods that
+        end before they were last updated are never considered complete.
+
+        This call is thread-safe.
+        """
+        if domain in self.domains:
+            return
+        valid_from = max(
+            (state.last_updated_timestamp for state in current_states),
+            default=0.0,
+        )
+        with self._lock:
+            self.domains = self.domains | {domain}
+            # The accumulator does not have history for the new domain yet
+            self._valid_from = max(time.time(), valid_from)
+
+    def reset(self) -> None:
+        """Forget all states after a gap in the recorded events.
+
+        This call is thread-safe.
+        """
+        with self._lock:
+            self._states.clear()
+            self._timestamps.clear()
+            self._valid_from = time.time()
+
+    @callback
+    def async_add_event(self, event: Event) -> None:
+        """Add the new state of a state_changed event if its domain is tracked.
+
+        This method must be run in the event loop.
+        """
+        entity_id: str = event.data["entity_id"]
+        if split_entity_id(entity_id)[0] not in self.domains:
+            return
+        if (new_state := event.data.get("new_state")) is None:
+            # The recorder records the removal of an entity as a state
+            # without a value which ends the previous state
+            new_state = State(
+                entity_id,
+                "",
+                last_changed=event.time_fired,
+                last_updated=event.time_fired,
+                validate_entity_id=False,
+            )
+        new_state_ts = new_state.last_updated_timestamp
+        with self._lock:
+            if (states := self._states.get(entity_id)) is None:
+                states = self._states[entity_id] = []
+                timestamps = self._timestamps[entity_id] = []
+                # The old state is the state at the start of the period
+                # if the entity did not change since we started tracking
+                if (old_state := event.data.get("old_state")) is not None:
+                    states.append(old_state)
+                    timestamps.append(old_state.last_updated_timestamp)
+            else:
+                timestamps = self._timestamps[entity_id]
+            if not timestamps or new_state_ts >= timestamps[-1]:
+                states.append(new_state)
+                timestamps.append(new_state_ts)
+            else:
+                idx = bisect_right(timestamps, new_state_ts)
+                states.insert(idx, new_state)
+                timestamps.insert(idx, new_state_ts)
+
+    def get_states_during_period(
+        self,
+        entity_ids: Iterable[str],
+        start_time: datetime,
+        end_time: datetime,
+        significant_changes_only: bool = True,
+    ) -> dict[str, list[State]] | None:
+        """Return the states of entity_ids during start_time - end_time.
+
+        The result matches get_full_significant_states_with_session with
+        include_start_time_state: the first state of each entity is the
+        last state before start_time if there is one.
+
+        Returns None if the accumulator does not have complete history
+        for the period, in which case the database must be queried.
+
+        This call is thread-safe.
+        """
+        start_time_ts = dt_util.utc_to_timestamp(start_time)
+        end_time_ts = dt_util.utc_to_timestamp(end_time)
+        result: dict[str, list[State]] = {}
+        with self._lock:
+            if start_time_ts < self._valid_from:
+                return None
+            for entity_id in entity_ids:
+                if (states := self._states.get(entity_id)) is None:
+                    continue
+                timestamps = self._timestamps[entity_id]
+                start_idx = bisect_left(timestamps, start_time_ts)
+                end_idx = bisect_left(timestamps, end_time_ts, start_idx)
+                entity_states = states[max(start_idx - 1, 0) : end_idx]
+                if significant_changes_only:
+                    entity_states = [
+                        state
+                        for idx, state in enumerate(entity_states)
+                        if (idx == 0 and start_idx)
+                        or state.last_changed == state.last_updated
+                    ]
+                if entity_states:
+                    result[entity_id] = entity_states
+        return result
+
+    def prune(self, before: datetime) -> None:
+        """Drop the states that are no longer needed for periods after before.
+
+        The last state before the cutoff is kept as the start state of the
+        next period.
+
+        This call is thread-safe.
+        """
+        before_ts = dt_util.utc_to_timestamp(before)
+        with self._lock:
+            for entity_id, timestamps in self._timestamps.items():
+                if (idx := bisect_left(timestamps, before_ts) - 1) > 0:
+                    del timestamps[:idx]
+                    del self._states[entity_id][:idx]
+            self._valid_from = max(self._valid_from, before_ts)
@@ -23,8 +23,28 @@ CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
 
 MAX_QUEUE_BACKLOG_MIN_VALUE = 65000
 ESTIMATED_QUEUE_ITEM_SIZE = 10240
+ESTIMATED_STATISTICS_ROW_SIZE = 512
 QUEUE_PERCENTAGE_ALLOWED_AVAILABLE_MEMORY = 0.65
 
+
+class RecorderQueueClass(StrEnum):
+    """The classes of the items in the recorder queue."""
+
+    STATES = "states"
+    EVENTS = "events"
+    STATISTICS = "statistics"
+    MAINTENANCE = "maintenance"
+
+
+# The share of the memory the recorder queue is allowed to use
+# that each class of the queue is allowed to use
+QUEUE_CLASS_BUDGETS = {
+    RecorderQueueClass.STATES: 0.7,
+    RecorderQueueClass.EVENTS: 0.2,
+    RecorderQueueClass.STATISTICS: 0.05,
+    RecorderQueueClass.MAINTENANCE: 0.05,
+}
+
 # The maximum number of rows (events) we purge in one delete statement
 
 # sqlite3 has a limit of 999 until version 3.32.0
@@ -40,6 +60,7 @@ SQLITE_MODERN_MAX_BIND_VARS = 4000
 DEFAULT_MAX_BIND_VARS = 4000
 
 DB_WORKER_PREFIX = "DbWorker"
+DB_READER_PREFIX = "DbReader"
 
 ALL_DOMAIN_EXCLUDE_ATTRS = {ATTR_ATTRIBUTION, ATTR_RESTORED, ATTR_SUPPORTED_FEATURES}
 
@@ -49,10 +70,18 @@ ATTR_APPLY_FILTER = "apply_filter"
 
 KEEPALIVE_TIME = 30
 
+# The seconds to wait before queueing the statistics imports that were
+# held back while the statistics in the queue exceeded their budget
+STATISTICS_IMPORT_RETRY_TIME = 10
+
 STATISTICS_ROWS_SCHEMA_VERSION = 23
 CONTEXT_ID_AS_BINARY_SCHEMA_VERSION = 36
 EVENT_TYPE_IDS_SCHEMA_VERSION = 37
 STATES_META_SCHEMA_VERSION = 38
+REF_COUNT_SCHEMA_VERSION = 43
+LOGBOOK_INDEX_SCHEMA_VERSION = 44
+STATISTICS_ROLLUPS_SCHEMA_VERSION = 45
+STATES_CHECKPOINTS_SCHEMA_VERSION = 46
 
 LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION = 28
 
@@ -2,12 +2,12 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 from collections.abc import Callable, Iterable
 from concurrent.futures import CancelledError
 import contextlib
 from datetime import datetime, timedelta
 import logging
-import queue
 import sqlite3
 import threading
 import time
@@ -20,10 +20,12 @@ from sqlalchemy.engine.interfaces import DBAPIConnection
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.session import Session
+from sqlalchemy.pool import QueuePool
 
 from homeassistant.components import persistent_notification
 from homeassistant.const import (
     ATTR_ENTITY_ID,
+    EVENT_CORE_CONFIG_UPDATE,
     EVENT_HOMEASSISTANT_CLOSE,
     EVENT_HOMEASSISTANT_FINAL_WRITE,
     EVENT_STATE_CHANGED,
@@ -31,6 +33,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers.event import (
+    async_call_later,
     async_track_time_change,
     async_track_time_interval,
     async_track_utc_time_change,
@@ -40,25 +43,34 @@ from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 import homeassistant.util.dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 
-from . import migration, statistics
+from . import migration, partitions, statistics
+from .accumulator import StatesAccumulator
 from .const import (
     CONTEXT_ID_AS_BINARY_SCHEMA_VERSION,
+    DB_READER_PREFIX,
     DB_WORKER_PREFIX,
     DOMAIN,
     ESTIMATED_QUEUE_ITEM_SIZE,
     EVENT_TYPE_IDS_SCHEMA_VERSION,
     KEEPALIVE_TIME,
     LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION,
+    LOGBOOK_INDEX_SCHEMA_VERSION,
     MARIADB_PYMYSQL_URL_PREFIX,
     MARIADB_URL_PREFIX,
     MAX_QUEUE_BACKLOG_MIN_VALUE,
     MYSQLDB_PYMYSQL_URL_PREFIX,
     MYSQLDB_URL_PREFIX,
+    QUEUE_CLASS_BUDGETS,
     QUEUE_PERCENTAGE_ALLOWED_AVAILABLE_MEMORY,
+    REF_COUNT_SCHEMA_VERSION,
     SQLITE_MAX_BIND_VARS,
     SQLITE_URL_PREFIX,
+    STATES_CHECKPOINTS_SCHEMA_VERSION,
     STATES_META_SCHEMA_VERSION,
+    STATISTICS_IMPORT_RETRY_TIME,
+    STATISTICS_ROLLUPS_SCHEMA_VERSION,
     STATISTICS_ROWS_SCHEMA_VERSION,
+    RecorderQueueClass,
     SupportedDialect,
 )
 from .db_schema import (
@@ -78,20 +90,28 @@ from .db_schema import (
 )
 from .executor import DBInterruptibleThreadPoolExecutor
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
-from .pool import POOL_SIZE, MutexPool, RecorderPool
+from .partitions import StatesPartitions
+from .pool import POOL_SIZE, READ_POOL_SIZE, MutexPool, RecorderPool
 from .queries import (
     has_entity_ids_to_migrate,
+    has_event_data_ref_counts_to_migrate,
     has_event_type_to_migrate,
     has_events_context_ids_to_migrate,
+    has_states_attributes_ref_counts_to_migrate,
     has_states_context_ids_to_migrate,
 )
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
+from .table_managers.logbook_index import LogbookIndexManager
 from .table_managers.recorder_runs import RecorderRunsManager
 from .table_managers.state_attributes import StateAttributesManager
 from .table_managers.states import StatesManager
+from .table_managers.states_buffer import StatesWriteBuffer
+from .table_managers.states_checkpoints import StatesCheckpointsManager
 from .table_managers.states_meta import StatesMetaManager
 from .table_managers.statistics_meta import StatisticsMetaManager
+from .table_managers.statistics_rollups import StatisticsRollupsManager
+from .task_queue import RecorderQueue, RecorderQueueClassStats
 from .tasks import (
     AdjustLRUSizeTask,
     AdjustStatisticsTask,
@@ -102,6 +122,7 @@ from .tasks import (
     DatabaseLockTask,
     EntityIDMigrationTask,
     EntityIDPostMigrationTask,
+    EventDataRefCountMigrationTask,
     EventIdMigrationTask,
     EventsContextIDMigrationTask,
     EventTypeIDMigrationTask,
@@ -110,7 +131,12 @@ from .tasks import (
     PerodicCleanupTask,
     PurgeTask,
     RecorderTask,
+    SealStatesPartitionTask,
+    StatesAttributesRefCountMigrationTask,
+    StatesCheckpointTask,
     StatesContextIDMigrationTask,
+    StatisticsRollupsTask,
+    StatisticsRollupsTimeZoneTask,
     StatisticsTask,
     StopTask,
     SynchronizeTask,
@@ -123,6 +149,7 @@ from .util import (
     build_mysqldb_conv,
     dburl_to_path,
     end_incomplete_runs,
+    execute_on_connection,
     execute_stmt_lambda_element,
     get_index_by_name,
     is_second_sunday,
@@ -159,6 +186,21 @@ CONNECTIVITY_ERR = "Error in database connectivity during commit"
 
 # Pool size must accommodate Recorder thread + All db executors
 MAX_DB_EXECUTOR_WORKERS = POOL_SIZE - 1
+MAX_DB_READ_EXECUTOR_WORKERS = READ_POOL_SIZE
+
+
+def _mysql_connect_args(db_url: str) -> dict[str, Any]:
+    """Return the connect args for a MySQL database url."""
+    connect_args: dict[str, Any] = {"charset": "utf8mb4"}
+    if db_url.startswith((MARIADB_URL_PREFIX, MYSQLDB_URL_PREFIX)):
+        # If they have configured MySQLDB but don't have
+        # the MySQLDB module installed this will throw
+        # an ImportError which we suppress here since
+        # sqlalchemy will give them a better error when
+        # it tried to import it below.
+        with contextlib.suppress(ImportError):
+            connect_args["conv"] = build_mysqldb_conv()
+    return connect_args
 
 
 class Recorder(threading.Thread):
@@ -178,6 +220,9 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool],
         exclude_event_types: set[str],
+        bulk_state_writes: bool = False,
+        db_partitioning: bool = False,
+        read_uri: str | None = None,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -190,8 +235,11 @@ class Recorder(threading.Thread):
         self.is_running: bool = False
         self._hass_started: asyncio.Future[object] = hass.loop.create_future()
         self.commit_interval = commit_interval
-        self._queue: queue.SimpleQueue[RecorderTask | Event] = queue.SimpleQueue()
+        self._queue = RecorderQueue()
         self.db_url = uri
+        # History, logbook and statistics queries read from this database
+        # instead when set, it must be a replica of the recorder database
+        self.db_read_url = read_uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
         self.database_engine: DatabaseEngine | None = None
@@ -204,7 +252,15 @@ class Recorder(threading.Thread):
         self.async_recorder_ready = asyncio.Event()
         self._queue_watch = threading.Event()
         self.engine: Engine | None = None
+        self.read_engine: Engine | None = None
         self.max_backlog: int = MAX_QUEUE_BACKLOG_MIN_VALUE
+        # Events other than state changes are not recorded while
+        # their class of the queue exceeds its budget
+        self._events_over_budget = False
+        # Statistics imports are held back in order while the statistics
+        # in the queue exceed their budget and are queued once they fit
+        self._pending_statistics_imports: deque[ImportStatisticsTask] = deque()
+        self._statistics_import_retry: CALLBACK_TYPE | None = None
         self._psutil: ha_psutil.PsutilWrapper | None = None
 
         # The entity_filter is exposed on the recorder instance so that
@@ -224,9 +280,24 @@ class Recorder(threading.Thread):
         self.states_meta_manager = StatesMetaManager(self)
         self.state_attributes_manager = StateAttributesManager(self)
         self.statistics_meta_manager = StatisticsMetaManager(self)
+        self.logbook_index_manager = LogbookIndexManager(self)
+        self.statistics_rollups_manager = StatisticsRollupsManager(self)
+        self.states_checkpoints_manager = StatesCheckpointsManager(self)
+        # Recorded states kept in memory for compiling short term statistics
+        self.states_accumulator = StatesAccumulator()
+        # States are written with bulk inserts from a columnar buffer
+        # instead of ORM objects when enabled and supported by the dialect
+        self.bulk_state_writes = bulk_state_writes
+        self.states_buffer = StatesWriteBuffer(self.states_manager)
+        self._use_states_buffer = False
+        # The states table is partitioned by state_id when enabled and
+        # supported by the dialect so purging can drop whole partitions
+        self.db_partitioning = db_partitioning
+        self.states_partitions: StatesPartitions | None = None
 
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
+        self._get_read_session: Callable[[], Session] | None = None
         self._completed_first_database_setup: bool | None = None
         self.async_migration_event = asyncio.Event()
         self.migration_in_progress = False
@@ -234,6 +305,7 @@ class Recorder(threading.Thread):
         self.use_legacy_events_index = False
         self._database_lock_task: DatabaseLockTask | None = None
         self._db_executor: DBInterruptibleThreadPoolExecutor | None = None
+        self._db_read_executor: DBInterruptibleThreadPoolExecutor | None = None
 
         self._event_listener: CALLBACK_TYPE | None = None
         self._queue_watcher: CALLBACK_TYPE | None = None
@@ -279,13 +351,36 @@ class Recorder(threading.Thread):
             raise RuntimeError("The database connection has not been established")
         return self._get_session()
 
+    def get_read_session(self) -> Session:
+        """Get a new sqlalchemy session for queries.
+
+        The session reads from the read-only connection pool if one is
+        configured and from the recorder database otherwise.
+        """
+        if self._get_read_session is not None:
+            return self._get_read_session()
+        return self.get_session()
+
     def queue_task(self, task: RecorderTask | Event) -> None:
         """Add a task to the recorder queue."""
         self._queue.put(task)
 
+    def queue_stats(self) -> dict[RecorderQueueClass, RecorderQueueClassStats]:
+        """Return the statistics of each class of the recorder queue."""
+        return self._queue.stats()
+
+    def queue_budget(self, queue_class: RecorderQueueClass) -> int:
+        """Return the last known budget in bytes of a class of the recorder queue."""
+        return int(
+            QUEUE_CLASS_BUDGETS[queue_class]
+            * self.max_backlog
+            * ESTIMATED_QUEUE_ITEM_SIZE
+        )
+
     def set_enable(self, enable: bool) -> None:
         """Enable or disable recording events and states."""
         self.enabled = enable
+        self.states_accumulator.reset()
 
     @callback
     def async_start_executor(self) -> None:
@@ -295,6 +390,11 @@ class Recorder(threading.Thread):
             max_workers=MAX_DB_EXECUTOR_WORKERS,
             shutdown_hook=self._shutdown_pool,
         )
+        self._db_read_executor = DBInterruptibleThreadPoolExecutor(
+            thread_name_prefix=DB_READER_PREFIX,
+            max_workers=MAX_DB_READ_EXECUTOR_WORKERS,
+            shutdown_hook=self._shutdown_pool,
+        )
 
     def _shutdown_pool(self) -> None:
         """Close the dbpool connections in the current thread."""
@@ -307,6 +407,11 @@ class Recorder(threading.Thread):
         entity_filter = self.entity_filter
         exclude_event_types = self.exclude_event_types
         queue_put = self._queue.put_nowait
+        states_accumulator = self.states_accumulator
+        # Events that were not recorded before the listener
+        # was started are not in the accumulator
+        states_accumulator.reset()
+        self._events_over_budget = False
 
         @callback
         def _event_listener(event: Event) -> None:
@@ -314,6 +419,9 @@ class Recorder(threading.Thread):
             if event.event_type in exclude_event_types:
                 return
 
+            if self._events_over_budget and event.event_type != EVENT_STATE_CHANGED:
+                return
+
             if (entity_id := event.data.get(ATTR_ENTITY_ID)) is None:
                 queue_put(event)
                 return
@@ -321,6 +429,12 @@ class Recorder(threading.Thread):
             if isinstance(entity_id, str):
                 if entity_filter(entity_id):
                     queue_put(event)
+                    if (
+                        states_accumulator.domains
+                        and event.event_type == EVENT_STATE_CHANGED
+                        and self.enabled
+                    ):
+                        states_accumulator.async_add_event(event)
                 return
 
             if isinstance(entity_id, list):
@@ -368,8 +482,23 @@ class Recorder(threading.Thread):
         """Add an executor job from within the event loop."""
         return self.hass.loop.run_in_executor(self._db_executor, target, *args)
 
+    @callback
+    def async_add_read_executor_job(
+        self, target: Callable[..., T], *args: Any
+    ) -> asyncio.Future[T]:
+        """Add a query job from within the event loop.
+
+        Queries run on their own executor so they do not have to wait
+        for other database jobs and at most MAX_DB_READ_EXECUTOR_WORKERS
+        of them run at the same time.
+        """
+        return self.hass.loop.run_in_executor(self._db_read_executor, target, *args)
+
     def _stop_executor(self) -> None:
         """Stop the executor."""
+        if self._db_read_executor is not None:
+            self._db_read_executor.shutdown()
+            self._db_read_executor = None
         if self._db_executor is None:
             return
         self._db_executor.shutdown()
@@ -383,7 +512,28 @@ class Recorder(threading.Thread):
         """
         size = self.backlog
         _LOGGER.debug("Recorder queue size is: %s", size)
-        if not self._reached_max_backlog_percentage(100):
+        over_budget = self._queue_classes_over_budget(QUEUE_CLASS_BUDGETS)
+        if RecorderQueueClass.MAINTENANCE in over_budget:
+            _LOGGER.warning(
+                "The recorder maintenance tasks exceeded their share of the "
+                "backlog queue; the database may be too slow to keep up with "
+                "purging and other maintenance"
+            )
+        events_over_budget = RecorderQueueClass.EVENTS in over_budget
+        if events_over_budget != self._events_over_budget:
+            self._events_over_budget = events_over_budget
+            if events_over_budget:
+                _LOGGER.error(
+                    "The recorder backlog queue reached the maximum size for "
+                    "events; The recorder will stop recording events other than "
+                    "state changes until the backlog has been written"
+                )
+            else:
+                _LOGGER.warning(
+                    "The recorder backlog queue for events has been written; "
+                    "The recorder will resume recording events"
+                )
+        if RecorderQueueClass.STATES not in over_budget:
             return
         _LOGGER.error(
             (
@@ -402,22 +552,60 @@ class Recorder(threading.Thread):
             self._psutil = ha_psutil.PsutilWrapper()
         return cast(int, self._psutil.psutil.virtual_memory().available)
 
+    def _max_queue_size(self) -> int:
+        """Return the size in bytes the queue may grow to with the available memory."""
+        max_queue_size = int(
+            QUEUE_PERCENTAGE_ALLOWED_AVAILABLE_MEMORY * self._available_memory()
+        )
+        self.max_backlog = max(
+            max_queue_size // ESTIMATED_QUEUE_ITEM_SIZE, MAX_QUEUE_BACKLOG_MIN_VALUE
+        )
+        return max_queue_size
+
     def _reached_max_backlog_percentage(self, percentage: int) -> bool:
         """Check if the system has reached the max queue backlog and return the maximum if it has."""
         percentage_modifier = percentage / 100
-        current_backlog = self.backlog
+        current_size = self._queue.size
         # First check the minimum value since its cheap
-        if current_backlog < (MAX_QUEUE_BACKLOG_MIN_VALUE * percentage_modifier):
+        if current_size < (
+            MAX_QUEUE_BACKLOG_MIN_VALUE
+            * ESTIMATED_QUEUE_ITEM_SIZE
+            * percentage_modifier
+        ):
             return False
         # If they have more RAM available, keep filling the backlog
         # since we do not want to stop recording events or give the
         # user a bad backup when they have plenty of RAM available.
-        max_queue_backlog = int(
-            QUEUE_PERCENTAGE_ALLOWED_AVAILABLE_MEMORY
-            * (self._available_memory() / ESTIMATED_QUEUE_ITEM_SIZE)
-        )
-        self.max_backlog = max(max_queue_backlog, MAX_QUEUE_BACKLOG_MIN_VALUE)
-        return current_backlog >= (max_queue_backlog * percentage_modifier)
+        return current_size >= (self._max_queue_size() * percentage_modifier)
+
+    def _queue_classes_over_budget(
+        self, queue_classes: Iterable[RecorderQueueClass]
+    ) -> set[RecorderQueueClass]:
+        """Return the classes of the queue that exceed their budget.
+
+        Each class may use its share of the memory the queue may use, so a
+        class that grows because the database is slow to process it cannot
+        cause the items of other classes to be dropped.
+        """
+        queue_ = self._queue
+        min_queue_size = MAX_QUEUE_BACKLOG_MIN_VALUE * ESTIMATED_QUEUE_ITEM_SIZE
+        # First check the minimum value since its cheap
+        if not (
+            over_min_size := {
+                queue_class
+                for queue_class in queue_classes
+                if queue_.class_size(queue_class)
+                >= QUEUE_CLASS_BUDGETS[queue_class] * min_queue_size
+            }
+        ):
+            return over_min_size
+        max_queue_size = self._max_queue_size()
+        return {
+            queue_class
+            for queue_class in over_min_size
+            if queue_.class_size(queue_class)
+            >= QUEUE_CLASS_BUDGETS[queue_class] * max_queue_size
+        }
 
     @callback
     def _async_stop_queue_watcher_and_event_listener(self) -> None:
@@ -428,6 +616,7 @@ class Recorder(threading.Thread):
         if self._event_listener:
             self._event_listener()
             self._event_listener = None
+            self.states_accumulator.reset()
 
     @callback
     def _async_stop_listeners(self) -> None:
@@ -456,11 +645,11 @@ class Recorder(threading.Thread):
         # We drain all the events in the queue and then insert
         # an empty one to ensure the next thing the recorder sees
         # is a request to shutdown.
-        while True:
-            try:
-                self._queue.get_nowait()
-            except queue.Empty:
-                break
+        self._queue.clear()
+        self._pending_statistics_imports.clear()
+        if self._statistics_import_retry:
+            self._statistics_import_retry()
+            self._statistics_import_retry = None
         self.queue_task(StopTask())
         await self.hass.async_add_executor_job(self.join)
 
@@ -468,6 +657,13 @@ class Recorder(threading.Thread):
         """Shut down the Recorder at final write."""
         if not self._hass_started.done():
             self._hass_started.set_result(SHUTDOWN_TASK)
+        if self._statistics_import_retry:
+            self._statistics_import_retry()
+            self._statistics_import_retry = None
+        # Write the statistics imports that were held back
+        # since there is no later chance to do so
+        while self._pending_statistics_imports:
+            self.queue_task(self._pending_statistics_imports.popleft())
         self.queue_task(StopTask())
         self._async_stop_listeners()
         await self.hass.async_add_executor_job(self.join)
@@ -483,8 +679,15 @@ class Recorder(threading.Thread):
         bus = self.hass.bus
         bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_close)
         bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_shutdown)
+        bus.async_listen(EVENT_CORE_CONFIG_UPDATE, self._async_core_config_updated)
         async_at_started(self.hass, self._async_hass_started)
 
+    @callback
+    def _async_core_config_updated(self, event: Event) -> None:
+        """Rebuild the statistics rollups when the time zone changes."""
+        if "time_zone" in event.data and self.statistics_rollups_manager.active:
+            self.queue_task(StatisticsRollupsTimeZoneTask())
+
     @callback
     def _async_startup_failed(self) -> None:
         """Report startup failure."""
@@ -535,6 +738,10 @@ class Recorder(threading.Thread):
     @callback
     def async_nightly_tasks(self, now: datetime) -> None:
         """Trigger the purge."""
+        if self.states_partitions is not None:
+            # Seal the partition first so the purge can drop
+            # it once its states are older than keep_days
+            self.queue_task(SealStatesPartitionTask())
         if self.auto_purge:
             # Purge will schedule the periodic cleanups
             # after it completes to ensure it does not happen
@@ -550,6 +757,10 @@ class Recorder(threading.Thread):
         """Run tasks every five minutes."""
         self.queue_task(ADJUST_LRU_SIZE_TASK)
         self.async_periodic_statistics()
+        if now.minute == 0:
+            # Checkpoint the latest states at the start of the hour
+            checkpoint = dt_util.as_utc(now).replace(second=0, microsecond=0)
+            self.queue_task(StatesCheckpointTask(checkpoint.timestamp()))
 
     def _adjust_lru_size(self) -> None:
         """Trigger the LRU adjustment.
@@ -638,7 +849,41 @@ class Recorder(threading.Thread):
         table: type[Statistics | StatisticsShortTerm],
     ) -> None:
         """Schedule import of statistics."""
-        self.queue_task(ImportStatisticsTask(metadata, stats, table))
+        task = ImportStatisticsTask(metadata, stats, table)
+        pending = self._pending_statistics_imports
+        if not pending and not self._queue_classes_over_budget(
+            (RecorderQueueClass.STATISTICS,)
+        ):
+            self.queue_task(task)
+            return
+        if not pending:
+            _LOGGER.warning(
+                "The recorder backlog queue reached the maximum size for "
+                "statistics; The import of statistics will be delayed until "
+                "the backlog has been written"
+            )
+            self._statistics_import_retry = async_call_later(
+                self.hass,
+                STATISTICS_IMPORT_RETRY_TIME,
+                self._async_queue_pending_statistics_imports,
+            )
+        pending.append(task)
+
+    @callback
+    def _async_queue_pending_statistics_imports(self, *_: Any) -> None:
+        """Queue the statistics imports that were held back while they fit."""
+        self._statistics_import_retry = None
+        pending = self._pending_statistics_imports
+        while pending and not self._queue_classes_over_budget(
+            (RecorderQueueClass.STATISTICS,)
+        ):
+            self.queue_task(pending.popleft())
+        if pending:
+            self._statistics_import_retry = async_call_later(
+                self.hass,
+                STATISTICS_IMPORT_RETRY_TIME,
+                self._async_queue_pending_statistics_imports,
+            )
 
     @callback
     def _async_setup_periodic_tasks(self) -> None:
@@ -773,6 +1018,25 @@ class Recorder(threading.Thread):
         if not database_was_ready:
             self._activate_and_set_db_ready()
 
+        # Keep the reference counts once the schema has them
+        ref_counts_active = self.schema_version >= REF_COUNT_SCHEMA_VERSION
+        self.state_attributes_manager.ref_counts_active = ref_counts_active
+        self.event_data_manager.ref_counts_active = ref_counts_active
+
+        if self.schema_version >= LOGBOOK_INDEX_SCHEMA_VERSION:
+            with session_scope(session=self.get_session(), read_only=True) as session:
+                self.logbook_index_manager.load(session)
+
+        if self.schema_version >= STATISTICS_ROLLUPS_SCHEMA_VERSION:
+            self._load_statistics_rollups()
+
+        if self.schema_version >= STATES_CHECKPOINTS_SCHEMA_VERSION:
+            with session_scope(session=self.get_session(), read_only=True) as session:
+                self.states_checkpoints_manager.load(session)
+
+        if self.db_partitioning and self.states_partitions is None:
+            self._setup_states_partitions()
+
         # Catch up with missed statistics
         self._schedule_compile_missing_statistics()
         _LOGGER.debug("Recorder processing the queue")
@@ -836,6 +1100,22 @@ class Recorder(threading.Thread):
                     ):
                         self.queue_task(EntityIDPostMigrationTask())
 
+            if (
+                self.schema_version < REF_COUNT_SCHEMA_VERSION
+                or execute_stmt_lambda_element(
+                    session, has_states_attributes_ref_counts_to_migrate()
+                )
+            ):
+                self.queue_task(StatesAttributesRefCountMigrationTask())
+
+            if (
+                self.schema_version < REF_COUNT_SCHEMA_VERSION
+                or execute_stmt_lambda_element(
+                    session, has_event_data_ref_counts_to_migrate()
+                )
+            ):
+                self.queue_task(EventDataRefCountMigrationTask())
+
             if self.schema_version > LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION:
                 with contextlib.suppress(SQLAlchemyError):
                     # If the index of event_ids on the states table is still present
@@ -924,9 +1204,16 @@ class Recorder(threading.Thread):
             # that is pending before running the task
             if TYPE_CHECKING:
                 assert isinstance(task, RecorderTask)
-            if not task.commit_before:
+            if task.commit_before:
                 self._commit_event_session_or_retry()
-            return task.run(self)
+            try:
+                return task.run(self)
+            finally:
+                # The statistics the task changed have been committed
+                # or rolled back by now
+                statistics.get_statistics_during_period_cache(
+                    self.hass
+                ).post_commit_pending()
         except exc.DatabaseError as err:
             if self._handle_database_error(err):
                 return
@@ -1077,25 +1364,33 @@ class Recorder(threading.Thread):
         # Matching attributes found in the pending commit
         if pending_event_data := event_data_manager.get_pending(shared_data):
             dbevent.event_data_rel = pending_event_data
+            event_data_manager.add_reference(pending_event_data)
         # Matching attributes id found in the cache
         elif (data_id := event_data_manager.get_from_cache(shared_data)) or (
             (hash_ := EventData.hash_shared_data_bytes(shared_data_bytes))
             and (data_id := event_data_manager.get(shared_data, hash_, session))
         ):
             dbevent.data_id = data_id
+            event_data_manager.add_reference(data_id)
         else:
             # No matching attributes found, save them in the DB
             dbevent_data = EventData(shared_data=shared_data, hash=hash_)
             event_data_manager.add_pending(dbevent_data)
+            event_data_manager.add_reference(dbevent_data)
             self._add_to_session(session, dbevent_data)
             dbevent.event_data_rel = dbevent_data
 
         self._add_to_session(session, dbevent)
+        if self.logbook_index_manager.active:
+            self.logbook_index_manager.add_event(event, dbevent, session)
 
     def _process_state_changed_event_into_session(self, event: Event) -> None:
         """Process a state_changed event into the session."""
         state_attributes_manager = self.state_attributes_manager
         states_meta_manager = self.states_meta_manager
+        if self._use_states_buffer and states_meta_manager.active:
+            self._process_state_changed_event_into_buffer(event)
+            return
         entity_removed = not event.data.get("new_state")
         entity_id = event.data["entity_id"]
 
@@ -1144,6 +1439,7 @@ class Recorder(threading.Thread):
         # Matching attributes found in the pending commit
         if pending_event_data := state_attributes_manager.get_pending(shared_attrs):
             dbstate.state_attributes = pending_event_data
+            state_attributes_manager.add_reference(pending_event_data)
         # Matching attributes id found in the cache
         elif (
             attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
@@ -1156,14 +1452,74 @@ class Recorder(threading.Thread):
             )
         ):
             dbstate.attributes_id = attributes_id
+            state_attributes_manager.add_reference(attributes_id)
         else:
             # No matching attributes found, save them in the DB
             dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
             state_attributes_manager.add_pending(dbstate_attributes)
+            state_attributes_manager.add_reference(dbstate_attributes)
             self._add_to_session(session, dbstate_attributes)
             dbstate.state_attributes = dbstate_attributes
 
         self._add_to_session(session, dbstate)
+        if self.logbook_index_manager.active:
+            self.logbook_index_manager.add_state_changed(event, dbstate)
+
+    def _process_state_changed_event_into_buffer(self, event: Event) -> None:
+        """Process a state_changed event into the states write buffer."""
+        state_attributes_manager = self.state_attributes_manager
+        states_meta_manager = self.states_meta_manager
+        entity_removed = not event.data.get("new_state")
+        entity_id = event.data["entity_id"]
+
+        if entity_id is None or not (
+            shared_attrs_bytes := state_attributes_manager.serialize_from_event(event)
+        ):
+            return
+
+        assert self.event_session is not None
+        session = self.event_session
+        # Map the entity_id to the StatesMeta table
+        metadata_id: int | StatesMeta | None
+        if not (metadata_id := states_meta_manager.get_pending(entity_id)) and not (
+            metadata_id := states_meta_manager.get(entity_id, session, True)
+        ):
+            if entity_removed:
+                # If the entity was removed, we don't need to add it to the
+                # StatesMeta table if it does not have a metadata_id
+                # allocated to it as it either never existed or was renamed.
+                return
+            metadata_id = StatesMeta(entity_id=entity_id)
+            states_meta_manager.add_pending(metadata_id)
+            self._add_to_session(session, metadata_id)
+
+        # Map the event data to the StateAttributes table
+        shared_attrs = shared_attrs_bytes.decode("utf-8")
+        attributes_id: int | StateAttributes | None
+        if not (
+            attributes_id := state_attributes_manager.get_pending(shared_attrs)
+        ) and not (
+            (attributes_id := state_attributes_manager.get_from_cache(shared_attrs))
+            or (
+                (hash_ := StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes))
+                and (
+                    attributes_id := state_attributes_manager.get(
+                        shared_attrs, hash_, session
+                    )
+                )
+            )
+        ):
+            attributes_id = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
+            state_attributes_manager.add_pending(attributes_id)
+            self._add_to_session(session, attributes_id)
+        state_attributes_manager.add_reference(attributes_id)
+
+        self._event_session_has_pending_writes = True
+        if self.logbook_index_manager.active:
+            self.logbook_index_manager.add_state_changed(event, len(self.states_buffer))
+        self.states_buffer.append(
+            event, entity_id, entity_removed, metadata_id, attributes_id
+        )
 
     def _handle_database_error(self, err: Exception) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1202,17 +1558,26 @@ class Recorder(threading.Thread):
         session = self.event_session
         self._commits_without_expire += 1
 
+        if self.states_buffer:
+            self.states_buffer.write(session)
+        # The reference counts are updated in the same transaction
+        # as the rows using them
+        self.state_attributes_manager.write_references(session)
+        self.event_data_manager.write_references(session)
+        self.logbook_index_manager.write(session, self.states_buffer)
         session.commit()
         self._event_session_has_pending_writes = False
         # We just committed the state attributes to the database
         # and we now know the attributes_ids.  We can save
         # many selects for matching attributes by loading them
         # into the LRU or committed now.
+        self.states_buffer.post_commit_pending()
         self.states_manager.post_commit_pending()
         self.state_attributes_manager.post_commit_pending()
         self.event_data_manager.post_commit_pending()
         self.event_type_manager.post_commit_pending()
         self.states_meta_manager.post_commit_pending()
+        self.logbook_index_manager.post_commit_pending()
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -1229,17 +1594,21 @@ class Recorder(threading.Thread):
             self._close_connection()
         move_away_broken_database(dburl_to_path(self.db_url))
         self.recorder_runs_manager.reset()
+        statistics.get_statistics_during_period_cache(self.hass).clear()
+        self.states_checkpoints_manager.reset()
         self._setup_recorder()
         self._setup_run()
 
     def _close_event_session(self) -> None:
         """Close the event session."""
+        self.states_buffer.reset()
         self.states_manager.reset()
         self.state_attributes_manager.reset()
         self.event_data_manager.reset()
         self.event_type_manager.reset()
         self.states_meta_manager.reset()
         self.statistics_meta_manager.reset()
+        self.logbook_index_manager.reset()
 
         if not self.event_session:
             return
@@ -1286,6 +1655,42 @@ class Recorder(threading.Thread):
         """Post migrate entity_ids if needed."""
         return migration.post_migrate_entity_ids(self)
 
+    def _load_statistics_rollups(self) -> None:
+        """Load the statistics rollups and backfill them if needed."""
+        with session_scope(session=self.get_session()) as session:
+            backfill = self.statistics_rollups_manager.load(session)
+        if backfill:
+            self.queue_task(StatisticsRollupsTask())
+
+    def _migrate_states_attributes_ref_counts(self) -> bool:
+        """Migrate states attributes reference counts if needed."""
+        if not self.state_attributes_manager.ref_counts_active:
+            # The schema is too old to have the reference counts
+            return True
+        return migration.migrate_states_attributes_ref_counts(self)
+
+    def _migrate_event_data_ref_counts(self) -> bool:
+        """Migrate event data reference counts if needed."""
+        if not self.event_data_manager.ref_counts_active:
+            # The schema is too old to have the reference counts
+            return True
+        return migration.migrate_event_data_ref_counts(self)
+
+    def _setup_states_partitions(self) -> None:
+        """Partition the states table and load the partitions."""
+        try:
+            self.states_partitions = partitions.setup_partitions(self)
+        except SQLAlchemyError:
+            _LOGGER.exception(
+                "Error partitioning the states table, it will not be partitioned"
+            )
+
+    def _seal_states_partition(self) -> None:
+        """Seal the states written up to now in a partition."""
+        if self.states_partitions is None:
+            return
+        self.states_partitions = partitions.seal_partition(self, self.states_partitions)
+
     def _cleanup_legacy_states_event_ids(self) -> bool:
         """Cleanup legacy event_ids if needed."""
         return migration.cleanup_legacy_states_event_ids(self)
@@ -1404,15 +1809,7 @@ class Recorder(threading.Thread):
                 MYSQLDB_PYMYSQL_URL_PREFIX,
             )
         ):
-            kwargs["connect_args"] = {"charset": "utf8mb4"}
-            if self.db_url.startswith((MARIADB_URL_PREFIX, MYSQLDB_URL_PREFIX)):
-                # If they have configured MySQLDB but don't have
-                # the MySQLDB module installed this will throw
-                # an ImportError which we suppress here since
-                # sqlalchemy will give them a better error when
-                # it tried to import it below.
-                with contextlib.suppress(ImportError):
-                    kwargs["connect_args"]["conv"] = build_mysqldb_conv()
+            kwargs["connect_args"] = _mysql_connect_args(self.db_url)
 
         # Disable extended logging for non SQLite databases
         if not self.db_url.startswith(SQLITE_URL_PREFIX):
@@ -1423,14 +1820,82 @@ class Recorder(threading.Thread):
 
         self.engine = create_engine(self.db_url, **kwargs, future=True)
         self._dialect_name = try_parse_enum(SupportedDialect, self.engine.dialect.name)
+        # Bulk state writes need the ids of the inserted rows back in order
+        # to link the old_state_id of the following states for an entity
+        self._use_states_buffer = (
+            self.bulk_state_writes
+            and self.engine.dialect.insert_executemany_returning_sort_by_parameter_order
+        )
+        if self.bulk_state_writes and not self._use_states_buffer:
+            _LOGGER.warning(
+                "Bulk state writes are not supported by the %s database, "
+                "states will be written one by one",
+                self.engine.dialect.name,
+            )
         sqlalchemy_event.listen(self.engine, "connect", self._setup_recorder_connection)
 
         Base.metadata.create_all(self.engine)
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
         _LOGGER.debug("Connected to recorder database")
+        if self.db_read_url:
+            self._setup_read_connection(self.db_read_url)
+
+    def _setup_read_connection(self, db_read_url: str) -> None:
+        """Set up the read-only connection pool for queries."""
+        assert self.engine is not None
+        kwargs: dict[str, Any] = {"pool_size": READ_POOL_SIZE}
+        if db_read_url.startswith(SQLITE_URL_PREFIX):
+            # The readers share the WAL of the recorder database
+            kwargs["connect_args"] = {"check_same_thread": False}
+            kwargs["poolclass"] = QueuePool
+        else:
+            kwargs["echo"] = False
+        if db_read_url.startswith(
+            (
+                MARIADB_URL_PREFIX,
+                MARIADB_PYMYSQL_URL_PREFIX,
+                MYSQLDB_URL_PREFIX,
+                MYSQLDB_PYMYSQL_URL_PREFIX,
+            )
+        ):
+            kwargs["connect_args"] = _mysql_connect_args(db_read_url)
+
+        read_engine = create_engine(db_read_url, **kwargs, future=True)
+        if read_engine.dialect.name != self.engine.dialect.name:
+            _LOGGER.warning(
+                "The read database uses %s while the recorder database uses %s, "
+                "queries will read from the recorder database",
+                read_engine.dialect.name,
+                self.engine.dialect.name,
+            )
+            read_engine.dispose()
+            return
+        sqlalchemy_event.listen(
+            read_engine, "connect", self._setup_read_connection_for_dialect
+        )
+        self.read_engine = read_engine
+        self._get_read_session = scoped_session(
+            sessionmaker(bind=read_engine, future=True)
+        )
+        _LOGGER.debug("Connected to read database")
+
+    def _setup_read_connection_for_dialect(
+        self, dbapi_connection: DBAPIConnection, connection_record: Any
+    ) -> None:
+        """Dbapi specific read connection settings."""
+        assert self.engine is not None
+        setup_connection_for_dialect(
+            self, self.engine.dialect.name, dbapi_connection, False
+        )
+        if self.engine.dialect.name == SupportedDialect.SQLITE:
+            execute_on_connection(dbapi_connection, "PRAGMA query_only=ON")
 
     def _close_connection(self) -> None:
         """Close the connection."""
+        if self.read_engine:
+            self.read_engine.dispose()
+            self.read_engine = None
+        self._get_read_session = None
         if self.engine:
             self.engine.dispose()
             self.engine = None
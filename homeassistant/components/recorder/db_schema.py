@@ -67,20 +67,24 @@ class Base(DeclarativeBase):
     """Base class for tables."""
 
 
-SCHEMA_VERSION = 42
+SCHEMA_VERSION = 46
 
 _LOGGER = logging.getLogger(__name__)
 
 TABLE_EVENTS = "events"
 TABLE_EVENT_DATA = "event_data"
 TABLE_EVENT_TYPES = "event_types"
+TABLE_LOGBOOK_INDEX = "logbook_index"
 TABLE_STATES = "states"
 TABLE_STATE_ATTRIBUTES = "state_attributes"
+TABLE_STATES_CHECKPOINTS = "states_checkpoints"
 TABLE_STATES_META = "states_meta"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 TABLE_STATISTICS = "statistics"
+TABLE_STATISTICS_DAILY = "statistics_daily"
 TABLE_STATISTICS_META = "statistics_meta"
+TABLE_STATISTICS_MONTHLY = "statistics_monthly"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
 
@@ -97,11 +101,15 @@ ALL_TABLES = [
     TABLE_EVENTS,
     TABLE_EVENT_DATA,
     TABLE_EVENT_TYPES,
+    TABLE_LOGBOOK_INDEX,
     TABLE_RECORDER_RUNS,
     TABLE_SCHEMA_CHANGES,
+    TABLE_STATES_CHECKPOINTS,
     TABLE_STATES_META,
     TABLE_STATISTICS,
+    TABLE_STATISTICS_DAILY,
     TABLE_STATISTICS_META,
+    TABLE_STATISTICS_MONTHLY,
     TABLE_STATISTICS_RUNS,
     TABLE_STATISTICS_SHORT_TERM,
 ]
@@ -120,6 +128,7 @@ STATES_CONTEXT_ID_BIN_INDEX = "ix_states_context_id_bin"
 LEGACY_STATES_EVENT_ID_INDEX = "ix_states_event_id"
 LEGACY_STATES_ENTITY_ID_LAST_UPDATED_INDEX = "ix_states_entity_id_last_updated_ts"
 CONTEXT_ID_BIN_MAX_LENGTH = 16
+DEVICE_ID_MAX_LENGTH = 32
 
 MYSQL_COLLATE = "utf8mb4_unicode_ci"
 MYSQL_DEFAULT_CHARSET = "utf8mb4"
@@ -338,6 +347,8 @@ class EventData(Base):
     shared_data: Mapped[str | None] = mapped_column(
         Text().with_variant(mysql.LONGTEXT, "mysql", "mariadb")
     )
+    # The number of events using the data, NULL if it is not known yet
+    ref_count: Mapped[int | None] = mapped_column(Integer)
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -551,6 +562,8 @@ class StateAttributes(Base):
     shared_attrs: Mapped[str | None] = mapped_column(
         Text().with_variant(mysql.LONGTEXT, "mysql", "mariadb")
     )
+    # The number of states using the attributes, NULL if it is not known yet
+    ref_count: Mapped[int | None] = mapped_column(Integer)
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -628,6 +641,74 @@ class StatesMeta(Base):
         )
 
 
+class LogbookIndex(Base):
+    """Index of the states and events shown in the logbook.
+
+    Only the rows the logbook would display are indexed so looking
+    up the logbook of an entity or a device is a range scan.
+    """
+
+    __table_args__ = (
+        Index(
+            "ix_logbook_index_metadata_id_time_fired_ts",
+            "metadata_id",
+            "time_fired_ts",
+        ),
+        Index("ix_logbook_index_device_id_time_fired_ts", "device_id", "time_fired_ts"),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_LOGBOOK_INDEX
+    id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
+    time_fired_ts: Mapped[float] = mapped_column(TIMESTAMP_TYPE, index=True)
+    metadata_id: Mapped[int | None] = mapped_column(Integer)
+    device_id: Mapped[str | None] = mapped_column(String(DEVICE_ID_MAX_LENGTH))
+    state_id: Mapped[int | None] = mapped_column(Integer)
+    event_id: Mapped[int | None] = mapped_column(Integer)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            "<recorder.LogbookIndex("
+            f"id={self.id}, time_fired_ts={self.time_fired_ts}, "
+            f"metadata_id={self.metadata_id}, device_id='{self.device_id}', "
+            f"state_id={self.state_id}, event_id={self.event_id}"
+            ")>"
+        )
+
+
+class StatesCheckpoints(Base):
+    """Checkpoint of the latest states of the entities at a point in time.
+
+    The last_updated_ts of the latest state of each entity before the
+    checkpoint is kept so the states at a later point in time only have
+    to be looked up since the checkpoint.
+    """
+
+    __table_args__ = (
+        Index(
+            "ix_states_checkpoints_checkpoint_ts_metadata_id",
+            "checkpoint_ts",
+            "metadata_id",
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATES_CHECKPOINTS
+    id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
+    checkpoint_ts: Mapped[float] = mapped_column(TIMESTAMP_TYPE)
+    metadata_id: Mapped[int] = mapped_column(Integer)
+    last_updated_ts: Mapped[float] = mapped_column(TIMESTAMP_TYPE)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            "<recorder.StatesCheckpoints("
+            f"id={self.id}, checkpoint_ts={self.checkpoint_ts}, "
+            f"metadata_id={self.metadata_id}, "
+            f"last_updated_ts={self.last_updated_ts}"
+            ")>"
+        )
+
+
 class StatisticsBase:
     """Statistics base class."""
 
@@ -721,6 +802,48 @@ class StatisticsShortTerm(Base, StatisticsBase):
     __tablename__ = TABLE_STATISTICS_SHORT_TERM
 
 
+class StatisticsDaily(Base, StatisticsBase):
+    """Long term statistics rolled up per local day.
+
+    The rows are aggregated from the hourly statistics, the end
+    of a day is not always 24 hours after its start.
+    """
+
+    duration = timedelta(days=1)
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index(
+            "ix_statistics_daily_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+    )
+    __tablename__ = TABLE_STATISTICS_DAILY
+
+
+class StatisticsMonthly(Base, StatisticsBase):
+    """Long term statistics rolled up per local month.
+
+    The rows are aggregated from the hourly statistics, the
+    duration is only the longest month.
+    """
+
+    duration = timedelta(days=31)
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index(
+            "ix_statistics_monthly_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+    )
+    __tablename__ = TABLE_STATISTICS_MONTHLY
+
+
 class StatisticsMeta(Base):
     """Statistics meta data."""
 
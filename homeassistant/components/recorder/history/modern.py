@@ -26,7 +26,12 @@ from homeassistant.core import HomeAssistant, State, split_entity_id
 import homeassistant.util.dt as dt_util
 
 from ... import recorder
-from ..db_schema import SHARED_ATTR_OR_LEGACY_ATTRIBUTES, StateAttributes, States
+from ..db_schema import (
+    SHARED_ATTR_OR_LEGACY_ATTRIBUTES,
+    StateAttributes,
+    States,
+    StatesCheckpoints,
+)
 from ..filters import Filters
 from ..models import (
     LazyState,
@@ -120,6 +125,35 @@ def get_significant_states(
         )
 
 
+def _min_state_id(instance: recorder.Recorder, start_time_ts: float) -> int | None:
+    """Return the lowest state_id of the states updated after start_time_ts.
+
+    Filtering on it lets the database skip the partitions of the
+    states table that only have older states.
+    """
+    if (states_partitions := instance.states_partitions) is None:
+        return None
+    return states_partitions.min_state_id(start_time_ts)
+
+
+def _states_checkpoint_ts(
+    instance: recorder.Recorder,
+    start_time_ts: float,
+    run_start_ts: float | None,
+    single_metadata_id: int | None,
+) -> float | None:
+    """Return the states checkpoint to look up the start time states from.
+
+    The single entity start time state is already looked up with a
+    single index seek so it does not use the checkpoints.
+    """
+    if run_start_ts is None or single_metadata_id:
+        return None
+    return instance.states_checkpoints_manager.checkpoint_before(
+        start_time_ts, run_start_ts
+    )
+
+
 def _significant_states_stmt(
     start_time_ts: float,
     end_time_ts: float | None,
@@ -128,10 +162,14 @@ def _significant_states_stmt(
     metadata_ids_in_significant_domains: list[int],
     significant_changes_only: bool,
     no_attributes: bool,
-    include_start_time_state: bool,
     run_start_ts: float | None,
+    min_state_id: int | None,
+    checkpoint_ts: float | None,
 ) -> Select | CompoundSelect:
-    """Query the database for significant state changes."""
+    """Query the database for significant state changes.
+
+    The start time states are included when run_start_ts is set.
+    """
     include_last_changed = not significant_changes_only
     stmt = _stmt_and_join_attributes(no_attributes, include_last_changed)
     if significant_changes_only:
@@ -154,11 +192,13 @@ def _significant_states_stmt(
     )
     if end_time_ts:
         stmt = stmt.filter(States.last_updated_ts < end_time_ts)
+    if min_state_id:
+        stmt = stmt.filter(States.state_id >= min_state_id)
     if not no_attributes:
         stmt = stmt.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
-    if not include_start_time_state or not run_start_ts:
+    if not run_start_ts:
         stmt = stmt.order_by(States.metadata_id, States.last_updated_ts)
         return stmt
     unioned_subquery = union_all(
@@ -170,6 +210,7 @@ def _significant_states_stmt(
                 metadata_ids,
                 no_attributes,
                 include_last_changed,
+                checkpoint_ts,
             ).subquery(),
             no_attributes,
             include_last_changed,
@@ -211,6 +252,101 @@ def get_significant_states_with_session(
         raise NotImplementedError("Filters are no longer supported")
     if not entity_ids:
         raise ValueError("entity_ids must be provided")
+    if (
+        query := _execute_significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+        )
+    ) is None:
+        return {}
+    rows, start_time_ts, entity_id_to_metadata_id = query
+    return _sorted_states_to_dict(
+        rows,
+        start_time_ts,
+        entity_ids,
+        entity_id_to_metadata_id,
+        minimal_response,
+        compressed_state_format,
+        no_attributes=no_attributes,
+    )
+
+
+def stream_significant_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    compressed_state_format: bool = False,
+) -> Iterator[tuple[str, list[State | dict[str, Any]]]]:
+    """Yield the significant states during start_time - end_time per entity.
+
+    Same as get_significant_states_with_session except the states of each
+    entity are yielded as soon as they have been read from the cursor
+    instead of building the result for all entities in memory.
+
+    Entities without states are not yielded.
+    """
+    if not entity_ids:
+        raise ValueError("entity_ids must be provided")
+    if (
+        query := _execute_significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+            stream=True,
+        )
+    ) is None:
+        return
+    rows, start_time_ts, entity_id_to_metadata_id = query
+    for entity_id, ent_results in _sorted_states_to_entity_states(
+        rows,
+        start_time_ts,
+        entity_ids,
+        entity_id_to_metadata_id,
+        minimal_response,
+        compressed_state_format,
+        no_attributes,
+    ):
+        if ent_results:
+            yield entity_id, ent_results
+
+
+def _execute_significant_states_query(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+    stream: bool = False,
+) -> tuple[Iterable[Row], float | None, dict[str, int | None]] | None:
+    """Execute the significant states query.
+
+    Returns the rows sorted by metadata_id and last_updated_ts, the start
+    time timestamp to use for the start time states, and the metadata_ids
+    of the entity_ids, or None if none of the entity_ids have states.
+
+    If stream is True, the rows are fetched from the cursor in batches as
+    they are consumed instead of all at once.
+    """
     entity_id_to_metadata_id: dict[str, int | None] | None = None
     metadata_ids_in_significant_domains: list[int] = []
     instance = recorder.get_instance(hass)
@@ -219,7 +355,7 @@ def get_significant_states_with_session(
             entity_ids, session, False
         )
     ) or not (possible_metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
-        return {}
+        return None
     metadata_ids = possible_metadata_ids
     if significant_changes_only:
         metadata_ids_in_significant_domains = [
@@ -236,6 +372,10 @@ def get_significant_states_with_session(
     start_time_ts = dt_util.utc_to_timestamp(start_time)
     end_time_ts = datetime_to_timestamp_or_none(end_time)
     single_metadata_id = metadata_ids[0] if len(metadata_ids) == 1 else None
+    min_state_id = _min_state_id(instance, start_time_ts)
+    checkpoint_ts = _states_checkpoint_ts(
+        instance, start_time_ts, run_start_ts, single_metadata_id
+    )
     stmt = lambda_stmt(
         lambda: _significant_states_stmt(
             start_time_ts,
@@ -245,8 +385,12 @@ def get_significant_states_with_session(
             metadata_ids_in_significant_domains,
             significant_changes_only,
             no_attributes,
-            include_start_time_state,
+            # SQLAlchemy mixes up the closure variables of lambdas with
+            # more than ten of them, include_start_time_state is implied
+            # by run_start_ts
             run_start_ts,
+            min_state_id,
+            checkpoint_ts,
         ),
         track_on=[
             bool(single_metadata_id),
@@ -255,16 +399,16 @@ def get_significant_states_with_session(
             significant_changes_only,
             no_attributes,
             include_start_time_state,
+            bool(min_state_id),
+            bool(checkpoint_ts),
         ],
     )
-    return _sorted_states_to_dict(
-        execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
+    return (
+        execute_stmt_lambda_element(
+            session, stmt, None, end_time, orm_rows=False, stream=stream
+        ),
         start_time_ts if include_start_time_state else None,
-        entity_ids,
         entity_id_to_metadata_id,
-        minimal_response,
-        compressed_state_format,
-        no_attributes=no_attributes,
     )
 
 
@@ -309,6 +453,7 @@ def _state_changed_during_period_stmt(
     limit: int | None,
     include_start_time_state: bool,
     run_start_ts: float | None,
+    min_state_id: int | None,
 ) -> Select | CompoundSelect:
     stmt = (
         _stmt_and_join_attributes(no_attributes, False)
@@ -323,6 +468,8 @@ def _state_changed_during_period_stmt(
     )
     if end_time_ts:
         stmt = stmt.filter(States.last_updated_ts < end_time_ts)
+    if min_state_id:
+        stmt = stmt.filter(States.state_id >= min_state_id)
     if not no_attributes:
         stmt = stmt.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
@@ -392,6 +539,7 @@ def state_changes_during_period(
             include_start_time_state = False
         start_time_ts = dt_util.utc_to_timestamp(start_time)
         end_time_ts = datetime_to_timestamp_or_none(end_time)
+        min_state_id = _min_state_id(instance, start_time_ts)
         stmt = lambda_stmt(
             lambda: _state_changed_during_period_stmt(
                 start_time_ts,
@@ -401,12 +549,14 @@ def state_changes_during_period(
                 limit,
                 include_start_time_state,
                 run_start_ts,
+                min_state_id,
             ),
             track_on=[
                 bool(end_time_ts),
                 no_attributes,
                 bool(limit),
                 include_start_time_state,
+                bool(min_state_id),
             ],
         )
         return cast(
@@ -566,6 +716,55 @@ def _get_start_time_state_for_entities_stmt(
     )
 
 
+def _get_start_time_state_from_checkpoint_stmt(
+    checkpoint_ts: float,
+    epoch_time: float,
+    metadata_ids: list[int],
+    no_attributes: bool,
+    include_last_changed: bool,
+) -> Select:
+    """Return the states at a specific point in time from a states checkpoint.
+
+    The latest states before the checkpoint are read from the checkpoint
+    so only the states since the checkpoint have to be scanned.
+    """
+    candidates = union_all(
+        select(StatesCheckpoints.metadata_id, StatesCheckpoints.last_updated_ts).filter(
+            (StatesCheckpoints.checkpoint_ts == checkpoint_ts)
+            & StatesCheckpoints.metadata_id.in_(metadata_ids)
+        ),
+        select(States.metadata_id, States.last_updated_ts).filter(
+            (States.last_updated_ts >= checkpoint_ts)
+            & (States.last_updated_ts < epoch_time)
+            & States.metadata_id.in_(metadata_ids)
+        ),
+    ).subquery()
+    most_recent_states_for_entities_by_date = (
+        select(
+            candidates.c.metadata_id.label("max_metadata_id"),
+            func.max(candidates.c.last_updated_ts).label("max_last_updated"),
+        )
+        .group_by(candidates.c.metadata_id)
+        .subquery()
+    )
+    stmt = _stmt_and_join_attributes_for_start_state(
+        no_attributes, include_last_changed
+    ).join(
+        most_recent_states_for_entities_by_date,
+        and_(
+            States.metadata_id
+            == most_recent_states_for_entities_by_date.c.max_metadata_id,
+            States.last_updated_ts
+            == most_recent_states_for_entities_by_date.c.max_last_updated,
+        ),
+    )
+    if no_attributes:
+        return stmt
+    return stmt.outerjoin(
+        StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+    )
+
+
 def _get_run_start_ts_for_utc_point_in_time(
     hass: HomeAssistant, utc_point_in_time: datetime
 ) -> float | None:
@@ -587,6 +786,7 @@ def _get_start_time_state_stmt(
     metadata_ids: list[int],
     no_attributes: bool,
     include_last_changed: bool,
+    checkpoint_ts: float | None,
 ) -> Select:
     """Return the states at a specific point in time."""
     if single_metadata_id:
@@ -598,6 +798,15 @@ def _get_start_time_state_stmt(
             no_attributes,
             include_last_changed,
         )
+    if checkpoint_ts:
+        # Only the states since the last checkpoint have to be looked at
+        return _get_start_time_state_from_checkpoint_stmt(
+            checkpoint_ts,
+            epoch_time,
+            metadata_ids,
+            no_attributes,
+            include_last_changed,
+        )
     # We have more than one entity to look at so we need to do a query on states
     # since the last recorder run started.
     return _get_start_time_state_for_entities_stmt(
@@ -654,6 +863,44 @@ def _sorted_states_to_dict(
     each list of states, otherwise our graphs won't start on the Y
     axis correctly.
     """
+    # Set all entity IDs to empty lists in result set to maintain the order
+    result: dict[str, list[State | dict[str, Any]]] = {
+        entity_id: [] for entity_id in entity_ids
+    }
+    for entity_id, ent_results in _sorted_states_to_entity_states(
+        states,
+        start_time_ts,
+        entity_ids,
+        entity_id_to_metadata_id,
+        minimal_response,
+        compressed_state_format,
+        no_attributes,
+    ):
+        result[entity_id].extend(ent_results)
+
+    if descending:
+        for ent_results in result.values():
+            ent_results.reverse()
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _sorted_states_to_entity_states(
+    states: Iterable[Row],
+    start_time_ts: float | None,
+    entity_ids: list[str],
+    entity_id_to_metadata_id: dict[str, int | None],
+    minimal_response: bool,
+    compressed_state_format: bool,
+    no_attributes: bool,
+) -> Iterator[tuple[str, list[State | dict[str, Any]]]]:
+    """Convert SQL results into the states of each entity.
+
+    States must be sorted by entity_id and last_updated
+
+    The states of an entity are yielded once all its rows have been read.
+    """
     field_map = _FIELD_MAP
     state_class: Callable[
         [Row, dict[str, dict[str, Any]], float | None, str, str, float | None, bool],
@@ -668,10 +915,6 @@ def _sorted_states_to_dict(
         attr_time = LAST_CHANGED_KEY
         attr_state = STATE_KEY
 
-    # Set all entity IDs to empty lists in result set to maintain the order
-    result: dict[str, list[State | dict[str, Any]]] = {
-        entity_id: [] for entity_id in entity_ids
-    }
     metadata_id_to_entity_id: dict[int, str] = {}
     metadata_id_to_entity_id = {
         v: k for k, v in entity_id_to_metadata_id.items() if v is not None
@@ -694,7 +937,7 @@ def _sorted_states_to_dict(
     for metadata_id, group in states_iter:
         entity_id = metadata_id_to_entity_id[metadata_id]
         attr_cache: dict[str, dict[str, Any]] = {}
-        ent_results = result[entity_id]
+        ent_results: list[State | dict[str, Any]] = []
         if (
             not minimal_response
             or split_entity_id(entity_id)[0] in NEED_ATTRIBUTE_DOMAINS
@@ -711,6 +954,7 @@ def _sorted_states_to_dict(
                 )
                 for db_state in group
             )
+            yield entity_id, ent_results
             continue
 
         prev_state: str | None = None
@@ -718,21 +962,20 @@ def _sorted_states_to_dict(
         # State for the first and last response. All the states
         # in-between only provide the "state" and the
         # "last_changed".
-        if not ent_results:
-            if (first_state := next(group, None)) is None:
-                continue
-            prev_state = first_state[state_idx]
-            ent_results.append(
-                state_class(
-                    first_state,
-                    attr_cache,
-                    start_time_ts,
-                    entity_id,
-                    prev_state,  # type: ignore[arg-type]
-                    first_state[last_updated_ts_idx],
-                    no_attributes,
-                )
+        if (first_state := next(group, None)) is None:
+            continue
+        prev_state = first_state[state_idx]
+        ent_results.append(
+            state_class(
+                first_state,
+                attr_cache,
+                start_time_ts,
+                entity_id,
+                prev_state,  # type: ignore[arg-type]
+                first_state[last_updated_ts_idx],
+                no_attributes,
             )
+        )
 
         #
         # minimal_response only makes sense with last_updated == last_updated
@@ -751,6 +994,7 @@ def _sorted_states_to_dict(
                 for row in group
                 if (state := row[state_idx]) != prev_state
             )
+            yield entity_id, ent_results
             continue
 
         # Non-compressed state format returns an ISO formatted string
@@ -763,10 +1007,4 @@ def _sorted_states_to_dict(
             for row in group
             if (state := row[state_idx]) != prev_state
         )
-
-    if descending:
-        for ent_results in result.values():
-            ent_results.reverse()
-
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+        yield entity_id, ent_results
@@ -57,9 +57,11 @@ from .db_schema import (
     STATISTICS_TABLES,
     TABLE_STATES,
     Base,
+    EventData,
     Events,
     EventTypes,
     SchemaChanges,
+    StateAttributes,
     States,
     StatesMeta,
     Statistics,
@@ -71,11 +73,15 @@ from .models import process_timestamp
 from .models.time import datetime_to_timestamp_or_none
 from .queries import (
     batch_cleanup_entity_ids,
+    count_events_by_data_ids,
+    count_states_by_attributes_ids,
     delete_duplicate_short_term_statistics_row,
     delete_duplicate_statistics_row,
     find_entity_ids_to_migrate,
+    find_event_data_ref_counts_to_migrate,
     find_event_type_to_migrate,
     find_events_context_ids_to_migrate,
+    find_states_attributes_ref_counts_to_migrate,
     find_states_context_ids_to_migrate,
     find_unmigrated_short_term_statistics_rows,
     find_unmigrated_statistics_rows,
@@ -1061,6 +1067,24 @@ def _apply_update(  # noqa: C901
         _migrate_statistics_columns_to_timestamp_removing_duplicates(
             hass, instance, session_maker, engine
         )
+    elif new_version == 43:
+        # The reference counts are backfilled by a live migration
+        _add_columns(session_maker, "state_attributes", ["ref_count INTEGER"])
+        _add_columns(session_maker, "event_data", ["ref_count INTEGER"])
+    elif new_version == 44:
+        # The logbook_index table is created by create_all and only
+        # indexes rows recorded after the migration, older logbook
+        # lookups keep using the states and events tables
+        pass
+    elif new_version == 45:
+        # The statistics_daily and statistics_monthly tables are created
+        # by create_all and backfilled from the hourly statistics by a
+        # live migration
+        pass
+    elif new_version == 46:
+        # The states_checkpoints table is created by create_all and the
+        # first checkpoint is written an hour after the upgrade
+        pass
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
@@ -1718,6 +1742,73 @@ def cleanup_legacy_states_event_ids(instance: Recorder) -> bool:
     return True
 
 
+@retryable_database_job("migrate state_attributes reference counts")
+def migrate_states_attributes_ref_counts(instance: Recorder) -> bool:
+    """Backfill the reference counts of state_attributes rows."""
+    session_maker = instance.get_session
+    _LOGGER.debug("Migrating state_attributes reference counts")
+    with session_scope(session=session_maker()) as session:
+        if attributes_ids := session.execute(
+            find_states_attributes_ref_counts_to_migrate(instance.max_bind_vars)
+        ).all():
+            ref_counts: dict[int, int] = dict(
+                session.execute(
+                    count_states_by_attributes_ids(
+                        [attributes_id for (attributes_id,) in attributes_ids]
+                    )
+                )
+                .tuples()
+                .all()
+            )
+            session.execute(
+                update(StateAttributes),
+                [
+                    {
+                        "attributes_id": attributes_id,
+                        "ref_count": ref_counts.get(attributes_id, 0),
+                    }
+                    for (attributes_id,) in attributes_ids
+                ],
+            )
+        # If there is more work to do return False
+        # so that we can be called again
+        is_done = not attributes_ids
+
+    _LOGGER.debug("Migrating state_attributes reference counts: done=%s", is_done)
+    return is_done
+
+
+@retryable_database_job("migrate event_data reference counts")
+def migrate_event_data_ref_counts(instance: Recorder) -> bool:
+    """Backfill the reference counts of event_data rows."""
+    session_maker = instance.get_session
+    _LOGGER.debug("Migrating event_data reference counts")
+    with session_scope(session=session_maker()) as session:
+        if data_ids := session.execute(
+            find_event_data_ref_counts_to_migrate(instance.max_bind_vars)
+        ).all():
+            ref_counts: dict[int, int] = dict(
+                session.execute(
+                    count_events_by_data_ids([data_id for (data_id,) in data_ids])
+                )
+                .tuples()
+                .all()
+            )
+            session.execute(
+                update(EventData),
+                [
+                    {"data_id": data_id, "ref_count": ref_counts.get(data_id, 0)}
+                    for (data_id,) in data_ids
+                ],
+            )
+        # If there is more work to do return False
+        # so that we can be called again
+        is_done = not data_ids
+
+    _LOGGER.debug("Migrating event_data reference counts: done=%s", is_done)
+    return is_done
+
+
 def _initialize_database(session: Session) -> bool:
     """Initialize a new database.
 
@@ -0,0 +1,358 @@
+"""Partition the states table by day on MySQL and PostgreSQL."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+import logging
+import re
+from typing import TYPE_CHECKING, Final, cast
+
+from sqlalchemy import Table, func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm.session import Session
+from sqlalchemy.schema import CreateIndex
+
+from homeassistant.util import dt as dt_util
+
+from .const import SupportedDialect
+from .db_schema import TABLE_STATES, States
+from .util import session_scope
+
+if TYPE_CHECKING:
+    from . import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+# The partition that receives the new states
+CURRENT_PARTITION: Final = "pcurrent"
+
+# The sealed partitions are named after the UTC day they were sealed on
+_SEALED_PARTITION_FORMAT: Final = "p%Y%m%d"
+_SEALED_PARTITION_RE: Final = re.compile(r"p(\d{8})$")
+_POSTGRESQL_BOUND_RE: Final = re.compile(r"TO \('?(\w+)'?\)$")
+
+# MySQL does not support foreign keys on partitioned tables so
+# they are dropped on all databases for consistency
+_STATES_FOREIGN_KEY_COLUMNS: Final = (
+    "old_state_id",
+    "attributes_id",
+    "event_id",
+    "metadata_id",
+)
+
+SUPPORTED_DIALECTS: Final = (SupportedDialect.MYSQL, SupportedDialect.POSTGRESQL)
+
+
+@dataclass(slots=True, frozen=True)
+class StatesPartition:
+    """A partition of the states table.
+
+    A sealed partition holds the states with a state_id lower than end_id
+    that were written before it was sealed on day, so all of them were
+    last updated before the end of that day. The current partition has no
+    day and no end_id.
+    """
+
+    name: str
+    day: date | None
+    end_id: int | None
+
+    @property
+    def end_ts(self) -> float | None:
+        """Return the timestamp all states in the partition were updated before."""
+        if self.day is None:
+            return None
+        return dt_util.utc_to_timestamp(
+            datetime.combine(self.day + timedelta(days=1), time.min, dt_util.UTC)
+        )
+
+
+class StatesPartitions:
+    """The partitions of the states table ordered by state_id."""
+
+    def __init__(self, partitions: Sequence[StatesPartition]) -> None:
+        """Initialize the partitions."""
+        self.partitions = partitions
+        self._sealed = [
+            partition for partition in partitions if partition.end_id is not None
+        ]
+        self._end_ts = [cast(float, partition.end_ts) for partition in self._sealed]
+
+    @property
+    def last_sealed(self) -> StatesPartition | None:
+        """Return the most recently sealed partition."""
+        return self._sealed[-1] if self._sealed else None
+
+    def min_state_id(self, start_ts: float) -> int | None:
+        """Return the lowest state_id of a state last updated after start_ts.
+
+        Adding this bound to a query on the state_id allows the database
+        to skip the partitions that cannot have matching states. Returns
+        None if no partition can be skipped.
+        """
+        if not (idx := bisect_right(self._end_ts, start_ts)):
+            return None
+        return self._sealed[idx - 1].end_id
+
+    def expired(self, purge_before_ts: float) -> list[StatesPartition]:
+        """Return the sealed partitions that only have states before purge_before_ts."""
+        return self._sealed[: bisect_right(self._end_ts, purge_before_ts)]
+
+
+def sealed_partition_name(day: date) -> str:
+    """Return the name of the partition sealed on day."""
+    return day.strftime(_SEALED_PARTITION_FORMAT)
+
+
+def _physical_name(dialect: SupportedDialect, name: str) -> str:
+    """Return the name of a partition in the database.
+
+    PostgreSQL partitions are tables of their own.
+    """
+    if dialect == SupportedDialect.POSTGRESQL:
+        return f"{TABLE_STATES}_{name}"
+    return name
+
+
+def parse_partitions(
+    dialect: SupportedDialect, rows: Iterable[tuple[str | None, str | None]]
+) -> StatesPartitions | None:
+    """Parse the partitions of the states table from the database catalog.
+
+    MySQL rows hold the name and the VALUES LESS THAN bound of each
+    partition, PostgreSQL rows the name of each partition table and its
+    partition bound expression. Returns None if the table is not
+    partitioned.
+    """
+    partitions: list[StatesPartition] = []
+    for physical_name, bound in rows:
+        if physical_name is None:
+            # MySQL reports a single unnamed partition for regular tables
+            return None
+        name = physical_name
+        if dialect == SupportedDialect.POSTGRESQL:
+            name = physical_name.removeprefix(f"{TABLE_STATES}_")
+            bound = (
+                match.group(1)
+                if bound and (match := _POSTGRESQL_BOUND_RE.search(bound))
+                else None
+            )
+        if bound is None or bound.upper() == "MAXVALUE":
+            partitions.append(StatesPartition(name, None, None))
+            continue
+        day = (
+            datetime.strptime(match.group(1), "%Y%m%d").date()
+            if (match := _SEALED_PARTITION_RE.match(name))
+            else None
+        )
+        partitions.append(StatesPartition(name, day, int(bound)))
+    if not partitions:
+        return None
+    partitions.sort(key=lambda partition: partition.end_id or float("inf"))
+    return StatesPartitions(partitions)
+
+
+def select_partitions_sql(dialect: SupportedDialect) -> str:
+    """Return the query for the partitions of the states table."""
+    if dialect == SupportedDialect.MYSQL:
+        return (
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION"
+            " FROM information_schema.PARTITIONS"
+            " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'states'"
+            " ORDER BY PARTITION_ORDINAL_POSITION"
+        )
+    return (
+        "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)"
+        " FROM pg_inherits"
+        " JOIN pg_class parent ON pg_inherits.inhparent = parent.oid"
+        " JOIN pg_class child ON pg_inherits.inhrelid = child.oid"
+        " WHERE parent.relname = 'states'"
+    )
+
+
+def partition_table_sql(dialect: SupportedDialect, next_id: int) -> list[str]:
+    """Return the statements to partition the states table.
+
+    The existing states become the current partition. With PostgreSQL the
+    table cannot be altered to become partitioned so it is attached to a
+    new partitioned states table instead. Its indexes are renamed so the
+    ones of the new table keep the names used by the schema migrations.
+    """
+    if dialect == SupportedDialect.MYSQL:
+        return [
+            f"ALTER TABLE {TABLE_STATES} PARTITION BY RANGE (state_id)"
+            f" (PARTITION {CURRENT_PARTITION} VALUES LESS THAN MAXVALUE)"
+        ]
+    current = _physical_name(dialect, CURRENT_PARTITION)
+    sequence = f"{TABLE_STATES}_partitioned_state_id_seq"
+    indexes = sorted(
+        cast(Table, States.__table__).indexes, key=lambda index: str(index.name)
+    )
+    pg_dialect = postgresql.dialect()  # type: ignore[no-untyped-call]
+    create_indexes = [
+        str(CreateIndex(index).compile(dialect=pg_dialect))  # type: ignore[no-untyped-call]
+        for index in indexes
+    ]
+    return [
+        f"ALTER TABLE {TABLE_STATES} RENAME TO {current}",
+        f"ALTER TABLE {current} RENAME CONSTRAINT {TABLE_STATES}_pkey"
+        f" TO {current}_pkey",
+        *(
+            f"ALTER INDEX IF EXISTS {index.name} RENAME TO {current}_{index.name}"
+            for index in indexes
+        ),
+        f"ALTER TABLE {current} ALTER COLUMN state_id DROP IDENTITY IF EXISTS",
+        f"CREATE TABLE {TABLE_STATES} (LIKE {current})"
+        " PARTITION BY RANGE (state_id)",
+        f"CREATE SEQUENCE {sequence} START WITH {next_id}"
+        f" OWNED BY {TABLE_STATES}.state_id",
+        f"ALTER TABLE {TABLE_STATES} ALTER COLUMN state_id"
+        f" SET DEFAULT nextval('{sequence}')",
+        f"ALTER TABLE {TABLE_STATES} ADD PRIMARY KEY (state_id)",
+        *create_indexes,
+        f"ALTER TABLE {TABLE_STATES} ATTACH PARTITION {current}"
+        " FOR VALUES FROM (MINVALUE) TO (MAXVALUE)",
+    ]
+
+
+def seal_partition_sql(
+    dialect: SupportedDialect, day: date, start_id: int | None, end_id: int
+) -> list[str]:
+    """Return the statements to seal the states before end_id in a partition.
+
+    MySQL copies the states of the current partition into the sealed
+    partition. PostgreSQL renames the current partition instead and
+    attaches a new one for the next states.
+    """
+    name = sealed_partition_name(day)
+    if dialect == SupportedDialect.MYSQL:
+        return [
+            f"ALTER TABLE {TABLE_STATES} REORGANIZE PARTITION {CURRENT_PARTITION}"
+            f" INTO (PARTITION {name} VALUES LESS THAN ({end_id}),"
+            f" PARTITION {CURRENT_PARTITION} VALUES LESS THAN MAXVALUE)"
+        ]
+    current = _physical_name(dialect, CURRENT_PARTITION)
+    sealed = _physical_name(dialect, name)
+    start = "MINVALUE" if start_id is None else start_id
+    return [
+        f"ALTER TABLE {TABLE_STATES} DETACH PARTITION {current}",
+        f"ALTER TABLE {current} RENAME TO {sealed}",
+        f"ALTER TABLE {TABLE_STATES} ATTACH PARTITION {sealed}"
+        f" FOR VALUES FROM ({start}) TO ({end_id})",
+        f"CREATE TABLE {current} PARTITION OF {TABLE_STATES}"
+        f" FOR VALUES FROM ({end_id}) TO (MAXVALUE)",
+    ]
+
+
+def drop_partition_sql(dialect: SupportedDialect, partition: StatesPartition) -> str:
+    """Return the statement to drop a sealed partition."""
+    if dialect == SupportedDialect.MYSQL:
+        return f"ALTER TABLE {TABLE_STATES} DROP PARTITION {partition.name}"
+    return f"DROP TABLE {_physical_name(dialect, partition.name)}"
+
+
+def _execute(instance: Recorder, statements: Iterable[str]) -> None:
+    """Execute partition statements in a single transaction."""
+    with session_scope(session=instance.get_session()) as session:
+        for statement in statements:
+            _LOGGER.debug("Partitioning states: %s", statement)
+            session.execute(text(statement))
+
+
+def _load_partitions(
+    session: Session, dialect: SupportedDialect
+) -> StatesPartitions | None:
+    """Load the partitions of the states table."""
+    return parse_partitions(
+        dialect,
+        cast(
+            Iterable[tuple[str | None, str | None]],
+            session.execute(text(select_partitions_sql(dialect))).all(),
+        ),
+    )
+
+
+def _next_state_id(session: Session) -> int:
+    """Return the state_id after the highest one."""
+    return (session.execute(select(func.max(States.state_id))).scalar() or 0) + 1
+
+
+def setup_partitions(instance: Recorder) -> StatesPartitions | None:
+    """Partition the states table if needed and load the partitions.
+
+    This call is not thread-safe and must be called from the
+    recorder thread.
+    """
+    dialect = instance.dialect_name
+    if dialect not in SUPPORTED_DIALECTS:
+        _LOGGER.warning(
+            "Partitioning the states table is only supported with MySQL, MariaDB"
+            " and PostgreSQL, the states table will not be partitioned"
+        )
+        return None
+    assert dialect is not None
+    with session_scope(session=instance.get_session(), read_only=True) as session:
+        if partitions := _load_partitions(session, dialect):
+            return partitions
+        next_id = _next_state_id(session)
+
+    from .migration import (  # pylint: disable=import-outside-toplevel
+        _drop_foreign_key_constraints,
+    )
+
+    _LOGGER.warning(
+        "Partitioning the states table, this may take a while for large databases"
+    )
+    assert instance.engine is not None
+    for column in _STATES_FOREIGN_KEY_COLUMNS:
+        _drop_foreign_key_constraints(
+            instance.get_session, instance.engine, TABLE_STATES, [column]
+        )
+    _execute(instance, partition_table_sql(dialect, next_id))
+    with session_scope(session=instance.get_session(), read_only=True) as session:
+        return _load_partitions(session, dialect)
+
+
+def seal_partition(
+    instance: Recorder, partitions: StatesPartitions
+) -> StatesPartitions:
+    """Seal the states written up to now in a partition for today.
+
+    Nothing is sealed if a partition was already sealed today or if
+    there are no new states.
+
+    This call is not thread-safe and must be called from the
+    recorder thread.
+    """
+    dialect = instance.dialect_name
+    assert dialect is not None
+    today = dt_util.utcnow().date()
+    last_sealed = partitions.last_sealed
+    if last_sealed and last_sealed.day and last_sealed.day >= today:
+        return partitions
+    with session_scope(session=instance.get_session(), read_only=True) as session:
+        end_id = _next_state_id(session)
+    start_id = last_sealed.end_id if last_sealed else None
+    if end_id <= (start_id or 1):
+        return partitions
+    _execute(instance, seal_partition_sql(dialect, today, start_id, end_id))
+    with session_scope(session=instance.get_session(), read_only=True) as session:
+        return _load_partitions(session, dialect) or partitions
+
+
+def drop_partition(
+    instance: Recorder, partitions: StatesPartitions, partition: StatesPartition
+) -> StatesPartitions:
+    """Drop a sealed partition and return the remaining partitions.
+
+    This call is not thread-safe and must be called from the
+    recorder thread.
+    """
+    dialect = instance.dialect_name
+    assert dialect is not None
+    _execute(instance, (drop_partition_sql(dialect, partition),))
+    return StatesPartitions(
+        [remaining for remaining in partitions.partitions if remaining != partition]
+    )
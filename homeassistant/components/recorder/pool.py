@@ -15,7 +15,7 @@ from sqlalchemy.pool import (
 from homeassistant.helpers.frame import report
 from homeassistant.util.async_ import check_loop
 
-from .const import DB_WORKER_PREFIX
+from .const import DB_READER_PREFIX, DB_WORKER_PREFIX
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +25,10 @@ DEBUG_MUTEX_POOL_TRACE = False
 
 POOL_SIZE = 5
 
+# The number of connections used by the db readers that run history,
+# logbook and statistics queries
+READ_POOL_SIZE = 2
+
 ADVISE_MSG = (
     "Use homeassistant.components.recorder.get_instance(hass).async_add_executor_job()"
 )
@@ -33,7 +37,8 @@ ADVISE_MSG = (
 class RecorderPool(SingletonThreadPool, NullPool):  # type: ignore[misc]
     """A hybrid of NullPool and SingletonThreadPool.
 
-    When called from the creating thread or db executor acts like SingletonThreadPool
+    When called from the creating thread, db executor or db reader acts like
+    SingletonThreadPool
     When called from any other thread, acts like NullPool
     """
 
@@ -41,15 +46,16 @@ class RecorderPool(SingletonThreadPool, NullPool):  # type: ignore[misc]
         self, *args: Any, **kw: Any
     ) -> None:
         """Create the pool."""
-        kw["pool_size"] = POOL_SIZE
+        kw["pool_size"] = POOL_SIZE + READ_POOL_SIZE
         SingletonThreadPool.__init__(self, *args, **kw)
 
     @property
     def recorder_or_dbworker(self) -> bool:
-        """Check if the thread is a recorder or dbworker thread."""
+        """Check if the thread is a recorder, dbworker or dbreader thread."""
         thread_name = threading.current_thread().name
         return bool(
-            thread_name == "Recorder" or thread_name.startswith(DB_WORKER_PREFIX)
+            thread_name == "Recorder"
+            or thread_name.startswith((DB_WORKER_PREFIX, DB_READER_PREFIX))
         )
 
     def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
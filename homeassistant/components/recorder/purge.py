@@ -1,7 +1,9 @@
 """Purge old data helper."""
 from __future__ import annotations
 
+from collections import Counter
 from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime
 from itertools import zip_longest
 import logging
@@ -10,35 +12,47 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy.orm.session import Session
 
-from .db_schema import Events, States, StatesMeta
+from . import partitions
+from .db_schema import Events, States, StatesMeta, StatisticsShortTerm
 from .models import DatabaseEngine
 from .queries import (
     attributes_ids_exist_in_states,
     attributes_ids_exist_in_states_with_fast_in_distinct,
+    count_states_attributes_ids_before,
     data_ids_exist_in_events,
     data_ids_exist_in_events_with_fast_in_distinct,
     delete_event_data_rows,
     delete_event_rows,
     delete_event_types_rows,
+    delete_logbook_index_rows,
     delete_recorder_runs_rows,
     delete_states_attributes_rows,
+    delete_states_checkpoints_rows,
     delete_states_meta_rows,
     delete_states_rows,
     delete_statistics_runs_rows,
     delete_statistics_short_term_rows,
     disconnect_states_rows,
+    disconnect_states_rows_before,
     find_entity_ids_to_purge,
+    find_event_data_ref_counts,
     find_event_types_to_purge,
     find_events_to_purge,
     find_latest_statistics_runs_run_id,
     find_legacy_detached_states_and_attributes_to_purge,
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
+    find_logbook_index_to_purge,
     find_short_term_statistics_to_purge,
+    find_states_attributes_ref_counts,
+    find_states_checkpoints_to_purge,
     find_states_to_purge,
     find_statistics_runs_to_purge,
+    update_event_data_ref_counts,
+    update_states_attributes_ref_counts,
 )
 from .repack import repack_database
+from .statistics import get_statistics_during_period_cache
 from .util import chunked_or_all, retryable_database_job, session_scope
 
 if TYPE_CHECKING:
@@ -50,6 +64,22 @@ _LOGGER = logging.getLogger(__name__)
 DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
 
+# The time in seconds a purge may keep the recorder thread busy before it
+# commits and yields to the queued states and events. The purge continues
+# where it left off the next time it runs.
+DEFAULT_PURGE_TIME_BUDGET = 1.0
+
+
+@dataclass(slots=True)
+class PurgeCursor:
+    """The progress of a purge that runs in multiple slices."""
+
+    states_done: bool = False
+    events_done: bool = False
+    states_purged: int = 0
+    events_purged: int = 0
+    slices: int = 0
+
 
 @retryable_database_job("purge")
 def purge_old_data(
@@ -59,15 +89,28 @@ def purge_old_data(
     apply_filter: bool = False,
     events_batch_size: int = DEFAULT_EVENTS_BATCHES_PER_PURGE,
     states_batch_size: int = DEFAULT_STATES_BATCHES_PER_PURGE,
+    time_budget: float = DEFAULT_PURGE_TIME_BUDGET,
+    cursor: PurgeCursor | None = None,
 ) -> bool:
     """Purge events and states older than purge_before.
 
     Cleans up an timeframe of an hour, based on the oldest record.
+
+    Stops purging states and events once time_budget has passed and returns
+    False so the purge can be continued. The cursor keeps the progress between
+    calls so the states or events that were already purged are not checked
+    again.
     """
     _LOGGER.debug(
         "Purging states and events before target %s",
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
+    deadline = time.monotonic() + time_budget
+    if cursor is None:
+        cursor = PurgeCursor()
+    cursor.slices += 1
+    if cursor.slices == 1 and instance.states_partitions is not None:
+        _drop_expired_states_partitions(instance, purge_before)
     with session_scope(session=instance.get_session()) as session:
         # Purge a max of max_bind_vars, based on the oldest states or events record
         has_more_to_purge = False
@@ -83,12 +126,24 @@ def purge_old_data(
                 " remaining"
             )
             # Once we are done purging legacy rows, we use the new method
-            has_more_to_purge |= _purge_states_and_attributes_ids(
-                instance, session, states_batch_size, purge_before
-            )
-            has_more_to_purge |= _purge_events_and_data_ids(
-                instance, session, events_batch_size, purge_before
-            )
+            if not cursor.states_done:
+                if _purge_states_and_attributes_ids(
+                    instance, session, states_batch_size, purge_before, deadline, cursor
+                ):
+                    has_more_to_purge = True
+                else:
+                    cursor.states_done = True
+            # The events are purged in the next slice if
+            # we ran out of time while purging states
+            if not cursor.events_done and not (
+                has_more_to_purge and time.monotonic() >= deadline
+            ):
+                if _purge_events_and_data_ids(
+                    instance, session, events_batch_size, purge_before, deadline, cursor
+                ):
+                    has_more_to_purge = True
+                else:
+                    cursor.events_done = True
 
         statistics_runs = _select_statistics_runs_to_purge(
             session, purge_before, instance.max_bind_vars
@@ -101,10 +156,39 @@ def purge_old_data(
 
         if short_term_statistics:
             _purge_short_term_statistics(session, short_term_statistics)
+            get_statistics_during_period_cache(instance.hass).invalidate(
+                None, 0, StatisticsShortTerm
+            )
+
+        if instance.logbook_index_manager.active and (
+            logbook_index := _select_logbook_index_to_purge(
+                session, purge_before, instance.max_bind_vars
+            )
+        ):
+            _purge_logbook_index(session, logbook_index)
+            # Only a full batch can leave index rows behind
+            has_more_to_purge |= len(logbook_index) == instance.max_bind_vars
+
+        if instance.states_checkpoints_manager.active and (
+            states_checkpoints := _select_states_checkpoints_to_purge(
+                session, purge_before, instance.max_bind_vars
+            )
+        ):
+            # The history queries must stop using the checkpoints
+            # before their rows are deleted
+            instance.states_checkpoints_manager.evict_purged(purge_before.timestamp())
+            _purge_states_checkpoints(session, states_checkpoints)
+            has_more_to_purge |= len(states_checkpoints) == instance.max_bind_vars
 
         if has_more_to_purge or statistics_runs or short_term_statistics:
             # Return false, as we might not be done yet.
-            _LOGGER.debug("Purging hasn't fully completed yet")
+            _LOGGER.debug(
+                "Purging hasn't fully completed yet, purged %s states and %s events"
+                " in %s slices",
+                cursor.states_purged,
+                cursor.events_purged,
+                cursor.slices,
+            )
             return False
 
         if apply_filter and _purge_filtered_data(instance, session) is False:
@@ -143,9 +227,11 @@ def _purge_legacy_format(
         session, purge_before, instance.max_bind_vars
     )
     _purge_state_ids(instance, session, state_ids)
-    _purge_unused_attributes_ids(instance, session, attributes_ids)
+    _release_attributes_ids(instance, session, attributes_ids)
+    _purge_unused_attributes_ids(instance, session, set(attributes_ids))
     _purge_event_ids(session, event_ids)
-    _purge_unused_data_ids(instance, session, data_ids)
+    _release_data_ids(instance, session, data_ids)
+    _purge_unused_data_ids(instance, session, set(data_ids))
 
     # The database may still have some rows that have an event_id but are not
     # linked to any event. These rows are not linked to any event because the
@@ -159,7 +245,8 @@ def _purge_legacy_format(
         session, purge_before, instance.max_bind_vars
     )
     _purge_state_ids(instance, session, detached_state_ids)
-    _purge_unused_attributes_ids(instance, session, detached_attributes_ids)
+    _release_attributes_ids(instance, session, detached_attributes_ids)
+    _purge_unused_attributes_ids(instance, session, set(detached_attributes_ids))
     return bool(
         event_ids
         or state_ids
@@ -175,6 +262,8 @@ def _purge_states_and_attributes_ids(
     session: Session,
     states_batch_size: int,
     purge_before: datetime,
+    deadline: float,
+    cursor: PurgeCursor,
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
@@ -189,7 +278,9 @@ def _purge_states_and_attributes_ids(
     # max_bind_vars
     attributes_ids_batch: set[int] = set()
     max_bind_vars = instance.max_bind_vars
-    for _ in range(states_batch_size):
+    for batch in range(states_batch_size):
+        if batch and time.monotonic() >= deadline:
+            break
         state_ids, attributes_ids = _select_state_attributes_ids_to_purge(
             session, purge_before, max_bind_vars
         )
@@ -197,7 +288,9 @@ def _purge_states_and_attributes_ids(
             has_remaining_state_ids_to_purge = False
             break
         _purge_state_ids(instance, session, state_ids)
-        attributes_ids_batch = attributes_ids_batch | attributes_ids
+        _release_attributes_ids(instance, session, attributes_ids)
+        cursor.states_purged += len(state_ids)
+        attributes_ids_batch.update(attributes_ids)
 
     _purge_unused_attributes_ids(instance, session, attributes_ids_batch)
     _LOGGER.debug(
@@ -212,6 +305,8 @@ def _purge_events_and_data_ids(
     session: Session,
     events_batch_size: int,
     purge_before: datetime,
+    deadline: float,
+    cursor: PurgeCursor,
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
@@ -224,7 +319,9 @@ def _purge_events_and_data_ids(
     # max_bind_vars
     data_ids_batch: set[int] = set()
     max_bind_vars = instance.max_bind_vars
-    for _ in range(events_batch_size):
+    for batch in range(events_batch_size):
+        if batch and time.monotonic() >= deadline:
+            break
         event_ids, data_ids = _select_event_data_ids_to_purge(
             session, purge_before, max_bind_vars
         )
@@ -232,7 +329,9 @@ def _purge_events_and_data_ids(
             has_remaining_event_ids_to_purge = False
             break
         _purge_event_ids(session, event_ids)
-        data_ids_batch = data_ids_batch | data_ids
+        _release_data_ids(instance, session, data_ids)
+        cursor.events_purged += len(event_ids)
+        data_ids_batch.update(data_ids)
 
     _purge_unused_data_ids(instance, session, data_ids_batch)
     _LOGGER.debug(
@@ -244,16 +343,16 @@ def _purge_events_and_data_ids(
 
 def _select_state_attributes_ids_to_purge(
     session: Session, purge_before: datetime, max_bind_vars: int
-) -> tuple[set[int], set[int]]:
-    """Return sets of state and attribute ids to purge."""
+) -> tuple[set[int], Counter[int]]:
+    """Return the set of state ids and the attribute ids of the states to purge."""
     state_ids = set()
-    attributes_ids = set()
+    attributes_ids: Counter[int] = Counter()
     for state_id, attributes_id in session.execute(
         find_states_to_purge(purge_before.timestamp(), max_bind_vars)
     ).all():
         state_ids.add(state_id)
         if attributes_id:
-            attributes_ids.add(attributes_id)
+            attributes_ids[attributes_id] += 1
     _LOGGER.debug(
         "Selected %s state ids and %s attributes_ids to remove",
         len(state_ids),
@@ -264,16 +363,16 @@ def _select_state_attributes_ids_to_purge(
 
 def _select_event_data_ids_to_purge(
     session: Session, purge_before: datetime, max_bind_vars: int
-) -> tuple[set[int], set[int]]:
-    """Return sets of event and data ids to purge."""
+) -> tuple[set[int], Counter[int]]:
+    """Return the set of event ids and the data ids of the events to purge."""
     event_ids = set()
-    data_ids = set()
+    data_ids: Counter[int] = Counter()
     for event_id, data_id in session.execute(
         find_events_to_purge(purge_before.timestamp(), max_bind_vars)
     ).all():
         event_ids.add(event_id)
         if data_id:
-            data_ids.add(data_id)
+            data_ids[data_id] += 1
     _LOGGER.debug(
         "Selected %s event ids and %s data_ids to remove", len(event_ids), len(data_ids)
     )
@@ -290,6 +389,26 @@ def _select_unused_attributes_ids(
     if not attributes_ids:
         return set()
 
+    # Attributes ids with a reference count only need a lookup by
+    # primary key. The ones that have not been backfilled yet fall
+    # back to looking for states that still use them.
+    to_remove: set[int] = set()
+    if instance.state_attributes_manager.ref_counts_active:
+        unknown_ids: set[int] = set()
+        for attributes_ids_chunk in chunked_or_all(
+            attributes_ids, instance.max_bind_vars
+        ):
+            for attributes_id, ref_count in session.execute(
+                find_states_attributes_ref_counts(attributes_ids_chunk)
+            ).all():
+                if ref_count is None:
+                    unknown_ids.add(attributes_id)
+                elif ref_count <= 0:
+                    to_remove.add(attributes_id)
+        if not (attributes_ids := unknown_ids):
+            _LOGGER.debug("Selected %s shared attributes to remove", len(to_remove))
+            return to_remove
+
     seen_ids: set[int] = set()
     if not database_engine.optimizer.slow_range_in_select:
         #
@@ -350,7 +469,7 @@ def _select_unused_attributes_ids(
                 ).all()
                 if attrs_id[0] is not None
             }
-    to_remove = attributes_ids - seen_ids
+    to_remove |= attributes_ids - seen_ids
     _LOGGER.debug(
         "Selected %s shared attributes to remove",
         len(to_remove),
@@ -358,6 +477,20 @@ def _select_unused_attributes_ids(
     return to_remove
 
 
+def _release_attributes_ids(
+    instance: Recorder, session: Session, attributes_ids: Counter[int]
+) -> None:
+    """Remove the references of purged states from the attributes reference counts."""
+    if attributes_ids and instance.state_attributes_manager.ref_counts_active:
+        session.execute(
+            update_states_attributes_ref_counts(),
+            [
+                {"b_attributes_id": attributes_id, "b_delta": -count}
+                for attributes_id, count in attributes_ids.items()
+            ],
+        )
+
+
 def _purge_unused_attributes_ids(
     instance: Recorder,
     session: Session,
@@ -382,6 +515,23 @@ def _select_unused_event_data_ids(
     if not data_ids:
         return set()
 
+    # See _select_unused_attributes_ids for how the reference
+    # counts are used.
+    to_remove: set[int] = set()
+    if instance.event_data_manager.ref_counts_active:
+        unknown_ids: set[int] = set()
+        for data_ids_chunk in chunked_or_all(data_ids, instance.max_bind_vars):
+            for data_id, ref_count in session.execute(
+                find_event_data_ref_counts(data_ids_chunk)
+            ).all():
+                if ref_count is None:
+                    unknown_ids.add(data_id)
+                elif ref_count <= 0:
+                    to_remove.add(data_id)
+        if not (data_ids := unknown_ids):
+            _LOGGER.debug("Selected %s shared event data to remove", len(to_remove))
+            return to_remove
+
     seen_ids: set[int] = set()
     # See _select_unused_attributes_ids for why this function
     # branches for non-sqlite databases.
@@ -403,11 +553,25 @@ def _select_unused_event_data_ids(
                 ).all()
                 if data_id[0] is not None
             }
-    to_remove = data_ids - seen_ids
+    to_remove |= data_ids - seen_ids
     _LOGGER.debug("Selected %s shared event data to remove", len(to_remove))
     return to_remove
 
 
+def _release_data_ids(
+    instance: Recorder, session: Session, data_ids: Counter[int]
+) -> None:
+    """Remove the references of purged events from the event data reference counts."""
+    if data_ids and instance.event_data_manager.ref_counts_active:
+        session.execute(
+            update_event_data_ref_counts(),
+            [
+                {"b_data_id": data_id, "b_delta": -count}
+                for data_id, count in data_ids.items()
+            ],
+        )
+
+
 def _purge_unused_data_ids(
     instance: Recorder, session: Session, data_ids_batch: set[int]
 ) -> None:
@@ -451,9 +615,33 @@ def _select_short_term_statistics_to_purge(
     return [statistic_id for (statistic_id,) in statistics]
 
 
+def _select_states_checkpoints_to_purge(
+    session: Session, purge_before: datetime, max_bind_vars: int
+) -> list[int]:
+    """Return a list of states checkpoints rows to purge."""
+    states_checkpoints = session.execute(
+        find_states_checkpoints_to_purge(purge_before, max_bind_vars)
+    ).all()
+    _LOGGER.debug(
+        "Selected %s states checkpoints rows to remove", len(states_checkpoints)
+    )
+    return [states_checkpoint_id for (states_checkpoint_id,) in states_checkpoints]
+
+
+def _select_logbook_index_to_purge(
+    session: Session, purge_before: datetime, max_bind_vars: int
+) -> list[int]:
+    """Return a list of logbook index rows to purge."""
+    logbook_index = session.execute(
+        find_logbook_index_to_purge(purge_before, max_bind_vars)
+    ).all()
+    _LOGGER.debug("Selected %s logbook index rows to remove", len(logbook_index))
+    return [logbook_index_id for (logbook_index_id,) in logbook_index]
+
+
 def _select_legacy_detached_state_and_attributes_and_data_ids_to_purge(
     session: Session, purge_before: datetime, max_bind_vars: int
-) -> tuple[set[int], set[int]]:
+) -> tuple[set[int], Counter[int]]:
     """Return a list of state, and attribute ids to purge.
 
     We do not link these anymore since state_change events
@@ -467,18 +655,18 @@ def _select_legacy_detached_state_and_attributes_and_data_ids_to_purge(
     ).all()
     _LOGGER.debug("Selected %s state ids to remove", len(states))
     state_ids = set()
-    attributes_ids = set()
+    attributes_ids: Counter[int] = Counter()
     for state_id, attributes_id in states:
         if state_id:
             state_ids.add(state_id)
-        if attributes_id:
-            attributes_ids.add(attributes_id)
+            if attributes_id:
+                attributes_ids[attributes_id] += 1
     return state_ids, attributes_ids
 
 
 def _select_legacy_event_state_and_attributes_and_data_ids_to_purge(
     session: Session, purge_before: datetime, max_bind_vars: int
-) -> tuple[set[int], set[int], set[int], set[int]]:
+) -> tuple[set[int], set[int], Counter[int], Counter[int]]:
     """Return a list of event, state, and attribute ids to purge linked by the event_id.
 
     We do not link these anymore since state_change events
@@ -493,16 +681,18 @@ def _select_legacy_event_state_and_attributes_and_data_ids_to_purge(
     _LOGGER.debug("Selected %s event ids to remove", len(events))
     event_ids = set()
     state_ids = set()
-    attributes_ids = set()
-    data_ids = set()
+    attributes_ids: Counter[int] = Counter()
+    data_ids: Counter[int] = Counter()
     for event_id, data_id, state_id, attributes_id in events:
-        event_ids.add(event_id)
+        # An event is repeated for each state linked to it
+        if event_id not in event_ids:
+            event_ids.add(event_id)
+            if data_id:
+                data_ids[data_id] += 1
         if state_id:
             state_ids.add(state_id)
-        if attributes_id:
-            attributes_ids.add(attributes_id)
-        if data_id:
-            data_ids.add(data_id)
+            if attributes_id:
+                attributes_ids[attributes_id] += 1
     return event_ids, state_ids, attributes_ids, data_ids
 
 
@@ -525,6 +715,35 @@ def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int])
     instance.states_manager.evict_purged_state_ids(state_ids)
 
 
+def _drop_expired_states_partitions(instance: Recorder, purge_before: datetime) -> None:
+    """Drop the partitions of the states table that only have states to purge.
+
+    The remaining states before purge_before are purged one by one.
+    """
+    assert instance.states_partitions is not None
+    for partition in instance.states_partitions.expired(purge_before.timestamp()):
+        assert partition.end_id is not None
+        end_id = partition.end_id
+        with session_scope(session=instance.get_session()) as session:
+            attributes_ids: Counter[int] = Counter(
+                dict(
+                    session.execute(count_states_attributes_ids_before(end_id))
+                    .tuples()
+                    .all()
+                )
+            )
+            _release_attributes_ids(instance, session, attributes_ids)
+            session.execute(disconnect_states_rows_before(end_id))
+        instance.states_partitions = partitions.drop_partition(
+            instance, instance.states_partitions, partition
+        )
+        _LOGGER.debug("Dropped states partition %s", partition.name)
+        # Evict any entries in the old_states cache referring to a dropped state
+        instance.states_manager.evict_purged_state_ids_before(end_id)
+        with session_scope(session=instance.get_session()) as session:
+            _purge_unused_attributes_ids(instance, session, set(attributes_ids))
+
+
 def _purge_batch_attributes_ids(
     instance: Recorder, session: Session, attributes_ids: set[int]
 ) -> None:
@@ -567,6 +786,18 @@ def _purge_short_term_statistics(
     _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
 
 
+def _purge_states_checkpoints(session: Session, states_checkpoints: list[int]) -> None:
+    """Delete by id."""
+    deleted_rows = session.execute(delete_states_checkpoints_rows(states_checkpoints))
+    _LOGGER.debug("Deleted %s states checkpoints rows", deleted_rows)
+
+
+def _purge_logbook_index(session: Session, logbook_index: list[int]) -> None:
+    """Delete by id."""
+    deleted_rows = session.execute(delete_logbook_index_rows(logbook_index))
+    _LOGGER.debug("Deleted %s logbook index rows", deleted_rows)
+
+
 def _purge_event_ids(session: Session, event_ids: set[int]) -> None:
     """Delete by event id."""
     if not event_ids:
@@ -703,11 +934,10 @@ def _purge_filtered_states(
     # created but since we did not remove them when we stopped adding new ones
     # we will need to purge them here.
     _purge_event_ids(session, filtered_event_ids)
+    purged_attributes_ids = Counter(id_ for id_ in attributes_ids if id_ is not None)
+    _release_attributes_ids(instance, session, purged_attributes_ids)
     unused_attribute_ids_set = _select_unused_attributes_ids(
-        instance,
-        session,
-        {id_ for id_ in attributes_ids if id_ is not None},
-        database_engine,
+        instance, session, set(purged_attributes_ids), database_engine
     )
     _purge_batch_attributes_ids(instance, session, unused_attribute_ids_set)
     return False
@@ -739,22 +969,25 @@ def _purge_filtered_events(
     _LOGGER.debug(
         "Selected %s event_ids to remove that should be filtered", len(event_ids_set)
     )
-    if (
-        instance.use_legacy_events_index
-        and (
-            states := session.query(States.state_id)
-            .filter(States.event_id.in_(event_ids_set))
-            .all()
-        )
-        and (state_ids := {state_id for (state_id,) in states})
+    if instance.use_legacy_events_index and (
+        states := session.query(States.state_id, States.attributes_id)
+        .filter(States.event_id.in_(event_ids_set))
+        .all()
     ):
         # These are legacy states that are linked to an event that are no longer
         # created but since we did not remove them when we stopped adding new ones
         # we will need to purge them here.
-        _purge_state_ids(instance, session, state_ids)
+        _purge_state_ids(instance, session, {state_id for state_id, _ in states})
+        _release_attributes_ids(
+            instance,
+            session,
+            Counter(attributes_id for _, attributes_id in states if attributes_id),
+        )
     _purge_event_ids(session, event_ids_set)
+    purged_data_ids = Counter(id_ for id_ in data_ids if id_ is not None)
+    _release_data_ids(instance, session, purged_data_ids)
     if unused_data_ids_set := _select_unused_event_data_ids(
-        instance, session, set(data_ids), database_engine
+        instance, session, set(purged_data_ids), database_engine
     ):
         _purge_batch_data_ids(instance, session, unused_data_ids_set)
     return False
@@ -3,8 +3,20 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from datetime import datetime
-
-from sqlalchemy import delete, distinct, func, lambda_stmt, select, union_all, update
+from typing import cast
+
+from sqlalchemy import (
+    Table,
+    bindparam,
+    delete,
+    distinct,
+    func,
+    lambda_stmt,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.sql.dml import Update
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Select
 
@@ -12,9 +24,12 @@ from .db_schema import (
     EventData,
     Events,
     EventTypes,
+    LogbookIndex,
     RecorderRuns,
+    SchemaChanges,
     StateAttributes,
     States,
+    StatesCheckpoints,
     StatesMeta,
     Statistics,
     StatisticsRuns,
@@ -538,6 +553,27 @@ def disconnect_states_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
     )
 
 
+def disconnect_states_rows_before(state_id: int) -> StatementLambdaElement:
+    """Disconnect the states rows linked to a state before state_id."""
+    return lambda_stmt(
+        lambda: update(States)
+        .where(States.state_id >= state_id)
+        .where(States.old_state_id < state_id)
+        .values(old_state_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def count_states_attributes_ids_before(state_id: int) -> StatementLambdaElement:
+    """Count the states before state_id using each of the attributes ids."""
+    return lambda_stmt(
+        lambda: select(States.attributes_id, func.count(States.state_id))
+        .filter(States.state_id < state_id)
+        .filter(States.attributes_id.is_not(None))
+        .group_by(States.attributes_id)
+    )
+
+
 def delete_states_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
     """Delete states rows."""
     return lambda_stmt(
@@ -567,6 +603,54 @@ def delete_states_attributes_rows(
     )
 
 
+def find_states_attributes_ref_counts(
+    attributes_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Find the reference counts of states_attributes rows."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id, StateAttributes.ref_count).where(
+            StateAttributes.attributes_id.in_(attributes_ids)
+        )
+    )
+
+
+def find_event_data_ref_counts(data_ids: Iterable[int]) -> StatementLambdaElement:
+    """Find the reference counts of event_data rows."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id, EventData.ref_count).where(
+            EventData.data_id.in_(data_ids)
+        )
+    )
+
+
+def update_states_attributes_ref_counts() -> Update:
+    """Generate an update to add to the reference counts of states_attributes rows.
+
+    The update is executed with a list of parameters holding the
+    b_attributes_id and the b_delta to add for each row.
+    """
+    table = cast(Table, StateAttributes.__table__)
+    return (
+        update(table)
+        .where(table.c.attributes_id == bindparam("b_attributes_id"))
+        .values(ref_count=table.c.ref_count + bindparam("b_delta"))
+    )
+
+
+def update_event_data_ref_counts() -> Update:
+    """Generate an update to add to the reference counts of event_data rows.
+
+    The update is executed with a list of parameters holding the
+    b_data_id and the b_delta to add for each row.
+    """
+    table = cast(Table, EventData.__table__)
+    return (
+        update(table)
+        .where(table.c.data_id == bindparam("b_data_id"))
+        .values(ref_count=table.c.ref_count + bindparam("b_delta"))
+    )
+
+
 def delete_statistics_runs_rows(
     statistics_runs: Iterable[int],
 ) -> StatementLambdaElement:
@@ -600,6 +684,28 @@ def delete_event_rows(
     )
 
 
+def delete_logbook_index_rows(
+    logbook_index_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Delete logbook_index rows."""
+    return lambda_stmt(
+        lambda: delete(LogbookIndex)
+        .where(LogbookIndex.id.in_(logbook_index_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_states_checkpoints_rows(
+    states_checkpoints_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Delete states_checkpoints rows."""
+    return lambda_stmt(
+        lambda: delete(StatesCheckpoints)
+        .where(StatesCheckpoints.id.in_(states_checkpoints_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
 def delete_recorder_runs_rows(
     purge_before: datetime, current_run_id: int
 ) -> StatementLambdaElement:
@@ -646,6 +752,39 @@ def find_short_term_statistics_to_purge(
     )
 
 
+def find_logbook_index_to_purge(
+    purge_before: datetime, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find logbook_index rows to purge."""
+    purge_before_ts = purge_before.timestamp()
+    return lambda_stmt(
+        lambda: select(LogbookIndex.id)
+        .filter(LogbookIndex.time_fired_ts < purge_before_ts)
+        .limit(max_bind_vars)
+    )
+
+
+def find_states_checkpoints_to_purge(
+    purge_before: datetime, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find states_checkpoints rows to purge."""
+    purge_before_ts = purge_before.timestamp()
+    return lambda_stmt(
+        lambda: select(StatesCheckpoints.id)
+        .filter(StatesCheckpoints.checkpoint_ts < purge_before_ts)
+        .limit(max_bind_vars)
+    )
+
+
+def find_logbook_index_schema_change(schema_version: int) -> StatementLambdaElement:
+    """Find when the schema version that added the logbook_index was reached."""
+    return lambda_stmt(
+        lambda: select(func.min(SchemaChanges.changed)).filter(
+            SchemaChanges.schema_version >= schema_version
+        )
+    )
+
+
 def find_statistics_runs_to_purge(
     purge_before: datetime, max_bind_vars: int
 ) -> StatementLambdaElement:
@@ -796,6 +935,64 @@ def has_entity_ids_to_migrate() -> StatementLambdaElement:
     )
 
 
+def has_states_attributes_ref_counts_to_migrate() -> StatementLambdaElement:
+    """Check if there are states_attributes reference counts to migrate."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id)
+        .filter(StateAttributes.ref_count.is_(None))
+        .limit(1)
+    )
+
+
+def has_event_data_ref_counts_to_migrate() -> StatementLambdaElement:
+    """Check if there are event_data reference counts to migrate."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id).filter(EventData.ref_count.is_(None)).limit(1)
+    )
+
+
+def find_states_attributes_ref_counts_to_migrate(
+    max_bind_vars: int,
+) -> StatementLambdaElement:
+    """Find states_attributes rows without a reference count."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id)
+        .filter(StateAttributes.ref_count.is_(None))
+        .limit(max_bind_vars)
+    )
+
+
+def find_event_data_ref_counts_to_migrate(
+    max_bind_vars: int,
+) -> StatementLambdaElement:
+    """Find event_data rows without a reference count."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id)
+        .filter(EventData.ref_count.is_(None))
+        .limit(max_bind_vars)
+    )
+
+
+def count_states_by_attributes_ids(
+    attributes_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Count the states using each of the attributes ids."""
+    return lambda_stmt(
+        lambda: select(States.attributes_id, func.count(States.state_id))
+        .filter(States.attributes_id.in_(attributes_ids))
+        .group_by(States.attributes_id)
+    )
+
+
+def count_events_by_data_ids(data_ids: Iterable[int]) -> StatementLambdaElement:
+    """Count the events using each of the data ids."""
+    return lambda_stmt(
+        lambda: select(Events.data_id, func.count(Events.event_id))
+        .filter(Events.data_id.in_(data_ids))
+        .group_by(Events.data_id)
+    )
+
+
 def find_states_context_ids_to_migrate(max_bind_vars: int) -> StatementLambdaElement:
     """Find events context_ids to migrate."""
     return lambda_stmt(
@@ -1,16 +1,18 @@
 """Statistics helper."""
 from __future__ import annotations
 
-from collections import defaultdict
-from collections.abc import Callable, Iterable, Sequence
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Collection, Hashable, Iterable, Sequence
 import contextlib
 import dataclasses
 from datetime import datetime, timedelta
 from functools import lru_cache, partial
-from itertools import chain, groupby
+from itertools import groupby
 import logging
 from operator import itemgetter
 import re
+import threading
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
 
 from sqlalchemy import Select, and_, bindparam, func, lambda_stmt, select, text
@@ -58,6 +60,8 @@ from .db_schema import (
     STATISTICS_TABLES,
     Statistics,
     StatisticsBase,
+    StatisticsDaily,
+    StatisticsMonthly,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -146,6 +150,11 @@ STATISTIC_UNIT_TO_UNIT_CONVERTER: dict[str | None, type[BaseUnitConverter]] = {
 }
 
 DATA_SHORT_TERM_STATISTICS_RUN_CACHE = "recorder_short_term_statistics_run_cache"
+DATA_STATISTICS_DURING_PERIOD_CACHE = "recorder_statistics_during_period_cache"
+
+# The maximum number of statistics rows the results
+# of statistics_during_period are cached for
+STATISTICS_DURING_PERIOD_CACHE_MAX_ROWS = 50000
 
 
 def mean(values: list[float]) -> float | None:
@@ -189,6 +198,189 @@ class ShortTermStatisticsRunCache:
         self._latest_id_by_metadata_id.update(metadata_id_to_id)
 
 
+@dataclasses.dataclass(slots=True)
+class _StatisticsDuringPeriodCacheEntry:
+    """A cached result of statistics_during_period."""
+
+    metadata_ids: set[int]
+    table: type[StatisticsBase]
+    start_ts: float
+    end_ts: float | None
+    result: dict[str, list[StatisticsRow]]
+    rows: int
+
+
+def _copy_statistics_result(
+    result: dict[str, list[StatisticsRow]],
+) -> dict[str, list[StatisticsRow]]:
+    """Copy a result of statistics_during_period so callers can modify it."""
+    return {
+        statistic_id: [row.copy() for row in rows]
+        for statistic_id, rows in result.items()
+    }
+
+
+class StatisticsDuringPeriodCache:
+    """Cache for the results of statistics_during_period.
+
+    The dashboards repeat the same queries on every refresh. The results
+    are kept until the statistics they were read from are compiled,
+    imported, adjusted or changed.
+
+    The invalidations are queued by the recorder thread while it writes
+    statistics and applied after they are committed, a result read while
+    they are applied is not cached since it may be from before the commit.
+    """
+
+    __slots__ = (
+        "hits",
+        "misses",
+        "_entries",
+        "_generation",
+        "_lock",
+        "_max_rows",
+        "_pending",
+        "_rows",
+    )
+
+    def __init__(self, max_rows: int = STATISTICS_DURING_PERIOD_CACHE_MAX_ROWS) -> None:
+        """Initialize the cache."""
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[
+            Hashable, _StatisticsDuringPeriodCacheEntry
+        ] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._max_rows = max_rows
+        self._pending: list[
+            tuple[set[int] | None, float, type[StatisticsBase] | None]
+        ] = []
+        self._rows = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached results."""
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        """Return the number of times cached results were invalidated."""
+        return self._generation
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Return the fraction of the lookups that were cached."""
+        if not (lookups := self.hits + self.misses):
+            return None
+        return self.hits / lookups
+
+    def get(self, key: Hashable) -> dict[str, list[StatisticsRow]] | None:
+        """Return a copy of a cached result.
+
+        This call is thread-safe.
+        """
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _copy_statistics_result(entry.result)
+
+    def set(
+        self,
+        key: Hashable,
+        generation: int,
+        metadata_ids: set[int],
+        table: type[StatisticsBase],
+        start_ts: float,
+        end_ts: float | None,
+        result: dict[str, list[StatisticsRow]],
+    ) -> None:
+        """Cache a copy of a result read while the cache was at generation.
+
+        This call is thread-safe.
+        """
+        rows = sum(len(statistic_rows) for statistic_rows in result.values())
+        if rows > self._max_rows:
+            return
+        entry = _StatisticsDuringPeriodCacheEntry(
+            metadata_ids,
+            table,
+            start_ts,
+            end_ts,
+            _copy_statistics_result(result),
+            rows,
+        )
+        with self._lock:
+            if generation != self._generation:
+                # The statistics changed while the result was read
+                return
+            if (old_entry := self._entries.pop(key, None)) is not None:
+                self._rows -= old_entry.rows
+            self._entries[key] = entry
+            self._rows += rows
+            while self._rows > self._max_rows:
+                _, old_entry = self._entries.popitem(last=False)
+                self._rows -= old_entry.rows
+
+    def invalidate(
+        self,
+        metadata_ids: Collection[int] | None,
+        start_ts: float,
+        table: type[StatisticsBase] | None = None,
+    ) -> None:
+        """Queue the invalidation of the results with statistics from start_ts.
+
+        metadata_ids None invalidates the results of all statistics and
+        table None invalidates the results of both tables.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.append(
+            (None if metadata_ids is None else set(metadata_ids), start_ts, table)
+        )
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to invalidate the results of the changed statistics.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+        with self._lock:
+            self._generation += 1
+            for key, entry in list(self._entries.items()):
+                for metadata_ids, start_ts, table in pending:
+                    if (
+                        (table is None or table is entry.table)
+                        and (entry.end_ts is None or entry.end_ts > start_ts)
+                        and (
+                            metadata_ids is None
+                            or not metadata_ids.isdisjoint(entry.metadata_ids)
+                        )
+                    ):
+                        del self._entries[key]
+                        self._rows -= entry.rows
+                        break
+
+    def clear(self) -> None:
+        """Clear the cache after the database has been reset.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.clear()
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._rows = 0
+
+
 class BaseStatisticsRow(TypedDict, total=False):
     """A processed row of statistic data."""
 
@@ -383,12 +575,14 @@ def _compile_hourly_statistics_last_sum_stmt(
     )
 
 
-def _compile_hourly_statistics(session: Session, start: datetime) -> None:
+def _compile_hourly_statistics(session: Session, start: datetime) -> list[int]:
     """Compile hourly statistics.
 
     This will summarize 5-minute statistics for one hour:
     - average, min max is computed by a database query
     - sum is taken from the last 5-minute entry during the hour
+
+    Returns the metadata_ids of the compiled statistics.
     """
     start_time = start.replace(minute=0)
     start_time_ts = start_time.timestamp()
@@ -438,6 +632,7 @@ def _compile_hourly_statistics(session: Session, start: datetime) -> None:
         Statistics.from_stats_ts(metadata_id, summary_item)
         for metadata_id, summary_item in summary.items()
     )
+    return list(summary)
 
 
 @retryable_database_job("compile missing statistics")
@@ -552,8 +747,13 @@ def _compile_statistics(
         platform_stats.extend(compiled.platform_stats)
         current_metadata.update(compiled.current_metadata)
 
+    # The accumulated states before the end of the period are
+    # not needed to compile the following periods anymore
+    instance.states_accumulator.prune(end)
+
     new_short_term_stats: list[StatisticsBase] = []
     updated_metadata_ids: set[int] = set()
+    modified_metadata_ids: set[int] = set()
     # Insert collected statistics in the database
     for stats in platform_stats:
         modified_statistic_id, metadata_id = statistics_meta_manager.update_or_add(
@@ -561,6 +761,7 @@ def _compile_statistics(
         )
         if modified_statistic_id is not None:
             modified_statistic_ids.add(modified_statistic_id)
+            modified_metadata_ids.add(metadata_id)
         updated_metadata_ids.add(metadata_id)
         if new_stat := _insert_statistics(
             session,
@@ -570,9 +771,20 @@ def _compile_statistics(
         ):
             new_short_term_stats.append(new_stat)
 
+    cache = get_statistics_during_period_cache(instance.hass)
+    if modified_metadata_ids:
+        # The units of the cached statistics may have changed
+        cache.invalidate(modified_metadata_ids, 0)
+    cache.invalidate(updated_metadata_ids, start.timestamp(), StatisticsShortTerm)
+
     if start.minute == 55:
         # A full hour is ready, summarize it
-        _compile_hourly_statistics(session, start)
+        hourly_metadata_ids = _compile_hourly_statistics(session, start)
+        hour_start_ts = start.replace(minute=0).timestamp()
+        instance.statistics_rollups_manager.update(
+            session, hourly_metadata_ids, (hour_start_ts,)
+        )
+        cache.invalidate(hourly_metadata_ids, hour_start_ts, Statistics)
 
     session.add(StatisticsRuns(start=start))
 
@@ -715,9 +927,22 @@ def get_metadata(
         )
 
 
+def _invalidate_cached_statistics(
+    instance: Recorder, session: Session, statistic_ids: Iterable[str]
+) -> None:
+    """Invalidate all cached results of the statistic_ids."""
+    if metadata := instance.statistics_meta_manager.get_many(
+        session, statistic_ids=set(statistic_ids)
+    ):
+        get_statistics_during_period_cache(instance.hass).invalidate(
+            [metadata_id for metadata_id, _ in metadata.values()], 0
+        )
+
+
 def clear_statistics(instance: Recorder, statistic_ids: list[str]) -> None:
     """Clear statistics for a list of statistic_ids."""
     with session_scope(session=instance.get_session()) as session:
+        _invalidate_cached_statistics(instance, session, statistic_ids)
         instance.statistics_meta_manager.delete(session, statistic_ids)
 
 
@@ -731,6 +956,7 @@ def update_statistics_metadata(
     statistics_meta_manager = instance.statistics_meta_manager
     if new_unit_of_measurement is not UNDEFINED:
         with session_scope(session=instance.get_session()) as session:
+            _invalidate_cached_statistics(instance, session, (statistic_id,))
             statistics_meta_manager.update_unit_of_measurement(
                 session, statistic_id, new_unit_of_measurement
             )
@@ -739,6 +965,7 @@ def update_statistics_metadata(
             session=instance.get_session(),
             exception_filter=_filter_unique_constraint_integrity_error(instance),
         ) as session:
+            _invalidate_cached_statistics(instance, session, (statistic_id,))
             statistics_meta_manager.update_statistic_id(
                 session, DOMAIN, statistic_id, new_statistic_id
             )
@@ -870,61 +1097,82 @@ def list_statistic_ids(
     return _flatten_list_statistic_ids_metadata_result(result)
 
 
+_get_start = itemgetter("start")
+_get_mean = itemgetter("mean")
+_get_min = itemgetter("min")
+_get_max = itemgetter("max")
+
+
+def _values(column: list[float | None], first: int, last: int) -> list[float]:
+    """Return the values of a column of statistics which are not None."""
+    values = column[first:last]
+    if None in values:
+        return [value for value in values if value is not None]
+    return cast(list[float], values)
+
+
 def _reduce_statistics(
     stats: dict[str, list[StatisticsRow]],
-    same_period: Callable[[float, float], bool],
     period_start_end: Callable[[float], tuple[float, float]],
-    period: timedelta,
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
 ) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to daily or monthly statistics."""
+    """Reduce hourly statistics to daily or monthly statistics.
+
+    The statistics are sorted by start so the rows of each period are
+    found by bisecting the start times at the end of the period, and
+    the values of the period are aggregated column by column instead
+    of comparing the periods of each pair of rows.
+    """
     result: dict[str, list[StatisticsRow]] = defaultdict(list)
-    period_seconds = period.total_seconds()
     _want_mean = "mean" in types
     _want_min = "min" in types
     _want_max = "max" in types
     _want_last_reset = "last_reset" in types
     _want_state = "state" in types
     _want_sum = "sum" in types
+    # The statistics of all statistic ids usually start at the same
+    # times, so the periods are only looked up once for each start
+    periods: dict[float, tuple[float, float]] = {}
     for statistic_id, stat_list in stats.items():
-        max_values: list[float] = []
-        mean_values: list[float] = []
-        min_values: list[float] = []
-        prev_stat: StatisticsRow = stat_list[0]
-        fake_entry: StatisticsRow = {"start": stat_list[-1]["start"] + period_seconds}
-
-        # Loop over the hourly statistics + a fake entry to end the period
-        for statistic in chain(stat_list, (fake_entry,)):
-            if not same_period(prev_stat["start"], statistic["start"]):
-                start, end = period_start_end(prev_stat["start"])
-                # The previous statistic was the last entry of the period
-                row: StatisticsRow = {
-                    "start": start,
-                    "end": end,
-                }
-                if _want_mean:
-                    row["mean"] = mean(mean_values) if mean_values else None
-                    mean_values.clear()
-                if _want_min:
-                    row["min"] = min(min_values) if min_values else None
-                    min_values.clear()
-                if _want_max:
-                    row["max"] = max(max_values) if max_values else None
-                    max_values.clear()
-                if _want_last_reset:
-                    row["last_reset"] = prev_stat.get("last_reset")
-                if _want_state:
-                    row["state"] = prev_stat.get("state")
-                if _want_sum:
-                    row["sum"] = prev_stat["sum"]
-                result[statistic_id].append(row)
-            if _want_max and (_max := statistic.get("max")) is not None:
-                max_values.append(_max)
-            if _want_mean and (_mean := statistic.get("mean")) is not None:
-                mean_values.append(_mean)
-            if _want_min and (_min := statistic.get("min")) is not None:
-                min_values.append(_min)
-            prev_stat = statistic
+        # The rows have all the requested types
+        starts: list[float] = list(map(_get_start, stat_list))
+        if _want_mean:
+            means: list[float | None] = list(map(_get_mean, stat_list))
+        if _want_min:
+            mins: list[float | None] = list(map(_get_min, stat_list))
+        if _want_max:
+            maxes: list[float | None] = list(map(_get_max, stat_list))
+        rows = result[statistic_id]
+        first = 0
+        count = len(stat_list)
+        while first < count:
+            if (period := periods.get(first_start := starts[first])) is None:
+                period = periods[first_start] = period_start_end(first_start)
+            start, end = period
+            # The first statistic after the end of the period starts the next one
+            last = bisect_left(starts, end, first + 1)
+            last_stat = stat_list[last - 1]
+            row: StatisticsRow = {"start": start, "end": end}
+            if _want_mean:
+                row["mean"] = (
+                    mean(values) if (values := _values(means, first, last)) else None
+                )
+            if _want_min:
+                row["min"] = (
+                    min(values) if (values := _values(mins, first, last)) else None
+                )
+            if _want_max:
+                row["max"] = (
+                    max(values) if (values := _values(maxes, first, last)) else None
+                )
+            if _want_last_reset:
+                row["last_reset"] = last_stat.get("last_reset")
+            if _want_state:
+                row["state"] = last_stat.get("state")
+            if _want_sum:
+                row["sum"] = last_stat["sum"]
+            rows.append(row)
+            first = last
 
     return result
 
@@ -971,10 +1219,8 @@ def _reduce_statistics_per_day(
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
 ) -> dict[str, list[StatisticsRow]]:
     """Reduce hourly statistics to daily statistics."""
-    _same_day_ts, _day_start_end_ts = reduce_day_ts_factory()
-    return _reduce_statistics(
-        stats, _same_day_ts, _day_start_end_ts, timedelta(days=1), types
-    )
+    _, _day_start_end_ts = reduce_day_ts_factory()
+    return _reduce_statistics(stats, _day_start_end_ts, types)
 
 
 def reduce_week_ts_factory() -> (
@@ -1021,10 +1267,8 @@ def _reduce_statistics_per_week(
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
 ) -> dict[str, list[StatisticsRow]]:
     """Reduce hourly statistics to weekly statistics."""
-    _same_week_ts, _week_start_end_ts = reduce_week_ts_factory()
-    return _reduce_statistics(
-        stats, _same_week_ts, _week_start_end_ts, timedelta(days=7), types
-    )
+    _, _week_start_end_ts = reduce_week_ts_factory()
+    return _reduce_statistics(stats, _week_start_end_ts, types)
 
 
 def _find_month_end_time(timestamp: datetime) -> datetime:
@@ -1078,10 +1322,21 @@ def _reduce_statistics_per_month(
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
 ) -> dict[str, list[StatisticsRow]]:
     """Reduce hourly statistics to monthly statistics."""
-    _same_month_ts, _month_start_end_ts = reduce_month_ts_factory()
-    return _reduce_statistics(
-        stats, _same_month_ts, _month_start_end_ts, timedelta(days=31), types
-    )
+    _, _month_start_end_ts = reduce_month_ts_factory()
+    return _reduce_statistics(stats, _month_start_end_ts, types)
+
+
+def _end_rolled_up_periods(
+    result: dict[str, list[StatisticsRow]],
+    period_start_end: Callable[[float], tuple[float, float]],
+) -> None:
+    """Set the end of the rolled up days or months, their durations vary."""
+    ends: dict[float, float] = {}
+    for rows in result.values():
+        for row in rows:
+            if (end := ends.get(start := row["start"])) is None:
+                end = ends[start] = period_start_end(start)[1]
+            row["end"] = end
 
 
 def _generate_statistics_during_period_stmt(
@@ -1636,6 +1891,42 @@ def _augment_result_with_change(
             prev_sum = _sum
 
 
+def _align_statistics_period(
+    start_time: datetime,
+    end_time: datetime | None,
+    period: Literal["5minute", "day", "hour", "week", "month"],
+) -> tuple[datetime, datetime | None]:
+    """Align start_time and end_time with the period."""
+    if period == "day":
+        start_time = dt_util.as_local(start_time).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        if end_time is not None:
+            end_local = dt_util.as_local(end_time)
+            end_time = end_local.replace(
+                hour=0, minute=0, second=0, microsecond=0
+            ) + timedelta(days=1)
+    elif period == "week":
+        start_local = dt_util.as_local(start_time)
+        start_time = start_local.replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) - timedelta(days=start_local.weekday())
+        if end_time is not None:
+            end_local = dt_util.as_local(end_time)
+            end_time = (
+                end_local.replace(hour=0, minute=0, second=0, microsecond=0)
+                - timedelta(days=end_local.weekday())
+                + timedelta(days=7)
+            )
+    elif period == "month":
+        start_time = dt_util.as_local(start_time).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        if end_time is not None:
+            end_time = _find_month_end_time(dt_util.as_local(end_time))
+    return start_time, end_time
+
+
 def _statistics_during_period_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -1673,41 +1964,18 @@ def _statistics_during_period_with_session(
     if statistic_ids is not None:
         metadata_ids = _extract_metadata_and_discard_impossible_columns(metadata, types)
 
-    # Align start_time and end_time with the period
-    if period == "day":
-        start_time = dt_util.as_local(start_time).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        start_time = start_time.replace()
-        if end_time is not None:
-            end_local = dt_util.as_local(end_time)
-            end_time = end_local.replace(
-                hour=0, minute=0, second=0, microsecond=0
-            ) + timedelta(days=1)
-    elif period == "week":
-        start_local = dt_util.as_local(start_time)
-        start_time = start_local.replace(
-            hour=0, minute=0, second=0, microsecond=0
-        ) - timedelta(days=start_local.weekday())
-        if end_time is not None:
-            end_local = dt_util.as_local(end_time)
-            end_time = (
-                end_local.replace(hour=0, minute=0, second=0, microsecond=0)
-                - timedelta(days=end_local.weekday())
-                + timedelta(days=7)
-            )
-    elif period == "month":
-        start_time = dt_util.as_local(start_time).replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
-        )
-        if end_time is not None:
-            end_time = _find_month_end_time(dt_util.as_local(end_time))
-
+    start_time, end_time = _align_statistics_period(start_time, end_time, period)
     table: type[Statistics | StatisticsShortTerm] = (
         Statistics if period != "5minute" else StatisticsShortTerm
     )
+    # The days and months are read from the rollups when they have them
+    rollup_table: type[StatisticsDaily | StatisticsMonthly] | None = None
+    if period in ("day", "month") and get_instance(
+        hass
+    ).statistics_rollups_manager.covers(start_time.timestamp()):
+        rollup_table = StatisticsDaily if period == "day" else StatisticsMonthly
     stmt = _generate_statistics_during_period_stmt(
-        start_time, end_time, metadata_ids, table, types
+        start_time, end_time, metadata_ids, rollup_table or table, types
     )
     stats = cast(
         Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
@@ -1723,19 +1991,25 @@ def _statistics_during_period_with_session(
         statistic_ids,
         metadata,
         True,
-        table,
+        rollup_table or table,
         start_time,
         units,
         types,
     )
 
-    if period == "day":
+    if rollup_table is StatisticsDaily:
+        _end_rolled_up_periods(result, reduce_day_ts_factory()[1])
+
+    elif rollup_table is StatisticsMonthly:
+        _end_rolled_up_periods(result, reduce_month_ts_factory()[1])
+
+    elif period == "day":
         result = _reduce_statistics_per_day(result, types)
 
-    if period == "week":
+    elif period == "week":
         result = _reduce_statistics_per_week(result, types)
 
-    if period == "month":
+    elif period == "month":
         result = _reduce_statistics_per_month(result, types)
 
     if "change" in _types:
@@ -1761,8 +2035,49 @@ def statistics_during_period(
     If end_time is omitted, returns statistics newer than or equal to start_time.
     If statistic_ids is omitted, returns statistics for all statistics ids.
     """
-    with session_scope(hass=hass, read_only=True) as session:
-        return _statistics_during_period_with_session(
+    if statistic_ids is None:
+        # The results for all statistics are not cached
+        with session_scope(hass=hass, read_only=True, read_pool=True) as session:
+            return _statistics_during_period_with_session(
+                hass,
+                session,
+                start_time,
+                end_time,
+                statistic_ids,
+                period,
+                units,
+                types,
+            )
+
+    if not isinstance(statistic_ids, set):
+        # This is for backwards compatibility to avoid a breaking change
+        # for custom integrations that call this method.
+        statistic_ids = set(statistic_ids)  # type: ignore[unreachable]
+    cache = get_statistics_during_period_cache(hass)
+    key = (
+        start_time.timestamp(),
+        end_time.timestamp() if end_time is not None else None,
+        period,
+        frozenset(units.items()) if units else None,
+        frozenset(types),
+        # The statistics are displayed in the units of the entities
+        frozenset(
+            (
+                statistic_id,
+                state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+                if (state := hass.states.get(statistic_id))
+                else None,
+            )
+            for statistic_id in statistic_ids
+        ),
+        # The days, weeks and months depend on the time zone
+        str(dt_util.DEFAULT_TIME_ZONE),
+    )
+    if (cached := cache.get(key)) is not None:
+        return cached
+    generation = cache.generation
+    with session_scope(hass=hass, read_only=True, read_pool=True) as session:
+        result = _statistics_during_period_with_session(
             hass,
             session,
             start_time,
@@ -1772,6 +2087,27 @@ def statistics_during_period(
             units,
             types,
         )
+        metadata = get_instance(hass).statistics_meta_manager.get_many(
+            session, statistic_ids=statistic_ids
+        )
+    if len(metadata) != len(statistic_ids):
+        # Statistics that do not exist yet would not invalidate the result
+        return result
+    metadata_ids = {metadata_id for metadata_id, _ in metadata.values()}
+    table: type[Statistics | StatisticsShortTerm] = (
+        Statistics if period != "5minute" else StatisticsShortTerm
+    )
+    start_time, end_time = _align_statistics_period(start_time, end_time, period)
+    cache.set(
+        key,
+        generation,
+        metadata_ids,
+        table,
+        start_time.timestamp(),
+        end_time.timestamp() if end_time is not None else None,
+        result,
+    )
+    return result
 
 
 def _get_last_statistics_stmt(
@@ -2306,14 +2642,25 @@ def _import_statistics_with_session(
     old_metadata_dict = statistics_meta_manager.get_many(
         session, statistic_ids={metadata["statistic_id"]}
     )
-    _, metadata_id = statistics_meta_manager.update_or_add(
+    modified_statistic_id, metadata_id = statistics_meta_manager.update_or_add(
         session, metadata, old_metadata_dict
     )
+    start_ts: float | None = None
     for stat in statistics:
         if stat_id := _statistics_exists(session, table, metadata_id, stat["start"]):
             _update_statistics(session, table, stat_id, stat)
         else:
             _insert_statistics(session, table, metadata_id, stat)
+        stat_start_ts = stat["start"].timestamp()
+        if start_ts is None or stat_start_ts < start_ts:
+            start_ts = stat_start_ts
+
+    cache = get_statistics_during_period_cache(instance.hass)
+    if modified_statistic_id is not None:
+        # The units of the cached statistics may have changed
+        cache.invalidate((metadata_id,), 0)
+    elif start_ts is not None:
+        cache.invalidate((metadata_id,), start_ts, table)
 
     if table != StatisticsShortTerm:
         return True
@@ -2328,6 +2675,14 @@ def _import_statistics_with_session(
     return True
 
 
+@singleton(DATA_STATISTICS_DURING_PERIOD_CACHE)
+def get_statistics_during_period_cache(
+    hass: HomeAssistant,
+) -> StatisticsDuringPeriodCache:
+    """Get the statistics_during_period cache."""
+    return StatisticsDuringPeriodCache()
+
+
 @singleton(DATA_SHORT_TERM_STATISTICS_RUN_CACHE)
 def get_short_term_statistics_run_cache(
     hass: HomeAssistant,
@@ -2394,15 +2749,31 @@ def import_statistics(
     table: type[StatisticsBase],
 ) -> bool:
     """Process an import_statistics job."""
-
+    statistics = list(statistics)
+    imported = False
     with session_scope(
         session=instance.get_session(),
         exception_filter=_filter_unique_constraint_integrity_error(instance),
     ) as session:
-        return _import_statistics_with_session(
+        imported = _import_statistics_with_session(
             instance, session, metadata, statistics, table
         )
 
+    if imported and table != StatisticsShortTerm:
+        # The rollups are updated after the import is committed so
+        # blocked duplicated rows do not fail the import
+        with session_scope(session=instance.get_session()) as session:
+            if statistic := instance.statistics_meta_manager.get(
+                session, metadata["statistic_id"]
+            ):
+                instance.statistics_rollups_manager.update(
+                    session,
+                    (statistic[0],),
+                    [stat["start"].timestamp() for stat in statistics],
+                )
+
+    return imported
+
 
 @retryable_database_job("adjust_statistics")
 def adjust_statistics(
@@ -2443,9 +2814,30 @@ def adjust_statistics(
             sum_adjustment,
         )
 
+        instance.statistics_rollups_manager.adjust_sum(
+            session,
+            metadata[statistic_id][0],
+            start_time.replace(minute=0).timestamp(),
+            sum_adjustment,
+        )
+
+        get_statistics_during_period_cache(instance.hass).invalidate(
+            (metadata[statistic_id][0],), start_time.replace(minute=0).timestamp()
+        )
+
     return True
 
 
+@retryable_database_job("backfill statistics rollups")
+def backfill_statistics_rollups(instance: Recorder) -> bool:
+    """Roll up one month of hourly statistics older than the rollups.
+
+    Returns True if there are no older hourly statistics left.
+    """
+    with session_scope(session=instance.get_session()) as session:
+        return instance.statistics_rollups_manager.backfill(session)
+
+
 def _change_statistics_unit_for_table(
     session: Session,
     table: type[StatisticsBase],
@@ -2503,10 +2895,14 @@ def change_statistics_unit(
         tables: tuple[type[StatisticsBase], ...] = (
             Statistics,
             StatisticsShortTerm,
+            StatisticsDaily,
+            StatisticsMonthly,
         )
         for table in tables:
             _change_statistics_unit_for_table(session, table, metadata_id, convert)
 
+        get_statistics_during_period_cache(instance.hass).invalidate((metadata_id,), 0)
+
         statistics_meta_manager.update_unit_of_measurement(
             session, statistic_id, new_unit
         )
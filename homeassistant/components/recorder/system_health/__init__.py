@@ -10,6 +10,8 @@ from homeassistant.core import HomeAssistant, callback
 from .. import get_instance
 from ..const import SupportedDialect
 from ..core import Recorder
+from ..statistics import get_statistics_during_period_cache
+from ..task_queue import LATENCY_BUCKETS
 from ..util import session_scope
 from .mysql import db_size_bytes as mysql_db_size_bytes
 from .postgresql import db_size_bytes as postgresql_db_size_bytes
@@ -54,6 +56,48 @@ def _async_get_db_engine_info(instance: Recorder) -> dict[str, Any]:
     return db_engine_info
 
 
+def _format_latency_bucket(bucket: float) -> str:
+    """Format the upper bound of a latency bucket."""
+    if bucket < 1:
+        return f"{bucket * 1000:g}ms"
+    return f"{bucket:g}s"
+
+
+_LATENCY_LABELS = [
+    *(f"<{_format_latency_bucket(bucket)}" for bucket in LATENCY_BUCKETS),
+    f">={_format_latency_bucket(LATENCY_BUCKETS[-1])}",
+]
+
+
+@callback
+def _async_get_queue_info(instance: Recorder) -> dict[str, Any]:
+    """Get the depth and latency of each class of the recorder queue."""
+    queue_info: dict[str, Any] = {}
+    for queue_class, stats in instance.queue_stats().items():
+        budget = instance.queue_budget(queue_class)
+        latency = ", ".join(
+            f"{label}: {count}" for label, count in zip(_LATENCY_LABELS, stats.latency)
+        )
+        queue_info[f"queue_{queue_class}"] = (
+            f"{stats.items} queued ({stats.size/1024/1024:.2f} of"
+            f" {budget/1024/1024:.2f} MiB); waited {latency}"
+        )
+    return queue_info
+
+
+@callback
+def _async_get_statistics_cache_info(hass: HomeAssistant) -> dict[str, Any]:
+    """Get the hit rate of the statistics query cache."""
+    cache = get_statistics_during_period_cache(hass)
+    hit_rate = "" if (rate := cache.hit_rate) is None else f" ({rate:.0%} hit rate)"
+    return {
+        "statistics_cache": (
+            f"{cache.hits} hits, {cache.misses} misses{hit_rate};"
+            f" {len(cache)} results cached"
+        )
+    }
+
+
 async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     instance = get_instance(hass)
@@ -61,6 +105,8 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     recorder_runs_manager = instance.recorder_runs_manager
     database_name = urlparse(instance.db_url).path.lstrip("/")
     db_engine_info = _async_get_db_engine_info(instance)
+    queue_info = _async_get_queue_info(instance)
+    statistics_cache_info = _async_get_statistics_cache_info(hass)
     db_stats: dict[str, Any] = {}
 
     if instance.async_db_ready.done():
@@ -71,4 +117,4 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": recorder_runs_manager.first.start,
             "current_recorder_run": recorder_runs_manager.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+    return db_runs | db_stats | db_engine_info | queue_info | statistics_cache_info
@@ -1,6 +1,7 @@
 """Support managing EventData."""
 from __future__ import annotations
 
+from collections import Counter
 from collections.abc import Iterable
 import logging
 from typing import TYPE_CHECKING, cast
@@ -11,7 +12,7 @@ from homeassistant.core import Event
 from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
 from ..db_schema import EventData
-from ..queries import get_shared_event_datas
+from ..queries import get_shared_event_datas, update_event_data_ref_counts
 from ..util import chunked, execute_stmt_lambda_element
 from . import BaseLRUTableManager
 
@@ -31,6 +32,10 @@ class EventDataManager(BaseLRUTableManager[EventData]):
         """Initialize the event type manager."""
         super().__init__(recorder, CACHE_SIZE)
         self.active = True  # always active
+        # If the schema has the reference counts
+        self.ref_counts_active = False
+        # The references added to committed rows since the last commit
+        self._references: Counter[int] = Counter()
 
     def serialize_from_event(self, event: Event) -> bytes | None:
         """Serialize event data."""
@@ -114,6 +119,41 @@ class EventDataManager(BaseLRUTableManager[EventData]):
         shared_data: str = db_event_data.shared_data
         self._pending[shared_data] = db_event_data
 
+    def add_reference(self, data_id: int | EventData) -> None:
+        """Count a reference of a new row in the events table to a EventData.
+
+        The reference count of a pending EventData is set before it is
+        inserted, the ones of committed rows are written by
+        write_references before the next commit.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self.ref_counts_active:
+            return
+        if isinstance(data_id, int):
+            self._references[data_id] += 1
+        else:
+            data_id.ref_count = (data_id.ref_count or 0) + 1
+
+    def write_references(self, session: Session) -> None:
+        """Add the references since the last commit to the reference counts.
+
+        Rows that have not had their reference count backfilled yet keep
+        a NULL reference count.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if references := self._references:
+            session.execute(
+                update_event_data_ref_counts(),
+                [
+                    {"b_data_id": data_id, "b_delta": count}
+                    for data_id, count in references.items()
+                ],
+            )
+
     def post_commit_pending(self) -> None:
         """Call after commit to load the data_ids of the new EventData into the LRU.
 
@@ -123,6 +163,16 @@ class EventDataManager(BaseLRUTableManager[EventData]):
         for shared_data, db_event_data in self._pending.items():
             self._id_map[shared_data] = db_event_data.data_id
         self._pending.clear()
+        self._references.clear()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        super().reset()
+        self._references.clear()
 
     def evict_purged(self, data_ids: set[int]) -> None:
         """Evict purged data_ids from the cache when they are no longer used.
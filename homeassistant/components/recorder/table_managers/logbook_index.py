@@ -0,0 +1,179 @@
+"""Support managing the logbook_index table."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm.session import Session
+
+from homeassistant.const import ATTR_DEVICE_ID, ATTR_ENTITY_ID, ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import Event, State, split_entity_id
+
+from ..const import LOGBOOK_INDEX_SCHEMA_VERSION
+from ..db_schema import DEVICE_ID_MAX_LENGTH, Events, LogbookIndex, States, StatesMeta
+from ..models import process_timestamp
+from ..queries import find_logbook_index_schema_change
+
+if TYPE_CHECKING:
+    from ..core import Recorder
+    from .states_buffer import StatesWriteBuffer
+
+# These must match ALWAYS_CONTINUOUS_DOMAINS and
+# CONDITIONALLY_CONTINUOUS_DOMAINS of the logbook
+ALWAYS_CONTINUOUS_DOMAINS = {"counter", "proximity"}
+CONDITIONALLY_CONTINUOUS_DOMAINS = {"sensor"}
+
+
+def _is_logbook_state_change(old_state: State | None, new_state: State | None) -> bool:
+    """Return if the logbook shows a state change.
+
+    This matches the filters the logbook applies when it
+    queries the states table.
+    """
+    if new_state is None or old_state is None or new_state.state == old_state.state:
+        return False
+    if new_state.last_changed != new_state.last_updated:
+        return False
+    domain = split_entity_id(new_state.entity_id)[0]
+    return domain not in ALWAYS_CONTINUOUS_DOMAINS and (
+        domain not in CONDITIONALLY_CONTINUOUS_DOMAINS
+        or ATTR_UNIT_OF_MEASUREMENT not in new_state.attributes
+    )
+
+
+class LogbookIndexManager:
+    """Manage the logbook_index table.
+
+    The rows of the states and events tables the logbook shows for an
+    entity or a device are indexed as they are written, so the logbook
+    does not have to scan the events table and match the event data.
+    """
+
+    def __init__(self, recorder: Recorder) -> None:
+        """Initialize the logbook index manager."""
+        self.active = False
+        self.recorder = recorder
+        # The time the index was started, older rows are not indexed
+        self.indexed_since: float | None = None
+        # States are either a pending States object or a row
+        # of the states write buffer
+        self._pending_states: list[tuple[float, States | int]] = []
+        self._pending_events: list[
+            tuple[float, int | StatesMeta | None, str | None, Events]
+        ] = []
+
+    def load(self, session: Session) -> None:
+        """Load the time the index was started and activate the manager.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if (
+            since := session.execute(
+                find_logbook_index_schema_change(LOGBOOK_INDEX_SCHEMA_VERSION)
+            ).scalar()
+        ) is not None:
+            self.indexed_since = process_timestamp(since).timestamp()
+        self.active = True
+
+    def add_state_changed(self, event: Event, dbstate: States | int) -> None:
+        """Index a state_changed event if the logbook shows it.
+
+        dbstate is the pending States object or the row of the
+        states write buffer for the event.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        new_state: State | None = event.data.get("new_state")
+        if _is_logbook_state_change(event.data.get("old_state"), new_state):
+            if TYPE_CHECKING:
+                assert new_state is not None
+            self._pending_states.append((new_state.last_updated_timestamp, dbstate))
+
+    def add_event(self, event: Event, dbevent: Events, session: Session) -> None:
+        """Index an event that references an entity or a device.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        data = event.data
+        metadata_id: int | StatesMeta | None = None
+        if (
+            isinstance(entity_id := data.get(ATTR_ENTITY_ID), str)
+            and (states_meta_manager := self.recorder.states_meta_manager).active
+        ):
+            # Entities that have never been recorded are not indexed
+            metadata_id = states_meta_manager.get_pending(
+                entity_id
+            ) or states_meta_manager.get(entity_id, session, True)
+        if (
+            not isinstance(device_id := data.get(ATTR_DEVICE_ID), str)
+            or len(device_id) > DEVICE_ID_MAX_LENGTH
+        ):
+            device_id = None
+        if metadata_id is not None or device_id is not None:
+            self._pending_events.append(
+                (event.time_fired_timestamp, metadata_id, device_id, dbevent)
+            )
+
+    def write(self, session: Session, states_buffer: StatesWriteBuffer) -> None:
+        """Insert the pending index rows.
+
+        Must be called after the states write buffer has been written
+        and before the session is committed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._pending_states and not self._pending_events:
+            return
+        # Flush so the pending States and Events have their ids
+        session.flush()
+        rows: list[dict[str, Any]] = []
+        state_id: int | None
+        metadata_id: int | None
+        for time_fired_ts, dbstate in self._pending_states:
+            if isinstance(dbstate, int):
+                state_id, metadata_id = states_buffer.written_row_ids(dbstate)
+            else:
+                state_id, metadata_id = dbstate.state_id, dbstate.metadata_id
+            rows.append(
+                {
+                    "time_fired_ts": time_fired_ts,
+                    "metadata_id": metadata_id,
+                    "device_id": None,
+                    "state_id": state_id,
+                    "event_id": None,
+                }
+            )
+        for time_fired_ts, metadata, device_id, dbevent in self._pending_events:
+            rows.append(
+                {
+                    "time_fired_ts": time_fired_ts,
+                    "metadata_id": metadata.metadata_id
+                    if isinstance(metadata, StatesMeta)
+                    else metadata,
+                    "device_id": device_id,
+                    "state_id": None,
+                    "event_id": dbevent.event_id,
+                }
+            )
+        session.execute(insert(LogbookIndex), rows)
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to clear the written index rows.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_states.clear()
+        self._pending_events.clear()
@@ -1,6 +1,7 @@
 """Support managing StateAttributes."""
 from __future__ import annotations
 
+from collections import Counter
 from collections.abc import Iterable
 import logging
 from typing import TYPE_CHECKING, cast
@@ -11,7 +12,7 @@ from homeassistant.core import Event
 from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
 from ..db_schema import StateAttributes
-from ..queries import get_shared_attributes
+from ..queries import get_shared_attributes, update_states_attributes_ref_counts
 from ..util import chunked, execute_stmt_lambda_element
 from . import BaseLRUTableManager
 
@@ -36,6 +37,10 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         """Initialize the event type manager."""
         super().__init__(recorder, CACHE_SIZE)
         self.active = True  # always active
+        # If the schema has the reference counts
+        self.ref_counts_active = False
+        # The references added to committed rows since the last commit
+        self._references: Counter[int] = Counter()
 
     def serialize_from_event(self, event: Event) -> bytes | None:
         """Serialize event data."""
@@ -123,6 +128,41 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         shared_attrs: str = db_state_attributes.shared_attrs
         self._pending[shared_attrs] = db_state_attributes
 
+    def add_reference(self, attributes_id: int | StateAttributes) -> None:
+        """Count a reference of a new row in the states table to a StateAttributes.
+
+        The reference count of a pending StateAttributes is set before it is
+        inserted, the ones of committed rows are written by
+        write_references before the next commit.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self.ref_counts_active:
+            return
+        if isinstance(attributes_id, int):
+            self._references[attributes_id] += 1
+        else:
+            attributes_id.ref_count = (attributes_id.ref_count or 0) + 1
+
+    def write_references(self, session: Session) -> None:
+        """Add the references since the last commit to the reference counts.
+
+        Rows that have not had their reference count backfilled yet keep
+        a NULL reference count.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if references := self._references:
+            session.execute(
+                update_states_attributes_ref_counts(),
+                [
+                    {"b_attributes_id": attributes_id, "b_delta": count}
+                    for attributes_id, count in references.items()
+                ],
+            )
+
     def post_commit_pending(self) -> None:
         """Call after commit to load the attributes_ids of the new StateAttributes into the LRU.
 
@@ -132,6 +172,16 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         for shared_attrs, db_state_attributes in self._pending.items():
             self._id_map[shared_attrs] = db_state_attributes.attributes_id
         self._pending.clear()
+        self._references.clear()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        super().reset()
+        self._references.clear()
 
     def evict_purged(self, attributes_ids: set[int]) -> None:
         """Evict purged attributes_ids from the cache when they are no longer used.
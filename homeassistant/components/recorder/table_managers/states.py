@@ -53,6 +53,14 @@ class StatesManager:
             self._last_committed_id[entity_id] = db_states.state_id
         self._pending.clear()
 
+    def update_committed(self, committed_ids: dict[str, int]) -> None:
+        """Load the state_ids of states committed outside of the session.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._last_committed_id.update(committed_ids)
+
     def reset(self) -> None:
         """Reset after the database has been reset or changed.
 
@@ -80,6 +88,19 @@ class StatesManager:
         ):
             last_committed_ids.pop(last_committed_ids_reversed[purged_state_id], None)
 
+    def evict_purged_state_ids_before(self, state_id: int) -> None:
+        """Evict the committed states with a state_id lower than state_id.
+
+        This is used when a whole partition of the states table is dropped.
+        """
+        last_committed_ids = self._last_committed_id
+        for entity_id in [
+            entity_id
+            for entity_id, committed_id in last_committed_ids.items()
+            if committed_id < state_id
+        ]:
+            del last_committed_ids[entity_id]
+
     def evict_purged_entity_ids(self, purged_entity_ids: set[str]) -> None:
         """Evict purged entity_ids from the committed states.
 
@@ -0,0 +1,210 @@
+"""Support buffering States rows for bulk inserts."""
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm.session import Session
+
+from homeassistant.core import Event, State
+
+from ..db_schema import EVENT_ORIGIN_TO_IDX, StateAttributes, States, StatesMeta
+from ..models import ulid_to_bytes_or_none, uuid_hex_to_bytes_or_none
+
+if TYPE_CHECKING:
+    from .states import StatesManager
+
+# Marks a row that does not have its old state in the buffer
+NO_OLD_ROW = -1
+
+
+class StatesWriteBuffer:
+    """Buffer pending States rows in columns and insert them in bulk.
+
+    Rows are kept in parallel columns instead of as States ORM objects
+    to avoid the per instance bookkeeping of the session.
+
+    The metadata_id and attributes_id columns hold either the id resolved
+    by the table managers or the pending StatesMeta/StateAttributes object
+    that gets its id when the session is flushed.
+
+    The old_state_id column holds a committed state_id, a pending States
+    object in the session, or None. When the old state is an earlier row
+    in the buffer, the old_row column holds the index of that row instead.
+    """
+
+    def __init__(self, states_manager: StatesManager) -> None:
+        """Initialize the states write buffer."""
+        self._states_manager = states_manager
+        self._state: list[str | None] = []
+        self._last_updated_ts = array("d")
+        self._last_changed_ts: list[float | None] = []
+        self._origin_idx: list[int | None] = []
+        self._context_id_bin: list[bytes | None] = []
+        self._context_user_id_bin: list[bytes | None] = []
+        self._context_parent_id_bin: list[bytes | None] = []
+        self._metadata_id: list[int | StatesMeta] = []
+        self._attributes_id: list[int | StateAttributes] = []
+        self._old_state_id: list[int | States | None] = []
+        self._old_row = array("l")
+        # The last row in the buffer for each entity_id that can be
+        # used as the old state of the next row for the entity_id
+        self._pending_rows: dict[str, int] = {}
+        self._state_ids: list[int] = []
+
+    def __len__(self) -> int:
+        """Return the number of buffered rows."""
+        return len(self._last_updated_ts)
+
+    def append(
+        self,
+        event: Event,
+        entity_id: str,
+        entity_removed: bool,
+        metadata_id: int | StatesMeta,
+        attributes_id: int | StateAttributes,
+    ) -> None:
+        """Append a row for a state_changed event.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        row = len(self._last_updated_ts)
+        old_state_id: int | States | None = None
+        if (old_row := self._pending_rows.pop(entity_id, None)) is None:
+            old_row = NO_OLD_ROW
+            states_manager = self._states_manager
+            old_state_id = states_manager.pop_pending(
+                entity_id
+            ) or states_manager.pop_committed(entity_id)
+        if not entity_removed:
+            self._pending_rows[entity_id] = row
+
+        state: State | None = event.data.get("new_state")
+        if state is None:
+            self._state.append(None)
+            self._last_updated_ts.append(event.time_fired_timestamp)
+            self._last_changed_ts.append(None)
+        else:
+            self._state.append(state.state)
+            self._last_updated_ts.append(state.last_updated_timestamp)
+            self._last_changed_ts.append(
+                None
+                if state.last_updated == state.last_changed
+                else state.last_changed_timestamp
+            )
+        context = event.context
+        self._origin_idx.append(EVENT_ORIGIN_TO_IDX.get(event.origin))
+        self._context_id_bin.append(ulid_to_bytes_or_none(context.id))
+        self._context_user_id_bin.append(uuid_hex_to_bytes_or_none(context.user_id))
+        self._context_parent_id_bin.append(ulid_to_bytes_or_none(context.parent_id))
+        self._metadata_id.append(metadata_id)
+        self._attributes_id.append(attributes_id)
+        self._old_state_id.append(old_state_id)
+        self._old_row.append(old_row)
+
+    def write(self, session: Session) -> None:
+        """Insert the buffered rows into the states table.
+
+        Rows are inserted in generations so a row that has an earlier row
+        in the buffer as its old state can use the state_id returned for
+        the earlier row.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not (count := len(self._last_updated_ts)):
+            return
+        # Flush so pending StatesMeta, StateAttributes and States
+        # objects referenced by the buffered rows have their ids
+        session.flush()
+        generations: list[list[int]] = []
+        row_generation = [0] * count
+        for row, old_row in enumerate(self._old_row):
+            generation = 0 if old_row == NO_OLD_ROW else row_generation[old_row] + 1
+            row_generation[row] = generation
+            if generation == len(generations):
+                generations.append([])
+            generations[generation].append(row)
+
+        state_ids = [0] * count
+        stmt = insert(States).returning(States.state_id, sort_by_parameter_order=True)
+        for rows in generations:
+            result = session.execute(
+                stmt, [self._row_params(row, state_ids) for row in rows]
+            )
+            for row, state_id in zip(rows, result.scalars()):
+                state_ids[row] = state_id
+        self._state_ids = state_ids
+
+    def _row_params(self, row: int, state_ids: list[int]) -> dict[str, Any]:
+        """Return the insert params for a row."""
+        metadata_id = self._metadata_id[row]
+        attributes_id = self._attributes_id[row]
+        old_state_id = self._old_state_id[row]
+        if (old_row := self._old_row[row]) != NO_OLD_ROW:
+            old_state_id = state_ids[old_row]
+        elif isinstance(old_state_id, States):
+            old_state_id = old_state_id.state_id
+        return {
+            "state": self._state[row],
+            "last_updated_ts": self._last_updated_ts[row],
+            "last_changed_ts": self._last_changed_ts[row],
+            "old_state_id": old_state_id,
+            "attributes_id": attributes_id
+            if isinstance(attributes_id, int)
+            else attributes_id.attributes_id,
+            "origin_idx": self._origin_idx[row],
+            "context_id_bin": self._context_id_bin[row],
+            "context_user_id_bin": self._context_user_id_bin[row],
+            "context_parent_id_bin": self._context_parent_id_bin[row],
+            "metadata_id": metadata_id
+            if isinstance(metadata_id, int)
+            else metadata_id.metadata_id,
+        }
+
+    def written_row_ids(self, row: int) -> tuple[int, int]:
+        """Return the state_id and metadata_id of a row after it was written.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        metadata_id = self._metadata_id[row]
+        return self._state_ids[row], (
+            metadata_id if isinstance(metadata_id, int) else metadata_id.metadata_id
+        )
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to load the state_ids of the rows into committed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._state_ids:
+            return
+        state_ids = self._state_ids
+        self._states_manager.update_committed(
+            {entity_id: state_ids[row] for entity_id, row in self._pending_rows.items()}
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._state.clear()
+        self._last_changed_ts.clear()
+        self._origin_idx.clear()
+        self._context_id_bin.clear()
+        self._context_user_id_bin.clear()
+        self._context_parent_id_bin.clear()
+        self._metadata_id.clear()
+        self._attributes_id.clear()
+        self._old_state_id.clear()
+        self._last_updated_ts = array("d")
+        self._old_row = array("l")
+        self._pending_rows.clear()
+        self._state_ids = []
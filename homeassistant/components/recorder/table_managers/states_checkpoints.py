@@ -0,0 +1,143 @@
+"""Support managing the states_checkpoints table."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+import logging
+from typing import TYPE_CHECKING
+
+from sqlalchemy import distinct, func, insert, literal, select, union_all
+from sqlalchemy.orm.session import Session
+
+from ..db_schema import States, StatesCheckpoints
+from ..models import process_timestamp
+
+if TYPE_CHECKING:
+    from ..core import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StatesCheckpointsManager:
+    """Manage the states_checkpoints table.
+
+    The last_updated_ts of the latest state of each entity is written
+    every hour, so looking up the states of many entities at a point in
+    time only has to scan the states since the previous checkpoint
+    instead of all the states since the recorder run started.
+    """
+
+    def __init__(self, recorder: Recorder) -> None:
+        """Initialize the states checkpoints manager."""
+        self.active = False
+        self.recorder = recorder
+        # The sorted timestamps of the checkpoints, the list is
+        # replaced instead of modified since it is read from the
+        # executor threads of the history queries
+        self._checkpoints: list[float] = []
+
+    def load(self, session: Session) -> None:
+        """Load the timestamps of the checkpoints and activate the manager.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._checkpoints = list(
+            session.execute(
+                select(distinct(StatesCheckpoints.checkpoint_ts)).order_by(
+                    StatesCheckpoints.checkpoint_ts
+                )
+            ).scalars()
+        )
+        self.active = True
+
+    def checkpoint_before(
+        self, point_in_time_ts: float, run_start_ts: float
+    ) -> float | None:
+        """Return the latest checkpoint of the run at or before point_in_time_ts.
+
+        This call is thread-safe.
+        """
+        if not self.active:
+            return None
+        checkpoints = self._checkpoints
+        if (idx := bisect_right(checkpoints, point_in_time_ts)) and (
+            checkpoint_ts := checkpoints[idx - 1]
+        ) > run_start_ts:
+            return checkpoint_ts
+        return None
+
+    def write(self, session: Session, checkpoint_ts: float) -> bool:
+        """Write a checkpoint of the latest states before checkpoint_ts.
+
+        The checkpoint is built from the previous checkpoint of the
+        current run and the states since then.
+
+        Returns True if a checkpoint was written, add must be called
+        after the session has been committed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        run_start_ts = process_timestamp(
+            self.recorder.recorder_runs_manager.current.start
+        ).timestamp()
+        checkpoints = self._checkpoints
+        if not self.active or checkpoint_ts <= run_start_ts:
+            # The states before the run started are not looked up
+            return False
+        if checkpoints and checkpoints[-1] >= checkpoint_ts:
+            return False
+        base_ts = self.checkpoint_before(checkpoint_ts, run_start_ts)
+        states_since_base = select(States.metadata_id, States.last_updated_ts).filter(
+            (States.last_updated_ts >= (base_ts or run_start_ts))
+            & (States.last_updated_ts < checkpoint_ts)
+        )
+        if base_ts is None:
+            states = states_since_base.subquery()
+        else:
+            states = union_all(
+                select(
+                    StatesCheckpoints.metadata_id, StatesCheckpoints.last_updated_ts
+                ).filter(StatesCheckpoints.checkpoint_ts == base_ts),
+                states_since_base,
+            ).subquery()
+        _LOGGER.debug("Writing the states checkpoint at %s", checkpoint_ts)
+        session.execute(
+            insert(StatesCheckpoints).from_select(
+                ["checkpoint_ts", "metadata_id", "last_updated_ts"],
+                select(
+                    literal(checkpoint_ts),
+                    states.c.metadata_id,
+                    func.max(states.c.last_updated_ts),
+                ).group_by(states.c.metadata_id),
+            )
+        )
+        return True
+
+    def add(self, checkpoint_ts: float) -> None:
+        """Add a checkpoint once it has been committed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._checkpoints = [*self._checkpoints, checkpoint_ts]
+
+    def evict_purged(self, purge_before: float) -> None:
+        """Evict the checkpoints before purge_before.
+
+        Must be called before the checkpoints are deleted.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        checkpoints = self._checkpoints
+        if idx := bisect_left(checkpoints, purge_before):
+            self._checkpoints = checkpoints[idx:]
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._checkpoints = []
@@ -0,0 +1,281 @@
+"""Support managing the statistics_daily and statistics_monthly tables."""
+from __future__ import annotations
+
+from collections.abc import Callable, Collection, Iterable
+from datetime import tzinfo
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Select, delete, distinct, func, insert, select, update
+from sqlalchemy.orm.session import Session
+
+from homeassistant.util import dt as dt_util
+
+from ..db_schema import Statistics, StatisticsBase, StatisticsDaily, StatisticsMonthly
+from ..statistics import reduce_day_ts_factory, reduce_month_ts_factory
+from ..util import chunked_or_all
+
+if TYPE_CHECKING:
+    from ..core import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+_PeriodStartEnd = Callable[[float], tuple[float, float]]
+
+
+def _rollup_tables() -> tuple[tuple[type[StatisticsBase], _PeriodStartEnd], ...]:
+    """Return the rollup tables and the periods of their rows.
+
+    The periods are recreated on each call in case the time zone changes.
+    """
+    return (
+        (StatisticsDaily, reduce_day_ts_factory()[1]),
+        (StatisticsMonthly, reduce_month_ts_factory()[1]),
+    )
+
+
+def _select_mean_min_max(
+    start_ts: float, end_ts: float, metadata_ids: Collection[int] | None
+) -> Select:
+    """Generate a select for the mean, min and max of the hourly statistics."""
+    stmt = (
+        select(
+            Statistics.metadata_id,
+            func.avg(Statistics.mean),
+            func.min(Statistics.min),
+            func.max(Statistics.max),
+        )
+        .filter(Statistics.start_ts >= start_ts)
+        .filter(Statistics.start_ts < end_ts)
+    )
+    if metadata_ids is not None:
+        stmt = stmt.filter(Statistics.metadata_id.in_(metadata_ids))
+    return stmt.group_by(Statistics.metadata_id)
+
+
+def _select_last_sum(
+    start_ts: float, end_ts: float, metadata_ids: Collection[int] | None
+) -> Select:
+    """Generate a select for the last sum of the hourly statistics."""
+    stmt = select(
+        Statistics.metadata_id,
+        Statistics.last_reset_ts,
+        Statistics.state,
+        Statistics.sum,
+        func.row_number()
+        .over(
+            partition_by=Statistics.metadata_id,
+            order_by=Statistics.start_ts.desc(),
+        )
+        .label("rownum"),
+    ).filter((Statistics.start_ts >= start_ts) & (Statistics.start_ts < end_ts))
+    if metadata_ids is not None:
+        stmt = stmt.filter(Statistics.metadata_id.in_(metadata_ids))
+    subquery = stmt.subquery()
+    return select(
+        subquery.c.metadata_id,
+        subquery.c.last_reset_ts,
+        subquery.c.state,
+        subquery.c.sum,
+    ).filter(subquery.c.rownum == 1)
+
+
+def _is_aligned(
+    session: Session, table: type[StatisticsBase], period_start_end: _PeriodStartEnd
+) -> bool:
+    """Return if the rolled up periods start at the periods of the time zone."""
+    return all(
+        start_ts is None or period_start_end(start_ts)[0] == start_ts
+        for start_ts in session.execute(select(distinct(table.start_ts))).scalars()
+    )
+
+
+class StatisticsRollupsManager:
+    """Manage the statistics_daily and statistics_monthly tables.
+
+    The hourly statistics are rolled up per local day and month as they
+    are compiled or imported, so the statistics of a day or a month are
+    read from a single row instead of being reduced from the hourly rows.
+    """
+
+    def __init__(self, recorder: Recorder) -> None:
+        """Initialize the statistics rollups manager."""
+        self.active = False
+        self.recorder = recorder
+        # The start of the oldest month rolled up, the statistics
+        # of older periods are reduced from the hourly statistics
+        self.since: float | None = None
+        # The rollups are only valid in the time zone they were built in
+        self._time_zone: tzinfo | None = None
+
+    def load(self, session: Session) -> bool:
+        """Load the rolled up periods and activate the manager.
+
+        The rollups are cleared if they were built in another time zone.
+
+        Returns True if older hourly statistics have to be backfilled.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        tables = _rollup_tables()
+        if not all(
+            _is_aligned(session, table, period_start_end)
+            for table, period_start_end in tables
+        ):
+            _LOGGER.info(
+                "Rebuilding the daily and monthly statistics for the time zone %s",
+                dt_util.DEFAULT_TIME_ZONE,
+            )
+            for table, _ in tables:
+                session.execute(delete(table))
+        self._time_zone = dt_util.DEFAULT_TIME_ZONE
+        self.active = True
+        self.since = session.execute(
+            select(func.min(StatisticsMonthly.start_ts))
+        ).scalar()
+        oldest = session.execute(select(func.min(Statistics.start_ts))).scalar()
+        if oldest is None:
+            if self.since is None:
+                # There are no statistics to backfill
+                self.since = tables[1][1](time.time())[0]
+            return False
+        return self.since is None or oldest < self.since
+
+    def covers(self, start_ts: float) -> bool:
+        """Return if the rollups have the statistics from start_ts."""
+        since = self.since
+        return since is not None and start_ts >= since and self._is_current()
+
+    def _is_current(self) -> bool:
+        """Return if the rollups are maintained in the current time zone."""
+        return (
+            self.active
+            and self.since is not None
+            and self._time_zone is dt_util.DEFAULT_TIME_ZONE
+        )
+
+    def update(
+        self, session: Session, metadata_ids: Collection[int], starts: Iterable[float]
+    ) -> None:
+        """Roll up the periods of the hourly statistics starting at starts.
+
+        Must be called after the hourly statistics have been added
+        to the session.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._is_current() or not metadata_ids:
+            return
+        if TYPE_CHECKING:
+            assert self.since is not None
+        starts = list(starts)
+        session.flush()
+        for table, period_start_end in _rollup_tables():
+            # Older periods are rolled up by the backfill
+            for period_start, period_end in sorted(
+                period
+                for period in {period_start_end(start_ts) for start_ts in starts}
+                if period[0] >= self.since
+            ):
+                for metadata_ids_chunk in chunked_or_all(
+                    metadata_ids, self.recorder.max_bind_vars
+                ):
+                    self._roll_up(
+                        session, table, period_start, period_end, metadata_ids_chunk
+                    )
+
+    def adjust_sum(
+        self, session: Session, metadata_id: int, start_ts: float, adj: float
+    ) -> None:
+        """Adjust the sums of the periods after start_ts.
+
+        Must be called after the sums of the hourly statistics have
+        been adjusted.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._is_current():
+            return
+        for table, period_start_end in _rollup_tables():
+            # The period of start_ts is rolled up again by update
+            session.execute(
+                update(table)
+                .where(table.metadata_id == metadata_id)
+                .where(table.start_ts >= period_start_end(start_ts)[1])
+                .values(sum=table.sum + adj)
+                .execution_options(synchronize_session=False)
+            )
+        self.update(session, (metadata_id,), (start_ts,))
+
+    def backfill(self, session: Session) -> bool:
+        """Roll up the month before the oldest month rolled up.
+
+        Returns True if there are no older hourly statistics left.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self.active or self._time_zone is not dt_util.DEFAULT_TIME_ZONE:
+            # The rollups are rebuilt after the time zone changed
+            return True
+        tables = _rollup_tables()
+        month_start_end = tables[1][1]
+        if self.since is None:
+            newest = session.execute(select(func.max(Statistics.start_ts))).scalar()
+            if newest is None:
+                self.since = month_start_end(time.time())[0]
+                return True
+            month_start, month_end = month_start_end(newest)
+        else:
+            month_start, month_end = month_start_end(self.since - 1)
+        oldest = session.execute(select(func.min(Statistics.start_ts))).scalar()
+        if oldest is None or oldest >= month_end:
+            return True
+        _LOGGER.debug("Rolling up the statistics of the month starting %s", month_start)
+        for table, period_start_end in tables:
+            period_start = month_start
+            while period_start < month_end:
+                period_end = period_start_end(period_start)[1]
+                self._roll_up(session, table, period_start, period_end, None)
+                period_start = period_end
+        self.since = month_start
+        return oldest >= month_start
+
+    def _roll_up(
+        self,
+        session: Session,
+        table: type[StatisticsBase],
+        period_start: float,
+        period_end: float,
+        metadata_ids: Collection[int] | None,
+    ) -> None:
+        """Replace the rollups of a period with the aggregated hourly statistics."""
+        created_ts = time.time()
+        rows: dict[int, dict[str, Any]] = {}
+        for metadata_id, mean, min_, max_ in session.execute(
+            _select_mean_min_max(period_start, period_end, metadata_ids)
+        ):
+            rows[metadata_id] = {
+                "created_ts": created_ts,
+                "metadata_id": metadata_id,
+                "start_ts": period_start,
+                "mean": mean,
+                "min": min_,
+                "max": max_,
+            }
+        for metadata_id, last_reset_ts, state, sum_ in session.execute(
+            _select_last_sum(period_start, period_end, metadata_ids)
+        ):
+            rows[metadata_id].update(
+                {"last_reset_ts": last_reset_ts, "state": state, "sum": sum_}
+            )
+        stmt = delete(table).where(table.start_ts == period_start)
+        if metadata_ids is not None:
+            stmt = stmt.where(table.metadata_id.in_(metadata_ids))
+        session.execute(stmt)
+        if rows:
+            session.execute(insert(table), list(rows.values()))
@@ -0,0 +1,213 @@
+"""The recorder queue with priority classes and memory accounting."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Final
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event
+
+from .const import ESTIMATED_QUEUE_ITEM_SIZE, RecorderQueueClass
+
+if TYPE_CHECKING:
+    from .tasks import RecorderTask
+
+# The upper bounds in seconds of the buckets of the latency histograms
+LATENCY_BUCKETS: Final = (0.01, 0.1, 1.0, 10.0, 60.0)
+
+# The seconds an item of a lower priority can wait while items of a
+# higher priority keep coming before it is processed anyway
+MAX_QUEUE_WAIT: Final = 30.0
+
+# The classes are processed in order of priority. State and event writes
+# share the highest priority so they are written in the order they were fired.
+# Tasks that must run after everything queued before them and before
+# everything queued after them, like the tasks used to wait for or stop
+# the recorder, are barrier tasks so they keep their place in the queue.
+_PRIORITIES: Final = {
+    RecorderQueueClass.STATES: 0,
+    RecorderQueueClass.EVENTS: 0,
+    RecorderQueueClass.STATISTICS: 1,
+    RecorderQueueClass.MAINTENANCE: 2,
+}
+
+# The item, its class, its estimated size, the time it was added
+# and its sequence number
+_QueueItem = tuple["RecorderTask | Event", RecorderQueueClass, int, float, int]
+
+
+@dataclass(slots=True)
+class RecorderQueueClassStats:
+    """Statistics of a class of the recorder queue.
+
+    latency holds the number of items that waited in the queue for less
+    than each of the LATENCY_BUCKETS and, as the last bucket, the number
+    of items that waited longer.
+    """
+
+    items: int = 0
+    size: int = 0
+    latency: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+
+class RecorderQueue:
+    """A queue of events and tasks for the recorder thread.
+
+    Items are processed in order of the priority of their class and in
+    the order they were added within a priority, with two exceptions:
+    - An item that waited longer than MAX_QUEUE_WAIT is processed before
+      the items of a higher priority that were added after it.
+    - Items added after a barrier task, like a migration task, are not
+      processed before it.
+
+    The number of items and their estimated size are kept per class so
+    each class can be held to its own budget.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the queue."""
+        self._not_empty = threading.Condition(threading.Lock())
+        self._queues: list[deque[_QueueItem]] = [
+            deque() for _ in range(max(_PRIORITIES.values()) + 1)
+        ]
+        self._items = 0
+        self._sequence = 0
+        # The sequence numbers of the barrier tasks in the queue
+        self._barriers: deque[int] = deque()
+        self._stats = {
+            queue_class: RecorderQueueClassStats() for queue_class in RecorderQueueClass
+        }
+
+    def put(self, item: RecorderTask | Event) -> None:
+        """Add an event or task to the queue.
+
+        This call is thread-safe.
+        """
+        # Event is never subclassed so we can
+        # use a fast type check
+        if type(item) is Event:  # noqa: E721
+            queue_class = (
+                RecorderQueueClass.STATES
+                if item.event_type == EVENT_STATE_CHANGED
+                else RecorderQueueClass.EVENTS
+            )
+            size = ESTIMATED_QUEUE_ITEM_SIZE
+            barrier = False
+        else:
+            if TYPE_CHECKING:
+                assert not isinstance(item, Event)
+            queue_class = item.queue_class
+            size = item.estimated_size
+            barrier = item.barrier
+        with self._not_empty:
+            sequence = self._sequence
+            self._sequence += 1
+            self._queues[_PRIORITIES[queue_class]].append(
+                (item, queue_class, size, time.monotonic(), sequence)
+            )
+            if barrier:
+                self._barriers.append(sequence)
+            self._items += 1
+            stats = self._stats[queue_class]
+            stats.items += 1
+            stats.size += size
+            self._not_empty.notify()
+
+    put_nowait = put
+
+    def get(self) -> RecorderTask | Event:
+        """Remove and return the next item, waiting for one if the queue is empty.
+
+        This call is thread-safe.
+        """
+        with self._not_empty:
+            while not self._items:
+                self._not_empty.wait()
+            return self._pop()
+
+    def get_nowait(self) -> RecorderTask | Event:
+        """Remove and return the next item or raise queue.Empty.
+
+        This call is thread-safe.
+        """
+        with self._not_empty:
+            if not self._items:
+                raise queue.Empty
+            return self._pop()
+
+    def _pop(self) -> RecorderTask | Event:
+        """Remove and return the next item, the lock must be held."""
+        now = time.monotonic()
+        barrier = self._barriers[0] if self._barriers else None
+        next_queue: deque[_QueueItem] | None = None
+        for priority_queue in self._queues:
+            if not priority_queue:
+                continue
+            _, _, _, queued, sequence = priority_queue[0]
+            if barrier is not None and sequence > barrier:
+                continue
+            if next_queue is None:
+                next_queue = priority_queue
+            elif now - queued > MAX_QUEUE_WAIT and sequence < next_queue[0][4]:
+                # The items of a lower priority are not starved
+                next_queue = priority_queue
+        # The oldest item is never after a barrier
+        assert next_queue is not None
+        item, queue_class, size, queued, sequence = next_queue.popleft()
+        if sequence == barrier:
+            self._barriers.popleft()
+        self._items -= 1
+        stats = self._stats[queue_class]
+        stats.items -= 1
+        stats.size -= size
+        stats.latency[bisect_left(LATENCY_BUCKETS, now - queued)] += 1
+        return item
+
+    def clear(self) -> None:
+        """Remove all items from the queue.
+
+        This call is thread-safe.
+        """
+        with self._not_empty:
+            for priority_queue in self._queues:
+                priority_queue.clear()
+            self._barriers.clear()
+            self._items = 0
+            for stats in self._stats.values():
+                stats.items = 0
+                stats.size = 0
+
+    def qsize(self) -> int:
+        """Return the number of items in the queue."""
+        return self._items
+
+    def empty(self) -> bool:
+        """Return if the queue is empty."""
+        return not self._items
+
+    @property
+    def size(self) -> int:
+        """Return the estimated size of the items in the queue."""
+        return sum(stats.size for stats in self._stats.values())
+
+    def class_size(self, queue_class: RecorderQueueClass) -> int:
+        """Return the estimated size of the items of a class in the queue."""
+        return self._stats[queue_class].size
+
+    def stats(self) -> dict[RecorderQueueClass, RecorderQueueClassStats]:
+        """Return a copy of the statistics of each class.
+
+        This call is thread-safe.
+        """
+        with self._not_empty:
+            return {
+                queue_class: RecorderQueueClassStats(
+                    stats.items, stats.size, stats.latency.copy()
+                )
+                for queue_class, stats in self._stats.items()
+            }
@@ -3,8 +3,8 @@ from __future__ import annotations
 
 import abc
 import asyncio
-from collections.abc import Callable, Iterable
-from dataclasses import dataclass
+from collections.abc import Callable, Iterable, Sized
+from dataclasses import dataclass, field
 from datetime import datetime
 import logging
 import threading
@@ -13,7 +13,12 @@ from typing import TYPE_CHECKING, Any
 from homeassistant.helpers.typing import UndefinedType
 
 from . import entity_registry, purge, statistics
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    ESTIMATED_QUEUE_ITEM_SIZE,
+    ESTIMATED_STATISTICS_ROW_SIZE,
+    RecorderQueueClass,
+)
 from .db_schema import Statistics, StatisticsShortTerm
 from .models import StatisticData, StatisticMetaData
 from .util import periodic_db_cleanups, session_scope
@@ -30,6 +35,15 @@ class RecorderTask:
     """ABC for recorder tasks."""
 
     commit_before = True
+    queue_class = RecorderQueueClass.MAINTENANCE
+    # The items added to the queue after a barrier task
+    # are not processed before it
+    barrier = False
+
+    @property
+    def estimated_size(self) -> int:
+        """Return the estimated size of the task in the recorder queue."""
+        return ESTIMATED_QUEUE_ITEM_SIZE
 
     @abc.abstractmethod
     def run(self, instance: Recorder) -> None:
@@ -40,6 +54,8 @@ class RecorderTask:
 class ChangeStatisticsUnitTask(RecorderTask):
     """Object to store statistics_id and unit to convert unit of statistics."""
 
+    queue_class = RecorderQueueClass.STATISTICS
+
     statistic_id: str
     new_unit_of_measurement: str
     old_unit_of_measurement: str
@@ -58,6 +74,8 @@ class ChangeStatisticsUnitTask(RecorderTask):
 class ClearStatisticsTask(RecorderTask):
     """Object to store statistics_ids which for which to remove statistics."""
 
+    queue_class = RecorderQueueClass.STATISTICS
+
     statistic_ids: list[str]
 
     def run(self, instance: Recorder) -> None:
@@ -69,6 +87,8 @@ class ClearStatisticsTask(RecorderTask):
 class UpdateStatisticsMetadataTask(RecorderTask):
     """Object to store statistics_id and unit for update of statistics metadata."""
 
+    queue_class = RecorderQueueClass.STATISTICS
+
     statistic_id: str
     new_statistic_id: str | None | UndefinedType
     new_unit_of_measurement: str | None | UndefinedType
@@ -87,6 +107,8 @@ class UpdateStatisticsMetadataTask(RecorderTask):
 class UpdateStatesMetadataTask(RecorderTask):
     """Task to update states metadata."""
 
+    queue_class = RecorderQueueClass.STATES
+
     entity_id: str
     new_entity_id: str
 
@@ -106,11 +128,16 @@ class PurgeTask(RecorderTask):
     purge_before: datetime
     repack: bool
     apply_filter: bool
+    cursor: purge.PurgeCursor = field(default_factory=purge.PurgeCursor)
 
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
         if purge.purge_old_data(
-            instance, self.purge_before, self.repack, self.apply_filter
+            instance,
+            self.purge_before,
+            self.repack,
+            self.apply_filter,
+            cursor=self.cursor,
         ):
             with instance.get_session() as session:
                 instance.recorder_runs_manager.load_from_db(session)
@@ -121,7 +148,7 @@ class PurgeTask(RecorderTask):
             return
         # Schedule a new purge task if this one didn't finish
         instance.queue_task(
-            PurgeTask(self.purge_before, self.repack, self.apply_filter)
+            PurgeTask(self.purge_before, self.repack, self.apply_filter, self.cursor)
         )
 
 
@@ -152,10 +179,23 @@ class PerodicCleanupTask(RecorderTask):
         periodic_db_cleanups(instance)
 
 
+@dataclass(slots=True)
+class SealStatesPartitionTask(RecorderTask):
+    """An object to insert into the recorder queue to seal a states partition."""
+
+    commit_before = True
+
+    def run(self, instance: Recorder) -> None:
+        """Seal the states written up to now in a partition."""
+        instance._seal_states_partition()  # pylint: disable=[protected-access]
+
+
 @dataclass(slots=True)
 class StatisticsTask(RecorderTask):
     """An object to insert into the recorder queue to run a statistics task."""
 
+    queue_class = RecorderQueueClass.STATISTICS
+
     start: datetime
     fire_events: bool
 
@@ -171,6 +211,8 @@ class StatisticsTask(RecorderTask):
 class CompileMissingStatisticsTask(RecorderTask):
     """An object to insert into the recorder queue to run a compile missing statistics."""
 
+    queue_class = RecorderQueueClass.STATISTICS
+
     def run(self, instance: Recorder) -> None:
         """Run statistics task to compile missing statistics."""
         if statistics.compile_missing_statistics(instance):
@@ -183,10 +225,22 @@ class CompileMissingStatisticsTask(RecorderTask):
 class ImportStatisticsTask(RecorderTask):
     """An object to insert into the recorder queue to run an import statistics task."""
 
+    queue_class = RecorderQueueClass.STATISTICS
+
     metadata: StatisticMetaData
     statistics: Iterable[StatisticData]
     table: type[Statistics | StatisticsShortTerm]
 
+    @property
+    def estimated_size(self) -> int:
+        """Return the estimated size of the task in the recorder queue."""
+        if not isinstance(self.statistics, Sized):
+            return ESTIMATED_QUEUE_ITEM_SIZE
+        return (
+            ESTIMATED_QUEUE_ITEM_SIZE
+            + len(self.statistics) * ESTIMATED_STATISTICS_ROW_SIZE
+        )
+
     def run(self, instance: Recorder) -> None:
         """Run statistics task."""
         if statistics.import_statistics(
@@ -203,6 +257,8 @@ class ImportStatisticsTask(RecorderTask):
 class AdjustStatisticsTask(RecorderTask):
     """An object to insert into the recorder queue to run an adjust statistics task."""
 
+    queue_class = RecorderQueueClass.STATISTICS
+
     statistic_id: str
     start_time: datetime
     sum_adjustment: float
@@ -237,10 +293,18 @@ class WaitTask(RecorderTask):
     """
 
     commit_before = False
+    barrier = True
 
     def run(self, instance: Recorder) -> None:
         """Handle the task."""
-        instance._queue_watch.set()  # pylint: disable=[protected-access]
+        try:
+            # Commit the pending data so it is in the database
+            # once the waiters are released
+            # pylint: disable-next=[protected-access]
+            instance._commit_event_session_or_retry()
+        finally:
+            # Release the waiters even if the commit failed
+            instance._queue_watch.set()  # pylint: disable=[protected-access]
 
 
 @dataclass(slots=True)
@@ -250,6 +314,7 @@ class DatabaseLockTask(RecorderTask):
     database_locked: asyncio.Event
     database_unlock: threading.Event
     queue_overflow: bool
+    barrier = True
 
     def run(self, instance: Recorder) -> None:
         """Handle the task."""
@@ -261,6 +326,7 @@ class StopTask(RecorderTask):
     """An object to insert into the recorder queue to stop the event handler."""
 
     commit_before = False
+    barrier = True
 
     def run(self, instance: Recorder) -> None:
         """Handle the task."""
@@ -284,6 +350,7 @@ class CommitTask(RecorderTask):
     """Commit the event session."""
 
     commit_before = False
+    queue_class = RecorderQueueClass.STATES
 
     def run(self, instance: Recorder) -> None:
         """Handle the task."""
@@ -298,6 +365,7 @@ class AddRecorderPlatformTask(RecorderTask):
     domain: str
     platform: Any
     commit_before = False
+    queue_class = RecorderQueueClass.STATISTICS
 
     def run(self, instance: Recorder) -> None:
         """Handle the task."""
@@ -314,6 +382,7 @@ class SynchronizeTask(RecorderTask):
 
     # commit_before is the default
     event: asyncio.Event
+    barrier = True
 
     def run(self, instance: Recorder) -> None:
         """Handle the task."""
@@ -326,6 +395,7 @@ class SynchronizeTask(RecorderTask):
 class PostSchemaMigrationTask(RecorderTask):
     """Post migration task to update schema."""
 
+    barrier = True
     old_version: int
     new_version: int
 
@@ -340,6 +410,8 @@ class PostSchemaMigrationTask(RecorderTask):
 class StatisticsTimestampMigrationCleanupTask(RecorderTask):
     """An object to insert into the recorder queue to run a statistics migration cleanup task."""
 
+    queue_class = RecorderQueueClass.STATISTICS
+
     def run(self, instance: Recorder) -> None:
         """Run statistics timestamp cleanup task."""
         if not statistics.cleanup_statistics_timestamp_migration(instance):
@@ -362,6 +434,7 @@ class AdjustLRUSizeTask(RecorderTask):
 class StatesContextIDMigrationTask(RecorderTask):
     """An object to insert into the recorder queue to migrate states context ids."""
 
+    barrier = True
     commit_before = False
 
     def run(self, instance: Recorder) -> None:
@@ -377,6 +450,7 @@ class StatesContextIDMigrationTask(RecorderTask):
 class EventsContextIDMigrationTask(RecorderTask):
     """An object to insert into the recorder queue to migrate events context ids."""
 
+    barrier = True
     commit_before = False
 
     def run(self, instance: Recorder) -> None:
@@ -388,10 +462,96 @@ class EventsContextIDMigrationTask(RecorderTask):
             instance.queue_task(EventsContextIDMigrationTask())
 
 
+@dataclass(slots=True)
+class StatesAttributesRefCountMigrationTask(RecorderTask):
+    """An object to insert into the recorder queue to backfill attributes reference counts."""
+
+    barrier = True
+    commit_before = True
+    # We have to commit before to make sure the references
+    # of pending rows are not counted again when they are
+    # committed since this happens live
+
+    def run(self, instance: Recorder) -> None:
+        """Run the attributes reference count migration task."""
+        if (
+            not instance._migrate_states_attributes_ref_counts()  # pylint: disable=[protected-access]
+        ):
+            # Schedule a new migration task if this one didn't finish
+            instance.queue_task(StatesAttributesRefCountMigrationTask())
+
+
+@dataclass(slots=True)
+class EventDataRefCountMigrationTask(RecorderTask):
+    """An object to insert into the recorder queue to backfill event data reference counts."""
+
+    barrier = True
+    commit_before = True
+    # We have to commit before to make sure the references
+    # of pending rows are not counted again when they are
+    # committed since this happens live
+
+    def run(self, instance: Recorder) -> None:
+        """Run the event data reference count migration task."""
+        if (
+            not instance._migrate_event_data_ref_counts()  # pylint: disable=[protected-access]
+        ):
+            # Schedule a new migration task if this one didn't finish
+            instance.queue_task(EventDataRefCountMigrationTask())
+
+
+@dataclass(slots=True)
+class StatisticsRollupsTask(RecorderTask):
+    """An object to insert into the recorder queue to backfill the statistics rollups."""
+
+    commit_before = False
+
+    def run(self, instance: Recorder) -> None:
+        """Run the statistics rollups backfill task."""
+        if not statistics.backfill_statistics_rollups(instance):
+            # Schedule a new backfill task if this one didn't finish
+            instance.queue_task(StatisticsRollupsTask())
+
+
+@dataclass(slots=True)
+class StatisticsRollupsTimeZoneTask(RecorderTask):
+    """An object to insert into the recorder queue to rebuild the statistics rollups.
+
+    The rollups are rebuilt after the time zone changed.
+    """
+
+    commit_before = False
+
+    def run(self, instance: Recorder) -> None:
+        """Run the statistics rollups time zone task."""
+        instance._load_statistics_rollups()  # pylint: disable=[protected-access]
+
+
+@dataclass(slots=True)
+class StatesCheckpointTask(RecorderTask):
+    """An object to insert into the recorder queue to checkpoint the latest states.
+
+    The pending states are committed first so all the states
+    before the checkpoint are included.
+    """
+
+    commit_before = True
+    checkpoint_ts: float
+
+    def run(self, instance: Recorder) -> None:
+        """Run the states checkpoint task."""
+        manager = instance.states_checkpoints_manager
+        with session_scope(session=instance.get_session()) as session:
+            written = manager.write(session, self.checkpoint_ts)
+        if written:
+            manager.add(self.checkpoint_ts)
+
+
 @dataclass(slots=True)
 class EventTypeIDMigrationTask(RecorderTask):
     """An object to insert into the recorder queue to migrate event type ids."""
 
+    barrier = True
     commit_before = True
     # We have to commit before to make sure there are
     # no new pending event_types about to be added to
@@ -408,6 +568,7 @@ class EventTypeIDMigrationTask(RecorderTask):
 class EntityIDMigrationTask(RecorderTask):
     """An object to insert into the recorder queue to migrate entity_ids to StatesMeta."""
 
+    barrier = True
     commit_before = True
     # We have to commit before to make sure there are
     # no new pending states_meta about to be added to
@@ -431,6 +592,8 @@ class EntityIDMigrationTask(RecorderTask):
 class EntityIDPostMigrationTask(RecorderTask):
     """An object to insert into the recorder queue to cleanup after entity_ids migration."""
 
+    barrier = True
+
     def run(self, instance: Recorder) -> None:
         """Run entity_id post migration task."""
         if (
@@ -449,6 +612,8 @@ class EventIdMigrationTask(RecorderTask):
     task is run if its no longer needed.
     """
 
+    barrier = True
+
     def run(self, instance: Recorder) -> None:
         """Clean up the legacy event_id index on states."""
         instance._cleanup_legacy_states_event_ids()  # pylint: disable=[protected-access]
@@ -458,6 +623,8 @@ class EventIdMigrationTask(RecorderTask):
 class RefreshEventTypesTask(RecorderTask):
     """An object to insert into the recorder queue to refresh event types."""
 
+    queue_class = RecorderQueueClass.EVENTS
+
     event_types: list[str]
 
     def run(self, instance: Recorder) -> None:
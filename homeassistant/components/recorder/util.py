@@ -121,15 +121,25 @@ def session_scope(
     session: Session | None = None,
     exception_filter: Callable[[Exception], bool] | None = None,
     read_only: bool = False,
+    read_pool: bool = False,
 ) -> Generator[Session, None, None]:
     """Provide a transactional scope around a series of operations.
 
     read_only is used to indicate that the session is only used for reading
     data and that no commit is required. It does not prevent the session
     from writing and is not a security measure.
+
+    read_pool is used to read from the read-only connection pool if one is
+    configured. It is only used for read only sessions created from hass
+    for queries that can tolerate reading from a replica.
     """
     if session is None and hass is not None:
-        session = get_instance(hass).get_session()
+        instance = get_instance(hass)
+        session = (
+            instance.get_read_session()
+            if read_only and read_pool
+            else instance.get_session()
+        )
 
     if session is None:
         raise RuntimeError("Session required")
@@ -209,6 +219,7 @@ def execute_stmt_lambda_element(
     end_time: datetime | None = None,
     yield_per: int = DEFAULT_YIELD_STATES_ROWS,
     orm_rows: bool = True,
+    stream: bool = False,
 ) -> Sequence[Row] | Result:
     """Execute a StatementLambdaElement.
 
@@ -220,8 +231,13 @@ def execute_stmt_lambda_element(
     when selecting non-ranged rows (ie selecting
     specific entities) since they are usually faster
     with .all().
+
+    If stream is True, yield_per is always used so the
+    rows can be consumed as they come off the cursor.
     """
-    use_all = not start_time or ((end_time or dt_util.utcnow()) - start_time).days <= 1
+    use_all = not stream and (
+        not start_time or ((end_time or dt_util.utcnow()) - start_time).days <= 1
+    )
     for tryno in range(RETRIES):
         try:
             if orm_rows:
@@ -386,6 +386,39 @@ def _timestamp_to_isoformat_or_none(timestamp: float | None) -> str | None:
     return dt_util.utc_from_timestamp(timestamp).isoformat()
 
 
+def _get_history(
+    hass: HomeAssistant,
+    session: Session,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    sensor_states: list[State],
+    entity_ids: list[str],
+    significant_changes_only: bool,
+) -> MutableMapping[str, list[State]]:
+    """Get the history of entity_ids between start and end.
+
+    The recorder accumulates the states of sensors in memory once we have
+    compiled statistics, the database is only queried if the accumulator
+    does not have the complete history of the period, like after a restart.
+    """
+    states_accumulator = get_instance(hass).states_accumulator
+    states_accumulator.track_domain(DOMAIN, sensor_states)
+    if (
+        history_list := states_accumulator.get_states_during_period(
+            entity_ids, start, end, significant_changes_only
+        )
+    ) is not None:
+        return history_list
+    return history.get_full_significant_states_with_session(
+        hass,
+        session,
+        start - datetime.timedelta.resolution,
+        end,
+        entity_ids=entity_ids,
+        significant_changes_only=significant_changes_only,
+    )
+
+
 def compile_statistics(  # noqa: C901
     hass: HomeAssistant,
     session: Session,
@@ -403,13 +436,8 @@ def compile_statistics(  # noqa: C901
     ]
     history_list: MutableMapping[str, list[State]] = {}
     if entities_full_history:
-        history_list = history.get_full_significant_states_with_session(
-            hass,
-            session,
-            start - datetime.timedelta.resolution,
-            end,
-            entity_ids=entities_full_history,
-            significant_changes_only=False,
+        history_list = _get_history(
+            hass, session, start, end, sensor_states, entities_full_history, False
         )
     entities_significant_history = [
         i.entity_id
@@ -417,12 +445,8 @@ def compile_statistics(  # noqa: C901
         if "sum" not in wanted_statistics[i.entity_id]
     ]
     if entities_significant_history:
-        _history_list = history.get_full_significant_states_with_session(
-            hass,
-            session,
-            start - datetime.timedelta.resolution,
-            end,
-            entity_ids=entities_significant_history,
+        _history_list = _get_history(
+            hass, session, start, end, sensor_states, entities_significant_history, True
         )
         history_list = {**history_list, **_history_list}
 
@@ -15,6 +15,7 @@ from homeassistant.helpers.json import json_bytes
 from homeassistant.util.json import JsonValueType
 
 from .connection import ActiveConnection
+from .const import SendMessageType
 from .error import Disconnect
 
 if TYPE_CHECKING:
@@ -52,15 +53,17 @@ class AuthPhase:
         self,
         logger: WebSocketAdapter,
         hass: HomeAssistant,
-        send_message: Callable[[bytes | str | dict[str, Any]], None],
+        send_message: Callable[[SendMessageType], None],
         cancel_ws: CALLBACK_TYPE,
         request: Request,
         send_bytes_text: Callable[[bytes], Coroutine[Any, Any, None]],
+        send_queue_size: Callable[[], int] | None = None,
     ) -> None:
         """Initialize the authenticated connection."""
         self._hass = hass
         # send_message will send a message to the client via the queue.
         self._send_message = send_message
+        self._send_queue_size = send_queue_size
         self._cancel_ws = cancel_ws
         self._logger = logger
         self._request = request
@@ -88,6 +91,7 @@ class AuthPhase:
                 self._send_message,
                 refresh_token.user,
                 refresh_token,
+                self._send_queue_size,
             )
             conn.subscriptions[
                 "auth"
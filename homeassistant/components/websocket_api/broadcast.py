@@ -0,0 +1,273 @@
+"""Broadcast state changes to the entity subscriptions of websocket connections."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Final
+
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+
+from . import const, messages
+from .const import PENDING_MSG_BACKPRESSURE
+
+if TYPE_CHECKING:
+    from .connection import ActiveConnection
+
+DATA_ENTITY_BROADCASTER: Final = f"{const.DOMAIN}.entity_broadcaster"
+
+
+@dataclass(slots=True)
+class EntityBroadcastMetrics:
+    """Metrics of the entity broadcaster.
+
+    diffs is the number of state diffs queued for subscriptions, merged
+    the number of them that were merged into a state diff of the same
+    entity in the backlog of a slow client, and frames the number of
+    messages they were sent in.
+    encoded_bytes is the size of the state diffs that were serialized and
+    reused_bytes the size of the serialized state diffs that were shared
+    with other subscriptions instead of being serialized again.
+    """
+
+    diffs: int = 0
+    merged: int = 0
+    frames: int = 0
+    encoded_bytes: int = 0
+    reused_bytes: int = 0
+
+    @property
+    def frames_saved(self) -> int:
+        """Return the number of messages saved by coalescing."""
+        return self.diffs - self.frames
+
+
+class _PendingChange:
+    """A state change of an entity that was not sent yet."""
+
+    __slots__ = ("fragment", "old_state", "new_state")
+
+    def __init__(
+        self,
+        fragment: tuple[str, bytes] | None,
+        old_state: State | None,
+        new_state: State | None,
+    ) -> None:
+        """Initialize the pending change.
+
+        The fragment is None if the change was merged with another
+        change and still has to be serialized.
+        """
+        self.fragment = fragment
+        self.old_state = old_state
+        self.new_state = new_state
+
+
+class _EntitySubscription:
+    """A subscribe_entities subscription of a connection."""
+
+    __slots__ = ("connection", "entity_ids", "msg_id", "pending", "backlog", "queued")
+
+    def __init__(
+        self, connection: ActiveConnection, entity_ids: set[str], msg_id: int
+    ) -> None:
+        """Initialize the subscription."""
+        self.connection = connection
+        self.entity_ids = entity_ids
+        self.msg_id = msg_id
+        # The state changes of the current iteration of the event loop
+        self.pending: dict[str, _PendingChange] = {}
+        # The merged state changes while the client is not keeping up
+        self.backlog: dict[str, _PendingChange] = {}
+        # If a message for the backlog is in the send queue
+        self.queued = False
+
+
+class EntityBroadcaster:
+    """Deliver state changes to all subscribe_entities subscriptions.
+
+    Each state change is serialized once and the serialized fragment
+    is shared by all subscriptions. The state changes of a subscription
+    in the same iteration of the event loop are coalesced into a single
+    message, unless an entity changed more than once.
+
+    Once PENDING_MSG_BACKPRESSURE messages are waiting to be sent to a
+    client, its state changes are merged into a backlog instead. A single
+    message is queued for the backlog and only built when the connection
+    sends it. Until then, a state change of an entity that is already in
+    the backlog replaces the pending change, so a client that cannot keep
+    up receives the latest states instead of every intermediate state and
+    the memory used for it is bounded by the number of entities.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the broadcaster."""
+        self._hass = hass
+        self._subscriptions: dict[_EntitySubscription, None] = {}
+        self._pending: dict[_EntitySubscription, None] = {}
+        self._unsub_state_changed: CALLBACK_TYPE | None = None
+        self._flush_scheduled = False
+        self.metrics = EntityBroadcastMetrics()
+
+    @callback
+    def async_subscribe(
+        self, connection: ActiveConnection, entity_ids: set[str], msg_id: int
+    ) -> CALLBACK_TYPE:
+        """Subscribe to the state changes of entity_ids or all entities."""
+        subscription = _EntitySubscription(connection, entity_ids, msg_id)
+        self._subscriptions[subscription] = None
+        if self._unsub_state_changed is None:
+            self._unsub_state_changed = self._hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_state_changed, run_immediately=True
+            )
+
+        @callback
+        def _async_unsubscribe() -> None:
+            """Unsubscribe and drop the pending state changes."""
+            self._subscriptions.pop(subscription, None)
+            self._pending.pop(subscription, None)
+            subscription.pending.clear()
+            subscription.backlog.clear()
+            if not self._subscriptions and self._unsub_state_changed:
+                self._unsub_state_changed()
+                self._unsub_state_changed = None
+
+        return _async_unsubscribe
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Queue a state change for the subscriptions that can see it."""
+        event_data = event.data
+        entity_id: str = event_data["entity_id"]
+        fragment: tuple[str, bytes] | None = None
+        serialized = False
+        metrics = self.metrics
+        for subscription in self._subscriptions:
+            if subscription.entity_ids and entity_id not in subscription.entity_ids:
+                continue
+            # We have to lookup the permissions again because the user might have
+            # changed since the subscription was created.
+            user = subscription.connection.user
+            permissions = user.permissions
+            if (
+                not user.is_admin
+                and not permissions.access_all_entities(POLICY_READ)
+                and not permissions.check_entity(entity_id, POLICY_READ)
+            ):
+                continue
+            if not serialized:
+                serialized = True
+                if fragment := messages.state_diff_fragment(event):
+                    metrics.encoded_bytes += len(fragment[1])
+            elif fragment:
+                metrics.reused_bytes += len(fragment[1])
+            if fragment is None:
+                self._async_send_pending(subscription)
+                subscription.connection.send_message(
+                    messages.invalid_json_message(subscription.msg_id)
+                )
+                continue
+            metrics.diffs += 1
+            change = _PendingChange(
+                fragment, event_data["old_state"], event_data["new_state"]
+            )
+            if entity_id in subscription.pending:
+                # A message can only hold one state change per entity
+                self._async_send_pending(subscription)
+            if subscription.queued:
+                self._async_merge_backlog(subscription, entity_id, change)
+                continue
+            subscription.pending[entity_id] = change
+            self._pending[subscription] = None
+
+        if self._pending and not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._hass.loop.call_soon(self._async_flush)
+
+    @callback
+    def _async_merge_backlog(
+        self, subscription: _EntitySubscription, entity_id: str, change: _PendingChange
+    ) -> None:
+        """Merge a state change into the backlog of a subscription."""
+        if (backlog_change := subscription.backlog.get(entity_id)) is None:
+            subscription.backlog[entity_id] = change
+            return
+        # The client never sees the state of the change in the backlog
+        self.metrics.merged += 1
+        backlog_change.fragment = None
+        backlog_change.new_state = change.new_state
+
+    @callback
+    def _async_send_pending(self, subscription: _EntitySubscription) -> None:
+        """Send the pending state changes of a subscription."""
+        if not (pending := subscription.pending):
+            return
+        subscription.pending = {}
+        connection = subscription.connection
+        if (
+            not subscription.queued
+            and connection.send_queue_size() < PENDING_MSG_BACKPRESSURE
+        ):
+            connection.send_message(
+                messages.state_diffs_message(
+                    subscription.msg_id,
+                    [change.fragment for change in pending.values() if change.fragment],
+                )
+            )
+            self.metrics.frames += 1
+            return
+        for entity_id, change in pending.items():
+            self._async_merge_backlog(subscription, entity_id, change)
+        if not subscription.queued:
+            subscription.queued = True
+            connection.send_message(
+                partial(self._async_build_backlog_message, subscription)
+            )
+
+    @callback
+    def _async_flush(self) -> None:
+        """Send the pending state changes of all subscriptions."""
+        self._flush_scheduled = False
+        pending = self._pending
+        self._pending = {}
+        for subscription in pending:
+            self._async_send_pending(subscription)
+
+    @callback
+    def _async_build_backlog_message(
+        self, subscription: _EntitySubscription
+    ) -> bytes | None:
+        """Build the message for the backlog of a subscription.
+
+        This is called by the connection when the message is sent.
+        """
+        subscription.queued = False
+        if not (backlog := subscription.backlog):
+            return None
+        subscription.backlog = {}
+        fragments: list[tuple[str, bytes]] = []
+        for entity_id, change in backlog.items():
+            if (fragment := change.fragment) is None:
+                if change.old_state is None and change.new_state is None:
+                    # Added and removed before the client saw it
+                    continue
+                if (
+                    fragment := messages.state_change_fragment(
+                        entity_id, change.old_state, change.new_state
+                    )
+                ) is None:
+                    continue
+            fragments.append(fragment)
+        if not fragments:
+            return None
+        self.metrics.frames += 1
+        return messages.state_diffs_message(subscription.msg_id, fragments)
+
+
+@callback
+def async_get_entity_broadcaster(hass: HomeAssistant) -> EntityBroadcaster:
+    """Return the entity broadcaster."""
+    if (broadcaster := hass.data.get(DATA_ENTITY_BROADCASTER)) is None:
+        broadcaster = hass.data[DATA_ENTITY_BROADCASTER] = EntityBroadcaster(hass)
+    return broadcaster
@@ -1,7 +1,7 @@
 """Commands part of Websocket API."""
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from functools import lru_cache, partial
 import json
 import logging
@@ -59,6 +59,7 @@ from homeassistant.setup import DATA_SETUP_TIME, async_get_loaded_integrations
 from homeassistant.util.json import format_unserializable_data
 
 from . import const, decorators, messages
+from .broadcast import async_get_entity_broadcaster
 from .connection import ActiveConnection
 from .messages import construct_result_message
 
@@ -306,14 +307,14 @@ async def handle_call_service(
 @callback
 def _async_get_allowed_states(
     hass: HomeAssistant, connection: ActiveConnection
-) -> list[State]:
+) -> Sequence[State]:
     user = connection.user
     if user.is_admin or user.permissions.access_all_entities(POLICY_READ):
-        return hass.states.async_all()
+        return hass.states.async_snapshot()
     entity_perm = connection.user.permissions.check_entity
     return [
         state
-        for state in hass.states.async_all()
+        for state in hass.states.async_snapshot()
         if entity_perm(state.entity_id, POLICY_READ)
     ]
 
@@ -361,30 +362,6 @@ def _send_handle_get_states_response(
     )
 
 
-@callback
-def _forward_entity_changes(
-    send_message: Callable[[str | bytes | dict[str, Any] | Callable[[], str]], None],
-    entity_ids: set[str],
-    user: User,
-    msg_id: int,
-    event: Event,
-) -> None:
-    """Forward entity state changed events to websocket."""
-    entity_id = event.data["entity_id"]
-    if entity_ids and entity_id not in entity_ids:
-        return
-    # We have to lookup the permissions again because the user might have
-    # changed since the subscription was created.
-    permissions = user.permissions
-    if (
-        not user.is_admin
-        and not permissions.access_all_entities(POLICY_READ)
-        and not permissions.check_entity(event.data["entity_id"], POLICY_READ)
-    ):
-        return
-    send_message(messages.cached_state_diff_message(msg_id, event))
-
-
 @callback
 @decorators.websocket_command(
     {
@@ -401,17 +378,9 @@ def handle_subscribe_entities(
     # state changed events or we will introduce a race condition
     # where some states are missed
     states = _async_get_allowed_states(hass, connection)
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED,
-        partial(
-            _forward_entity_changes,
-            connection.send_message,
-            entity_ids,
-            connection.user,
-            msg["id"],
-        ),
-        run_immediately=True,
-    )
+    connection.subscriptions[msg["id"]] = async_get_entity_broadcaster(
+        hass
+    ).async_subscribe(connection, entity_ids, msg["id"])
     connection.send_result(msg["id"])
 
     # JSON serialize here so we can recover if it blows up due to the
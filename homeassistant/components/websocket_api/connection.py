@@ -29,6 +29,11 @@ MessageHandler = Callable[[HomeAssistant, "ActiveConnection", dict[str, Any]], N
 BinaryHandler = Callable[[HomeAssistant, "ActiveConnection", bytes], None]
 
 
+def _no_send_queue() -> int:
+    """Return the size of the send queue of a connection without one."""
+    return 0
+
+
 class ActiveConnection:
     """Handle an active websocket client connection."""
 
@@ -36,6 +41,7 @@ class ActiveConnection:
         "logger",
         "hass",
         "send_message",
+        "send_queue_size",
         "user",
         "refresh_token_id",
         "subscriptions",
@@ -50,14 +56,17 @@ class ActiveConnection:
         self,
         logger: WebSocketAdapter,
         hass: HomeAssistant,
-        send_message: Callable[[bytes | str | dict[str, Any]], None],
+        send_message: Callable[[const.SendMessageType], None],
         user: User,
         refresh_token: RefreshToken,
+        send_queue_size: Callable[[], int] | None = None,
     ) -> None:
         """Initialize an active connection."""
         self.logger = logger
         self.hass = hass
         self.send_message = send_message
+        # Returns the number of messages waiting to be sent to the client
+        self.send_queue_size = send_queue_size or _no_send_queue
         self.user = user
         self.refresh_token_id = refresh_token.id
         self.subscriptions: dict[Hashable, Callable[[], Any]] = {}
@@ -242,9 +251,7 @@ class ActiveConnection:
         current_connection.set(None)
 
     @callback
-    def _connect_closed_error(
-        self, msg: bytes | str | dict[str, Any] | Callable[[], str]
-    ) -> None:
+    def _connect_closed_error(self, msg: const.SendMessageType) -> None:
         """Send a message when the connection is closed."""
         self.logger.debug("Tried to send message %s on closed connection", msg)
 
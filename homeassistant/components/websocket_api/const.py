@@ -16,11 +16,17 @@ WebSocketCommandHandler = Callable[
 AsyncWebSocketCommandHandler = Callable[
     [HomeAssistant, "ActiveConnection", dict[str, Any]], Awaitable[None]
 ]
+# A message or a callable that builds the message when it is sent,
+# the callable returns None if there is nothing to send anymore
+SendMessageType = bytes | str | dict[str, Any] | Callable[[], bytes | None]
 
 DOMAIN: Final = "websocket_api"
 URL: Final = "/api/websocket"
 PENDING_MSG_PEAK: Final = 1024
 PENDING_MSG_PEAK_TIME: Final = 5
+# Once this many messages are pending, state changes for subscribe_entities
+# are merged into a single pending message until the client catches up.
+PENDING_MSG_BACKPRESSURE: Final = 256
 # Maximum number of messages that can be pending at any given time.
 # This is effectively the upper limit of the number of entities
 # that can fire state changes within ~1 second.
@@ -27,6 +27,7 @@ from .const import (
     SIGNAL_WEBSOCKET_CONNECTED,
     SIGNAL_WEBSOCKET_DISCONNECTED,
     URL,
+    SendMessageType,
 )
 from .error import Disconnect
 from .messages import message_to_json_bytes
@@ -95,7 +96,7 @@ class WebSocketHandler:
         # to where messages are queued. This allows the implementation
         # to use a deque and an asyncio.Future to avoid the overhead of
         # an asyncio.Queue.
-        self._message_queue: deque[bytes | None] = deque()
+        self._message_queue: deque[bytes | Callable[[], bytes | None] | None] = deque()
         self._ready_future: asyncio.Future[None] | None = None
 
     def __repr__(self) -> str:
@@ -140,8 +141,12 @@ class WebSocketHandler:
                 if (message := message_queue.popleft()) is None:
                     return
 
-                debug_enabled = is_enabled_for(logging_debug)
                 messages_remaining -= 1
+                # A callable builds the message when it is sent
+                if not isinstance(message, bytes) and (message := message()) is None:
+                    continue
+
+                debug_enabled = is_enabled_for(logging_debug)
 
                 if (
                     not messages_remaining
@@ -158,8 +163,13 @@ class WebSocketHandler:
                     # A None message is used to signal the end of the connection
                     if (message := message_queue.popleft()) is None:
                         return
-                    messages.append(message)
                     messages_remaining -= 1
+                    if (
+                        not isinstance(message, bytes)
+                        and (message := message()) is None
+                    ):
+                        continue
+                    messages.append(message)
 
                 coalesced_messages = b"".join((b"[", b",".join(messages), b"]"))
                 if debug_enabled:
@@ -183,9 +193,13 @@ class WebSocketHandler:
             self._peak_checker_unsub = None
 
     @callback
-    def _send_message(self, message: str | bytes | dict[str, Any]) -> None:
+    def _send_message(self, message: SendMessageType) -> None:
         """Queue sending a message to the client.
 
+        A callable message is called to build the message when it is sent,
+        which allows building a single message from changes that happen
+        while the client is not ready to receive it.
+
         Closes connection if the client is not reading the messages.
 
         Async friendly.
@@ -233,6 +247,11 @@ class WebSocketHandler:
                 self._hass, PENDING_MSG_PEAK_TIME, self._check_write_peak
             )
 
+    @callback
+    def _send_queue_size(self) -> int:
+        """Return the number of messages waiting to be sent."""
+        return len(self._message_queue)
+
     @callback
     def _check_write_peak(self, _utc_time: dt.datetime) -> None:
         """Check that we are no longer above the write peak."""
@@ -299,7 +318,13 @@ class WebSocketHandler:
 
         send_bytes_text = partial(writer.send, binary=False)
         auth = AuthPhase(
-            logger, hass, self._send_message, self._cancel, request, send_bytes_text
+            logger,
+            hass,
+            self._send_message,
+            self._cancel,
+            request,
+            send_bytes_text,
+            self._send_queue_size,
         )
         connection = None
         disconnect_warn = None
@@ -1,9 +1,10 @@
 """Message templates for websocket commands."""
 from __future__ import annotations
 
+from collections.abc import Iterable
 from functools import lru_cache
 import logging
-from typing import TYPE_CHECKING, Any, Final, cast
+from typing import Any, Final
 
 import voluptuous as vol
 
@@ -140,37 +141,69 @@ def _partial_cached_event_message(event: Event) -> bytes:
     )
 
 
-def cached_state_diff_message(iden: int, event: Event) -> bytes:
-    """Return an event message.
+def state_diff_fragment(event: Event) -> tuple[str, bytes] | None:
+    """Serialize a state_changed event to a fragment of a state diff message.
 
-    Serialize to json once per message.
+    Returns the key of the entity event in the message and the
+    serialized entry for that key, or None if the event cannot be
+    serialized. Fragments of different entities can be combined into
+    a single message with state_diffs_message.
+    """
+    return _state_diff_fragment(_state_diff_event(event))
 
-    Since we can have many clients connected that are
-    all getting many of the same events (mostly state changed)
-    we can avoid serializing the same data for each connection.
+
+def state_change_fragment(
+    entity_id: str, old_state: State | None, new_state: State | None
+) -> tuple[str, bytes] | None:
+    """Serialize the change from old_state to new_state to a fragment.
+
+    This is used to merge several state changes of an entity into a
+    single change. old_state is None if the entity was added and
+    new_state is None if it was removed.
     """
+    return _state_diff_fragment(_state_change_diff(entity_id, old_state, new_state))
+
+
+def _state_diff_fragment(diff: dict[str, Any]) -> tuple[str, bytes] | None:
+    """Serialize a state diff of a single entity to a fragment."""
+    kind, entry = next(iter(diff.items()))
+    if (serialized := _message_to_json_bytes_or_none(entry)) is None:
+        return None
+    # Strip the braces or brackets so entries can be joined
+    return kind, serialized[1:-1]
+
+
+def invalid_json_message(iden: int) -> bytes:
+    """Return an error message for a response that cannot be serialized."""
     return b"".join(
-        (
-            _partial_cached_state_diff_message(event)[:-1],
-            b',"id":',
-            str(iden).encode(),
-            b"}",
-        )
+        (INVALID_JSON_PARTIAL_MESSAGE[:-1], b',"id":', str(iden).encode(), b"}")
     )
 
 
-@lru_cache(maxsize=128)
-def _partial_cached_state_diff_message(event: Event) -> bytes:
-    """Cache and serialize the event to json.
+def state_diffs_message(iden: int, fragments: Iterable[tuple[str, bytes]]) -> bytes:
+    """Return an event message combining state diff fragments.
 
-    The message is constructed without the id which
-    will be appended in cached_state_diff_message
+    The fragments must be of different entities since the message
+    can only hold one entry per entity and entity event key.
     """
-    return (
-        _message_to_json_bytes_or_none(
-            {"type": "event", "event": _state_diff_event(event)}
+    entries: dict[str, list[bytes]] = {}
+    for kind, entry in fragments:
+        entries.setdefault(kind, []).append(entry)
+    parts: list[bytes] = []
+    if additions := entries.get(ENTITY_EVENT_ADD):
+        parts.append(b'"a":{' + b",".join(additions) + b"}")
+    if changes := entries.get(ENTITY_EVENT_CHANGE):
+        parts.append(b'"c":{' + b",".join(changes) + b"}")
+    if removals := entries.get(ENTITY_EVENT_REMOVE):
+        parts.append(b'"r":[' + b",".join(removals) + b"]")
+    return b"".join(
+        (
+            b'{"type":"event","event":{',
+            b",".join(parts),
+            b'},"id":',
+            str(iden).encode(),
+            b"}",
         )
-        or INVALID_JSON_PARTIAL_MESSAGE
     )
 
 
@@ -185,19 +218,21 @@ def _state_diff_event(event: Event) -> dict:
         "r": [entity_id,…]
     }
     """
-    if (event_new_state := event.data["new_state"]) is None:
-        return {ENTITY_EVENT_REMOVE: [event.data["entity_id"]]}
-    if TYPE_CHECKING:
-        event_new_state = cast(State, event_new_state)
-    if (event_old_state := event.data["old_state"]) is None:
-        return {
-            ENTITY_EVENT_ADD: {
-                event_new_state.entity_id: event_new_state.as_compressed_state
-            }
-        }
-    if TYPE_CHECKING:
-        event_old_state = cast(State, event_old_state)
-    return _state_diff(event_old_state, event_new_state)
+    event_data = event.data
+    return _state_change_diff(
+        event_data["entity_id"], event_data["old_state"], event_data["new_state"]
+    )
+
+
+def _state_change_diff(
+    entity_id: str, old_state: State | None, new_state: State | None
+) -> dict:
+    """Convert a state change to the minimal version."""
+    if new_state is None:
+        return {ENTITY_EVENT_REMOVE: [entity_id]}
+    if old_state is None:
+        return {ENTITY_EVENT_ADD: {entity_id: new_state.as_compressed_state}}
+    return _state_diff(old_state, new_state)
 
 
 def _state_diff(
@@ -240,7 +275,9 @@ def _state_diff(
     return {ENTITY_EVENT_CHANGE: {new_state.entity_id: diff}}
 
 
-def _message_to_json_bytes_or_none(message: dict[str, Any]) -> bytes | None:
+def _message_to_json_bytes_or_none(
+    message: dict[str, Any] | list[Any],
+) -> bytes | None:
     """Serialize a websocket message to json or return None."""
     try:
         return json_bytes(message)
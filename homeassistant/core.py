@@ -1637,12 +1637,19 @@ class States(UserDict[str, State]):
 
     Maintains an additional index:
     - domain -> dict[str, State]
+
+    Immutable snapshots of all states and of the states of each domain
+    are built on the first read after a change. A change only invalidates
+    the snapshot of the domain of the changed state, so readers of other
+    domains keep iterating the same snapshot without allocating.
     """
 
     def __init__(self) -> None:
         """Initialize the container."""
         super().__init__()
         self._domain_index: defaultdict[str, dict[str, State]] = defaultdict(dict)
+        self._snapshot: tuple[State, ...] | None = None
+        self._domain_snapshots: dict[str, tuple[State, ...]] = {}
 
     def values(self) -> ValuesView[State]:
         """Return the underlying values to avoid __iter__ overhead."""
@@ -1652,12 +1659,39 @@ class States(UserDict[str, State]):
         """Add an item."""
         self.data[key] = entry
         self._domain_index[entry.domain][entry.entity_id] = entry
+        self._snapshot = None
+        self._domain_snapshots.pop(entry.domain, None)
 
     def __delitem__(self, key: str) -> None:
         """Remove an item."""
         entry = self[key]
         del self._domain_index[entry.domain][entry.entity_id]
         super().__delitem__(key)
+        self._snapshot = None
+        self._domain_snapshots.pop(entry.domain, None)
+
+    def domains(self) -> KeysView[str]:
+        """Get all domains that have or had states."""
+        return self._domain_index.keys()
+
+    def snapshot(self) -> tuple[State, ...]:
+        """Get an immutable snapshot of all states."""
+        if (snapshot := self._snapshot) is None:
+            snapshot = self._snapshot = tuple(self.data.values())
+        return snapshot
+
+    def domain_snapshot(self, key: str) -> tuple[State, ...]:
+        """Get an immutable snapshot of the states of a domain.
+
+        The same snapshot is returned until a state of the domain changes.
+        """
+        if (snapshot := self._domain_snapshots.get(key)) is not None:
+            return snapshot
+        # Avoid polluting _domain_index with non-existing domains
+        if key not in self._domain_index:
+            return ()
+        snapshot = self._domain_snapshots[key] = tuple(self._domain_index[key].values())
+        return snapshot
 
     def domain_entity_ids(self, key: str) -> KeysView[str] | tuple[()]:
         """Get all entity_ids for a domain."""
@@ -1758,6 +1792,29 @@ class StateMachine:
             states.extend(self._states.domain_states(domain))
         return states
 
+    @callback
+    def async_domains(self) -> KeysView[str]:
+        """Return the domains that have or had states.
+
+        This method must be run in the event loop.
+        """
+        return self._states.domains()
+
+    @callback
+    def async_snapshot(self, domain_filter: str | None = None) -> tuple[State, ...]:
+        """Return an immutable snapshot of the states matching the filter.
+
+        Unlike async_all, the snapshot is only rebuilt after the states
+        matching the filter changed, so callers that only iterate the
+        states should prefer it. Snapshots of a domain are not rebuilt
+        when the states of other domains change.
+
+        This method must be run in the event loop.
+        """
+        if domain_filter is None:
+            return self._states.snapshot()
+        return self._states.domain_snapshot(domain_filter.lower())
+
     def get(self, entity_id: str) -> State | None:
         """Retrieve state of entity_id or None if not found.
 
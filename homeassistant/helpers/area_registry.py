@@ -1,8 +1,8 @@
 """Provide a way to connect devices to one physical location."""
 from __future__ import annotations
 
-from collections import UserDict
-from collections.abc import Iterable, ValuesView
+from collections import defaultdict
+from collections.abc import Iterable
 import dataclasses
 from typing import Any, Literal, TypedDict, cast
 
@@ -10,6 +10,7 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.util import slugify
 
 from . import device_registry as dr, entity_registry as er
+from .registry import BaseRegistryItems, RegistryIndexType
 from .storage import Store
 from .typing import UNDEFINED, UndefinedType
 
@@ -42,51 +43,63 @@ class AreaEntry:
     picture: str | None
 
 
-class AreaRegistryItems(UserDict[str, AreaEntry]):
+class AreaRegistryItems(BaseRegistryItems[AreaEntry]):
     """Container for area registry items, maps area id -> entry.
 
-    Maintains an additional index:
+    Maintains three additional indexes:
     - normalized name -> entry
+    - floor_id -> dict[key, True]
+    - label -> dict[key, True]
     """
 
     def __init__(self) -> None:
         """Initialize the container."""
         super().__init__()
         self._normalized_names: dict[str, AreaEntry] = {}
-
-    def values(self) -> ValuesView[AreaEntry]:
-        """Return the underlying values to avoid __iter__ overhead."""
-        return self.data.values()
-
-    def __setitem__(self, key: str, entry: AreaEntry) -> None:
-        """Add an item."""
-        data = self.data
-        normalized_name = normalize_area_name(entry.name)
-
-        if key in data:
-            old_entry = data[key]
+        self._floors_index: RegistryIndexType = defaultdict(dict)
+        self._labels_index: RegistryIndexType = defaultdict(dict)
+
+    def _index_entry(self, key: str, entry: AreaEntry) -> None:
+        """Index an entry."""
+        self._normalized_names[normalize_area_name(entry.name)] = entry
+        if entry.floor_id is not None:
+            self._floors_index[entry.floor_id][key] = True
+        for label in entry.labels:
+            self._labels_index[label][key] = True
+
+    def _unindex_entry(
+        self, key: str, replacement_entry: AreaEntry | None = None
+    ) -> None:
+        """Unindex an entry."""
+        old_entry = self.data[key]
+        if replacement_entry is not None:
+            normalized_name = normalize_area_name(replacement_entry.name)
             if (
                 normalized_name != old_entry.normalized_name
                 and normalized_name in self._normalized_names
             ):
                 raise ValueError(
-                    f"The name {entry.name} ({normalized_name}) is already in use"
+                    f"The name {replacement_entry.name} ({normalized_name}) is already"
+                    " in use"
                 )
-            del self._normalized_names[old_entry.normalized_name]
-        data[key] = entry
-        self._normalized_names[normalized_name] = entry
-
-    def __delitem__(self, key: str) -> None:
-        """Remove an item."""
-        entry = self[key]
-        normalized_name = normalize_area_name(entry.name)
-        del self._normalized_names[normalized_name]
-        super().__delitem__(key)
+        del self._normalized_names[old_entry.normalized_name]
+        if old_entry.floor_id is not None:
+            self._unindex_entry_value(key, old_entry.floor_id, self._floors_index)
+        for label in old_entry.labels:
+            self._unindex_entry_value(key, label, self._labels_index)
 
     def get_area_by_name(self, name: str) -> AreaEntry | None:
         """Get area by name."""
         return self._normalized_names.get(normalize_area_name(name))
 
+    def get_areas_for_floor(self, floor_id: str) -> list[AreaEntry]:
+        """Get areas for floor."""
+        return self._get_indexed(floor_id, self._floors_index)
+
+    def get_areas_for_label(self, label: str) -> list[AreaEntry]:
+        """Get areas for label."""
+        return self._get_indexed(label, self._labels_index)
+
 
 class AreaRegistryStore(Store[dict[str, list[dict[str, Any]]]]):
     """Store area registry data."""
@@ -371,9 +384,8 @@ class AreaRegistry:
         def _handle_floor_registry_update(event: fr.EventFloorRegistryUpdated) -> None:
             """Update areas that are associated with a floor that has been removed."""
             floor_id = event.data["floor_id"]
-            for area_id, area in self.areas.items():
-                if floor_id == area.floor_id:
-                    self.async_update(area_id, floor_id=None)
+            for area in self.areas.get_areas_for_floor(floor_id):
+                self.async_update(area.id, floor_id=None)
 
         self.hass.bus.async_listen(
             event_type=fr.EVENT_FLOOR_REGISTRY_UPDATED,
@@ -385,11 +397,8 @@ class AreaRegistry:
         def _handle_label_registry_update(event: lr.EventLabelRegistryUpdated) -> None:
             """Update areas that have a label that has been removed."""
             label_id = event.data["label_id"]
-            for area_id, area in self.areas.items():
-                if label_id in area.labels:
-                    labels = area.labels.copy()
-                    labels.remove(label_id)
-                    self.async_update(area_id, labels=labels)
+            for area in self.areas.get_areas_for_label(label_id):
+                self.async_update(area.id, labels=area.labels - {label_id})
 
         self.hass.bus.async_listen(
             event_type=lr.EVENT_LABEL_REGISTRY_UPDATED,
@@ -414,13 +423,13 @@ async def async_load(hass: HomeAssistant) -> None:
 @callback
 def async_entries_for_floor(registry: AreaRegistry, floor_id: str) -> list[AreaEntry]:
     """Return entries that match a floor."""
-    return [area for area in registry.areas.values() if floor_id == area.floor_id]
+    return registry.areas.get_areas_for_floor(floor_id)
 
 
 @callback
 def async_entries_for_label(registry: AreaRegistry, label_id: str) -> list[AreaEntry]:
     """Return entries that match a label."""
-    return [area for area in registry.areas.values() if label_id in area.labels]
+    return registry.areas.get_areas_for_label(label_id)
 
 
 def normalize_area_name(area_name: str) -> str:
@@ -271,6 +271,37 @@ class CalculatedState:
     shadowed_attributes: Mapping[str, Any]
 
 
+def _static_attributes(
+    unit_of_measurement: str | None,
+    assumed_state: bool,
+    attribution: str | None,
+    device_class: str | None,
+    entity_picture: str | None,
+    icon: str | None,
+    name: str | None,
+    supported_features: int | None,
+) -> dict[str, Any]:
+    """Return the state attributes which do not depend on the state."""
+    attr: dict[str, Any] = {}
+    if unit_of_measurement is not None:
+        attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
+    if assumed_state:
+        attr[ATTR_ASSUMED_STATE] = assumed_state
+    if attribution is not None:
+        attr[ATTR_ATTRIBUTION] = attribution
+    if device_class is not None:
+        attr[ATTR_DEVICE_CLASS] = str(device_class)
+    if entity_picture is not None:
+        attr[ATTR_ENTITY_PICTURE] = entity_picture
+    if icon is not None:
+        attr[ATTR_ICON] = icon
+    if name is not None:
+        attr[ATTR_FRIENDLY_NAME] = name
+    if supported_features is not None:
+        attr[ATTR_SUPPORTED_FEATURES] = supported_features
+    return attr
+
+
 class CachedProperties(type):
     """Metaclass which invalidates cached entity properties on write to _attr_.
 
@@ -527,6 +558,11 @@ class Entity(
     # and removes the need for constant None checks or asserts.
     _state_info: StateInfo = None  # type: ignore[assignment]
 
+    # The static attributes of the last written state and the values they
+    # were built from
+    __static_attr: dict[str, Any]
+    __static_attr_values: tuple[Any, ...] | None = None
+
     __capabilities_updated_at: deque[float]
     __capabilities_updated_at_reported: bool = False
     __remove_event: asyncio.Event | None = None
@@ -1049,37 +1085,29 @@ class Entity(
             attr.update(self.state_attributes or {})
             attr.update(self.extra_state_attributes or {})
 
-        if (unit_of_measurement := self.unit_of_measurement) is not None:
-            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
-
-        if assumed_state := self.assumed_state:
-            attr[ATTR_ASSUMED_STATE] = assumed_state
-
-        if (attribution := self.attribution) is not None:
-            attr[ATTR_ATTRIBUTION] = attribution
-
+        unit_of_measurement = self.unit_of_measurement
+        assumed_state = self.assumed_state
+        attribution = self.attribution
         shadowed_attr[ATTR_DEVICE_CLASS] = self.device_class
-        if (
-            device_class := (entry and entry.device_class)
-            or shadowed_attr[ATTR_DEVICE_CLASS]
-        ) is not None:
-            attr[ATTR_DEVICE_CLASS] = str(device_class)
-
-        if (entity_picture := self.entity_picture) is not None:
-            attr[ATTR_ENTITY_PICTURE] = entity_picture
-
+        entity_picture = self.entity_picture
         shadowed_attr[ATTR_ICON] = self.icon
-        if (icon := (entry and entry.icon) or shadowed_attr[ATTR_ICON]) is not None:
-            attr[ATTR_ICON] = icon
-
         shadowed_attr[ATTR_FRIENDLY_NAME] = self._friendly_name_internal()
-        if (
-            name := (entry and entry.name) or shadowed_attr[ATTR_FRIENDLY_NAME]
-        ) is not None:
-            attr[ATTR_FRIENDLY_NAME] = name
-
-        if (supported_features := self.supported_features) is not None:
-            attr[ATTR_SUPPORTED_FEATURES] = supported_features
+        static_attr_values = (
+            unit_of_measurement,
+            assumed_state,
+            attribution,
+            (entry and entry.device_class) or shadowed_attr[ATTR_DEVICE_CLASS],
+            entity_picture,
+            (entry and entry.icon) or shadowed_attr[ATTR_ICON],
+            (entry and entry.name) or shadowed_attr[ATTR_FRIENDLY_NAME],
+            self.supported_features,
+        )
+        # The static attributes rarely change, only rebuild them when
+        # one of their values changed
+        if static_attr_values != self.__static_attr_values:
+            self.__static_attr = _static_attributes(*static_attr_values)
+            self.__static_attr_values = static_attr_values
+        attr.update(self.__static_attr)
 
         return (state, attr, capability_attr, shadowed_attr)
 
@@ -1168,12 +1196,22 @@ class Entity(
             self._context = None
             self._context_set = None
 
+        force_update = self.force_update
+        if (
+            not force_update
+            and (old_state := hass.states.get(entity_id)) is not None
+            and old_state.state == state
+            and old_state.attributes == attr
+        ):
+            # The state machine would ignore the write
+            return
+
         try:
             hass.states.async_set(
                 entity_id,
                 state,
                 attr,
-                self.force_update,
+                force_update,
                 self._context,
                 self._state_info,
             )
@@ -1182,7 +1220,7 @@ class Entity(
                 "Failed to set state for %s, fall back to %s", entity_id, STATE_UNKNOWN
             )
             hass.states.async_set(
-                entity_id, STATE_UNKNOWN, {}, self.force_update, self._context
+                entity_id, STATE_UNKNOWN, {}, force_update, self._context
             )
 
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Awaitable, Callable, Coroutine, Iterable
+from collections.abc import Awaitable, Callable, Coroutine, Hashable, Iterable
 from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from functools import partial
 from logging import Logger, getLogger
+from timeit import default_timer as timer
 from typing import TYPE_CHECKING, Any, Protocol
 
 import voluptuous as vol
@@ -46,6 +48,7 @@ from .issue_registry import IssueSeverity, async_create_issue
 from .typing import UNDEFINED, ConfigType, DiscoveryInfoType
 
 if TYPE_CHECKING:
+    from .device_registry import DeviceInfo
     from .entity import Entity
 
 
@@ -54,6 +57,10 @@ SLOW_SETUP_MAX_WAIT = 60
 SLOW_ADD_ENTITY_MAX_WAIT = 15  # Per Entity
 SLOW_ADD_MIN_TIMEOUT = 500
 
+# The polling interval is stretched up to this many scan intervals
+# while the updates of the entities take longer than the scan interval
+MAX_POLL_INTERVAL_MULTIPLE = 10
+
 PLATFORM_NOT_READY_RETRIES = 10
 DATA_ENTITY_PLATFORM = "entity_platform"
 DATA_DOMAIN_ENTITIES = "domain_entities"
@@ -63,6 +70,37 @@ PLATFORM_NOT_READY_BASE_WAIT_TIME = 30  # seconds
 _LOGGER = getLogger(__name__)
 
 
+def _freeze(value: Any) -> Any:
+    """Return a hashable version of a device info value."""
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    return value
+
+
+def _device_info_key(device_info: DeviceInfo) -> Hashable | None:
+    """Return a key for the device info, None if it is not hashable."""
+    key: Hashable = _freeze(device_info)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+@dataclass(slots=True)
+class PollingStats:
+    """Statistics of the polling of an entity platform."""
+
+    polls: int = 0
+    skipped_polls: int = 0
+    last_poll_duration: float = 0.0
+    max_poll_duration: float = 0.0
+
+
 class AddEntitiesCallback(Protocol):
     """Protocol type for EntityPlatform.add_entities callback."""
 
@@ -140,6 +178,10 @@ class EntityPlatform:
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: CALLBACK_TYPE | None = None
         self._process_updates: asyncio.Lock | None = None
+        # The scan intervals between the polls, more than one while
+        # the updates take longer than the scan interval
+        self._poll_interval_multiple = 1
+        self.polling_stats = PollingStats()
 
         self.parallel_updates: asyncio.Semaphore | None = None
         self._update_in_sequence: bool = False
@@ -345,11 +387,11 @@ class EntityPlatform:
 
                 # Block till all entities are done
                 while self._tasks:
-                    pending = [task for task in self._tasks if not task.done()]
+                    # Entities without updates before they are added may
+                    # already be done, their errors are raised by gather
+                    tasks = self._tasks.copy()
                     self._tasks.clear()
-
-                    if pending:
-                        await asyncio.gather(*pending)
+                    await asyncio.gather(*tasks)
 
                 hass.config.components.add(full_name)
                 self._setup_complete = True
@@ -515,22 +557,19 @@ class EntityPlatform:
         if not new_entities:  # type: ignore[truthy-iterable]
             return
 
-        hass = self.hass
-
-        entity_registry = ent_reg.async_get(hass)
-        tasks = [
-            self._async_add_entity(entity, update_before_add, entity_registry)
-            for entity in new_entities
-        ]
+        entities = list(new_entities)
 
         # No entities for processing
-        if not tasks:
+        if not entities:
             return
 
-        timeout = max(SLOW_ADD_ENTITY_MAX_WAIT * len(tasks), SLOW_ADD_MIN_TIMEOUT)
+        entity_registry = ent_reg.async_get(self.hass)
+        timeout = max(SLOW_ADD_ENTITY_MAX_WAIT * len(entities), SLOW_ADD_MIN_TIMEOUT)
         try:
             async with self.hass.timeout.async_timeout(timeout, self.domain):
-                await asyncio.gather(*tasks)
+                await self._async_add_entities(
+                    entities, update_before_add, entity_registry
+                )
         except TimeoutError:
             self.logger.warning(
                 "Timed out adding entities for domain %s with platform %s after %ds",
@@ -553,10 +592,15 @@ class EntityPlatform:
         ):
             return
 
-        self._async_unsub_polling = async_track_time_interval(
+        self._async_unsub_polling = self._async_track_polling()
+
+    @callback
+    def _async_track_polling(self) -> CALLBACK_TYPE:
+        """Track the polling interval of the entities."""
+        return async_track_time_interval(
             self.hass,
             self._update_entity_states,
-            self.scan_interval,
+            self.scan_interval * self._poll_interval_multiple,
             name=f"EntityPlatform poll {self.domain}.{self.platform_name}",
         )
 
@@ -576,32 +620,110 @@ class EntityPlatform:
                 already_exists = True
         return (already_exists, restored)
 
-    async def _async_add_entity(  # noqa: C901
+    async def _async_add_entities(
         self,
-        entity: Entity,
+        entities: list[Entity],
         update_before_add: bool,
         entity_registry: EntityRegistry,
     ) -> None:
-        """Add an entity to the platform."""
-        if entity is None:
-            raise ValueError("Entity cannot be None")
+        """Add a batch of entities to the platform.
 
-        entity.add_to_platform_start(
-            self.hass,
-            self,
-            self._get_parallel_updates_semaphore(hasattr(entity, "update")),
-        )
+        The entities are registered in a single pass which resolves each
+        distinct device once. Only the device updates and adding the
+        entities to Home Assistant are awaited.
+
+        The first error is raised once the other entities have been added.
+        """
+        errors: list[Exception] = []
+        started: list[Entity] = []
+        for entity in entities:
+            if entity is None:
+                errors.append(ValueError("Entity cannot be None"))  # type: ignore[unreachable]
+                continue
+            entity.add_to_platform_start(
+                self.hass,
+                self,
+                self._get_parallel_updates_semaphore(hasattr(entity, "update")),
+            )
+            started.append(entity)
 
         # Update properties before we generate the entity_id. This will happen
         # also for disabled entities.
         if update_before_add:
+            updated = await asyncio.gather(
+                *(self._async_update_before_add(entity) for entity in started)
+            )
+            started = [entity for entity, success in zip(started, updated) if success]
+
+        devices: dict[Hashable, dev_reg.DeviceEntry | dev_reg.DeviceInfoError] = {}
+        registered: list[Entity] = []
+        for entity in started:
             try:
-                await entity.async_device_update(warning=False)
-            except Exception:  # pylint: disable=broad-except
-                self.logger.exception("%s: Error on device update!", self.platform_name)
-                entity.add_to_platform_abort()
-                return
+                if self._async_register_entity(entity, entity_registry, devices):
+                    registered.append(entity)
+            except Exception as err:  # pylint: disable=broad-except
+                errors.append(err)
+
+        if registered:
+            await asyncio.gather(
+                *(entity.add_to_platform_finish() for entity in registered)
+            )
+        if errors:
+            raise errors[0]
 
+    async def _async_update_before_add(self, entity: Entity) -> bool:
+        """Update an entity before it is added, return False if it failed."""
+        try:
+            await entity.async_device_update(warning=False)
+        except Exception:  # pylint: disable=broad-except
+            self.logger.exception("%s: Error on device update!", self.platform_name)
+            entity.add_to_platform_abort()
+            return False
+        return True
+
+    @callback
+    def _async_get_or_create_device(
+        self,
+        device_info: DeviceInfo,
+        devices: dict[Hashable, dev_reg.DeviceEntry | dev_reg.DeviceInfoError],
+    ) -> dev_reg.DeviceEntry:
+        """Get or create the device of an entity.
+
+        Entities of the same device usually have the same device info,
+        the device is only looked up once per batch for each of them.
+        """
+        if TYPE_CHECKING:
+            assert self.config_entry is not None
+        if (key := _device_info_key(device_info)) is not None and (
+            device_or_error := devices.get(key)
+        ) is not None:
+            if isinstance(device_or_error, dev_reg.DeviceInfoError):
+                raise device_or_error
+            return device_or_error
+        try:
+            device = dev_reg.async_get(self.hass).async_get_or_create(
+                config_entry_id=self.config_entry.entry_id,
+                **device_info,
+            )
+        except dev_reg.DeviceInfoError as exc:
+            if key is not None:
+                devices[key] = exc
+            raise
+        if key is not None:
+            devices[key] = device
+        return device
+
+    @callback
+    def _async_register_entity(  # noqa: C901
+        self,
+        entity: Entity,
+        entity_registry: EntityRegistry,
+        devices: dict[Hashable, dev_reg.DeviceEntry | dev_reg.DeviceInfoError],
+    ) -> bool:
+        """Register an entity with the platform.
+
+        Returns False if the entity is not added.
+        """
         suggested_object_id: str | None = None
         generate_new_entity_id = False
 
@@ -635,14 +757,11 @@ class EntityPlatform:
                         )
                     self.logger.error(msg)
                     entity.add_to_platform_abort()
-                    return
+                    return False
 
             if self.config_entry and (device_info := entity.device_info):
                 try:
-                    device = dev_reg.async_get(self.hass).async_get_or_create(
-                        config_entry_id=self.config_entry.entry_id,
-                        **device_info,
-                    )
+                    device = self._async_get_or_create_device(device_info, devices)
                 except dev_reg.DeviceInfoError as exc:
                     self.logger.error(
                         "%s: Not adding entity with invalid device info: %s",
@@ -650,7 +769,7 @@ class EntityPlatform:
                         str(exc),
                     )
                     entity.add_to_platform_abort()
-                    return
+                    return False
             else:
                 device = None
 
@@ -746,7 +865,7 @@ class EntityPlatform:
                 "Entity id already exists - ignoring: %s", entity.entity_id
             )
             entity.add_to_platform_abort()
-            return
+            return False
 
         if entity.registry_entry and entity.registry_entry.disabled:
             self.logger.debug(
@@ -756,7 +875,7 @@ class EntityPlatform:
                 or f'"{self.platform_name} {entity.unique_id}"',
             )
             entity.add_to_platform_abort()
-            return
+            return False
 
         entity_id = entity.entity_id
         self.entities[entity_id] = entity
@@ -778,8 +897,7 @@ class EntityPlatform:
             self.domain_platform_entities.pop(entity_id)
 
         entity.async_on_remove(remove_entity_cb)
-
-        await entity.add_to_platform_finish()
+        return True
 
     async def async_reset(self) -> None:
         """Remove all entities and reset data.
@@ -897,26 +1015,64 @@ class EntityPlatform:
                 self.domain,
                 self.scan_interval,
             )
+            self.polling_stats.skipped_polls += 1
             return
 
-        async with self._process_updates:
-            if self._update_in_sequence or len(self.entities) <= 1:
-                # If we know we will update sequentially, we want to avoid scheduling
-                # the coroutines as tasks that will wait on the semaphore lock.
-                for entity in list(self.entities.values()):
-                    # If the entity is removed from hass during the previous
-                    # entity being updated, we need to skip updating the
-                    # entity.
-                    if entity.should_poll and entity.hass:
-                        await entity.async_update_ha_state(True)
-                return
-
-            if tasks := [
-                entity.async_update_ha_state(True)
-                for entity in self.entities.values()
-                if entity.should_poll
-            ]:
-                await asyncio.gather(*tasks)
+        start = timer()
+        try:
+            async with self._process_updates:
+                if self._update_in_sequence or len(self.entities) <= 1:
+                    # If we know we will update sequentially, we want to avoid
+                    # scheduling the coroutines as tasks that will wait on the
+                    # semaphore lock.
+                    for entity in list(self.entities.values()):
+                        # If the entity is removed from hass during the previous
+                        # entity being updated, we need to skip updating the
+                        # entity.
+                        if entity.should_poll and entity.hass:
+                            await entity.async_update_ha_state(True)
+                    return
+
+                if tasks := [
+                    entity.async_update_ha_state(True)
+                    for entity in self.entities.values()
+                    if entity.should_poll
+                ]:
+                    await asyncio.gather(*tasks)
+        finally:
+            self._async_polled(timer() - start)
+
+    @callback
+    def _async_polled(self, duration: float) -> None:
+        """Record a poll and adapt the polling interval to its duration.
+
+        The interval is stretched to the scan intervals the updates take
+        instead of skipping the polls while the previous one is running,
+        and restored once the updates are fast enough again.
+        """
+        stats = self.polling_stats
+        stats.polls += 1
+        stats.last_poll_duration = duration
+        stats.max_poll_duration = max(stats.max_poll_duration, duration)
+
+        if (scan_interval := self.scan_interval.total_seconds()) <= 0:
+            return
+        multiple = min(int(duration // scan_interval) + 1, MAX_POLL_INTERVAL_MULTIPLE)
+        if multiple == self._poll_interval_multiple:
+            return
+        self._poll_interval_multiple = multiple
+        if self._async_unsub_polling is None:
+            return
+        if multiple > 1:
+            self.logger.debug(
+                "Polling %s %s every %s while the updates take %.1f seconds",
+                self.platform_name,
+                self.domain,
+                self.scan_interval * multiple,
+                duration,
+            )
+        self._async_unsub_polling()
+        self._async_unsub_polling = self._async_track_polling()
 
 
 current_platform: ContextVar[EntityPlatform | None] = ContextVar(
@@ -946,3 +1102,24 @@ def async_get_platforms(
     platforms: list[EntityPlatform] = hass.data[DATA_ENTITY_PLATFORM][integration_name]
 
     return platforms
+
+
+@callback
+def async_get_polling_stats(hass: HomeAssistant) -> dict[str, PollingStats]:
+    """Return the polling stats of the entity platforms that have polled.
+
+    The stats are keyed by domain and platform name, followed by the
+    config entry id for platforms set up from a config entry.
+    """
+    polling_stats: dict[str, PollingStats] = {}
+    platforms: dict[str, list[EntityPlatform]] = hass.data.get(DATA_ENTITY_PLATFORM, {})
+    for integration_platforms in platforms.values():
+        for platform in integration_platforms:
+            stats = platform.polling_stats
+            if not stats.polls and not stats.skipped_polls:
+                continue
+            key = f"{platform.domain}.{platform.platform_name}"
+            if platform.config_entry:
+                key = f"{key} ({platform.config_entry.entry_id})"
+            polling_stats[key] = stats
+    return polling_stats
@@ -13,6 +13,7 @@ import time
 from typing import TYPE_CHECKING, Any, Concatenate, ParamSpec, TypedDict, TypeVar
 
 import attr
+from lru import LRU
 
 from homeassistant.const import (
     EVENT_CORE_CONFIG_UPDATE,
@@ -67,6 +68,17 @@ _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
 
+_TEMPLATE_RENDER_SCHEDULER = "template_render_scheduler"
+
+# Refreshes of tracked templates triggered by state changes are rendered
+# in slices. Once the renders of a slice took longer than this, the
+# remaining refreshes are rendered in the next iteration of the event
+# loop so other callbacks are not starved.
+TEMPLATE_RENDER_SLICE_TIME = 0.05
+
+# The number of template sources to keep render time stats for
+TEMPLATE_RENDER_STATS_SIZE = 1024
+
 _LOGGER = logging.getLogger(__name__)
 
 # Used to spread async_track_utc_time_change listeners and DataUpdateCoordinator
@@ -108,6 +120,15 @@ class TrackTemplate:
     rate_limit: timedelta | None = None
 
 
+@dataclass(slots=True)
+class TemplateRenderStats:
+    """Class for the render time stats of a tracked template source."""
+
+    renders: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+
 @dataclass(slots=True)
 class TrackTemplateResult:
     """Class for result of template tracking.
@@ -914,6 +935,9 @@ class TrackTemplateResultInfo:
         self._info: dict[Template, RenderInfo] = {}
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable[[], None]] = {}
+        self._render_scheduler = _async_get_template_render_scheduler(hass)
+        self._strict = False
+        self._log_fn: Callable[[int, str], None] | None = None
 
     def __repr__(self) -> str:
         """Return the representation."""
@@ -925,6 +949,8 @@ class TrackTemplateResultInfo:
         log_fn: Callable[[int, str], None] | None = None,
     ) -> None:
         """Activation of template tracking."""
+        self._strict = strict
+        self._log_fn = log_fn
         block_render = False
         super_template = self._track_templates[0] if self._has_super_template else None
 
@@ -968,7 +994,9 @@ class TrackTemplateResultInfo:
                     log_fn(logging.ERROR, str(info.exception))
 
         self._track_state_changes = async_track_state_change_filtered(
-            self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
+            self.hass,
+            _render_infos_to_track_states(self._info.values()),
+            self._async_schedule_refresh,
         )
         self._update_time_listeners()
         _LOGGER.debug(
@@ -1026,6 +1054,7 @@ class TrackTemplateResultInfo:
         assert self._track_state_changes
         self._track_state_changes.async_remove()
         self._rate_limit.async_remove()
+        self._render_scheduler.async_cancel(self)
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
 
@@ -1034,6 +1063,45 @@ class TrackTemplateResultInfo:
         """Force recalculate the template."""
         self._refresh(None)
 
+    @callback
+    def _async_schedule_refresh(self, event: EventType[EventStateChangedData]) -> None:
+        """Schedule a refresh for a state change."""
+        self._render_scheduler.async_schedule(self, event)
+
+    @callback
+    def _async_refresh_events(
+        self, events: list[EventType[EventStateChangedData]]
+    ) -> None:
+        """Refresh the templates for the state changes of a loop iteration.
+
+        Each template is refreshed once for the last of the state changes
+        that triggers a re-render of the template, preferring state changes
+        that are not rate limited for the template.
+        """
+        if len(events) == 1 or self._has_super_template:
+            for event in events:
+                self._refresh(event)
+            return
+
+        triggered: dict[EventType[EventStateChangedData], list[TrackTemplate]] = {}
+        for track_template_ in self._track_templates:
+            info = self._info[track_template_.template]
+            trigger: EventType[EventStateChangedData] | None = None
+            for event in reversed(events):
+                if not _event_triggers_rerender(event, info):
+                    continue
+                if _rate_limit_for_event(event, info, track_template_) is None:
+                    trigger = event
+                    break
+                if trigger is None:
+                    trigger = event
+            if trigger is not None:
+                triggered.setdefault(trigger, []).append(track_template_)
+
+        for event in events:
+            if track_templates := triggered.get(event):
+                self._refresh(event, track_templates)
+
     def _render_template_if_ready(
         self,
         track_template_: TrackTemplate,
@@ -1078,8 +1146,8 @@ class TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
-        self._info[template] = info = template.async_render_to_info(
-            track_template_.variables
+        self._info[template] = info = self._render_scheduler.async_render_to_info(
+            template, track_template_.variables, self._strict, self._log_fn
         )
 
         try:
@@ -1221,6 +1289,144 @@ class TrackTemplateResultInfo:
         self.hass.async_run_hass_job(self._job, event, updates)
 
 
+class _TemplateRenderScheduler:
+    """Coalesce the refreshes of tracked templates triggered by state changes.
+
+    All state changes that trigger a refresh of a TrackTemplateResultInfo
+    in the same iteration of the event loop are handled together, so each
+    of its templates is rendered at most once.
+
+    Templates with the same source, environment and variables are rendered
+    once per slice as long as no other state changes that trigger a refresh
+    happen.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._pending: dict[
+            TrackTemplateResultInfo, list[EventType[EventStateChangedData]]
+        ] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._rendering = False
+        self._renders: dict[
+            tuple[str, bool, bool], list[tuple[TemplateVarsType, RenderInfo]]
+        ] = {}
+        self.stats: LRU[str, TemplateRenderStats] = LRU(TEMPLATE_RENDER_STATS_SIZE)
+
+    @callback
+    def async_schedule(
+        self,
+        track_info: TrackTemplateResultInfo,
+        event: EventType[EventStateChangedData],
+    ) -> None:
+        """Schedule a refresh of a tracker for a state change."""
+        # The state changed so renders of this slice can no longer be reused
+        self._renders.clear()
+        if (events := self._pending.get(track_info)) is None:
+            self._pending[track_info] = [event]
+        else:
+            events.append(event)
+        if self._task is None:
+            self._task = self._hass.async_create_task(
+                self._async_render_pending(), "template render scheduler"
+            )
+
+    @callback
+    def async_cancel(self, track_info: TrackTemplateResultInfo) -> None:
+        """Cancel the pending refresh of a tracker."""
+        self._pending.pop(track_info, None)
+
+    async def _async_render_pending(self) -> None:
+        """Refresh the pending trackers in slices."""
+        try:
+            while self._pending:
+                self._async_render_slice()
+                # Yield to the event loop between slices
+                await asyncio.sleep(0)
+        finally:
+            self._task = None
+
+    @callback
+    def _async_render_slice(self) -> None:
+        """Refresh the pending trackers until the slice time is used up."""
+        self._rendering = True
+        pending = self._pending
+        deadline = time.monotonic() + TEMPLATE_RENDER_SLICE_TIME
+        try:
+            while pending:
+                track_info = next(iter(pending))
+                # pylint: disable-next=protected-access
+                track_info._async_refresh_events(pending.pop(track_info))
+                if time.monotonic() > deadline:
+                    break
+        finally:
+            self._rendering = False
+            self._renders.clear()
+
+    @callback
+    def async_render_to_info(
+        self,
+        template: Template,
+        variables: TemplateVarsType,
+        strict: bool,
+        log_fn: Callable[[int, str], None] | None,
+    ) -> RenderInfo:
+        """Render a template and collect its render time.
+
+        While rendering a slice, the render of a template with the same
+        source, environment and variables is reused. Each template gets
+        its own copy of the render info.
+        """
+        # pylint: disable-next=protected-access
+        key = (template.template, bool(template._limited), strict)
+        reusable = self._rendering and log_fn is None
+        if reusable and (renders := self._renders.get(key)):
+            for render_variables, info in renders:
+                if render_variables == variables:
+                    info = copy.copy(info)
+                    info.template = template
+                    return info
+
+        start = time.perf_counter()
+        info = template.async_render_to_info(variables)
+        render_time = time.perf_counter() - start
+
+        if (stats := self.stats.get(template.template)) is None:
+            stats = self.stats[template.template] = TemplateRenderStats()
+        stats.renders += 1
+        stats.total_time += render_time
+        stats.max_time = max(stats.max_time, render_time)
+
+        if reusable:
+            self._renders.setdefault(key, []).append((variables, copy.copy(info)))
+        return info
+
+
+@callback
+def _async_get_template_render_scheduler(
+    hass: HomeAssistant,
+) -> _TemplateRenderScheduler:
+    """Return the template render scheduler."""
+    if (scheduler := hass.data.get(_TEMPLATE_RENDER_SCHEDULER)) is None:
+        scheduler = hass.data[_TEMPLATE_RENDER_SCHEDULER] = _TemplateRenderScheduler(
+            hass
+        )
+    return scheduler
+
+
+@callback
+def async_get_template_render_stats(
+    hass: HomeAssistant,
+) -> dict[str, TemplateRenderStats]:
+    """Return the render time stats of the tracked template sources.
+
+    Only renders of templates that are re-rendered by a tracker
+    after the initial render are included.
+    """
+    return dict(_async_get_template_render_scheduler(hass).stats.items())
+
+
 TrackTemplateResultListener = Callable[
     [
         EventType[EventStateChangedData] | None,
@@ -0,0 +1,70 @@
+"""Provide a base implementation for registries."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import UserDict, defaultdict
+from collections.abc import Mapping, ValuesView
+from typing import Literal, TypeVar
+
+_DataT = TypeVar("_DataT")
+
+# Maps an indexed value to the keys of the entries with that value,
+# the keys are stored in a dict to keep their insertion order
+RegistryIndexType = defaultdict[str, dict[str, Literal[True]]]
+
+
+class BaseRegistryItems(UserDict[str, _DataT], ABC):
+    """Base class for registry items, maps key -> entry.
+
+    The indexes of the entries are maintained incrementally as they are
+    added, replaced and removed so the entries with a value can be looked
+    up without scanning the registry.
+    """
+
+    def values(self) -> ValuesView[_DataT]:
+        """Return the underlying values to avoid __iter__ overhead."""
+        return self.data.values()
+
+    @abstractmethod
+    def _index_entry(self, key: str, entry: _DataT) -> None:
+        """Index an entry."""
+
+    @abstractmethod
+    def _unindex_entry(self, key: str, replacement_entry: _DataT | None = None) -> None:
+        """Unindex an entry.
+
+        replacement_entry is the entry replacing it, if any.
+        """
+
+    def __setitem__(self, key: str, entry: _DataT) -> None:
+        """Add an item."""
+        data = self.data
+        if key in data:
+            self._unindex_entry(key, entry)
+        data[key] = entry
+        self._index_entry(key, entry)
+
+    def __delitem__(self, key: str) -> None:
+        """Remove an item."""
+        self._unindex_entry(key)
+        super().__delitem__(key)
+
+    @staticmethod
+    def _unindex_entry_value(key: str, value: str, index: RegistryIndexType) -> None:
+        """Unindex an entry value.
+
+        key is the key of the entry
+        value is the value to unindex such as config_entry_id or device_id.
+        index is the index to unindex from.
+        """
+        entries = index[value]
+        del entries[key]
+        if not entries:
+            del index[value]
+
+    def _get_indexed(
+        self, value: str, index: Mapping[str, dict[str, Literal[True]]]
+    ) -> list[_DataT]:
+        """Get the entries with a value from an index."""
+        data = self.data
+        return [data[key] for key in index.get(value, ())]
@@ -29,6 +29,7 @@ from homeassistant.const import (
 from homeassistant.core import (
     Context,
     EntityServiceResponse,
+    Event,
     HassJob,
     HomeAssistant,
     ServiceCall,
@@ -56,6 +57,7 @@ from . import (
 )
 from .group import expand_entity_ids
 from .selector import TargetSelector
+from .singleton import singleton
 from .typing import ConfigType, TemplateVarsType
 
 if TYPE_CHECKING:
@@ -70,6 +72,10 @@ _LOGGER = logging.getLogger(__name__)
 
 SERVICE_DESCRIPTION_CACHE = "service_description_cache"
 ALL_SERVICE_DESCRIPTIONS_CACHE = "all_service_descriptions_cache"
+REFERENCED_TARGETS_CACHE = "service_referenced_targets_cache"
+
+# The cache is cleared when it grows past this many targets
+MAX_REFERENCED_TARGETS = 1024
 
 
 @cache
@@ -473,61 +479,150 @@ def async_extract_referenced_entity_ids(
     if not selector.device_ids and not selector.area_ids:
         return selected
 
-    ent_reg = entity_registry.async_get(hass)
-    dev_reg = device_registry.async_get(hass)
-    area_reg = area_registry.async_get(hass)
+    targets = async_get_referenced_targets_cache(hass).async_get(
+        selector.device_ids, selector.area_ids
+    )
+    selected.missing_devices.update(targets.missing_devices)
+    selected.missing_areas.update(targets.missing_areas)
+    selected.referenced_devices.update(targets.referenced_devices)
+    selected.indirectly_referenced.update(targets.indirectly_referenced)
+    return selected
 
-    for device_id in selector.device_ids:
-        if device_id not in dev_reg.devices:
-            selected.missing_devices.add(device_id)
 
-    for area_id in selector.area_ids:
-        if area_id not in area_reg.areas:
-            selected.missing_areas.add(area_id)
+@dataclasses.dataclass(frozen=True, slots=True)
+class ReferencedTargets:
+    """Class to hold the registry entries referenced by device and area IDs."""
 
-    # Find devices for targeted areas
-    selected.referenced_devices.update(selector.device_ids)
+    missing_devices: frozenset[str]
+    missing_areas: frozenset[str]
+    referenced_devices: frozenset[str]
+    indirectly_referenced: frozenset[str]
 
-    if selector.area_ids:
-        for device_entry in dev_reg.devices.values():
-            if device_entry.area_id in selector.area_ids:
-                selected.referenced_devices.add(device_entry.id)
 
-    if not selector.area_ids and not selected.referenced_devices:
-        return selected
+class ReferencedTargetsCache:
+    """Cache the entities and devices referenced by device and area IDs.
 
-    entities = ent_reg.entities
-    # Add indirectly referenced by area
-    selected.indirectly_referenced.update(
-        entry.entity_id
-        for area_id in selector.area_ids
-        # The entity's area matches a targeted area
-        for entry in entities.get_entries_for_area_id(area_id)
-        # Do not add entities which are hidden or which are config
-        # or diagnostic entities.
-        if entry.entity_category is None and entry.hidden_by is None
-    )
-    # Add indirectly referenced by device
-    selected.indirectly_referenced.update(
-        entry.entity_id
-        for device_id in selected.referenced_devices
-        for entry in entities.get_entries_for_device_id(device_id)
-        # Do not add entities which are hidden or which are config
-        # or diagnostic entities.
+    The cache is cleared when the entity, device or area registry is
+    updated.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.hits = 0
+        self.misses = 0
+        self._targets: dict[
+            tuple[frozenset[str], frozenset[str]], ReferencedTargets
+        ] = {}
+        # The registry entries the targets were resolved from, they are
+        # replaced without update events when the registries are mocked
+        self._entries: tuple[object | None, ...] = (None, None, None)
+        for event_type in (
+            area_registry.EVENT_AREA_REGISTRY_UPDATED,
+            device_registry.EVENT_DEVICE_REGISTRY_UPDATED,
+            entity_registry.EVENT_ENTITY_REGISTRY_UPDATED,
+        ):
+            hass.bus.async_listen(event_type, self._async_clear, run_immediately=True)
+
+    @callback
+    def _async_clear(self, event: Event) -> None:
+        """Clear the cache after a registry has been updated."""
+        self._targets.clear()
+
+    @callback
+    def async_get(self, device_ids: set[str], area_ids: set[str]) -> ReferencedTargets:
+        """Get the entries referenced by device and area IDs."""
+        hass = self.hass
+        ent_reg = entity_registry.async_get(hass)
+        dev_reg = device_registry.async_get(hass)
+        area_reg = area_registry.async_get(hass)
+        entries = (ent_reg.entities, dev_reg.devices, area_reg.areas)
         if (
-            entry.entity_category is None
-            and entry.hidden_by is None
-            and (
-                # The entity's device matches a device referenced
-                # by an area and the entity
-                # has no explicitly set area
-                not entry.area_id
-                # The entity's device matches a targeted device
-                or device_id in selector.device_ids
+            any(new is not old for new, old in zip(entries, self._entries))
+            or len(self._targets) >= MAX_REFERENCED_TARGETS
+        ):
+            self._targets.clear()
+            self._entries = entries
+
+        key = (frozenset(device_ids), frozenset(area_ids))
+        if (targets := self._targets.get(key)) is not None:
+            self.hits += 1
+            return targets
+        self.misses += 1
+        targets = self._targets[key] = _async_resolve_referenced_targets(
+            ent_reg, dev_reg, area_reg, device_ids, area_ids
+        )
+        return targets
+
+
+@singleton(REFERENCED_TARGETS_CACHE)
+def async_get_referenced_targets_cache(hass: HomeAssistant) -> ReferencedTargetsCache:
+    """Get the referenced targets cache."""
+    return ReferencedTargetsCache(hass)
+
+
+@callback
+def _async_resolve_referenced_targets(
+    ent_reg: entity_registry.EntityRegistry,
+    dev_reg: device_registry.DeviceRegistry,
+    area_reg: area_registry.AreaRegistry,
+    device_ids: set[str],
+    area_ids: set[str],
+) -> ReferencedTargets:
+    """Resolve the entries referenced by device and area IDs."""
+    missing_devices = {
+        device_id for device_id in device_ids if device_id not in dev_reg.devices
+    }
+    missing_areas = {area_id for area_id in area_ids if area_id not in area_reg.areas}
+
+    # Find devices for targeted areas
+    referenced_devices = set(device_ids)
+    for area_id in area_ids:
+        referenced_devices.update(
+            device_entry.id
+            for device_entry in dev_reg.devices.get_devices_for_area_id(area_id)
+        )
+
+    indirectly_referenced: set[str] = set()
+    if area_ids or referenced_devices:
+        entities = ent_reg.entities
+        # Add indirectly referenced by area
+        indirectly_referenced.update(
+            entry.entity_id
+            for area_id in area_ids
+            # The entity's area matches a targeted area
+            for entry in entities.get_entries_for_area_id(area_id)
+            # Do not add entities which are hidden or which are config
+            # or diagnostic entities.
+            if entry.entity_category is None and entry.hidden_by is None
+        )
+        # Add indirectly referenced by device
+        indirectly_referenced.update(
+            entry.entity_id
+            for device_id in referenced_devices
+            for entry in entities.get_entries_for_device_id(device_id)
+            # Do not add entities which are hidden or which are config
+            # or diagnostic entities.
+            if (
+                entry.entity_category is None
+                and entry.hidden_by is None
+                and (
+                    # The entity's device matches a device referenced
+                    # by an area and the entity
+                    # has no explicitly set area
+                    not entry.area_id
+                    # The entity's device matches a targeted device
+                    or device_id in device_ids
+                )
             )
         )
+
+    return ReferencedTargets(
+        frozenset(missing_devices),
+        frozenset(missing_areas),
+        frozenset(referenced_devices),
+        frozenset(indirectly_referenced),
     )
-    return selected
 
 
 @bind_hass
@@ -5,7 +5,7 @@ from ast import literal_eval
 import asyncio
 import base64
 import collections.abc
-from collections.abc import Callable, Generator, Iterable
+from collections.abc import Callable, Iterable, Iterator
 from contextlib import AbstractContextManager, suppress
 from contextvars import ContextVar
 from datetime import datetime, timedelta
@@ -51,6 +51,7 @@ from homeassistant.const import (
     ATTR_PERSONS,
     ATTR_UNIT_OF_MEASUREMENT,
     EVENT_HOMEASSISTANT_START,
+    EVENT_HOMEASSISTANT_STARTED,
     EVENT_HOMEASSISTANT_STOP,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
@@ -58,6 +59,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import (
     Context,
+    Event,
     HomeAssistant,
     State,
     callback,
@@ -80,6 +82,7 @@ from homeassistant.util.thread import ThreadWithException
 
 from . import area_registry, device_registry, entity_registry, location as loc_helper
 from .singleton import singleton
+from .storage import Store
 from .translation import async_translate_state
 from .typing import TemplateVarsType
 
@@ -93,6 +96,13 @@ _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 _ENVIRONMENT_STRICT = "template.environment_strict"
 _HASS_LOADER = "template.hass_loader"
+_TEMPLATE_SOURCES = "template.template_sources"
+_TEMPLATE_STATES = "template.template_states"
+_TEMPLATE_ALL_STATES = "template.template_all_states"
+
+TEMPLATE_SOURCES_STORAGE_KEY = "core.template_sources"
+TEMPLATE_SOURCES_STORAGE_VERSION = 1
+TEMPLATE_SOURCES_SAVE_DELAY = 60
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
@@ -155,6 +165,27 @@ MAX_CUSTOM_TEMPLATE_SIZE = 5 * 1024 * 1024
 
 CACHED_TEMPLATE_LRU: LRU[State, TemplateState] = LRU(CACHED_TEMPLATE_STATES)
 CACHED_TEMPLATE_NO_COLLECT_LRU: LRU[State, TemplateState] = LRU(CACHED_TEMPLATE_STATES)
+
+#
+# COMPILED_TEMPLATE_CODE_SIZE is the number of compiled templates that
+# are kept after the last Template using them has been garbage collected.
+#
+# Templates with the same source are compiled only once for all
+# environments with the same flags, filters and tests. Keeping the most
+# recently used ones avoids compiling templates again that are created
+# and destroyed often, like the ones of websocket render_template
+# subscriptions.
+#
+COMPILED_TEMPLATE_CODE_SIZE = 1024
+COMPILED_TEMPLATE_CODE_LRU: LRU[
+    tuple[
+        str | jinja2.nodes.Template,
+        bool,
+        bool,
+        tuple[frozenset[str], frozenset[str]],
+    ],
+    CodeType | str,
+] = LRU(COMPILED_TEMPLATE_CODE_SIZE)
 ENTITY_COUNT_GROWTH_FACTOR = 1.2
 
 ORJSON_PASSTHROUGH_OPTIONS = (
@@ -493,18 +524,7 @@ class Template:
             return TemplateEnvironment(
                 self.hass, self._limited, self._strict, self._log_fn
             )
-        if self._limited:
-            wanted_env = _ENVIRONMENT_LIMITED
-        elif self._strict:
-            wanted_env = _ENVIRONMENT_STRICT
-        else:
-            wanted_env = _ENVIRONMENT
-        ret: TemplateEnvironment | None = self.hass.data.get(wanted_env)
-        if ret is None:
-            ret = self.hass.data[wanted_env] = TemplateEnvironment(
-                self.hass, self._limited, self._strict, self._log_fn
-            )
-        return ret
+        return _get_environment(self.hass, self._limited, self._strict)
 
     def ensure_valid(self) -> None:
         """Return if template is valid."""
@@ -864,10 +884,10 @@ class AllStates:
         if (render_info := _render_info.get()) is not None:
             render_info.all_states_lifecycle = True
 
-    def __iter__(self) -> Generator[TemplateState, None, None]:
+    def __iter__(self) -> Iterator[TemplateState]:
         """Return all states."""
         self._collect_all()
-        return _state_generator(self._hass, None)
+        return _state_iterator(self._hass, None)
 
     def __len__(self) -> int:
         """Return number of states."""
@@ -954,10 +974,10 @@ class DomainStates:
         if (entity_collect := _render_info.get()) is not None:
             entity_collect.domains_lifecycle.add(self._domain)  # type: ignore[attr-defined]
 
-    def __iter__(self) -> Generator[TemplateState, None, None]:
+    def __iter__(self) -> Iterator[TemplateState]:
         """Return the iteration over all the states."""
         self._collect_domain()
-        return _state_generator(self._hass, self._domain)
+        return _state_iterator(self._hass, self._domain)
 
     def __len__(self) -> int:
         """Return number of states."""
@@ -1134,26 +1154,58 @@ def _collect_state(hass: HomeAssistant, entity_id: str) -> None:
         entity_collect.entities.add(entity_id)  # type: ignore[attr-defined]
 
 
-def _state_generator(
-    hass: HomeAssistant, domain: str | None
-) -> Generator[TemplateState, None, None]:
-    """State generator for a domain or all states."""
-    states = hass.states
-    # If domain is None, we want to iterate over all states, but making
-    # a copy of the dict is expensive. So we iterate over the protected
-    # _states dict instead. This is safe because we're not modifying it
-    # and everything is happening in the same thread (MainThread).
-    #
-    # We do not want to expose this method in the public API though to
-    # ensure it does not get misused.
-    #
-    container: Iterable[State]
-    if domain is None:
-        container = states._states.values()  # pylint: disable=protected-access
-    else:
-        container = states.async_all(domain)
-    for state in container:
-        yield _template_state_no_collect(hass, state)
+def _domain_template_states(
+    hass: HomeAssistant, domain: str
+) -> tuple[TemplateState, ...]:
+    """Return the TemplateStates of a domain without collecting.
+
+    The TemplateStates are cached with the snapshot of the domain they
+    were created from and are only recreated after the domain changed.
+    """
+    snapshot = hass.states.async_snapshot(domain)
+    cache: dict[
+        str, tuple[tuple[State, ...], tuple[TemplateState, ...]]
+    ] = hass.data.setdefault(_TEMPLATE_STATES, {})
+    if (cached := cache.get(domain)) is not None and cached[0] is snapshot:
+        return cached[1]
+    template_states = tuple(
+        _template_state_no_collect(hass, state) for state in snapshot
+    )
+    cache[domain] = (snapshot, template_states)
+    return template_states
+
+
+def _all_template_states(hass: HomeAssistant) -> tuple[TemplateState, ...]:
+    """Return the TemplateStates of all states without collecting.
+
+    The TemplateStates are in the order the states were added and are
+    cached with the snapshot of all states they were created from. They
+    are taken from the cached TemplateStates of the domains.
+    """
+    snapshot = hass.states.async_snapshot()
+    cached: tuple[tuple[State, ...], tuple[TemplateState, ...]] | None = hass.data.get(
+        _TEMPLATE_ALL_STATES
+    )
+    if cached is not None and cached[0] is snapshot:
+        return cached[1]
+    domain_template_states: dict[State, TemplateState] = {}
+    for domain in hass.states.async_domains():
+        domain_template_states.update(
+            zip(
+                hass.states.async_snapshot(domain),
+                _domain_template_states(hass, domain),
+            )
+        )
+    template_states = tuple(domain_template_states[state] for state in snapshot)
+    hass.data[_TEMPLATE_ALL_STATES] = (snapshot, template_states)
+    return template_states
+
+
+def _state_iterator(hass: HomeAssistant, domain: str | None) -> Iterator[TemplateState]:
+    """State iterator for a domain or all states."""
+    if domain is not None:
+        return iter(_domain_template_states(hass, domain))
+    return iter(_all_template_states(hass))
 
 
 def _get_state_if_valid(hass: HomeAssistant, entity_id: str) -> TemplateState | None:
@@ -2437,6 +2489,133 @@ def _load_custom_templates(hass: HomeAssistant) -> dict[str, str]:
     return result
 
 
+def _get_environment(
+    hass: HomeAssistant, limited: bool | None, strict: bool | None
+) -> TemplateEnvironment:
+    """Return the shared template environment with the flags."""
+    if limited:
+        wanted_env = _ENVIRONMENT_LIMITED
+    elif strict:
+        wanted_env = _ENVIRONMENT_STRICT
+    else:
+        wanted_env = _ENVIRONMENT
+    ret: TemplateEnvironment | None = hass.data.get(wanted_env)
+    if ret is None:
+        ret = hass.data[wanted_env] = TemplateEnvironment(hass, limited, strict)
+    return ret
+
+
+async def async_load_template_sources(hass: HomeAssistant) -> None:
+    """Load the sources of the templates compiled before the last restart.
+
+    The templates are compiled again in the background.
+    """
+    template_sources = TemplateSourceCache(hass)
+    await template_sources.async_load()
+    hass.data[_TEMPLATE_SOURCES] = template_sources
+
+
+class TemplateSourceCache:
+    """Persist the sources of the most recently compiled templates across restarts.
+
+    Only the sources are stored, the templates are compiled again by their
+    environment after a restart so the code always passes its checks.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the template source cache."""
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            TEMPLATE_SOURCES_STORAGE_VERSION,
+            TEMPLATE_SOURCES_STORAGE_KEY,
+            private=True,
+            atomic_writes=True,
+        )
+        self.compile_task: asyncio.Task[None] | None = None
+
+    async def async_load(self) -> None:
+        """Load the template sources and schedule saving them."""
+        sources: list[tuple[str, bool, bool]] = []
+        if isinstance(data := await self._store.async_load(), dict):
+            try:
+                sources = [
+                    (source, bool(limited), bool(strict))
+                    for source, limited, strict in data["templates"]
+                    if isinstance(source, str)
+                ]
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.debug("Discarding malformed template sources")
+                sources = []
+        hass = self._hass
+        if sources:
+            self.compile_task = hass.async_create_background_task(
+                self._async_compile(sources), "template compile sources"
+            )
+        # Most templates are compiled during startup, the rest is
+        # saved when Home Assistant stops
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, self._async_save)
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_save)
+
+    async def _async_compile(self, sources: list[tuple[str, bool, bool]]) -> None:
+        """Compile the templates in the executor and share their code."""
+        hass = self._hass
+        environments = [
+            (_get_environment(hass, limited, strict), source)
+            for source, limited, strict in sources
+        ]
+        compiled = await hass.async_add_executor_job(
+            _compile_template_sources, environments
+        )
+        for env, source, code in compiled:
+            env.add_compiled_code(source, code)
+
+    @callback
+    def _async_save(self, _: Event) -> None:
+        """Save the sources of the most recently compiled templates."""
+        self._store.async_delay_save(self._data_to_save, TEMPLATE_SOURCES_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        hass_data = self._hass.data
+        # Only the templates compiled by the environments of Home Assistant
+        # can be compiled again after a restart
+        signatures = {
+            env.compile_signature
+            for key in (_ENVIRONMENT, _ENVIRONMENT_LIMITED, _ENVIRONMENT_STRICT)
+            if (env := hass_data.get(key)) is not None
+        }
+        return {
+            "templates": [
+                [source, limited, strict]
+                for (
+                    source,
+                    limited,
+                    strict,
+                    signature,
+                ), _ in COMPILED_TEMPLATE_CODE_LRU.items()
+                if isinstance(source, str) and signature in signatures
+            ],
+        }
+
+
+def _compile_template_sources(
+    environments: list[tuple[TemplateEnvironment, str]],
+) -> list[tuple[TemplateEnvironment, str, CodeType]]:
+    """Compile the template sources without sharing the code.
+
+    Runs in the executor, templates that do not compile are skipped.
+    """
+    compiled: list[tuple[TemplateEnvironment, str, CodeType]] = []
+    for env, source in environments:
+        try:
+            compiled.append((env, source, env.compile_uncached(source)))
+        except jinja2.TemplateError:
+            continue
+    return compiled
+
+
 @singleton(_HASS_LOADER)
 def _get_hass_loader(hass: HomeAssistant) -> HassLoader:
     return HassLoader({})
@@ -2483,6 +2662,9 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         """Initialise template environment."""
         super().__init__(undefined=make_logging_undefined(strict, log_fn))
         self.hass = hass
+        self._limited = bool(limited)
+        self._strict = bool(strict)
+        self._compile_signature: tuple[frozenset[str], frozenset[str]] | None = None
         self.template_cache: weakref.WeakValueDictionary[
             str | jinja2.nodes.Template, CodeType | str | None
         ] = weakref.WeakValueDictionary()
@@ -2786,10 +2968,53 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 defer_init,
             )
 
+        key = self.compiled_code_key(source)
         if (cached := self.template_cache.get(source)) is None:
-            cached = self.template_cache[source] = super().compile(source)
+            if (cached := COMPILED_TEMPLATE_CODE_LRU.get(key)) is None:
+                cached = super().compile(source)
+            self.template_cache[source] = cached
+        COMPILED_TEMPLATE_CODE_LRU[key] = cached
 
         return cached
 
+    @property
+    def compile_signature(self) -> tuple[frozenset[str], frozenset[str]]:
+        """Return the names of the filters and tests of the environment.
+
+        The filters and tests are checked when a template is compiled, so
+        only environments with the same ones can share the compiled code.
+        """
+        if (signature := self._compile_signature) is None:
+            signature = self._compile_signature = (
+                frozenset(self.filters),
+                frozenset(self.tests),
+            )
+        return signature
+
+    def compiled_code_key(
+        self, source: str | jinja2.nodes.Template
+    ) -> tuple[
+        str | jinja2.nodes.Template,
+        bool,
+        bool,
+        tuple[frozenset[str], frozenset[str]],
+    ]:
+        """Return the key of the compiled code of a source in the shared cache."""
+        return (source, self._limited, self._strict, self.compile_signature)
+
+    def compile_uncached(self, source: str) -> CodeType:
+        """Compile a template without using or sharing the cached code.
+
+        This method is thread-safe.
+        """
+        return super().compile(source)
+
+    @callback
+    def add_compiled_code(self, source: str, code: CodeType) -> None:
+        """Share the code of a template compiled with compile_uncached."""
+        key = self.compiled_code_key(source)
+        if key not in COMPILED_TEMPLATE_CODE_LRU:
+            COMPILED_TEMPLATE_CODE_LRU[key] = code
+
 
 _NO_HASS_ENV = TemplateEnvironment(None)
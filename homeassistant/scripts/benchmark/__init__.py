@@ -314,6 +314,171 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def template_states_selectattr(hass):
+    """Render a states selectattr template 1000 times with 10k entities.
+
+    Each render follows a state change of a single entity, so only
+    the states of its domain have to be snapshotted again.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers.template import Template
+
+    domains = [f"domain_{idx}" for idx in range(100)]
+    for domain in domains:
+        for idx in range(100):
+            hass.states.async_set(f"{domain}.entity_{idx}", "off")
+
+    tmpl = Template(
+        "{{ states | selectattr('state', 'eq', 'on') | list | count }}", hass
+    )
+    renders = 1000
+
+    start = timer()
+    for idx in range(renders):
+        hass.states.async_set(
+            f"domain_0.entity_{idx % 100}", "on" if idx % 2 else "off"
+        )
+        tmpl.async_render()
+    return timer() - start
+
+
+@benchmark
+async def recorder_write_states_orm(hass):
+    """Write 100k states for 1000 entities to the recorder with ORM objects."""
+    return _recorder_write_states(hass, False)
+
+
+@benchmark
+async def recorder_write_states_bulk(hass):
+    """Write 100k states for 1000 entities to the recorder with bulk inserts."""
+    return _recorder_write_states(hass, True)
+
+
+def _recorder_write_states(hass, bulk):
+    """Write states to an in-memory recorder database in 10 commits."""
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from homeassistant.components.recorder.db_schema import (
+        Base,
+        StateAttributes,
+        States,
+        StatesMeta,
+    )
+    from homeassistant.components.recorder.table_managers.states import StatesManager
+    from homeassistant.components.recorder.table_managers.states_buffer import (
+        StatesWriteBuffer,
+    )
+
+    # pylint: enable=import-outside-toplevel
+
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    entity_count = 1000
+    rows_per_commit = 10**4
+    commits = 10
+
+    with Session(engine) as session:
+        attributes = StateAttributes(shared_attrs="{}", hash=0)
+        states_meta = [
+            StatesMeta(entity_id=f"sensor.power_{idx}") for idx in range(entity_count)
+        ]
+        session.add(attributes)
+        session.add_all(states_meta)
+        session.commit()
+        attributes_id = attributes.attributes_id
+        metadata_ids = [meta.metadata_id for meta in states_meta]
+
+    events = [
+        core.Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": f"sensor.power_{idx % entity_count}",
+                "old_state": None,
+                "new_state": core.State(f"sensor.power_{idx % entity_count}", str(idx)),
+            },
+        )
+        for idx in range(rows_per_commit * commits)
+    ]
+
+    states_manager = StatesManager()
+    states_buffer = StatesWriteBuffer(states_manager)
+
+    start = timer()
+
+    with Session(engine) as session:
+        session.expire_on_commit = False
+        for commit in range(commits):
+            for idx in range(commit * rows_per_commit, (commit + 1) * rows_per_commit):
+                event = events[idx]
+                entity_id = event.data["entity_id"]
+                metadata_id = metadata_ids[idx % entity_count]
+                if bulk:
+                    states_buffer.append(
+                        event, entity_id, False, metadata_id, attributes_id
+                    )
+                    continue
+                dbstate = States.from_event(event)
+                if old_state := states_manager.pop_pending(entity_id):
+                    dbstate.old_state = old_state
+                elif old_state_id := states_manager.pop_committed(entity_id):
+                    dbstate.old_state_id = old_state_id
+                states_manager.add_pending(entity_id, dbstate)
+                dbstate.entity_id = None
+                dbstate.metadata_id = metadata_id
+                dbstate.attributes_id = attributes_id
+                session.add(dbstate)
+            if bulk:
+                states_buffer.write(session)
+            session.commit()
+            states_buffer.post_commit_pending()
+            states_manager.post_commit_pending()
+
+    return timer() - start
+
+
+@benchmark
+async def recorder_reduce_statistics(hass):
+    """Reduce a year of hourly statistics for 100 statistic ids.
+
+    The statistics are reduced to daily, weekly and monthly
+    statistics like a yearly energy dashboard does.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder import statistics
+
+    statistic_count = 100
+    hours = 365 * 24
+    first_start = 1704067200.0  # 2024-01-01 00:00:00 UTC
+    stats = {
+        f"sensor.energy_{idx}": [
+            {
+                "start": first_start + hour * 3600,
+                "end": first_start + (hour + 1) * 3600,
+                "mean": float(hour % 24),
+                "min": float(hour % 12),
+                "max": float(hour % 24 + 10),
+                "last_reset": None,
+                "state": float(hour),
+                "sum": float(hour * idx),
+            }
+            for hour in range(hours)
+        ]
+        for idx in range(statistic_count)
+    }
+    types = {"last_reset", "max", "mean", "min", "state", "sum"}
+
+    start = timer()
+    # pylint: disable=protected-access
+    statistics._reduce_statistics_per_day(stats, types)
+    statistics._reduce_statistics_per_week(stats, types)
+    statistics._reduce_statistics_per_month(stats, types)
+    # pylint: enable=protected-access
+    return timer() - start
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -0,0 +1,57 @@
+"""The tests for downsampling history states."""
+import pytest
+
+from homeassistant.components.history.downsample import (
+    DOWNSAMPLE_LTTB,
+    DOWNSAMPLE_MIN_MAX,
+    downsample_compressed_states,
+)
+
+
+def _compressed_states(values: list[str]) -> list[dict[str, str | float]]:
+    """Return compressed states with a state per second."""
+    return [{"s": value, "lu": float(idx)} for idx, value in enumerate(values)]
+
+
+@pytest.mark.parametrize("method", [DOWNSAMPLE_LTTB, DOWNSAMPLE_MIN_MAX])
+def test_downsample_keeps_short_series(method: str) -> None:
+    """Test series with fewer states than max_points are not changed."""
+    states = _compressed_states(["1", "2", "3"])
+    assert downsample_compressed_states(states, 3, method) is states
+
+
+def test_downsample_lttb() -> None:
+    """Test downsampling with Largest-Triangle-Three-Buckets keeps the peaks."""
+    states = _compressed_states(["0", "0", "10", "0", "0", "0", "-10", "0", "0", "0"])
+    assert downsample_compressed_states(states, 4, DOWNSAMPLE_LTTB) == [
+        states[0],
+        states[2],
+        states[6],
+        states[9],
+    ]
+
+
+def test_downsample_min_max() -> None:
+    """Test downsampling with min-max buckets keeps the extremes in order."""
+    states = _compressed_states(["5", "9", "1", "4", "4", "8", "2", "4", "6", "5"])
+    assert downsample_compressed_states(states, 6, DOWNSAMPLE_MIN_MAX) == [
+        states[0],
+        states[1],
+        states[2],
+        states[5],
+        states[6],
+        states[9],
+    ]
+
+
+def test_downsample_keeps_non_numeric_states() -> None:
+    """Test states without a numeric value are always kept."""
+    states = _compressed_states(
+        ["1", "2", "unavailable", "3", "4", "5", "6", "unknown", "7", "8"]
+    )
+    downsampled = downsample_compressed_states(states, 6, DOWNSAMPLE_LTTB)
+    assert len(downsampled) == 6
+    assert states[2] in downsampled
+    assert states[7] in downsampled
+    assert downsampled[0] is states[0]
+    assert downsampled[-1] is states[-1]
@@ -523,6 +523,128 @@ async def test_history_stream_historical_only(
     }
 
 
+async def test_history_stream_historical_only_chunked_downsampled(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history stream sends a chunk per entity with downsampled states."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    sensor_one_states = []
+    for value in (1, 5, 2, 2, 2, 9, 3, 3, 1, 4):
+        hass.states.async_set("sensor.one", str(value))
+        sensor_one_states.append(hass.states.get("sensor.one"))
+        await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.two", "off")
+    sensor_two_last_updated = hass.states.get("sensor.two").last_updated
+    await async_wait_recording_done(hass)
+    end_time = dt_util.utcnow()
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "entity_ids": ["sensor.one", "sensor.two"],
+            "start_time": now.isoformat(),
+            "end_time": end_time.isoformat(),
+            "include_start_time_state": True,
+            "significant_changes_only": False,
+            "no_attributes": True,
+            "minimal_response": True,
+            "chunked": True,
+            "max_points": 4,
+            "downsample_method": "min_max",
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["id"] == 1
+    assert response["type"] == "result"
+
+    # The first and last states and the min and max of the states between
+    expected_sensor_one = [sensor_one_states[idx] for idx in (0, 5, 8, 9)]
+    response = await client.receive_json()
+    assert response == {
+        "event": {
+            "states": {
+                "sensor.one": [
+                    {"lu": state.last_updated.timestamp(), "s": state.state}
+                    for state in expected_sensor_one
+                ],
+                "sensor.two": [{"lu": sensor_two_last_updated.timestamp(), "s": "off"}],
+            }
+        },
+        "id": 1,
+        "type": "event",
+    }
+
+    response = await client.receive_json()
+    assert response == {
+        "event": {
+            "end_time": sensor_two_last_updated.timestamp(),
+            "start_time": now.timestamp(),
+            "states": {},
+        },
+        "id": 1,
+        "type": "event",
+    }
+
+
+async def test_history_stream_historical_only_chunked_batches(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history stream sends the entities in chunks of a bounded size."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    entity_ids = ["sensor.one", "sensor.two", "sensor.three"]
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "on")
+    await async_wait_recording_done(hass)
+    last_updated = hass.states.get("sensor.three").last_updated
+    end_time = dt_util.utcnow()
+
+    client = await hass_ws_client()
+    with patch.object(websocket_api, "MAX_ENTITIES_PER_CHUNK", 2):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "entity_ids": entity_ids,
+                "start_time": now.isoformat(),
+                "end_time": end_time.isoformat(),
+                "include_start_time_state": True,
+                "significant_changes_only": False,
+                "no_attributes": True,
+                "minimal_response": True,
+                "chunked": True,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+
+        chunks = [await client.receive_json() for _ in range(2)]
+        response = await client.receive_json()
+
+    assert [len(chunk["event"]["states"]) for chunk in chunks] == [2, 1]
+    streamed = {}
+    for chunk in chunks:
+        streamed.update(chunk["event"]["states"])
+    assert sorted(streamed) == sorted(entity_ids)
+    assert response == {
+        "event": {
+            "end_time": last_updated.timestamp(),
+            "start_time": now.timestamp(),
+            "states": {},
+        },
+        "id": 1,
+        "type": "event",
+    }
+
+
 async def test_history_stream_significant_domain_historical_only(
     recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
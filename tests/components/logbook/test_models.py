@@ -1,7 +1,16 @@
 """The tests for the logbook component models."""
+from datetime import timedelta
 from unittest.mock import Mock
 
-from homeassistant.components.logbook.models import LazyEventPartialState
+from freezegun import freeze_time
+
+from homeassistant.components.logbook.models import (
+    LazyEventPartialState,
+    LiveContextCache,
+)
+from homeassistant.core import Context, HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util.ulid import ulid_to_bytes
 
 
 def test_lazy_event_partial_state_context():
@@ -24,3 +33,48 @@ def test_lazy_event_partial_state_context():
     assert state.event_type == "event_type"
     assert state.entity_id == "entity_id"
     assert state.state == "state"
+
+
+async def test_live_context_cache(hass: HomeAssistant) -> None:
+    """Test the live context cache remembers the origin events of contexts."""
+    cache = LiveContextCache(hass, ttl=60, max_size=2)
+    init_listeners = hass.bus.async_listeners()
+    parent = Context()
+    hass.bus.async_fire("before_subscribe", context=parent)
+    assert cache.async_get(ulid_to_bytes(parent.id)) is None
+
+    unsub = cache.async_subscribe()
+    unsub_other = cache.async_subscribe()
+    parent = Context()
+    hass.bus.async_fire("automation_triggered", {"name": "Mock"}, context=parent)
+    child = Context(parent_id=parent.id)
+    hass.bus.async_fire("call_service", {"domain": "light"}, context=child)
+    hass.bus.async_fire("not_an_origin", context=child)
+
+    row = cache.async_get(ulid_to_bytes(parent.id))
+    assert row is not None
+    assert row.event_type == "automation_triggered"
+    assert row.context is parent
+    row = cache.async_get(ulid_to_bytes(child.id))
+    assert row is not None
+    assert row.event_type == "call_service"
+
+    # The oldest origin is evicted once the cache is full
+    other = Context()
+    hass.bus.async_fire("other", context=other)
+    assert cache.async_get(ulid_to_bytes(parent.id)) is None
+    assert cache.async_get(ulid_to_bytes(child.id)) is not None
+
+    # The origins older than the ttl are evicted
+    with freeze_time(dt_util.utcnow() + timedelta(seconds=61)):
+        hass.bus.async_fire("expire")
+    assert cache.async_get(ulid_to_bytes(child.id)) is None
+    assert cache.async_get(ulid_to_bytes(other.id)) is None
+
+    later = Context()
+    hass.bus.async_fire("later", context=later)
+    unsub()
+    assert cache.async_get(ulid_to_bytes(later.id)) is not None
+    unsub_other()
+    assert cache.async_get(ulid_to_bytes(later.id)) is None
+    assert hass.bus.async_listeners() == init_listeners
@@ -11,6 +11,7 @@ from homeassistant import core
 from homeassistant.components import logbook, recorder
 from homeassistant.components.automation import ATTR_SOURCE, EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.logbook import websocket_api
+from homeassistant.components.logbook.models import LiveContextCache, LogbookConfig
 from homeassistant.components.recorder import Recorder
 from homeassistant.components.recorder.util import get_instance
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
@@ -35,6 +36,7 @@ from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.entityfilter import CONF_ENTITY_GLOBS
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
 
 from tests.common import MockConfigEntry, async_fire_time_changed
 from tests.components.recorder.common import (
@@ -2963,3 +2965,59 @@ async def test_subscribe_all_entities_are_continuous_with_device(
     assert listeners_without_writes(
         hass.bus.async_listeners()
     ) == listeners_without_writes(init_listeners)
+
+
+async def test_live_feed_shared_by_streams(hass: HomeAssistant) -> None:
+    """Test live streams with the same filter share a feed and its messages."""
+    hass.data[logbook.DOMAIN] = LogbookConfig(
+        {}, None, None, LiveContextCache(hass, 60, 100)
+    )
+    hass.data[websocket_api.LIVE_FEEDS] = {}
+    init_listeners = hass.bus.async_listeners()
+
+    def _get_live_feed(entity_id: str) -> websocket_api.LogbookLiveFeed:
+        return websocket_api._async_get_live_feed(
+            hass, (logbook.EVENT_LOGBOOK_ENTRY,), None, [entity_id], None
+        )
+
+    feed = _get_live_feed("light.kitchen")
+    assert _get_live_feed("light.kitchen") is feed
+    other_feed = _get_live_feed("light.hallway")
+    assert other_feed is not feed
+    received: list[Event] = []
+    remove_streams = [
+        feed.async_add_stream(received.append),
+        feed.async_add_stream(received.append),
+        other_feed.async_add_stream(received.append),
+    ]
+
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    hass.states.async_set("light.kitchen", STATE_ON)
+    await hass.async_block_till_done()
+    assert len(received) == 2
+    assert received[0] is received[1]
+
+    with patch.object(
+        feed.event_processor, "humanify", wraps=feed.event_processor.humanify
+    ) as humanify:
+        events_json = feed.async_events_json([received[0]])
+        assert feed.async_events_json([received[1]]) is events_json
+    assert humanify.call_count == 1
+    assert json_loads(websocket_api._live_event_message(7, events_json)) == {
+        "id": 7,
+        "type": "event",
+        "event": {
+            "events": [
+                {
+                    "entity_id": "light.kitchen",
+                    "state": STATE_ON,
+                    "when": received[0].data["new_state"].last_updated.timestamp(),
+                }
+            ]
+        },
+    }
+
+    for remove_stream in remove_streams:
+        remove_stream()
+    assert hass.data[websocket_api.LIVE_FEEDS] == {}
+    assert hass.bus.async_listeners() == init_listeners
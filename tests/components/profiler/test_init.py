@@ -14,6 +14,8 @@ from homeassistant.components.profiler import (
     CONF_SECONDS,
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
+    SERVICE_LOG_POLLING_STATS,
+    SERVICE_LOG_TEMPLATE_RENDERS,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LRU_STATS,
     SERVICE_MEMORY,
@@ -27,9 +29,16 @@ from homeassistant.components.profiler.const import DOMAIN
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import TrackTemplate, async_track_template_result
+from homeassistant.helpers.template import Template
 import homeassistant.util.dt as dt_util
 
-from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.common import (
+    MockConfigEntry,
+    MockEntity,
+    MockEntityPlatform,
+    async_fire_time_changed,
+)
 
 
 async def test_basic_usage(hass: HomeAssistant, tmp_path: Path) -> None:
@@ -280,6 +289,64 @@ async def test_lru_stats(hass: HomeAssistant, caplog: pytest.LogCaptureFixture)
     assert "sqlalchemy_test" in caplog.text
 
 
+async def test_log_template_renders(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test logging template render stats."""
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_LOG_TEMPLATE_RENDERS)
+
+    template = Template("{{ states('sensor.profiled') }}", hass)
+    info = async_track_template_result(
+        hass, [TrackTemplate(template, None)], lambda *_: None
+    )
+    hass.states.async_set("sensor.profiled", "1")
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.profiled", "2")
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(DOMAIN, SERVICE_LOG_TEMPLATE_RENDERS, blocking=True)
+
+    assert "Template rendered 2 times" in caplog.text
+    assert "{{ states('sensor.profiled') }}" in caplog.text
+    info.async_remove()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_log_polling_stats(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test logging the polling stats of the entity platforms."""
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_LOG_POLLING_STATS)
+
+    platform = MockEntityPlatform(hass)
+    platform.async_prepare()
+    await platform.async_add_entities([MockEntity(should_poll=True)])
+    await platform._update_entity_states(dt_util.utcnow())
+
+    await hass.services.async_call(DOMAIN, SERVICE_LOG_POLLING_STATS, blocking=True)
+
+    assert "Platform test_domain.test_platform polled 1 times" in caplog.text
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
 async def test_log_object_sources(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -0,0 +1,114 @@
+"""Test the recorder states accumulator."""
+from datetime import timedelta
+
+from homeassistant.components.recorder.accumulator import StatesAccumulator
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, State
+import homeassistant.util.dt as dt_util
+
+
+def _state_changed_event(old_state: State | None, new_state: State | None) -> Event:
+    """Create a state_changed event."""
+    entity_id = (new_state or old_state).entity_id
+    return Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": entity_id, "old_state": old_state, "new_state": new_state},
+    )
+
+
+def test_accumulator_states_during_period() -> None:
+    """Test the accumulator returns the states of a period with the start state."""
+    accumulator = StatesAccumulator()
+    start = dt_util.utcnow().replace(second=0, microsecond=0) + timedelta(minutes=5)
+    end = start + timedelta(minutes=5)
+
+    accumulator.track_domain("sensor", [])
+    before = State("sensor.power", "1", last_updated=start - timedelta(minutes=1))
+    during = State("sensor.power", "2", last_updated=start + timedelta(minutes=1))
+    attributes_only = State(
+        "sensor.power",
+        "2",
+        {"attr": 1},
+        last_changed=during.last_changed,
+        last_updated=start + timedelta(minutes=2),
+    )
+    after = State("sensor.power", "3", last_updated=end)
+    not_tracked = State("light.kitchen", "on", last_updated=during.last_updated)
+
+    accumulator.async_add_event(_state_changed_event(before, during))
+    accumulator.async_add_event(_state_changed_event(during, attributes_only))
+    accumulator.async_add_event(_state_changed_event(attributes_only, after))
+    accumulator.async_add_event(_state_changed_event(None, not_tracked))
+
+    entity_ids = ["sensor.power", "sensor.other", "light.kitchen"]
+    assert accumulator.get_states_during_period(entity_ids, start, end, False) == {
+        "sensor.power": [before, during, attributes_only]
+    }
+    assert accumulator.get_states_during_period(entity_ids, start, end) == {
+        "sensor.power": [before, during]
+    }
+
+    # The period before tracking started is not complete
+    assert (
+        accumulator.get_states_during_period(
+            entity_ids, start - timedelta(minutes=10), start
+        )
+        is None
+    )
+
+    accumulator.prune(end)
+    assert accumulator.get_states_during_period(entity_ids, start, end) is None
+    assert accumulator.get_states_during_period(
+        entity_ids, end, end + timedelta(minutes=5)
+    ) == {"sensor.power": [attributes_only, after]}
+
+    accumulator.reset()
+    assert (
+        accumulator.get_states_during_period(
+            entity_ids, end, end + timedelta(minutes=5)
+        )
+        == {}
+    )
+
+
+def test_accumulator_entity_removed() -> None:
+    """Test removing an entity ends its last state."""
+    accumulator = StatesAccumulator()
+    start = dt_util.utcnow() + timedelta(minutes=5)
+    end = start + timedelta(minutes=5)
+
+    accumulator.track_domain("sensor", [])
+    before = State("sensor.power", "1", last_updated=start - timedelta(minutes=1))
+    accumulator.async_add_event(_state_changed_event(None, before))
+    accumulator.async_add_event(
+        Event(
+            EVENT_STATE_CHANGED,
+            {"entity_id": "sensor.power", "old_state": before, "new_state": None},
+            time_fired=start + timedelta(minutes=1),
+        )
+    )
+
+    states = accumulator.get_states_during_period(["sensor.power"], start, end)
+    assert states is not None
+    assert [state.state for state in states["sensor.power"]] == ["1", ""]
+
+
+def test_accumulator_tracked_after_states_changed() -> None:
+    """Test periods before the current states were updated are not complete."""
+    accumulator = StatesAccumulator()
+    now = dt_util.utcnow()
+    current = State("sensor.power", "1", last_updated=now + timedelta(minutes=20))
+
+    accumulator.track_domain("sensor", [current])
+    assert (
+        accumulator.get_states_during_period(
+            ["sensor.power"], now + timedelta(minutes=10), now + timedelta(minutes=15)
+        )
+        is None
+    )
+    assert (
+        accumulator.get_states_during_period(
+            ["sensor.power"], now + timedelta(minutes=25), now + timedelta(minutes=30)
+        )
+        == {}
+    )
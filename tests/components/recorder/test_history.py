@@ -27,7 +27,10 @@ from homeassistant.components.recorder.models.legacy import (
     LegacyLazyState,
     LegacyLazyStatePreSchema31,
 )
-from homeassistant.components.recorder.util import session_scope
+from homeassistant.components.recorder.util import (
+    execute_stmt_lambda_element,
+    session_scope,
+)
 import homeassistant.core as ha
 from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers.json import JSONEncoder
@@ -625,6 +628,48 @@ def test_get_significant_states_multiple_entity_ids(
     )
 
 
+def test_stream_significant_states_consumes_rows_incrementally(
+    hass_recorder: Callable[..., HomeAssistant],
+) -> None:
+    """Test the states of an entity are yielded before all rows are read."""
+    hass = hass_recorder()
+    zero, four, states = record_states(hass)
+    entity_ids = ["media_player.test", "media_player.test2", "thermostat.test"]
+    results: list = []
+    rows_read = 0
+
+    def _execute_stmt_lambda_element(*args, **kwargs):
+        result = execute_stmt_lambda_element(*args, **kwargs)
+        results.append(result)
+
+        def _counting_rows():
+            nonlocal rows_read
+            for row in result:
+                rows_read += 1
+                yield row
+
+        return _counting_rows()
+
+    with session_scope(hass=hass, read_only=True) as session, patch(
+        "homeassistant.components.recorder.history.modern.execute_stmt_lambda_element",
+        _execute_stmt_lambda_element,
+    ):
+        stream = history.stream_significant_states_with_session(
+            hass, session, zero, four, entity_ids
+        )
+        first_entity_id, first_states = next(stream)
+        rows_read_for_first_entity = rows_read
+        streamed = {first_entity_id: first_states, **dict(stream)}
+
+    # The rows are fetched from the cursor as they are consumed
+    assert not isinstance(results[0], list)
+    assert rows_read_for_first_entity < rows_read
+    for entity_id in entity_ids:
+        assert_multiple_states_equal_without_context_and_last_changed(
+            states[entity_id], streamed[entity_id]
+        )
+
+
 def test_get_significant_states_are_ordered(
     hass_recorder: Callable[..., HomeAssistant],
 ) -> None:
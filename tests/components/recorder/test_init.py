@@ -12,14 +12,17 @@ from unittest.mock import MagicMock, Mock, patch
 
 from freezegun.api import FrozenDateTimeFactory
 import pytest
+from sqlalchemy import text
 from sqlalchemy.exc import DatabaseError, OperationalError, SQLAlchemyError
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import (
     CONF_AUTO_PURGE,
     CONF_AUTO_REPACK,
+    CONF_BULK_STATE_WRITES,
     CONF_COMMIT_INTERVAL,
     CONF_DB_MAX_RETRIES,
+    CONF_DB_READ_URL,
     CONF_DB_RETRY_WAIT,
     CONF_DB_URL,
     CONFIG_SCHEMA,
@@ -32,9 +35,13 @@ from homeassistant.components.recorder import (
     statistics,
 )
 from homeassistant.components.recorder.const import (
+    DB_READER_PREFIX,
+    ESTIMATED_QUEUE_ITEM_SIZE,
     EVENT_RECORDER_5MIN_STATISTICS_GENERATED,
     EVENT_RECORDER_HOURLY_STATISTICS_GENERATED,
     KEEPALIVE_TIME,
+    MAX_QUEUE_BACKLOG_MIN_VALUE,
+    RecorderQueueClass,
     SupportedDialect,
 )
 from homeassistant.components.recorder.db_schema import (
@@ -1392,6 +1399,64 @@ def test_saving_sets_old_state(hass_recorder: Callable[..., HomeAssistant]) -> N
         assert states_by_state["s4"].old_state_id == states_by_state["s2"].state_id
 
 
+def test_saving_sets_old_state_bulk_state_writes(
+    hass_recorder: Callable[..., HomeAssistant],
+) -> None:
+    """Test saving sets old state with bulk state writes in a single commit."""
+    hass = hass_recorder({CONF_BULK_STATE_WRITES: True, CONF_COMMIT_INTERVAL: 30})
+    instance = recorder.get_instance(hass)
+    if not instance._use_states_buffer:
+        pytest.skip("Database does not support bulk state writes")
+
+    hass.states.set("test.one", "s1", {"attr": 1})
+    hass.states.set("test.two", "s2", {})
+    hass.states.set("test.one", "s3", {"attr": 2})
+    hass.states.set("test.one", "s4", {"attr": 1})
+    wait_recording_done(hass)
+    hass.states.set("test.two", "s5", {})
+    hass.states.remove("test.one")
+    wait_recording_done(hass)
+    hass.states.set("test.one", "s6", {})
+    wait_recording_done(hass)
+
+    assert len(instance.states_buffer) == 0
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = list(
+            session.query(
+                StatesMeta.entity_id,
+                States.state_id,
+                States.old_state_id,
+                States.state,
+                StateAttributes.shared_attrs,
+            )
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .outerjoin(
+                StateAttributes,
+                States.attributes_id == StateAttributes.attributes_id,
+            )
+        )
+        assert len(states) == 7
+        states_by_state = {state.state: state for state in states}
+
+        assert states_by_state["s1"].entity_id == "test.one"
+        assert states_by_state["s2"].entity_id == "test.two"
+        assert states_by_state["s5"].entity_id == "test.two"
+        assert states_by_state[None].entity_id == "test.one"
+        assert states_by_state["s6"].entity_id == "test.one"
+        assert states_by_state["s1"].shared_attrs == '{"attr":1}'
+        assert states_by_state["s3"].shared_attrs == '{"attr":2}'
+        assert states_by_state["s4"].shared_attrs == '{"attr":1}'
+
+        assert states_by_state["s1"].old_state_id is None
+        assert states_by_state["s2"].old_state_id is None
+        assert states_by_state["s3"].old_state_id == states_by_state["s1"].state_id
+        assert states_by_state["s4"].old_state_id == states_by_state["s3"].state_id
+        assert states_by_state["s5"].old_state_id == states_by_state["s2"].state_id
+        assert states_by_state[None].old_state_id == states_by_state["s4"].state_id
+        assert states_by_state["s6"].old_state_id is None
+
+
 def test_saving_state_with_serializable_data(
     hass_recorder: Callable[..., HomeAssistant], caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -1931,6 +1996,123 @@ async def test_database_lock_and_overflow_checks_available_memory(
     assert start_time.count(":") == 2
 
 
+async def test_events_over_budget_keep_recording_states(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a backlog of events does not stop recording state changes."""
+    await async_wait_recording_done(hass)
+    instance = get_instance(hass)
+    event_type = "EVENT_TEST"
+    event_types = (event_type,)
+
+    def _get_db_events_and_states():
+        with session_scope(hass=hass, read_only=True) as session:
+            return (
+                list(
+                    session.query(Events).filter(
+                        Events.event_type_id.in_(select_event_type_ids(event_types))
+                    )
+                ),
+                list(session.query(States)),
+            )
+
+    def _class_size(queue_class: RecorderQueueClass) -> int:
+        if queue_class is RecorderQueueClass.EVENTS:
+            return MAX_QUEUE_BACKLOG_MIN_VALUE * ESTIMATED_QUEUE_ITEM_SIZE
+        return 0
+
+    with patch.object(
+        instance._queue, "class_size", side_effect=_class_size
+    ), patch.object(
+        recorder.core.Recorder,
+        "_available_memory",
+        return_value=ESTIMATED_QUEUE_ITEM_SIZE,
+    ):
+        instance._async_check_queue()
+    assert (
+        "The recorder will stop recording events other than state changes"
+        in caplog.text
+    )
+    assert instance.recording
+
+    hass.bus.async_fire(event_type)
+    hass.states.async_set("sensor.power", "1")
+    await async_wait_recording_done(hass)
+    db_events, db_states = await instance.async_add_executor_job(
+        _get_db_events_and_states
+    )
+    assert len(db_events) == 0
+    assert len(db_states) == 1
+
+    instance._async_check_queue()
+    assert "The recorder will resume recording events" in caplog.text
+
+    hass.bus.async_fire(event_type)
+    await async_wait_recording_done(hass)
+    db_events, db_states = await instance.async_add_executor_job(
+        _get_db_events_and_states
+    )
+    assert len(db_events) == 1
+
+
+async def test_statistics_over_budget_delays_imports(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test statistics imports are held back and not dropped when over budget."""
+    await async_wait_recording_done(hass)
+    instance = get_instance(hass)
+    period = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    statistic_ids = ("test:total_energy_import", "test:total_gas_import")
+
+    def _import(statistic_id: str) -> None:
+        statistics.async_add_external_statistics(
+            hass,
+            {
+                "has_mean": False,
+                "has_sum": True,
+                "name": None,
+                "source": "test",
+                "statistic_id": statistic_id,
+                "unit_of_measurement": "kWh",
+            },
+            ({"start": period, "sum": 2},),
+        )
+
+    def _get_metadata():
+        return statistics.get_metadata(hass, statistic_ids=set(statistic_ids))
+
+    def _class_size(queue_class: RecorderQueueClass) -> int:
+        if queue_class is RecorderQueueClass.STATISTICS:
+            return MAX_QUEUE_BACKLOG_MIN_VALUE * ESTIMATED_QUEUE_ITEM_SIZE
+        return 0
+
+    with patch.object(
+        instance._queue, "class_size", side_effect=_class_size
+    ), patch.object(
+        recorder.core.Recorder,
+        "_available_memory",
+        return_value=ESTIMATED_QUEUE_ITEM_SIZE,
+    ):
+        for statistic_id in statistic_ids:
+            _import(statistic_id)
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=30))
+    assert "The import of statistics will be delayed" in caplog.text
+
+    await async_wait_recording_done(hass)
+    assert await instance.async_add_executor_job(_get_metadata) == {}
+
+    # The imports are queued in order once the statistics fit in their budget
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=60))
+    await async_wait_recording_done(hass)
+    metadata = await instance.async_add_executor_job(_get_metadata)
+    metadata_ids = [metadata[statistic_id][0] for statistic_id in statistic_ids]
+    assert metadata_ids == sorted(metadata_ids)
+
+
 async def test_database_lock_timeout(
     recorder_mock: Recorder, hass: HomeAssistant, recorder_db_url: str
 ) -> None:
@@ -2485,3 +2667,46 @@ async def test_events_are_recorded_until_final_write(
     await hass.async_block_till_done()
 
     assert not instance.engine
+
+
+async def test_read_database(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    recorder_db_url: str,
+    tmp_path: Path,
+) -> None:
+    """Test queries read from the read database on their own executor."""
+    if not recorder_db_url.startswith("sqlite://"):
+        pytest.skip("The read database is a reader of the SQLite database")
+    recorder_db_url = "sqlite:///" + str(tmp_path / "pytest.db")
+    instance = await async_setup_recorder_instance(
+        hass, {CONF_DB_URL: recorder_db_url, CONF_DB_READ_URL: recorder_db_url}
+    )
+    hass.states.async_set("sensor.power", "1")
+    await async_wait_recording_done(hass)
+    assert instance.read_engine is not None
+
+    def _query() -> tuple[str, list[str], int]:
+        with session_scope(hass=hass, read_only=True) as session:
+            assert session.get_bind() is instance.engine
+        with session_scope(hass=hass, read_only=True, read_pool=True) as session:
+            assert session.get_bind() is instance.read_engine
+            states = [state.state for state in session.query(States)]
+            query_only = session.execute(text("PRAGMA query_only")).scalar()
+        return threading.current_thread().name, states, query_only
+
+    thread_name, states, query_only = await instance.async_add_read_executor_job(_query)
+    assert thread_name.startswith(DB_READER_PREFIX)
+    assert states == ["1"]
+    assert query_only == 1
+
+    def _write() -> None:
+        with session_scope(session=instance.get_read_session()) as session:
+            session.execute(text("DELETE FROM states"))
+
+    with pytest.raises(OperationalError):
+        await instance.async_add_read_executor_job(_write)
+
+    # Sessions that write still use the recorder database
+    with session_scope(hass=hass, read_pool=True) as session:
+        assert session.get_bind() is instance.engine
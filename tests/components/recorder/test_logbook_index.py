@@ -0,0 +1,257 @@
+"""Test the logbook index."""
+from datetime import timedelta
+
+from freezegun import freeze_time
+import pytest
+from sqlalchemy import func, select
+
+from homeassistant.components.logbook.queries import statement_for_request
+from homeassistant.components.recorder import CONF_BULK_STATE_WRITES
+from homeassistant.components.recorder.db_schema import (
+    Events,
+    LogbookIndex,
+    States,
+    StatesMeta,
+)
+from homeassistant.components.recorder.models import (
+    extract_event_type_ids,
+    extract_metadata_ids,
+)
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.util import (
+    execute_stmt_lambda_element,
+    session_scope,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+DEVICE_ID = "8fb7e4ea03924ea1acbd3c4e1e8fa0ca"
+
+
+def _indexed_states(hass: HomeAssistant) -> list[tuple[str, str | None]]:
+    """Return the entity_id and state of the indexed states."""
+    with session_scope(hass=hass, read_only=True) as session:
+        return list(
+            session.execute(
+                select(StatesMeta.entity_id, States.state)
+                .select_from(LogbookIndex)
+                .join(States, LogbookIndex.state_id == States.state_id)
+                .join(StatesMeta, LogbookIndex.metadata_id == StatesMeta.metadata_id)
+                .order_by(LogbookIndex.id)
+            ).tuples()
+        )
+
+
+@pytest.mark.parametrize("bulk_state_writes", [False, True])
+async def test_state_changes_are_indexed(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    bulk_state_writes: bool,
+) -> None:
+    """Test only the state changes the logbook shows are indexed."""
+    instance = await async_setup_recorder_instance(
+        hass, {CONF_BULK_STATE_WRITES: bulk_state_writes}
+    )
+    assert instance.logbook_index_manager.active
+    assert instance.logbook_index_manager.indexed_since is not None
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.kitchen", "on", {"brightness": 10})
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("counter.visits", "1")
+    hass.states.async_set("counter.visits", "2")
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.mode", "eco")
+    hass.states.async_set("sensor.mode", "boost")
+    hass.states.async_remove("sensor.mode")
+    await async_wait_recording_done(hass)
+
+    assert _indexed_states(hass) == [
+        ("light.kitchen", "on"),
+        ("light.kitchen", "off"),
+        ("sensor.mode", "boost"),
+    ]
+
+
+async def test_events_are_indexed(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the events with an entity_id or a device_id are indexed."""
+    await async_setup_recorder_instance(hass)
+
+    hass.states.async_set("light.kitchen", "on")
+    await async_wait_recording_done(hass)
+    hass.bus.async_fire("test_entity", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("test_unknown_entity", {"entity_id": "light.unknown"})
+    hass.bus.async_fire("test_device", {"device_id": DEVICE_ID})
+    hass.bus.async_fire("test_invalid_device", {"device_id": ["not", "an", "id"]})
+    hass.bus.async_fire("test_no_data")
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        metadata_id = session.execute(
+            select(StatesMeta.metadata_id).where(
+                StatesMeta.entity_id == "light.kitchen"
+            )
+        ).scalar()
+        assert list(
+            session.execute(
+                select(
+                    LogbookIndex.metadata_id,
+                    LogbookIndex.device_id,
+                    Events.time_fired_ts == LogbookIndex.time_fired_ts,
+                )
+                .join(Events, LogbookIndex.event_id == Events.event_id)
+                .order_by(LogbookIndex.id)
+            ).tuples()
+        ) == [(metadata_id, None, True), (None, DEVICE_ID, True)]
+
+
+async def test_index_queries_match_legacy_queries(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the logbook index queries return the same rows as the legacy queries."""
+    instance = await async_setup_recorder_instance(hass)
+    start = dt_util.utcnow()
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.hallway", "on")
+    hass.states.async_set("light.hallway", "off")
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "W"})
+    await async_wait_recording_done(hass)
+    hass.bus.async_fire("logbook_entry", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("logbook_entry", {"entity_id": "light.hallway"})
+    hass.bus.async_fire("mobile_app_notification_action", {"device_id": DEVICE_ID})
+    hass.bus.async_fire("test_not_in_logbook", {"entity_id": "light.kitchen"})
+    hass.states.async_set("light.kitchen", "off")
+    await async_wait_recording_done(hass)
+    end = dt_util.utcnow() + timedelta(seconds=1)
+
+    entity_ids = ["light.kitchen", "sensor.power"]
+    with session_scope(hass=hass, read_only=True) as session:
+        metadata_ids = extract_metadata_ids(
+            instance.states_meta_manager.get_many(entity_ids, session, False)
+        )
+        event_type_ids = tuple(
+            extract_event_type_ids(
+                instance.event_type_manager.get_many(
+                    ("logbook_entry", "mobile_app_notification_action"), session
+                )
+            )
+        )
+
+        def _rows(since: float | None, **kwargs) -> list[tuple]:
+            return [
+                (row.event_type, row.entity_id, row.state, row.context_only)
+                for row in execute_stmt_lambda_element(
+                    session,
+                    statement_for_request(
+                        start,
+                        end,
+                        event_type_ids,
+                        **kwargs,
+                        logbook_index_since=since,
+                    ),
+                    orm_rows=False,
+                )
+                if not row.context_only
+            ]
+
+        since = instance.logbook_index_manager.indexed_since
+        for kwargs in (
+            {"entity_ids": entity_ids, "states_metadata_ids": metadata_ids},
+            {"device_ids": [DEVICE_ID]},
+            {
+                "entity_ids": entity_ids,
+                "states_metadata_ids": metadata_ids,
+                "device_ids": [DEVICE_ID],
+            },
+        ):
+            legacy = _rows(None, **kwargs)
+            assert legacy
+            assert _rows(since, **kwargs) == legacy
+
+
+async def test_index_queries_include_excluded_entities(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the events of entities without states metadata are still found."""
+    instance = await async_setup_recorder_instance(hass)
+    start = dt_util.utcnow()
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.excluded", "off")
+    await async_wait_recording_done(hass)
+    hass.bus.async_fire("logbook_entry", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("logbook_entry", {"entity_id": "light.excluded"})
+    await async_wait_recording_done(hass)
+    end = dt_util.utcnow() + timedelta(seconds=1)
+
+    # Excluding the entity purges its states and states metadata
+    # but its events are kept
+    instance.entity_filter = lambda entity_id: entity_id != "light.excluded"
+    purge_before = dt_util.utcnow() - timedelta(days=1)
+    while not purge_old_data(instance, purge_before, repack=False, apply_filter=True):
+        pass
+
+    with session_scope(hass=hass, read_only=True) as session:
+        event_type_ids = tuple(
+            extract_event_type_ids(
+                instance.event_type_manager.get_many(("logbook_entry",), session)
+            )
+        )
+        for entity_ids in (["light.excluded"], ["light.kitchen", "light.excluded"]):
+            metadata_ids = extract_metadata_ids(
+                instance.states_meta_manager.get_many(entity_ids, session, False)
+            )
+            assert len(metadata_ids) == len(entity_ids) - 1
+            rows = execute_stmt_lambda_element(
+                session,
+                statement_for_request(
+                    start,
+                    end,
+                    event_type_ids,
+                    entity_ids=entity_ids,
+                    states_metadata_ids=metadata_ids,
+                    logbook_index_since=instance.logbook_index_manager.indexed_since,
+                ),
+                orm_rows=False,
+            )
+            assert sorted(
+                json_loads(row.event_data)["entity_id"]
+                for row in rows
+                if row.event_type == "logbook_entry" and not row.context_only
+            ) == sorted(entity_ids)
+
+
+async def test_purge_logbook_index(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test purging removes the old index rows."""
+    instance = await async_setup_recorder_instance(hass)
+    old = dt_util.utcnow() - timedelta(days=10)
+
+    with freeze_time(old):
+        hass.states.async_set("light.kitchen", "off")
+        hass.states.async_set("light.kitchen", "on")
+        await async_wait_recording_done(hass)
+    hass.states.async_set("light.kitchen", "off")
+    await async_wait_recording_done(hass)
+    assert _indexed_states(hass) == [("light.kitchen", "on"), ("light.kitchen", "off")]
+
+    purge_before = dt_util.utcnow() - timedelta(days=5)
+    while not purge_old_data(instance, purge_before, repack=False):
+        pass
+
+    with session_scope(hass=hass, read_only=True) as session:
+        assert session.execute(select(func.count(LogbookIndex.id))).scalar() == 1
+    assert _indexed_states(hass) == [("light.kitchen", "off")]
@@ -21,20 +21,32 @@ from sqlalchemy.pool import StaticPool
 
 from homeassistant.bootstrap import async_setup_component
 from homeassistant.components import persistent_notification as pn, recorder
-from homeassistant.components.recorder import db_schema, migration
+from homeassistant.components.recorder import CONF_COMMIT_INTERVAL, db_schema, migration
 from homeassistant.components.recorder.db_schema import (
     SCHEMA_VERSION,
+    EventData,
+    Events,
     RecorderRuns,
+    StateAttributes,
     States,
 )
+from homeassistant.components.recorder.tasks import (
+    EventDataRefCountMigrationTask,
+    StatesAttributesRefCountMigrationTask,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import recorder as recorder_helper
 import homeassistant.util.dt as dt_util
 
-from .common import async_wait_recording_done, create_engine_test
+from .common import (
+    async_recorder_block_till_done,
+    async_wait_recording_done,
+    create_engine_test,
+)
 
 from tests.common import async_fire_time_changed
+from tests.typing import RecorderInstanceGenerator
 
 
 def _get_native_states(hass, entity_id):
@@ -419,6 +431,116 @@ async def test_schema_migrate(
         assert apply_update_mock.called
 
 
+async def test_migrate_ref_counts(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the reference counts of attributes and event data are backfilled."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done(hass)
+
+    def _insert_rows():
+        with session_scope(hass=hass) as session:
+            used = StateAttributes(shared_attrs='{"used":true}', hash=1)
+            unused = StateAttributes(shared_attrs='{"used":false}', hash=2)
+            event_data = EventData(shared_data='{"used":true}', hash=3)
+            session.add_all(
+                (
+                    used,
+                    unused,
+                    event_data,
+                    States(state="on", state_attributes=used),
+                    States(state="off", state_attributes=used),
+                    Events(event_data_rel=event_data),
+                )
+            )
+            session.flush()
+            return used.attributes_id, unused.attributes_id, event_data.data_id
+
+    used_id, unused_id, data_id = await instance.async_add_executor_job(_insert_rows)
+
+    instance.queue_task(StatesAttributesRefCountMigrationTask())
+    instance.queue_task(EventDataRefCountMigrationTask())
+    await async_recorder_block_till_done(hass)
+
+    def _fetch_ref_counts():
+        with session_scope(hass=hass, read_only=True) as session:
+            return (
+                dict(
+                    session.query(
+                        StateAttributes.attributes_id, StateAttributes.ref_count
+                    )
+                ),
+                dict(session.query(EventData.data_id, EventData.ref_count)),
+            )
+
+    attributes_ref_counts, data_ref_counts = await instance.async_add_executor_job(
+        _fetch_ref_counts
+    )
+    assert attributes_ref_counts[used_id] == 2
+    assert attributes_ref_counts[unused_id] == 0
+    assert data_ref_counts[data_id] == 1
+    assert None not in attributes_ref_counts.values()
+    assert None not in data_ref_counts.values()
+
+
+async def test_migrate_ref_counts_with_pending_rows(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the references of pending states and events are counted once."""
+    instance = await async_setup_recorder_instance(hass, {CONF_COMMIT_INTERVAL: 30})
+    hass.states.async_set("sensor.one", "on", {"shared": True})
+    hass.bus.async_fire("custom_event", {"shared": True})
+    await async_wait_recording_done(hass)
+
+    def _reset_ref_counts():
+        with session_scope(hass=hass) as session:
+            session.query(StateAttributes).update({StateAttributes.ref_count: None})
+            session.query(EventData).update({EventData.ref_count: None})
+
+    await instance.async_add_executor_job(_reset_ref_counts)
+
+    pending_writes: list[bool] = []
+
+    def _record_pending_writes(migrate):
+        def _migrate(instance):
+            pending_writes.append(instance._event_session_has_pending_writes)
+            return migrate(instance)
+
+        return _migrate
+
+    hass.states.async_set("sensor.two", "on", {"shared": True})
+    hass.bus.async_fire("custom_event", {"shared": True})
+    await hass.async_block_till_done()
+    # The migration is queued right behind the pending states and events
+    with patch.object(
+        migration,
+        "migrate_states_attributes_ref_counts",
+        _record_pending_writes(migration.migrate_states_attributes_ref_counts),
+    ), patch.object(
+        migration,
+        "migrate_event_data_ref_counts",
+        _record_pending_writes(migration.migrate_event_data_ref_counts),
+    ):
+        instance.queue_task(StatesAttributesRefCountMigrationTask())
+        instance.queue_task(EventDataRefCountMigrationTask())
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    def _fetch_ref_counts():
+        with session_scope(hass=hass, read_only=True) as session:
+            return (
+                session.query(StateAttributes.ref_count)
+                .filter(StateAttributes.shared_attrs == '{"shared":true}')
+                .scalar(),
+                session.query(EventData.ref_count)
+                .filter(EventData.shared_data == '{"shared":true}')
+                .scalar(),
+            )
+
+    assert not any(pending_writes)
+    assert await instance.async_add_executor_job(_fetch_ref_counts) == (2, 2)
+
+
 def test_invalid_update(hass: HomeAssistant) -> None:
     """Test that an invalid new version raises an exception."""
     with pytest.raises(ValueError):
@@ -0,0 +1,263 @@
+"""Test partitioning the states table."""
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from freezegun import freeze_time
+import pytest
+from sqlalchemy import delete, func, select
+
+from homeassistant.components.recorder import CONF_DB_PARTITIONING, history
+from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder.db_schema import StateAttributes, States
+from homeassistant.components.recorder.partitions import (
+    StatesPartition,
+    StatesPartitions,
+    drop_partition_sql,
+    parse_partitions,
+    partition_table_sql,
+    seal_partition_sql,
+    select_partitions_sql,
+)
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+def _partitions(*sealed: tuple[date, int]) -> StatesPartitions:
+    """Return partitions sealed on each day up to a state_id."""
+    return StatesPartitions(
+        [
+            *(
+                StatesPartition(day.strftime("p%Y%m%d"), day, end_id)
+                for day, end_id in sealed
+            ),
+            StatesPartition("pcurrent", None, None),
+        ]
+    )
+
+
+def test_parse_partitions() -> None:
+    """Test parsing the partitions from the database catalog."""
+    assert parse_partitions(SupportedDialect.MYSQL, [(None, None)]) is None
+    assert parse_partitions(SupportedDialect.POSTGRESQL, []) is None
+
+    mysql = parse_partitions(
+        SupportedDialect.MYSQL,
+        [("p20240101", "100"), ("p20240102", "250"), ("pcurrent", "MAXVALUE")],
+    )
+    postgresql = parse_partitions(
+        SupportedDialect.POSTGRESQL,
+        [
+            ("states_pcurrent", "FOR VALUES FROM ('250') TO (MAXVALUE)"),
+            ("states_p20240102", "FOR VALUES FROM ('100') TO ('250')"),
+            ("states_p20240101", "FOR VALUES FROM (MINVALUE) TO ('100')"),
+        ],
+    )
+    expected = [
+        StatesPartition("p20240101", date(2024, 1, 1), 100),
+        StatesPartition("p20240102", date(2024, 1, 2), 250),
+        StatesPartition("pcurrent", None, None),
+    ]
+    assert mysql is not None
+    assert mysql.partitions == expected
+    assert postgresql is not None
+    assert postgresql.partitions == expected
+
+
+def test_min_state_id_and_expired() -> None:
+    """Test finding the partitions to skip and to drop."""
+    partitions = _partitions((date(2024, 1, 1), 100), (date(2024, 1, 2), 250))
+    jan_2 = dt_util.utc_to_timestamp(datetime(2024, 1, 2, tzinfo=dt_util.UTC))
+    jan_3 = dt_util.utc_to_timestamp(datetime(2024, 1, 3, tzinfo=dt_util.UTC))
+
+    assert partitions.last_sealed == partitions.partitions[1]
+    assert partitions.min_state_id(jan_2 - 1) is None
+    assert partitions.min_state_id(jan_2) == 100
+    assert partitions.min_state_id(jan_3 - 1) == 100
+    assert partitions.min_state_id(jan_3) == 250
+
+    assert partitions.expired(jan_2 - 1) == []
+    assert partitions.expired(jan_2) == partitions.partitions[:1]
+    assert partitions.expired(jan_3 + 3600) == partitions.partitions[:2]
+
+    assert _partitions().last_sealed is None
+    assert _partitions().min_state_id(jan_3) is None
+
+
+def test_mysql_sql() -> None:
+    """Test the statements to partition the states table with MySQL."""
+    partition = StatesPartition("p20240102", date(2024, 1, 2), 250)
+
+    assert "information_schema.PARTITIONS" in select_partitions_sql(
+        SupportedDialect.MYSQL
+    )
+    assert partition_table_sql(SupportedDialect.MYSQL, 1) == [
+        "ALTER TABLE states PARTITION BY RANGE (state_id)"
+        " (PARTITION pcurrent VALUES LESS THAN MAXVALUE)"
+    ]
+    assert seal_partition_sql(SupportedDialect.MYSQL, date(2024, 1, 2), 100, 250) == [
+        "ALTER TABLE states REORGANIZE PARTITION pcurrent"
+        " INTO (PARTITION p20240102 VALUES LESS THAN (250),"
+        " PARTITION pcurrent VALUES LESS THAN MAXVALUE)"
+    ]
+    assert (
+        drop_partition_sql(SupportedDialect.MYSQL, partition)
+        == "ALTER TABLE states DROP PARTITION p20240102"
+    )
+
+
+def test_postgresql_sql() -> None:
+    """Test the statements to partition the states table with PostgreSQL."""
+    partition = StatesPartition("p20240102", date(2024, 1, 2), 250)
+
+    assert "pg_inherits" in select_partitions_sql(SupportedDialect.POSTGRESQL)
+    statements = partition_table_sql(SupportedDialect.POSTGRESQL, 1000)
+    assert statements[0] == "ALTER TABLE states RENAME TO states_pcurrent"
+    assert (
+        "CREATE TABLE states (LIKE states_pcurrent) PARTITION BY RANGE (state_id)"
+        in statements
+    )
+    assert (
+        "CREATE SEQUENCE states_partitioned_state_id_seq START WITH 1000"
+        " OWNED BY states.state_id" in statements
+    )
+    assert (
+        "CREATE INDEX ix_states_metadata_id_last_updated_ts"
+        " ON states (metadata_id, last_updated_ts)" in statements
+    )
+    assert statements[-1] == (
+        "ALTER TABLE states ATTACH PARTITION states_pcurrent"
+        " FOR VALUES FROM (MINVALUE) TO (MAXVALUE)"
+    )
+
+    assert seal_partition_sql(
+        SupportedDialect.POSTGRESQL, date(2024, 1, 2), 100, 250
+    ) == [
+        "ALTER TABLE states DETACH PARTITION states_pcurrent",
+        "ALTER TABLE states_pcurrent RENAME TO states_p20240102",
+        "ALTER TABLE states ATTACH PARTITION states_p20240102"
+        " FOR VALUES FROM (100) TO (250)",
+        "CREATE TABLE states_pcurrent PARTITION OF states"
+        " FOR VALUES FROM (250) TO (MAXVALUE)",
+    ]
+    first_partition = seal_partition_sql(
+        SupportedDialect.POSTGRESQL, date(2024, 1, 2), None, 250
+    )
+    assert "FROM (MINVALUE) TO (250)" in first_partition[2]
+    assert (
+        drop_partition_sql(SupportedDialect.POSTGRESQL, partition)
+        == "DROP TABLE states_p20240102"
+    )
+
+
+async def test_partitioning_not_supported(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the states table is not partitioned with SQLite."""
+    instance = await async_setup_recorder_instance(hass, {CONF_DB_PARTITIONING: True})
+    assert instance.db_partitioning
+    assert instance.states_partitions is None
+    assert "will not be partitioned" in caplog.text
+
+
+async def test_history_skips_partitions(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test history queries skip the partitions with older states."""
+    instance = await async_setup_recorder_instance(hass)
+    now = dt_util.utcnow()
+    yesterday = now - timedelta(days=1)
+
+    with freeze_time(yesterday):
+        hass.states.async_set("sensor.power", "1")
+        await async_wait_recording_done(hass)
+    hass.states.async_set("sensor.power", "2")
+    await async_wait_recording_done(hass)
+    with session_scope(hass=hass, read_only=True) as session:
+        end_id = session.execute(select(func.max(States.state_id))).scalar()
+    hass.states.async_set("sensor.power", "3")
+    await async_wait_recording_done(hass)
+
+    # The partition claims the state written today before it was
+    # sealed so it is only returned if the partition is not skipped
+    instance.states_partitions = _partitions((yesterday.date(), end_id + 1))
+    start = datetime.combine(now.date(), datetime.min.time(), dt_util.UTC)
+
+    def _states(start_time: datetime) -> list[str]:
+        return [
+            state.state
+            for state in history.get_significant_states(
+                hass,
+                start_time,
+                entity_ids=["sensor.power"],
+                include_start_time_state=False,
+            )["sensor.power"]
+        ]
+
+    assert _states(start) == ["3"]
+    assert _states(start - timedelta(seconds=1)) == ["2", "3"]
+    assert [
+        state.state
+        for state in history.state_changes_during_period(
+            hass, start, entity_id="sensor.power", include_start_time_state=False
+        )["sensor.power"]
+    ] == ["3"]
+
+    instance.states_partitions = None
+    assert _states(start) == ["2", "3"]
+
+
+async def test_purge_drops_expired_partitions(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test purging drops the partitions of the states to purge."""
+    instance = await async_setup_recorder_instance(hass)
+    old = dt_util.utcnow() - timedelta(days=10)
+
+    with freeze_time(old):
+        hass.states.async_set("sensor.old", "1", {"unit": "W"})
+        hass.states.async_set("sensor.power", "1", {"unit": "W"})
+        hass.states.async_set("sensor.power", "2", {"unit": "kW"})
+        await async_wait_recording_done(hass)
+    with session_scope(hass=hass, read_only=True) as session:
+        end_id = session.execute(select(func.max(States.state_id))).scalar() + 1
+    hass.states.async_set("sensor.power", "3", {"unit": "kW"})
+    await async_wait_recording_done(hass)
+
+    instance.states_partitions = _partitions((old.date(), end_id))
+    statements: list[str] = []
+
+    def _execute(instance, partition_statements) -> None:
+        """Drop the partition with SQLite."""
+        statements.extend(partition_statements)
+        with session_scope(session=instance.get_session()) as session:
+            session.execute(delete(States).where(States.state_id < end_id))
+
+    with patch.object(instance, "_dialect_name", SupportedDialect.MYSQL), patch(
+        "homeassistant.components.recorder.partitions._execute", _execute
+    ):
+        finished = purge_old_data(
+            instance, dt_util.utcnow() - timedelta(days=5), repack=False
+        )
+    assert finished
+    assert statements == [
+        f"ALTER TABLE states DROP PARTITION {old.strftime('p%Y%m%d')}"
+    ]
+    assert instance.states_partitions.last_sealed is None
+    assert "sensor.old" not in instance.states_manager._last_committed_id
+    assert "sensor.power" in instance.states_manager._last_committed_id
+
+    with session_scope(hass=hass) as session:
+        assert [
+            (state.state, state.old_state_id) for state in session.query(States)
+        ] == [("3", None)]
+        assert dict(
+            session.query(StateAttributes.shared_attrs, StateAttributes.ref_count)
+        ) == {'{"unit":"kW"}': 1}
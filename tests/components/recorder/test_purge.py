@@ -12,6 +12,7 @@ from sqlalchemy.orm.session import Session
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import SupportedDialect
 from homeassistant.components.recorder.db_schema import (
+    EventData,
     Events,
     EventTypes,
     RecorderRuns,
@@ -22,7 +23,7 @@ from homeassistant.components.recorder.db_schema import (
     StatisticsShortTerm,
 )
 from homeassistant.components.recorder.history import get_significant_states
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import PurgeCursor, purge_old_data
 from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
@@ -100,6 +101,101 @@ async def test_purge_big_database(
         assert state_attributes.count() == 1
 
 
+async def test_purge_with_time_budget(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test a purge that runs out of time continues where it left off."""
+
+    instance = await async_setup_recorder_instance(hass)
+
+    for _ in range(12):
+        await _add_test_states(hass, wait_recording_done=False)
+    await async_wait_recording_done(hass)
+
+    with patch.object(instance, "max_bind_vars", 12), patch.object(
+        instance.database_engine, "max_bind_vars", 12
+    ), session_scope(hass=hass) as session:
+        states = session.query(States)
+        state_attributes = session.query(StateAttributes)
+        assert states.count() == 72
+        assert state_attributes.count() == 3
+
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+        cursor = PurgeCursor()
+
+        # Only one batch of states is purged per slice without time
+        finished = purge_old_data(
+            instance, purge_before, repack=False, time_budget=0, cursor=cursor
+        )
+        assert not finished
+        assert states.count() == 60
+        assert cursor == PurgeCursor(states_purged=12, slices=1)
+
+        while not purge_old_data(
+            instance, purge_before, repack=False, time_budget=0, cursor=cursor
+        ):
+            assert cursor.slices < 10
+
+        assert states.count() == 24
+        assert state_attributes.count() == 1
+        assert cursor == PurgeCursor(
+            states_done=True, events_done=True, states_purged=48, slices=5
+        )
+
+
+async def test_purge_with_reference_counts(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test shared attributes and event data are purged by their reference counts."""
+    instance = await async_setup_recorder_instance(hass)
+    old = dt_util.utcnow() - timedelta(days=10)
+
+    with freeze_time(old):
+        hass.states.async_set("sensor.power", "1", {"unit": "W"})
+        hass.states.async_set("sensor.power", "2", {"unit": "W"})
+        hass.states.async_set("sensor.power", "3", {"unit": "kW"})
+        hass.bus.async_fire("EVENT_TEST", {"test": "old"})
+        hass.bus.async_fire("EVENT_TEST", {"test": "shared"})
+        await async_wait_recording_done(hass)
+    hass.states.async_set("sensor.power", "4", {"unit": "kW"})
+    hass.bus.async_fire("EVENT_TEST", {"test": "shared"})
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert dict(
+            session.query(StateAttributes.shared_attrs, StateAttributes.ref_count)
+        ) == {'{"unit":"W"}': 2, '{"unit":"kW"}': 2}
+        assert dict(
+            session.query(EventData.shared_data, EventData.ref_count).filter(
+                EventData.shared_data.like('{"test":%')
+            )
+        ) == {'{"test":"old"}': 1, '{"test":"shared"}': 2}
+
+    # The states and events using the rows do not have to be searched
+    with patch(
+        "homeassistant.components.recorder.purge.attributes_ids_exist_in_states_with_fast_in_distinct"
+    ) as attributes_ids_exist, patch(
+        "homeassistant.components.recorder.purge.data_ids_exist_in_events_with_fast_in_distinct"
+    ) as data_ids_exist:
+        finished = purge_old_data(
+            instance, dt_util.utcnow() - timedelta(days=5), repack=False
+        )
+    assert finished
+    assert not attributes_ids_exist.called
+    assert not data_ids_exist.called
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 1
+        assert dict(
+            session.query(StateAttributes.shared_attrs, StateAttributes.ref_count)
+        ) == {'{"unit":"kW"}': 1}
+        assert dict(
+            session.query(EventData.shared_data, EventData.ref_count).filter(
+                EventData.shared_data.like('{"test":%')
+            )
+        ) == {'{"test":"shared"}': 1}
+
+
 async def test_purge_old_states(
     async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
 ) -> None:
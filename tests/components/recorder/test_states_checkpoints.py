@@ -0,0 +1,235 @@
+"""Test the states checkpoints."""
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import patch
+
+from sqlalchemy import func, select
+from sqlalchemy.orm.session import Session
+
+from homeassistant.components.recorder import CONF_COMMIT_INTERVAL, Recorder, history
+from homeassistant.components.recorder.db_schema import StatesCheckpoints, StatesMeta
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.tasks import StatesCheckpointTask
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant, State
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+ENTITY_IDS = ["light.kitchen", "light.hallway", "sensor.power", "switch.fan"]
+
+
+async def _async_checkpoint(hass: HomeAssistant, instance: Recorder) -> float:
+    """Write a states checkpoint at the current time."""
+    checkpoint_ts = dt_util.utcnow().timestamp()
+    instance.queue_task(StatesCheckpointTask(checkpoint_ts))
+    await async_wait_recording_done(hass)
+    return checkpoint_ts
+
+
+def _checkpointed_states(hass: HomeAssistant, checkpoint_ts: float) -> dict[str, float]:
+    """Return the last_updated_ts of the states in a checkpoint."""
+    with session_scope(hass=hass, read_only=True) as session:
+        return dict(
+            session.execute(
+                select(StatesMeta.entity_id, StatesCheckpoints.last_updated_ts)
+                .join(
+                    StatesMeta, StatesCheckpoints.metadata_id == StatesMeta.metadata_id
+                )
+                .where(StatesCheckpoints.checkpoint_ts == checkpoint_ts)
+            )
+            .tuples()
+            .all()
+        )
+
+
+def _as_dicts(
+    states: MutableMapping[str, list[State | dict[str, Any]]],
+) -> dict[str, list[dict[str, Any]]]:
+    """Return the states as dicts."""
+    return {
+        entity_id: [
+            state.as_dict() if isinstance(state, State) else state
+            for state in entity_states
+        ]
+        for entity_id, entity_states in states.items()
+    }
+
+
+def _assert_start_states_match_legacy(
+    hass: HomeAssistant, instance: Recorder, start_time: datetime
+) -> None:
+    """Assert the start time states from the checkpoint match the legacy query."""
+    manager = instance.states_checkpoints_manager
+    for kwargs in (
+        {},
+        {"significant_changes_only": False},
+        {"no_attributes": True},
+    ):
+        states = history.get_significant_states(
+            hass, start_time, entity_ids=ENTITY_IDS, **kwargs
+        )
+        with patch.object(manager, "checkpoint_before", return_value=None):
+            legacy = history.get_significant_states(
+                hass, start_time, entity_ids=ENTITY_IDS, **kwargs
+            )
+        assert len(states) == len(ENTITY_IDS)
+        assert _as_dicts(states) == _as_dicts(legacy)
+
+
+async def test_checkpoints_are_written(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the checkpoints have the latest state of each entity."""
+    instance = await async_setup_recorder_instance(hass)
+    manager = instance.states_checkpoints_manager
+    assert manager.active
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.hallway", "on")
+    await async_wait_recording_done(hass)
+    first = await _async_checkpoint(hass, instance)
+    kitchen = hass.states.get("light.kitchen").last_updated_timestamp
+    hallway = hass.states.get("light.hallway").last_updated_timestamp
+    assert _checkpointed_states(hass, first) == {
+        "light.kitchen": kitchen,
+        "light.hallway": hallway,
+    }
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "W"})
+    await async_wait_recording_done(hass)
+    second = await _async_checkpoint(hass, instance)
+    # The second checkpoint is built from the first one
+    assert _checkpointed_states(hass, second) == {
+        "light.kitchen": hass.states.get("light.kitchen").last_updated_timestamp,
+        "light.hallway": hallway,
+        "sensor.power": hass.states.get("sensor.power").last_updated_timestamp,
+    }
+
+    # Checkpoints are not written twice or before the latest one
+    instance.queue_task(StatesCheckpointTask(first))
+    await async_wait_recording_done(hass)
+    assert _checkpointed_states(hass, first) == {
+        "light.kitchen": kitchen,
+        "light.hallway": hallway,
+    }
+    run_start_ts = dt_util.as_utc(
+        instance.recorder_runs_manager.current.start
+    ).timestamp()
+    assert manager.checkpoint_before(second, run_start_ts) == second
+    assert manager.checkpoint_before(second - 1e-3, run_start_ts) == first
+    assert manager.checkpoint_before(first - 1e-3, run_start_ts) is None
+    # Checkpoints of older runs are not used
+    assert manager.checkpoint_before(second, second) is None
+
+
+async def test_pending_states_are_committed_before_checkpoint(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the pending states are committed before the checkpoint is written."""
+    instance = await async_setup_recorder_instance(hass, {CONF_COMMIT_INTERVAL: 30})
+    manager = instance.states_checkpoints_manager
+    pending_writes: list[bool] = []
+    write = manager.write
+
+    def _write(session: Session, checkpoint_ts: float) -> bool:
+        pending_writes.append(instance._event_session_has_pending_writes)
+        return write(session, checkpoint_ts)
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.hallway", "off")
+    await hass.async_block_till_done()
+    # The checkpoint is queued right behind the states
+    with patch.object(manager, "write", _write):
+        checkpoint_ts = await _async_checkpoint(hass, instance)
+
+    assert pending_writes == [False]
+    assert _checkpointed_states(hass, checkpoint_ts) == {
+        "light.kitchen": hass.states.get("light.kitchen").last_updated_timestamp,
+        "light.hallway": hass.states.get("light.hallway").last_updated_timestamp,
+    }
+
+
+async def test_start_states_match_legacy_queries(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the start time states from the checkpoints match the legacy query."""
+    instance = await async_setup_recorder_instance(hass)
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.hallway", "on", {"brightness": 10})
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "W"})
+    await async_wait_recording_done(hass)
+    await _async_checkpoint(hass, instance)
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "W"})
+    await async_wait_recording_done(hass)
+    checkpoint_ts = await _async_checkpoint(hass, instance)
+    hass.states.async_set("sensor.power", "3", {"unit_of_measurement": "W"})
+    hass.states.async_set("switch.fan", "on")
+    await async_wait_recording_done(hass)
+    start_time = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("switch.fan", "off")
+    await async_wait_recording_done(hass)
+
+    run_start_ts = dt_util.as_utc(
+        instance.recorder_runs_manager.current.start
+    ).timestamp()
+    assert (
+        instance.states_checkpoints_manager.checkpoint_before(
+            start_time.timestamp(), run_start_ts
+        )
+        == checkpoint_ts
+    )
+    _assert_start_states_match_legacy(hass, instance, start_time)
+    _assert_start_states_match_legacy(
+        hass, instance, dt_util.utc_from_timestamp(checkpoint_ts)
+    )
+
+
+async def test_checkpoint_queued_every_hour(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test a checkpoint is queued at the start of every hour."""
+    instance = await async_setup_recorder_instance(hass)
+    hour = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    with patch.object(instance, "queue_task") as queue_task_mock:
+        instance._async_five_minute_tasks(hour + timedelta(minutes=5, seconds=10))
+        assert not any(
+            isinstance(call.args[0], StatesCheckpointTask)
+            for call in queue_task_mock.mock_calls
+        )
+        instance._async_five_minute_tasks(hour + timedelta(seconds=10))
+    assert StatesCheckpointTask(hour.timestamp()) in [
+        call.args[0] for call in queue_task_mock.mock_calls
+    ]
+
+
+async def test_purge_states_checkpoints(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test purging removes the old checkpoints."""
+    instance = await async_setup_recorder_instance(hass)
+    manager = instance.states_checkpoints_manager
+    hass.states.async_set("light.kitchen", "on")
+    await async_wait_recording_done(hass)
+    first = await _async_checkpoint(hass, instance)
+    hass.states.async_set("light.kitchen", "off")
+    await async_wait_recording_done(hass)
+    second = await _async_checkpoint(hass, instance)
+
+    purge_before = dt_util.utc_from_timestamp(second)
+    while not purge_old_data(instance, purge_before, repack=False):
+        pass
+
+    assert manager.checkpoint_before(second - 1e-3, 0) is None
+    assert manager.checkpoint_before(second, 0) == second
+    assert not _checkpointed_states(hass, first)
+    with session_scope(hass=hass, read_only=True) as session:
+        assert session.execute(select(func.count(StatesCheckpoints.id))).scalar() == 1
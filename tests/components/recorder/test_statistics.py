@@ -8,16 +8,18 @@ from sqlalchemy import select
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import Recorder, history, statistics
-from homeassistant.components.recorder.db_schema import StatisticsShortTerm
+from homeassistant.components.recorder.db_schema import Statistics, StatisticsShortTerm
 from homeassistant.components.recorder.models import (
     datetime_to_timestamp_or_none,
     process_timestamp,
 )
 from homeassistant.components.recorder.statistics import (
     STATISTIC_UNIT_TO_UNIT_CONVERTER,
+    StatisticsDuringPeriodCache,
     _generate_max_mean_min_statistic_in_sub_period_stmt,
     _generate_statistics_at_time_stmt,
     _generate_statistics_during_period_stmt,
+    _reduce_statistics_per_day,
     async_add_external_statistics,
     async_import_statistics,
     get_last_short_term_statistics,
@@ -25,6 +27,7 @@ from homeassistant.components.recorder.statistics import (
     get_latest_short_term_statistics_with_session,
     get_metadata,
     get_short_term_statistics_run_cache,
+    get_statistics_during_period_cache,
     list_statistic_ids,
 )
 from homeassistant.components.recorder.table_managers.statistics_meta import (
@@ -47,7 +50,7 @@ from .common import (
 )
 
 from tests.common import mock_registry
-from tests.typing import WebSocketGenerator
+from tests.typing import RecorderInstanceGenerator, WebSocketGenerator
 
 
 def test_converters_align_with_sensor() -> None:
@@ -2390,3 +2393,180 @@ def test_change_with_none(
     assert stats == {}
 
     dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
+
+
+def test_reduce_statistics_per_day() -> None:
+    """Test reducing hourly statistics with missing hours and values."""
+    day1 = dt_util.as_utc(dt_util.parse_datetime("2023-05-01 00:00:00"))
+    day2 = day1 + timedelta(days=1)
+    day4 = day1 + timedelta(days=3)
+
+    def _hour(day, hour, mean, min_, max_, sum_):
+        start = (day + timedelta(hours=hour)).timestamp()
+        return {
+            "start": start,
+            "end": start + 3600,
+            "mean": mean,
+            "min": min_,
+            "max": max_,
+            "last_reset": None,
+            "state": sum_,
+            "sum": sum_,
+        }
+
+    stats = {
+        "sensor.one": [
+            _hour(day1, 0, 1.0, 0.0, 2.0, 1.0),
+            _hour(day1, 23, 3.0, 2.0, 4.0, 2.0),
+            _hour(day2, 0, None, None, None, 3.0),
+            _hour(day4, 5, 5.0, 5.0, 5.0, 4.0),
+        ],
+        "sensor.two": [
+            _hour(day2, 1, None, None, None, 1.0),
+            _hour(day2, 2, 4.0, -1.0, 6.0, 2.0),
+        ],
+    }
+    types = {"last_reset", "max", "mean", "min", "state", "sum"}
+
+    def _day(day, mean, min_, max_, sum_):
+        return {
+            "start": day.timestamp(),
+            "end": (day + timedelta(days=1)).timestamp(),
+            "mean": mean,
+            "min": min_,
+            "max": max_,
+            "last_reset": None,
+            "state": sum_,
+            "sum": sum_,
+        }
+
+    assert _reduce_statistics_per_day(stats, types) == {
+        "sensor.one": [
+            _day(day1, 2.0, 0.0, 4.0, 2.0),
+            _day(day2, None, None, None, 3.0),
+            _day(day4, 5.0, 5.0, 5.0, 4.0),
+        ],
+        "sensor.two": [_day(day2, 4.0, -1.0, 6.0, 2.0)],
+    }
+    assert _reduce_statistics_per_day(stats, {"sum"}) == {
+        "sensor.one": [
+            {
+                "start": day.timestamp(),
+                "end": (day + timedelta(days=1)).timestamp(),
+                "sum": sum_,
+            }
+            for day, sum_ in ((day1, 2.0), (day2, 3.0), (day4, 4.0))
+        ],
+        "sensor.two": [
+            {
+                "start": day2.timestamp(),
+                "end": (day2 + timedelta(days=1)).timestamp(),
+                "sum": 2.0,
+            }
+        ],
+    }
+
+
+async def test_statistics_during_period_cache(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the statistics are cached until they are changed."""
+    instance = await async_setup_recorder_instance(hass)
+    cache = get_statistics_during_period_cache(hass)
+    period1 = dt_util.as_utc(dt_util.parse_datetime("2023-05-08 00:00:00"))
+
+    def _metadata(statistic_id: str) -> dict:
+        return {
+            "has_mean": False,
+            "has_sum": True,
+            "name": None,
+            "source": "test",
+            "statistic_id": statistic_id,
+            "unit_of_measurement": "kWh",
+        }
+
+    def _statistics(start_hour: int, hours: int) -> list[dict]:
+        return [
+            {
+                "start": period1 + timedelta(hours=hour),
+                "last_reset": None,
+                "state": hour,
+                "sum": hour,
+            }
+            for hour in range(start_hour, start_hour + hours)
+        ]
+
+    for statistic_id in ("test:one", "test:two"):
+        async_add_external_statistics(hass, _metadata(statistic_id), _statistics(0, 4))
+    await async_wait_recording_done(hass)
+
+    def _one(end_time=None) -> dict:
+        return statistics_during_period(
+            hass, period1, end_time, {"test:one"}, types={"change", "sum"}
+        )
+
+    stats = _one()
+    assert [row["sum"] for row in stats["test:one"]] == [0, 1, 2, 3]
+    assert (cache.hits, cache.misses) == (0, 1)
+    # The cached result can not be modified by the caller
+    stats["test:one"].clear()
+    assert [row["sum"] for row in _one()["test:one"]] == [0, 1, 2, 3]
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+    # Other statistics do not invalidate the results
+    before = _one(period1 + timedelta(hours=2))
+    async_add_external_statistics(hass, _metadata("test:two"), _statistics(0, 1))
+    await async_wait_recording_done(hass)
+    assert len(cache) == 2
+
+    # Results that end before the changed statistics are kept
+    instance.async_adjust_statistics(
+        "test:one", period1 + timedelta(hours=2), 10, "kWh"
+    )
+    await async_wait_recording_done(hass)
+    assert len(cache) == 1
+    assert _one(period1 + timedelta(hours=2)) == before
+    assert [row["sum"] for row in _one()["test:one"]] == [0, 1, 12, 13]
+
+    # Statistics that do not exist are not cached
+    statistics_during_period(hass, period1, None, {"test:one", "test:three"})
+    assert len(cache) == 2
+
+
+def test_statistics_during_period_cache_limits() -> None:
+    """Test results read before an invalidation or over the row limit are dropped."""
+    cache = StatisticsDuringPeriodCache(max_rows=3)
+
+    def _result(rows: int) -> dict:
+        return {"test:one": [{"start": float(start)} for start in range(rows)]}
+
+    generation = cache.generation
+    cache.invalidate({1}, 0)
+    cache.post_commit_pending()
+    cache.set("stale", generation, {1}, StatisticsShortTerm, 0, None, _result(1))
+    assert cache.get("stale") is None
+
+    generation = cache.generation
+    cache.set("too_big", generation, {1}, StatisticsShortTerm, 0, None, _result(4))
+    cache.set("first", generation, {1}, StatisticsShortTerm, 0, None, _result(2))
+    cache.set("second", generation, {2}, StatisticsShortTerm, 0, 10, _result(1))
+    assert cache.get("first") == _result(2)
+    cache.set("third", generation, {2}, StatisticsShortTerm, 0, None, _result(1))
+    # The least recently used result is evicted
+    assert len(cache) == 2
+    assert cache.get("second") is None
+
+    # Only the results with statistics after the invalidated start are dropped
+    cache = StatisticsDuringPeriodCache()
+    generation = cache.generation
+    cache.set("short_term", generation, {1}, StatisticsShortTerm, 0, None, _result(1))
+    cache.set("before", generation, {2}, StatisticsShortTerm, 0, 10, _result(1))
+    cache.set("after", generation, {2}, StatisticsShortTerm, 0, None, _result(1))
+    cache.invalidate({2}, 10)
+    cache.invalidate({1}, 0, Statistics)
+    assert len(cache) == 3
+    cache.post_commit_pending()
+    assert cache.get("after") is None
+    assert cache.get("before") is not None
+    assert cache.get("short_term") is not None
@@ -0,0 +1,221 @@
+"""Test the daily and monthly statistics rollups."""
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import patch
+
+from sqlalchemy import func, select
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import (
+    StatisticsDaily,
+    StatisticsMonthly,
+    StatisticsShortTerm,
+)
+from homeassistant.components.recorder.statistics import (
+    StatisticsDuringPeriodCache,
+    async_add_external_statistics,
+    statistics_during_period,
+)
+from homeassistant.components.recorder.tasks import StatisticsRollupsTimeZoneTask
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done, do_adhoc_statistics
+
+from tests.typing import RecorderInstanceGenerator
+
+STATISTIC_ID = "test:total_energy_import"
+METADATA = {
+    "has_mean": True,
+    "has_sum": True,
+    "name": "Total imported energy",
+    "source": "test",
+    "statistic_id": STATISTIC_ID,
+    "unit_of_measurement": "kWh",
+}
+TYPES = {"change", "last_reset", "max", "mean", "min", "state", "sum"}
+
+
+def _month_start(time: datetime, months: int = 0) -> datetime:
+    """Return the start of the local month months after time."""
+    start = dt_util.as_local(time).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+    for _ in range(abs(months)):
+        if months > 0:
+            start = (start + timedelta(days=32)).replace(day=1)
+        else:
+            start = (start - timedelta(days=1)).replace(day=1)
+    return start
+
+
+def _hourly_statistics(start: datetime, hours: int) -> list[dict[str, Any]]:
+    """Return hourly statistics starting at start."""
+    return [
+        {
+            "start": start + timedelta(hours=hour),
+            "mean": float(hour % 7),
+            "min": float(hour % 5),
+            "max": float(hour % 11 + 10),
+            "last_reset": None,
+            "state": float(hour),
+            "sum": float(hour * 2),
+        }
+        for hour in range(hours)
+    ]
+
+
+def _local_days(start: datetime, hours: int) -> int:
+    """Return the number of local days of the hours from start."""
+    return len(
+        {
+            dt_util.as_local(start + timedelta(hours=hour)).date()
+            for hour in range(hours)
+        }
+    )
+
+
+def _monthly_sums(hass: HomeAssistant) -> list[float]:
+    """Return the sums of the monthly rollups."""
+    with session_scope(hass=hass, read_only=True) as session:
+        return list(
+            session.execute(
+                select(StatisticsMonthly.sum).order_by(StatisticsMonthly.start_ts)
+            ).scalars()
+        )
+
+
+def _rollup_counts(hass: HomeAssistant) -> tuple[int, int]:
+    """Return the number of daily and monthly rollups."""
+    with session_scope(hass=hass, read_only=True) as session:
+        return (
+            session.execute(select(func.count(StatisticsDaily.id))).scalar(),
+            session.execute(select(func.count(StatisticsMonthly.id))).scalar(),
+        )
+
+
+def _assert_rollups_match_hourly(
+    instance: Recorder, start_time: datetime, end_time: datetime | None = None
+) -> None:
+    """Assert the rollups return the hourly statistics reduced per period."""
+    manager = instance.statistics_rollups_manager
+    assert manager.covers(start_time.timestamp())
+    for period in ("day", "month"):
+        rolled_up = statistics_during_period(
+            instance.hass, start_time, end_time, {STATISTIC_ID}, period, None, TYPES
+        )
+        # The rolled up result must not be returned from the cache
+        with patch.object(manager, "since", None), patch.object(
+            StatisticsDuringPeriodCache, "get", return_value=None
+        ):
+            reduced = statistics_during_period(
+                instance.hass, start_time, end_time, {STATISTIC_ID}, period, None, TYPES
+            )
+        assert rolled_up[STATISTIC_ID]
+        assert rolled_up == reduced
+
+
+async def test_imported_statistics_are_rolled_up(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test imported and adjusted statistics are rolled up per day and month."""
+    instance = await async_setup_recorder_instance(hass)
+    manager = instance.statistics_rollups_manager
+    assert manager.active
+    assert manager.since == _month_start(dt_util.utcnow()).timestamp()
+
+    # Two days at the end of next month and two days of the month after
+    next_month = _month_start(dt_util.utcnow(), 2)
+    start = next_month - timedelta(days=2)
+    async_add_external_statistics(hass, METADATA, _hourly_statistics(start, 96))
+    await async_wait_recording_done(hass)
+
+    assert _rollup_counts(hass) == (_local_days(start, 96), 2)
+    _assert_rollups_match_hourly(instance, start)
+    _assert_rollups_match_hourly(instance, next_month)
+    _assert_rollups_match_hourly(instance, start, next_month + timedelta(hours=30))
+
+    sums = _monthly_sums(hass)
+    instance.async_adjust_statistics(
+        STATISTIC_ID, start + timedelta(hours=30), 100, "kWh"
+    )
+    await async_wait_recording_done(hass)
+
+    assert _monthly_sums(hass) == [value + 100 for value in sums]
+    _assert_rollups_match_hourly(instance, start)
+
+
+async def test_compiled_statistics_are_rolled_up(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the compiled hourly statistics are rolled up per day and month."""
+    instance = await async_setup_recorder_instance(hass)
+    start = _month_start(dt_util.utcnow(), 1) + timedelta(hours=5)
+    instance.async_import_statistics(
+        METADATA,
+        [
+            {**statistic, "start": dt_util.as_utc(start) + timedelta(minutes=5 * idx)}
+            for idx, statistic in enumerate(_hourly_statistics(start, 12))
+        ],
+        StatisticsShortTerm,
+    )
+    do_adhoc_statistics(hass, start=dt_util.as_utc(start + timedelta(minutes=55)))
+    await async_wait_recording_done(hass)
+
+    assert _rollup_counts(hass) == (1, 1)
+    _assert_rollups_match_hourly(instance, start)
+    with session_scope(hass=hass, read_only=True) as session:
+        daily = session.query(StatisticsDaily).one()
+        assert (daily.mean, daily.min, daily.max, daily.sum) == (
+            # The hour is compiled from the 12 short term statistics
+            sum(hour % 7 for hour in range(12)) / 12,
+            0.0,
+            20.0,
+            22.0,
+        )
+
+
+async def test_older_statistics_are_backfilled(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the statistics older than the rollups are backfilled on load."""
+    instance = await async_setup_recorder_instance(hass)
+    manager = instance.statistics_rollups_manager
+    oldest_month = _month_start(dt_util.utcnow(), -3)
+    start = oldest_month + timedelta(days=20)
+
+    async_add_external_statistics(hass, METADATA, _hourly_statistics(start, 24 * 20))
+    await async_wait_recording_done(hass)
+    assert _rollup_counts(hass) == (0, 0)
+    assert not manager.covers(start.timestamp())
+
+    instance.queue_task(StatisticsRollupsTimeZoneTask())
+    for _ in range(5):
+        await async_wait_recording_done(hass)
+
+    assert manager.since == oldest_month.timestamp()
+    assert _rollup_counts(hass) == (_local_days(start, 24 * 20), 2)
+    _assert_rollups_match_hourly(instance, oldest_month)
+
+
+async def test_rollups_rebuilt_when_time_zone_changes(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the rollups are rebuilt for the new time zone."""
+    instance = await async_setup_recorder_instance(hass)
+    manager = instance.statistics_rollups_manager
+    start = _month_start(dt_util.utcnow(), 2) - timedelta(days=2)
+    async_add_external_statistics(hass, METADATA, _hourly_statistics(start, 96))
+    await async_wait_recording_done(hass)
+
+    await hass.config.async_update(time_zone="Asia/Tokyo")
+    new_start = _month_start(start, 1) - timedelta(days=1)
+    # The rollups of the old time zone are not used
+    assert not manager.covers(new_start.timestamp())
+
+    for _ in range(5):
+        await async_wait_recording_done(hass)
+
+    assert _rollup_counts(hass) == (_local_days(start, 96), 2)
+    _assert_rollups_match_hourly(instance, new_start - timedelta(days=1))
@@ -1,4 +1,5 @@
 """Test recorder system health."""
+import re
 from unittest.mock import ANY, Mock, patch
 
 import pytest
@@ -32,7 +33,18 @@ async def test_recorder_system_health(
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        "queue_states": ANY,
+        "queue_events": ANY,
+        "queue_statistics": ANY,
+        "queue_maintenance": ANY,
+        "statistics_cache": ANY,
     }
+    assert re.fullmatch(
+        r"0 queued \(0\.00 of 444\.34 MiB\); waited "
+        r"<10ms: \d+, <100ms: \d+, <1s: \d+, <10s: \d+, <60s: \d+, >=60s: \d+",
+        info["queue_states"],
+    )
+    assert info["statistics_cache"] == "0 hits, 0 misses; 0 results cached"
 
 
 @pytest.mark.parametrize(
@@ -58,6 +70,11 @@ async def test_recorder_system_health_alternate_dbms(
         "estimated_db_size": "1.00 MiB",
         "database_engine": dialect_name.value,
         "database_version": ANY,
+        "queue_states": ANY,
+        "queue_events": ANY,
+        "queue_statistics": ANY,
+        "queue_maintenance": ANY,
+        "statistics_cache": ANY,
     }
 
 
@@ -89,6 +106,11 @@ async def test_recorder_system_health_db_url_missing_host(
         "estimated_db_size": "1.00 MiB",
         "database_engine": dialect_name.value,
         "database_version": ANY,
+        "queue_states": ANY,
+        "queue_events": ANY,
+        "queue_statistics": ANY,
+        "queue_maintenance": ANY,
+        "statistics_cache": ANY,
     }
 
 
@@ -115,4 +137,9 @@ async def test_recorder_system_health_crashed_recorder_runs_table(
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        "queue_states": ANY,
+        "queue_events": ANY,
+        "queue_statistics": ANY,
+        "queue_maintenance": ANY,
+        "statistics_cache": ANY,
     }
@@ -0,0 +1,179 @@
+"""Test the recorder queue."""
+import asyncio
+from datetime import datetime
+import queue
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder.const import (
+    ESTIMATED_QUEUE_ITEM_SIZE,
+    ESTIMATED_STATISTICS_ROW_SIZE,
+    RecorderQueueClass,
+)
+from homeassistant.components.recorder.db_schema import Statistics
+from homeassistant.components.recorder.task_queue import MAX_QUEUE_WAIT, RecorderQueue
+from homeassistant.components.recorder.tasks import (
+    CommitTask,
+    ImportStatisticsTask,
+    KeepAliveTask,
+    PostSchemaMigrationTask,
+    PurgeTask,
+    StatisticsTask,
+    StatisticsTimestampMigrationCleanupTask,
+    StopTask,
+    SynchronizeTask,
+    WaitTask,
+)
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event
+
+
+def test_queue_priorities() -> None:
+    """Test state and event writes are processed before other tasks."""
+    recorder_queue = RecorderQueue()
+    purge = PurgeTask(datetime(2024, 1, 1), False, False)
+    keep_alive = KeepAliveTask()
+    statistics = StatisticsTask(datetime(2024, 1, 1), False)
+    state_changed = Event(EVENT_STATE_CHANGED, {"entity_id": "sensor.power"})
+    event = Event("test_event")
+    commit = CommitTask()
+
+    for item in (purge, keep_alive, statistics, state_changed, event, commit):
+        recorder_queue.put(item)
+
+    assert recorder_queue.qsize() == 6
+    stats = recorder_queue.stats()
+    assert stats[RecorderQueueClass.STATES].items == 2
+    assert stats[RecorderQueueClass.EVENTS].items == 1
+    assert stats[RecorderQueueClass.STATISTICS].items == 1
+    assert stats[RecorderQueueClass.MAINTENANCE].items == 2
+    assert recorder_queue.size == 6 * ESTIMATED_QUEUE_ITEM_SIZE
+
+    assert [recorder_queue.get() for _ in range(6)] == [
+        state_changed,
+        event,
+        commit,
+        statistics,
+        purge,
+        keep_alive,
+    ]
+    assert recorder_queue.empty()
+    assert recorder_queue.size == 0
+    stats = recorder_queue.stats()
+    assert sum(stats[RecorderQueueClass.STATES].latency) == 2
+    assert sum(stats[RecorderQueueClass.MAINTENANCE].latency) == 2
+
+    with pytest.raises(queue.Empty):
+        recorder_queue.get_nowait()
+
+
+def test_queue_barriers() -> None:
+    """Test the items added after a barrier task are not processed before it."""
+    recorder_queue = RecorderQueue()
+    purge = PurgeTask(datetime(2024, 1, 1), False, False)
+    post_schema_migration = PostSchemaMigrationTask(42, 43)
+    cleanup = StatisticsTimestampMigrationCleanupTask()
+    statistics = StatisticsTask(datetime(2024, 1, 1), False)
+    state_changed = Event(EVENT_STATE_CHANGED, {"entity_id": "sensor.power"})
+
+    for item in (purge, post_schema_migration, cleanup, statistics, state_changed):
+        recorder_queue.put(item)
+
+    assert [recorder_queue.get() for _ in range(5)] == [
+        purge,
+        post_schema_migration,
+        state_changed,
+        cleanup,
+        statistics,
+    ]
+    assert recorder_queue.empty()
+
+
+def test_queue_wait_and_stop_tasks_keep_their_position() -> None:
+    """Test the tasks used to wait for or stop the recorder are not delayed."""
+    recorder_queue = RecorderQueue()
+    statistics = StatisticsTask(datetime(2024, 1, 1), False)
+    wait = WaitTask()
+    synchronize = SynchronizeTask(asyncio.Event())
+    stop = StopTask()
+    events = [Event("test_event") for _ in range(4)]
+
+    for item in (
+        statistics,
+        events[0],
+        wait,
+        events[1],
+        synchronize,
+        events[2],
+        stop,
+        events[3],
+    ):
+        recorder_queue.put(item)
+
+    assert [recorder_queue.get() for _ in range(8)] == [
+        events[0],
+        statistics,
+        wait,
+        events[1],
+        synchronize,
+        events[2],
+        stop,
+        events[3],
+    ]
+    assert recorder_queue.empty()
+
+
+def test_queue_max_wait() -> None:
+    """Test the items of a lower priority are processed once they waited too long."""
+    recorder_queue = RecorderQueue()
+    purge = PurgeTask(datetime(2024, 1, 1), False, False)
+    statistics = StatisticsTask(datetime(2024, 1, 1), False)
+    events = [Event("test_event") for _ in range(3)]
+
+    with patch(
+        "homeassistant.components.recorder.task_queue.time.monotonic"
+    ) as mock_monotonic:
+        mock_monotonic.return_value = 0
+        recorder_queue.put(purge)
+        recorder_queue.put(statistics)
+        recorder_queue.put(events[0])
+        assert recorder_queue.get() is events[0]
+
+        mock_monotonic.return_value = MAX_QUEUE_WAIT + 1
+        recorder_queue.put(events[1])
+        recorder_queue.put(events[2])
+        # The oldest of the items that waited too long is processed first
+        assert [recorder_queue.get() for _ in range(4)] == [
+            purge,
+            statistics,
+            events[1],
+            events[2],
+        ]
+
+
+def test_queue_import_statistics_size() -> None:
+    """Test the size of statistics imports is accounted for."""
+    recorder_queue = RecorderQueue()
+    recorder_queue.put(
+        ImportStatisticsTask(
+            {
+                "has_mean": False,
+                "has_sum": True,
+                "name": None,
+                "source": "test",
+                "statistic_id": "test:total_energy_import",
+                "unit_of_measurement": "kWh",
+            },
+            [{"start": datetime(2024, 1, 1), "sum": 1}] * 10,
+            Statistics,
+        )
+    )
+    assert recorder_queue.class_size(RecorderQueueClass.STATISTICS) == (
+        ESTIMATED_QUEUE_ITEM_SIZE + 10 * ESTIMATED_STATISTICS_ROW_SIZE
+    )
+    assert recorder_queue.class_size(RecorderQueueClass.STATES) == 0
+
+    recorder_queue.clear()
+    assert recorder_queue.empty()
+    assert recorder_queue.class_size(RecorderQueueClass.STATISTICS) == 0
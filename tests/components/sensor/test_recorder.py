@@ -195,6 +195,65 @@ def test_compile_hourly_statistics(
     assert "Error while processing event StatisticsTask" not in caplog.text
 
 
+async def test_compile_statistics_from_accumulated_states(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test statistics are compiled from accumulated states without the database."""
+    now = dt_util.utcnow()
+    period0 = now.replace(
+        minute=now.minute - now.minute % 5, second=0, microsecond=0
+    ) + timedelta(minutes=5)
+    freezer.move_to(period0 - timedelta(minutes=1))
+    await async_setup_component(hass, "sensor", {})
+    # Wait for the sensor recorder platform to be added
+    await async_recorder_block_till_done(hass)
+    attributes = {
+        "device_class": "battery",
+        "state_class": "measurement",
+        "unit_of_measurement": "%",
+    }
+    hass.states.async_set("sensor.test1", "10", attributes)
+    await async_wait_recording_done(hass)
+
+    # The first compile queries the database and starts accumulating states
+    do_adhoc_statistics(hass, start=period0 - timedelta(minutes=5))
+    await async_wait_recording_done(hass)
+
+    freezer.move_to(period0 + timedelta(minutes=1))
+    hass.states.async_set("sensor.test1", "20", attributes)
+    freezer.move_to(period0 + timedelta(minutes=2))
+    hass.states.async_set("sensor.test1", "30", attributes)
+    await async_wait_recording_done(hass)
+
+    freezer.move_to(period0 + timedelta(minutes=5, seconds=10))
+    with patch.object(
+        history,
+        "get_full_significant_states_with_session",
+        wraps=history.get_full_significant_states_with_session,
+    ) as get_states_mock:
+        do_adhoc_statistics(hass, start=period0)
+        await async_wait_recording_done(hass)
+    assert get_states_mock.call_count == 0
+
+    stats = statistics_during_period(hass, period0, period="5minute")
+    assert stats == {
+        "sensor.test1": [
+            {
+                "start": process_timestamp(period0).timestamp(),
+                "end": process_timestamp(period0 + timedelta(minutes=5)).timestamp(),
+                "mean": pytest.approx(24.0),
+                "min": pytest.approx(10.0),
+                "max": pytest.approx(30.0),
+                "last_reset": None,
+                "state": None,
+                "sum": None,
+            }
+        ]
+    }
+
+
 @pytest.mark.parametrize(
     (
         "device_class",
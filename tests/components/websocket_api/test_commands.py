@@ -15,6 +15,9 @@ from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH_OK,
     TYPE_AUTH_REQUIRED,
 )
+from homeassistant.components.websocket_api.broadcast import (
+    async_get_entity_broadcaster,
+)
 from homeassistant.components.websocket_api.const import FEATURE_COALESCE_MESSAGES, URL
 from homeassistant.const import SIGNAL_BOOTSTRAP_INTEGRATIONS
 from homeassistant.core import Context, HomeAssistant, State, SupportsResponse, callback
@@ -1260,6 +1263,108 @@ async def test_subscribe_unsubscribe_entities_specific_entities(
     }
 
 
+async def test_subscribe_entities_coalesces_state_changes(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+) -> None:
+    """Test state changes of a loop iteration are sent in a single message."""
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"a": {}}
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.bedroom", "on")
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_remove("light.bedroom")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.kitchen": {"a": {}, "c": ANY, "lc": ANY, "s": "on"},
+            "light.bedroom": {"a": {}, "c": ANY, "lc": ANY, "s": "on"},
+        }
+    }
+
+    # A message only holds one state change per entity
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "c": {"light.kitchen": {"+": {"c": ANY, "lc": ANY, "s": "off"}}},
+        "r": ["light.bedroom"],
+    }
+
+    metrics = async_get_entity_broadcaster(hass).metrics
+    assert metrics.diffs == 4
+    assert metrics.merged == 0
+    assert metrics.frames == 2
+    assert metrics.frames_saved == 2
+    assert metrics.reused_bytes == 0
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "subscribe_entities", "entity_ids": ["light.kitchen"]}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+
+    encoded_bytes = metrics.encoded_bytes
+    hass.states.async_set("light.kitchen", "on")
+    messages = [await websocket_client.receive_json() for _ in range(2)]
+    assert {msg["id"] for msg in messages} == {7, 8}
+    assert messages[0]["event"] == messages[1]["event"]
+    # The state change is serialized once for both subscriptions
+    assert metrics.reused_bytes == metrics.encoded_bytes - encoded_bytes
+
+
+async def test_subscribe_entities_burst_does_not_disconnect(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+) -> None:
+    """Test a burst of state changes is merged for a client that cannot keep up."""
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"a": {}}
+
+    # Every state change needs its own message since it is the same entity
+    last_value = str(const.MAX_PENDING_MSG * 2 - 1)
+    for value in range(const.MAX_PENDING_MSG * 2):
+        hass.states.async_set("sensor.power", value)
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["a"]["sensor.power"]["s"] == "0"
+    values = ["0"]
+    while values[-1] != last_value:
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == 7
+        assert msg["type"] == "event"
+        values.append(msg["event"]["c"]["sensor.power"]["+"]["s"])
+
+    assert len(values) <= const.PENDING_MSG_BACKPRESSURE + 1
+    metrics = async_get_entity_broadcaster(hass).metrics
+    assert metrics.diffs == const.MAX_PENDING_MSG * 2
+    assert metrics.frames == len(values)
+    assert metrics.merged == metrics.diffs - metrics.frames
+
+    await websocket_client.send_json({"id": 8, "type": "ping"})
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["type"] == "pong"
+
+
 async def test_render_template_renders_template(
     hass: HomeAssistant, websocket_client
 ) -> None:
@@ -2293,3 +2293,36 @@ async def test_entries_for_label(
 
     assert not dr.async_entries_for_label(device_registry, "unknown")
     assert not dr.async_entries_for_label(device_registry, "")
+
+
+async def test_area_and_label_indexes_follow_updates(
+    hass: HomeAssistant, device_registry: dr.DeviceRegistry
+) -> None:
+    """Test the area and label indexes are updated with the devices."""
+    config_entry = MockConfigEntry()
+    config_entry.add_to_hass(hass)
+    entry = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={("bridgeid", "0123")},
+    )
+    entry = device_registry.async_update_device(
+        entry.id, area_id="kitchen", labels={"label1"}
+    )
+    assert dr.async_entries_for_area(device_registry, "kitchen") == [entry]
+    assert dr.async_entries_for_label(device_registry, "label1") == [entry]
+
+    entry = device_registry.async_update_device(
+        entry.id, area_id="hallway", labels={"label2"}
+    )
+    assert not dr.async_entries_for_area(device_registry, "kitchen")
+    assert dr.async_entries_for_area(device_registry, "hallway") == [entry]
+    assert not dr.async_entries_for_label(device_registry, "label1")
+
+    device_registry.async_clear_area_id("hallway")
+    device_registry.async_clear_label_id("label2")
+    assert not dr.async_entries_for_area(device_registry, "hallway")
+    assert not dr.async_entries_for_label(device_registry, "label2")
+
+    device_registry.async_update_device(entry.id, area_id="hallway")
+    device_registry.async_remove_device(entry.id)
+    assert not dr.async_entries_for_area(device_registry, "hallway")
@@ -2468,3 +2468,77 @@ async def test_entity_report_deprecated_supported_features_values(
         "is using deprecated supported features values which will be removed"
         not in caplog.text
     )
+
+
+async def test_unchanged_state_writes_are_skipped(hass: HomeAssistant) -> None:
+    """Test writing an unchanged state does not set the state again."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent._attr_state = "on"
+    ent._attr_extra_state_attributes = {"level": 1}
+    ent.async_write_ha_state()
+    state = hass.states.get("hello.world")
+
+    with patch(
+        "homeassistant.core.StateMachine.async_set", autospec=True
+    ) as async_set_mock:
+        ent.async_write_ha_state()
+    assert not async_set_mock.called
+    assert hass.states.get("hello.world") is state
+
+    # Attributes mutated in place are written
+    ent.extra_state_attributes["level"] = 2
+    ent.async_write_ha_state()
+    assert hass.states.get("hello.world").attributes == {"level": 2}
+
+    # Forced updates are always written
+    state = hass.states.get("hello.world")
+    ent._attr_force_update = True
+    ent.async_write_ha_state()
+    assert hass.states.get("hello.world") is not state
+
+
+async def test_unchanged_state_write_expires_context(hass: HomeAssistant) -> None:
+    """Test the context expires even if the unchanged state is not written."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent._attr_state = "on"
+    ent.async_write_ha_state()
+    state = hass.states.get("hello.world")
+
+    with patch("homeassistant.helpers.entity.CONTEXT_RECENT_TIME_SECONDS", -5):
+        ent.async_set_context(Context())
+        ent.async_write_ha_state()
+
+    assert hass.states.get("hello.world") is state
+    assert ent._context is None
+    assert ent._context_set is None
+
+
+async def test_static_attributes_are_rebuilt_on_change(
+    hass: HomeAssistant, entity_registry: er.EntityRegistry
+) -> None:
+    """Test the static attributes follow the entity and the registry entry."""
+    platform = MockEntityPlatform(hass, domain="test")
+    ent = entity.Entity()
+    ent._attr_unique_id = "qwer"
+    ent._attr_name = "Kitchen"
+    ent._attr_icon = "mdi:lamp"
+    await platform.async_add_entities([ent])
+    state = hass.states.get("test.kitchen")
+    assert state.attributes == {"friendly_name": "Kitchen", "icon": "mdi:lamp"}
+
+    ent._attr_icon = "mdi:lightbulb"
+    ent._attr_attribution = "Data provided by the sun"
+    ent.async_write_ha_state()
+    assert hass.states.get("test.kitchen").attributes == {
+        ATTR_ATTRIBUTION: "Data provided by the sun",
+        ATTR_FRIENDLY_NAME: "Kitchen",
+        "icon": "mdi:lightbulb",
+    }
+
+    entity_registry.async_update_entity("test.kitchen", name="Pantry")
+    await hass.async_block_till_done()
+    assert hass.states.get("test.kitchen").attributes[ATTR_FRIENDLY_NAME] == "Pantry"
@@ -77,6 +77,85 @@ async def test_polling_only_updates_entities_it_should_poll(
     assert poll_ent.async_update.called
 
 
+async def test_polling_interval_adapts_to_slow_updates(
+    hass: HomeAssistant,
+) -> None:
+    """Test the polling interval is stretched while the updates are slow."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+    await component.async_setup({})
+
+    poll_ent = MockEntity(should_poll=True)
+    poll_ent.async_update = Mock()
+    await component.async_add_entities([poll_ent])
+    platform = poll_ent.platform
+    poll_ent.async_update.reset_mock()
+    now = dt_util.utcnow()
+
+    # The poll takes two and a half scan intervals
+    with patch.object(entity_platform, "timer", side_effect=[0, 50]):
+        async_fire_time_changed(hass, now + timedelta(seconds=20))
+        await hass.async_block_till_done()
+    assert poll_ent.async_update.call_count == 1
+    assert platform.polling_stats == entity_platform.PollingStats(
+        polls=1, last_poll_duration=50, max_poll_duration=50
+    )
+
+    # The next poll is three scan intervals after the slow one
+    async_fire_time_changed(hass, now + timedelta(seconds=50))
+    await hass.async_block_till_done()
+    assert poll_ent.async_update.call_count == 1
+    with patch.object(entity_platform, "timer", side_effect=[0, 1]):
+        async_fire_time_changed(hass, now + timedelta(seconds=61))
+        await hass.async_block_till_done()
+    assert poll_ent.async_update.call_count == 2
+    assert platform.polling_stats.polls == 2
+
+    # The scan interval is restored once the updates are fast
+    async_fire_time_changed(hass, now + timedelta(seconds=100))
+    await hass.async_block_till_done()
+    assert poll_ent.async_update.call_count == 3
+
+
+async def test_polling_skipped_while_updating(hass: HomeAssistant) -> None:
+    """Test the skipped polls are counted."""
+    entity_platform = MockEntityPlatform(hass)
+    updating = asyncio.Event()
+    finish = asyncio.Event()
+
+    class SlowEntity(MockEntity):
+        """Mock entity with a slow update."""
+
+        async def async_update(self) -> None:
+            updating.set()
+            await finish.wait()
+
+    await entity_platform.async_add_entities([SlowEntity(should_poll=True)])
+    task = hass.async_create_task(entity_platform._update_entity_states(None))
+    await updating.wait()
+    await entity_platform._update_entity_states(None)
+    finish.set()
+    await task
+
+    assert entity_platform.polling_stats.polls == 1
+    assert entity_platform.polling_stats.skipped_polls == 1
+
+
+async def test_get_polling_stats(hass: HomeAssistant) -> None:
+    """Test the polling stats of the platforms that have polled are returned."""
+    polled_platform = MockEntityPlatform(hass)
+    polled_platform.config_entry = MockConfigEntry(entry_id="polled_entry")
+    idle_platform = MockEntityPlatform(hass, platform_name="idle_platform")
+    polled_platform.async_prepare()
+    idle_platform.async_prepare()
+    await polled_platform.async_add_entities([MockEntity(should_poll=True)])
+    await idle_platform.async_add_entities([MockEntity(should_poll=True)])
+    await polled_platform._update_entity_states(None)
+
+    assert entity_platform.async_get_polling_stats(hass) == {
+        "test_domain.test_platform (polled_entry)": polled_platform.polling_stats
+    }
+
+
 async def test_polling_disabled_by_config_entry(hass: HomeAssistant) -> None:
     """Test the polling of only updated entities."""
     entity_platform = MockEntityPlatform(hass)
@@ -1143,6 +1222,63 @@ async def test_device_info_called(
     assert device.via_device_id == via.id
 
 
+async def test_device_looked_up_once_per_batch(
+    hass: HomeAssistant,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test entities with the same device info only look up the device once."""
+    config_entry = MockConfigEntry(entry_id="super-mock-id")
+    config_entry.add_to_hass(hass)
+
+    def _device_info(identifier: str) -> DeviceInfo:
+        return {
+            "identifiers": {("hue", identifier)},
+            "connections": {(dr.CONNECTION_NETWORK_MAC, identifier)},
+            "name": f"Device {identifier}",
+        }
+
+    async def async_setup_entry(hass, config_entry, async_add_entities):
+        """Mock setup entry method."""
+        async_add_entities(
+            [
+                MockEntity(unique_id="first", device_info=_device_info("1234")),
+                MockEntity(unique_id="second", device_info=_device_info("1234")),
+                MockEntity(unique_id="third", device_info=_device_info("5678")),
+                # Invalid device info
+                MockEntity(unique_id="fourth", device_info={"name": "Invalid"}),
+                MockEntity(unique_id="fifth", device_info={"name": "Invalid"}),
+            ]
+        )
+        return True
+
+    platform = MockPlatform(async_setup_entry=async_setup_entry)
+    entity_platform = MockEntityPlatform(
+        hass, platform_name=config_entry.domain, platform=platform
+    )
+
+    with patch.object(
+        device_registry,
+        "async_get_or_create",
+        wraps=device_registry.async_get_or_create,
+    ) as get_or_create_mock:
+        assert await entity_platform.async_setup_entry(config_entry)
+        await hass.async_block_till_done()
+
+    assert len(get_or_create_mock.mock_calls) == 3
+    assert caplog.text.count("Not adding entity with invalid device info") == 2
+    assert len(hass.states.async_entity_ids()) == 3
+    first = device_registry.async_get_device(identifiers={("hue", "1234")})
+    second = device_registry.async_get_device(identifiers={("hue", "5678")})
+    assert {
+        entry.unique_id: entry.device_id
+        for entry in er.async_entries_for_config_entry(
+            entity_registry, config_entry.entry_id
+        )
+    } == {"first": first.id, "second": first.id, "third": second.id}
+
+
 async def test_device_info_not_overrides(
     hass: HomeAssistant, device_registry: dr.DeviceRegistry
 ) -> None:
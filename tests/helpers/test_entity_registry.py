@@ -1840,3 +1840,30 @@ async def test_entries_for_label(entity_registry: er.EntityRegistry) -> None:
 
     assert not er.async_entries_for_label(entity_registry, "unknown")
     assert not er.async_entries_for_label(entity_registry, "")
+
+
+async def test_indexes_follow_updates(entity_registry: er.EntityRegistry) -> None:
+    """Test the label and area indexes are updated with the entries."""
+    entry = entity_registry.async_get_or_create(
+        domain="light", platform="hue", unique_id="123"
+    )
+    entry = entity_registry.async_update_entity(
+        entry.entity_id, area_id="kitchen", labels={"label1", "label2"}
+    )
+    assert er.async_entries_for_area(entity_registry, "kitchen") == [entry]
+    assert er.async_entries_for_label(entity_registry, "label1") == [entry]
+
+    entry = entity_registry.async_update_entity(
+        entry.entity_id, area_id="hallway", labels={"label2"}
+    )
+    assert not er.async_entries_for_area(entity_registry, "kitchen")
+    assert er.async_entries_for_area(entity_registry, "hallway") == [entry]
+    assert not er.async_entries_for_label(entity_registry, "label1")
+    assert er.async_entries_for_label(entity_registry, "label2") == [entry]
+
+    entity_registry.async_clear_label_id("label2")
+    assert not er.async_entries_for_label(entity_registry, "label2")
+    assert entity_registry.async_get(entry.entity_id).labels == set()
+
+    entity_registry.async_remove(entry.entity_id)
+    assert not er.async_entries_for_area(entity_registry, "hallway")
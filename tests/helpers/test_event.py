@@ -25,6 +25,7 @@ from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_get_template_render_stats,
     async_track_device_registry_updated_event,
     async_track_entity_registry_updated_event,
     async_track_point_in_time,
@@ -1737,6 +1738,77 @@ async def test_track_template_result_super_template_2_initially_false(
     info3.async_remove()
 
 
+async def test_track_template_result_coalesces_state_changes(
+    hass: HomeAssistant,
+) -> None:
+    """Test state changes in the same loop iteration cause a single render."""
+    runs = []
+    template = Template("{{ states('sensor.one') }} {{ states('sensor.two') }}", hass)
+
+    @ha.callback
+    def refresh_listener(
+        event: EventType[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass, [TrackTemplate(template, None)], refresh_listener
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("sensor.two", "2")
+    await hass.async_block_till_done()
+    assert runs == ["1 2"]
+    assert async_get_template_render_stats(hass)[template.template].renders == 1
+
+    hass.states.async_set("sensor.one", "3")
+    await hass.async_block_till_done()
+    assert runs == ["1 2", "3 2"]
+    assert async_get_template_render_stats(hass)[template.template].renders == 2
+
+    info.async_remove()
+    hass.states.async_set("sensor.one", "4")
+    await hass.async_block_till_done()
+    assert len(runs) == 2
+
+
+async def test_track_template_result_shares_renders(hass: HomeAssistant) -> None:
+    """Test trackers with the same template and variables share a render."""
+    runs = []
+    source = "{{ states('sensor.shared') }} {{ suffix }}"
+
+    @ha.callback
+    def refresh_listener(
+        event: EventType[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        runs.append(updates.pop().result)
+
+    trackers = []
+    for suffix in ("a", "a", "b"):
+        template = Template(source, hass)
+        info = async_track_template_result(
+            hass, [TrackTemplate(template, {"suffix": suffix})], refresh_listener
+        )
+        trackers.append((info, template))
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.shared", "on")
+    await hass.async_block_till_done()
+    assert sorted(runs) == ["on a", "on a", "on b"]
+    assert async_get_template_render_stats(hass)[source].renders == 2
+
+    # The trackers sharing a render have their own render info
+    render_infos = [info._info[template] for info, template in trackers[:2]]
+    assert render_infos[0] is not render_infos[1]
+    assert [render_info.template for render_info in render_infos] == [
+        template for _, template in trackers[:2]
+    ]
+    assert [render_info.result() for render_info in render_infos] == ["on a"] * 2
+
+
 async def test_track_template_result_complex(hass: HomeAssistant) -> None:
     """Test tracking template."""
     specific_runs = []
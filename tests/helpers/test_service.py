@@ -28,6 +28,7 @@ from homeassistant.core import (
     SupportsResponse,
 )
 from homeassistant.helpers import (
+    area_registry as ar,
     device_registry as dr,
     entity_registry as er,
     service,
@@ -37,6 +38,7 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.setup import async_setup_component
 
 from tests.common import (
+    MockConfigEntry,
     MockEntity,
     MockUser,
     async_mock_service,
@@ -559,6 +561,54 @@ async def test_extract_entity_ids_from_devices(hass: HomeAssistant, area_mock) -
     )
 
 
+async def test_referenced_targets_are_cached(
+    hass: HomeAssistant,
+    area_registry: ar.AreaRegistry,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test the entities referenced by areas are cached until the registries change."""
+    config_entry = MockConfigEntry()
+    config_entry.add_to_hass(hass)
+    kitchen = area_registry.async_create("Kitchen")
+    device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={("test", "device")},
+    )
+    device_registry.async_update_device(device.id, area_id=kitchen.id)
+    entity_registry.async_get_or_create("light", "test", "ceiling", device_id=device.id)
+    cache = service.async_get_referenced_targets_cache(hass)
+    call = ServiceCall("light", "turn_on", {"area_id": [kitchen.id, "unknown"]})
+
+    for _ in range(2):
+        selected = service.async_extract_referenced_entity_ids(hass, call)
+        assert selected.indirectly_referenced == {"light.test_ceiling"}
+        assert selected.referenced_devices == {device.id}
+        assert selected.missing_areas == {"unknown"}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # The selected entities can be modified without changing the cache
+    selected.indirectly_referenced.clear()
+    selected = service.async_extract_referenced_entity_ids(hass, call)
+    assert selected.indirectly_referenced == {"light.test_ceiling"}
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    entity_registry.async_get_or_create("light", "test", "bowl", device_id=device.id)
+    selected = service.async_extract_referenced_entity_ids(hass, call)
+    assert selected.indirectly_referenced == {"light.test_ceiling", "light.test_bowl"}
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    device_registry.async_update_device(device.id, area_id=None)
+    selected = service.async_extract_referenced_entity_ids(hass, call)
+    assert not selected.indirectly_referenced
+    assert (cache.hits, cache.misses) == (2, 3)
+
+    area_registry.async_delete(kitchen.id)
+    selected = service.async_extract_referenced_entity_ids(hass, call)
+    assert selected.missing_areas == {kitchen.id, "unknown"}
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
 async def test_async_get_all_descriptions(hass: HomeAssistant) -> None:
     """Test async_get_all_descriptions."""
     group = hass.components.group
@@ -12,6 +12,7 @@ from typing import Any
 from unittest.mock import patch
 
 from freezegun import freeze_time
+import jinja2
 import orjson
 import pytest
 import voluptuous as vol
@@ -20,6 +21,7 @@ from homeassistant.components import group
 from homeassistant.config import async_process_ha_core_config
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STARTED,
     STATE_ON,
     STATE_UNAVAILABLE,
     UnitOfLength,
@@ -249,6 +251,43 @@ def test_iterating_domain_states(hass: HomeAssistant) -> None:
     )
 
 
+def test_iterating_states_after_domain_change(hass: HomeAssistant) -> None:
+    """Test iterating states after the states of a domain changed."""
+    tmpl = template.Template(
+        "{{ states | selectattr('state', 'eq', 'on') | map(attribute='entity_id')"
+        " | sort | join(',') }}",
+        hass,
+    )
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("switch.ac", "on")
+    assert tmpl.async_render() == "light.kitchen,switch.ac"
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.bedroom", "on")
+    assert tmpl.async_render() == "light.bedroom,switch.ac"
+
+    hass.states.async_remove("switch.ac")
+    assert tmpl.async_render() == "light.bedroom"
+
+
+def test_iterating_all_states_in_insertion_order(hass: HomeAssistant) -> None:
+    """Test iterating all states keeps the order the states were added in."""
+    tmpl = template.Template(
+        "{{ states | map(attribute='entity_id') | join(',') }}", hass
+    )
+    hass.states.async_set("sensor.temperature", "10")
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("sensor.humidity", "50")
+    assert tmpl.async_render() == "sensor.temperature,light.kitchen,sensor.humidity"
+
+    # Changed states keep their place
+    hass.states.async_set("sensor.temperature", "11")
+    hass.states.async_set("light.bedroom", "off")
+    assert tmpl.async_render() == (
+        "sensor.temperature,light.kitchen,sensor.humidity,light.bedroom"
+    )
+
+
 async def test_import(hass: HomeAssistant) -> None:
     """Test that imports work from the config/custom_templates folder."""
     await template.async_load_custom_templates(hass)
@@ -4582,9 +4621,136 @@ async def test_cache_garbage_collection() -> None:
     del tpl
     assert template._NO_HASS_ENV.template_cache.get(template_string)
     del tpl2
+    # The most recently compiled templates are kept
+    assert template._NO_HASS_ENV.template_cache.get(template_string)
+    del template.COMPILED_TEMPLATE_CODE_LRU[
+        template._NO_HASS_ENV.compiled_code_key(template_string)
+    ]
     assert not template._NO_HASS_ENV.template_cache.get(template_string)
 
 
+async def test_compiled_code_shared_between_environments(hass: HomeAssistant) -> None:
+    """Test templates with the same source share the compiled code."""
+    template_string = "{{ states('sensor.shared') }}"
+    tpl = template.Template(template_string, hass)
+    assert tpl.async_render() == "unknown"
+    code = template.COMPILED_TEMPLATE_CODE_LRU[
+        tpl._env.compiled_code_key(template_string)
+    ]
+    del tpl
+
+    # A new environment with the same flags uses the same code
+    hass.data.pop(template._ENVIRONMENT)
+    with patch.object(
+        jinja2.sandbox.ImmutableSandboxedEnvironment, "compile"
+    ) as mock_compile:
+        tpl = template.Template(template_string, hass)
+        assert tpl.async_render() == "unknown"
+    assert not mock_compile.called
+    assert tpl._compiled_code is code
+
+
+async def test_compiled_code_not_shared_with_other_filters(
+    hass: HomeAssistant,
+) -> None:
+    """Test environments with other filters do not share the compiled code."""
+    template_string = "{{ 'sensor.shared' | area_id }}"
+    tpl = template.Template(template_string, hass)
+    assert tpl.async_render() is None
+
+    # The area_id filter does not exist without hass
+    with pytest.raises(TemplateError):
+        template.Template(template_string).ensure_valid()
+
+
+async def test_template_sources_cache(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the templates are compiled again after a restart."""
+    template_string = "{{ states('sensor.persisted') | float(1) * 2 }}"
+    await template.async_load_template_sources(hass)
+    tpl = template.Template(template_string, hass)
+    assert tpl.async_render() == 2.0
+    key = tpl._env.compiled_code_key(template_string)
+    no_hass_tpl = template.Template("{{ 'no hass' }}")
+    no_hass_tpl.ensure_valid()
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass,
+        dt_util.utcnow() + timedelta(seconds=template.TEMPLATE_SOURCES_SAVE_DELAY),
+    )
+    await hass.async_block_till_done()
+    data = hass_storage[template.TEMPLATE_SOURCES_STORAGE_KEY]["data"]
+    assert [template_string, False, False] in data["templates"]
+    # Only the sources of the templates of Home Assistant are stored
+    assert ["{{ 'no hass' }}", False, False] not in data["templates"]
+
+    # Simulate a restart
+    del tpl
+    template.COMPILED_TEMPLATE_CODE_LRU.clear()
+    hass.data.pop(template._ENVIRONMENT)
+    await template.async_load_template_sources(hass)
+    await hass.data[template._TEMPLATE_SOURCES].compile_task
+    assert key in template.COMPILED_TEMPLATE_CODE_LRU
+    with patch.object(
+        jinja2.sandbox.ImmutableSandboxedEnvironment, "compile"
+    ) as mock_compile:
+        tpl = template.Template(template_string, hass)
+        assert tpl.async_render() == 2.0
+    assert not mock_compile.called
+
+
+async def test_template_sources_cache_invalid_template(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test stored sources that do not compile are skipped."""
+    template_string = "{{ 'valid' }}"
+    hass_storage[template.TEMPLATE_SOURCES_STORAGE_KEY] = {
+        "version": template.TEMPLATE_SOURCES_STORAGE_VERSION,
+        "key": template.TEMPLATE_SOURCES_STORAGE_KEY,
+        "data": {
+            "templates": [
+                ["{{ 'invalid' | no_such_filter }}", False, False],
+                [template_string, False, False],
+            ],
+        },
+    }
+    await template.async_load_template_sources(hass)
+    await hass.data[template._TEMPLATE_SOURCES].compile_task
+    tpl = template.Template(template_string, hass)
+    assert tpl._env.compiled_code_key(template_string) in (
+        template.COMPILED_TEMPLATE_CODE_LRU
+    )
+    assert tpl.async_render() == "valid"
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [],
+        {},
+        {"templates": None},
+        {"templates": [["{{ 'malformed' }}", False]]},
+        {"templates": [[None, False, False]]},
+    ],
+)
+async def test_template_sources_cache_malformed(
+    hass: HomeAssistant, hass_storage: dict[str, Any], data: Any
+) -> None:
+    """Test malformed template sources are discarded."""
+    hass_storage[template.TEMPLATE_SOURCES_STORAGE_KEY] = {
+        "version": template.TEMPLATE_SOURCES_STORAGE_VERSION,
+        "key": template.TEMPLATE_SOURCES_STORAGE_KEY,
+        "data": data,
+    }
+    await template.async_load_template_sources(hass)
+    assert hass.data[template._TEMPLATE_SOURCES].compile_task is None
+    tpl = template.Template("{{ 'malformed' }}", hass)
+    assert tpl.async_render() == "malformed"
+
+
 def test_is_template_string() -> None:
     """Test is template string."""
     assert template.is_template_string("{{ x }}") is True
@@ -1172,6 +1172,36 @@ async def test_statemachine_entity_ids(hass: HomeAssistant) -> None:
     assert states == ["light.bowl", "switch.ac"]
 
 
+async def test_statemachine_snapshot(hass: HomeAssistant) -> None:
+    """Test async_snapshot method."""
+    assert hass.states.async_snapshot() == ()
+    assert hass.states.async_snapshot("light") == ()
+
+    hass.states.async_set("light.bowl", "on", {})
+    hass.states.async_set("switch.ac", "off", {})
+    light_snapshot = hass.states.async_snapshot("LIGHT")
+    switch_snapshot = hass.states.async_snapshot("switch")
+    all_snapshot = hass.states.async_snapshot()
+    assert light_snapshot == (hass.states.get("light.bowl"),)
+    assert switch_snapshot == (hass.states.get("switch.ac"),)
+    assert all_snapshot == tuple(hass.states.async_all())
+    assert hass.states.async_snapshot("light") is light_snapshot
+    assert hass.states.async_snapshot() is all_snapshot
+    assert set(hass.states.async_domains()) == {"light", "switch"}
+
+    # Only the snapshot of the changed domain is rebuilt
+    hass.states.async_set("light.bowl", "off", {})
+    assert hass.states.async_snapshot("light") == (hass.states.get("light.bowl"),)
+    assert hass.states.async_snapshot("light") is not light_snapshot
+    assert hass.states.async_snapshot("switch") is switch_snapshot
+    assert hass.states.async_snapshot() is not all_snapshot
+    assert light_snapshot[0].state == "on"
+
+    hass.states.async_remove("switch.ac")
+    assert hass.states.async_snapshot("switch") == ()
+    assert hass.states.async_snapshot() == (hass.states.get("light.bowl"),)
+
+
 async def test_statemachine_remove(hass: HomeAssistant) -> None:
     """Test remove method."""
     hass.states.async_set("light.bowl", "on", {})